@@ -166,7 +166,8 @@ async def general_exception_handler(request: Request, exc: Exception):
 
 
 # Register routes
-from api_gateway.routes import upload, health, jobs, download, stream, models, clips, analytics
+from api_gateway.routes import upload, health, jobs, download, stream, models, clips, analytics, webhooks
+from api_gateway.services.event_dispatcher import event_dispatcher
 
 app.include_router(upload.router, prefix="/api/v1", tags=["upload"])
 app.include_router(health.router, prefix="/api/v1", tags=["health"])
@@ -176,6 +177,13 @@ app.include_router(stream.router, prefix="/api/v1", tags=["stream"])
 app.include_router(models.router, prefix="/api/v1", tags=["models"])
 app.include_router(clips.router, prefix="/api/v1", tags=["clips"])
 app.include_router(analytics.router, prefix="/api/v1", tags=["analytics"])
+app.include_router(webhooks.router, prefix="/api/v1", tags=["webhooks"])
+
+
+@app.on_event("shutdown")
+async def stop_event_dispatcher():
+    """Close the process-wide SSE event subscription."""
+    await event_dispatcher.stop()
 
 
 @app.get("/")
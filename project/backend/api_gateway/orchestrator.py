@@ -24,6 +24,7 @@ from shared.errors import (
 from shared.logging import get_logger
 from api_gateway.services.event_publisher import publish_event
 from api_gateway.services.sse_manager import broadcast_event
+from api_gateway.services.job_status_store import patch_job_stage, patch_job_status
 from api_gateway.services.budget_helpers import get_budget_limit, get_cost_estimate
 from api_gateway.services.time_estimator import calculate_estimated_remaining
 
@@ -150,15 +151,13 @@ async def stop_pipeline_gracefully(job_id: str, stage_name: str, progress: int)
         stage_name: Stage that just completed
         progress: Current progress percentage
     """
-    await db_client.table("jobs").update({
+    stop_update = {
         "current_stage": stage_name,
         "progress": progress,
         "updated_at": "now()"
-    }).eq("id", job_id).execute()
-    
-    # Invalidate cache
-    cache_key = f"job_status:{job_id}"
-    await redis_client.client.delete(cache_key)
+    }
+    await db_client.table("jobs").update(stop_update).eq("id", job_id).execute()
+    await patch_job_status(job_id, stop_update)
     
     logger.info(
         f"Pipeline stopped gracefully after {stage_name} (progress: {progress}%)",
@@ -247,10 +246,7 @@ async def update_progress(
             update_data["estimated_remaining"] = estimated_remaining
         
         await db_client.table("jobs").update(update_data).eq("id", job_id).execute()
-        
-        # Invalidate cache
-        cache_key = f"job_status:{job_id}"
-        await redis_client.client.delete(cache_key)
+        await patch_job_status(job_id, update_data)
         
         # Get current total cost to include in progress event
         try:
@@ -336,15 +332,13 @@ async def handle_pipeline_error(job_id: str, error: Exception) -> None:
             retryable = isinstance(error, RetryableError)
         
         # Update job status
-        await db_client.table("jobs").update({
+        failure_update = {
             "status": "failed",
             "error_message": error_message,
             "updated_at": "now()"
-        }).eq("id", job_id).execute()
-        
-        # Invalidate cache
-        cache_key = f"job_status:{job_id}"
-        await redis_client.client.delete(cache_key)
+        }
+        await db_client.table("jobs").update(failure_update).eq("id", job_id).execute()
+        await patch_job_status(job_id, failure_update)
         
         # Publish error event
         await publish_event(job_id, "error", {
@@ -391,6 +385,8 @@ async def execute_pipeline(job_id: str, audio_url: str, user_prompt: str, stop_a
             "template": template
         }
     )
+    clip_pipeline = None  # Composer clip pipeline, fed while clips are still generating
+    reference_prefetcher = None  # Reference images started while the scene plan streams
     try:
         # Stage 1: Audio Parser (10% progress)
         # Publish stage update FIRST before status change to avoid flickering
@@ -418,15 +414,18 @@ async def execute_pipeline(job_id: str, audio_url: str, user_prompt: str, stop_a
                     "status": "processing",
                     "started_at": datetime.now().isoformat()
                 }).execute()
+            await patch_job_stage(job_id, "audio_parser", status="processing")
         except Exception as e:
             logger.warning("Failed to track audio parser start time", exc_info=e, extra={"job_id": job_id})
         
         # Update job status to processing
-        await db_client.table("jobs").update({
+        processing_update = {
             "status": "processing",
             "current_stage": "audio_parser",
             "updated_at": "now()"
-        }).eq("id", job_id).execute()
+        }
+        await db_client.table("jobs").update(processing_update).eq("id", job_id).execute()
+        await patch_job_status(job_id, processing_update)
         
         if await check_cancellation(job_id):
             await error_handler(job_id, PipelineError("Job cancelled by user"))
@@ -705,6 +704,7 @@ async def execute_pipeline(job_id: str, audio_url: str, user_prompt: str, stop_a
                     "status": "processing",
                     "started_at": datetime.now().isoformat()
                 }).execute()
+            await patch_job_stage(job_id, "scene_planner", status="processing")
         except Exception as e:
             logger.warning("Failed to track scene planner start time", exc_info=e, extra={"job_id": job_id})
         
@@ -733,10 +733,19 @@ async def execute_pipeline(job_id: str, audio_url: str, user_prompt: str, stop_a
                 logger.error(f"Invalid job_id format: {job_id}", exc_info=e, extra={"job_id": job_id})
                 raise ValidationError(f"Invalid job_id format: {job_id}", job_id=job_id) from e
             
+            # Start reference images for characters and scenes while the plan is still streaming
+            if settings.reference_prefetch_enabled and not await should_stop_after_stage("scene_planner", stop_at_stage):
+                from modules.reference_generator.prefetch import ReferencePrefetcher
+                reference_prefetcher = ReferencePrefetcher(
+                    job_uuid,
+                    user_uploaded_images=await load_user_reference_images(job_uuid)
+                )
+            
             plan = await process_scene_planning(
                 job_id=job_uuid,
                 user_prompt=user_prompt,
-                audio_data=audio_data
+                audio_data=audio_data,
+                on_entry=reference_prefetcher.add if reference_prefetcher else None
             )
             await publish_event(job_id, "message", {
                 "text": "Scene planning complete!",
@@ -968,6 +977,7 @@ async def execute_pipeline(job_id: str, audio_url: str, user_prompt: str, stop_a
                     "status": "processing",
                     "started_at": datetime.now().isoformat()
                 }).execute()
+            await patch_job_stage(job_id, "reference_generator", status="processing")
         except Exception as e:
             logger.warning("Failed to track reference generator start time", exc_info=e, extra={"job_id": job_id})
         
@@ -1073,8 +1083,11 @@ async def execute_pipeline(job_id: str, audio_url: str, user_prompt: str, stop_a
             job_id_uuid = UUID(job_id)
             duration_seconds = audio_data.duration if hasattr(audio_data, 'duration') else None
             
-            # Load user-uploaded reference images
-            user_uploaded_images = await load_user_reference_images(job_id_uuid)
+            # Load user-uploaded reference images (already loaded if references were prefetched)
+            if reference_prefetcher:
+                user_uploaded_images = reference_prefetcher.user_uploaded_images
+            else:
+                user_uploaded_images = await load_user_reference_images(job_id_uuid)
             
             logger.info(
                 f"Loaded user-uploaded images for job {job_id}",
@@ -1097,7 +1110,8 @@ async def execute_pipeline(job_id: str, audio_url: str, user_prompt: str, stop_a
                 job_id_uuid,
                 plan,
                 duration_seconds,
-                user_uploaded_images=user_uploaded_images if user_uploaded_images else None
+                user_uploaded_images=user_uploaded_images if user_uploaded_images else None,
+                prefetcher=reference_prefetcher
             )
             
             # Track progress as images complete (for more frequent updates)
@@ -1158,6 +1172,7 @@ async def execute_pipeline(job_id: str, audio_url: str, user_prompt: str, stop_a
                         "status": "failed",
                         "metadata": json.dumps(failure_metadata)
                     }).execute()
+                    await patch_job_stage(job_id, "reference_generator", status="failed", metadata=failure_metadata)
                 except Exception as stage_err:
                     logger.warning("Failed to record reference generator failure metadata", exc_info=stage_err)
                 raise PipelineError("Reference generator did not produce any references")
@@ -1229,15 +1244,17 @@ async def execute_pipeline(job_id: str, audio_url: str, user_prompt: str, stop_a
         except Exception as e:
             # Set fallback flag
             logger.error("Reference Generator failed, setting fallback mode", exc_info=e, extra={"job_id": job_id})
+            fallback_metadata = {
+                "fallback_mode": True,
+                "fallback_reason": str(e)
+            }
             await db_client.table("job_stages").insert({
                 "job_id": job_id,
                 "stage_name": "reference_generator",
                 "status": "failed",
-                "metadata": json.dumps({
-                    "fallback_mode": True,
-                    "fallback_reason": str(e)
-                })
+                "metadata": json.dumps(fallback_metadata)
             }).execute()
+            await patch_job_stage(job_id, "reference_generator", status="failed", metadata=fallback_metadata)
             # Publish failed event
             await publish_event(job_id, "stage_update", {
                 "stage": "reference_generator",
@@ -1245,6 +1262,10 @@ async def execute_pipeline(job_id: str, audio_url: str, user_prompt: str, stop_a
             })
             references = None
         
+        # Drop prefetched images the reference generator didn't claim
+        if reference_prefetcher:
+            await reference_prefetcher.close()
+        
         # Publish reference generator completion and cost update
         if references is not None:
             await publish_event(job_id, "stage_update", {
@@ -1282,6 +1303,7 @@ async def execute_pipeline(job_id: str, audio_url: str, user_prompt: str, stop_a
                     "status": "processing",
                     "started_at": datetime.now().isoformat()
                 }).execute()
+            await patch_job_stage(job_id, "prompt_generator", status="processing")
         except Exception as e:
             logger.warning("Failed to track prompt generator start time", exc_info=e, extra={"job_id": job_id})
         
@@ -1412,6 +1434,7 @@ async def execute_pipeline(job_id: str, audio_url: str, user_prompt: str, stop_a
                     "status": "processing",
                     "started_at": datetime.now().isoformat()
                 }).execute()
+            await patch_job_stage(job_id, "video_generator", status="processing")
         except Exception as e:
             logger.warning("Failed to track video generator start time", exc_info=e, extra={"job_id": job_id})
         
@@ -1441,6 +1464,13 @@ async def execute_pipeline(job_id: str, audio_url: str, user_prompt: str, stop_a
         try:
             from modules.video_generator.process import process as generate_videos
             
+            # Pipelined composition: normalize each clip as soon as it's generated.
+            # Lipsync replaces every clip afterwards, so there's nothing to get ahead on.
+            from modules.composer.config import PIPELINED_COMPOSITION
+            if PIPELINED_COMPOSITION and template != "lipsync" and stop_at_stage != "video_generator":
+                from modules.composer.clip_pipeline import ClipPipeline
+                clip_pipeline = ClipPipeline(UUID(job_id), aspect_ratio)
+            
             # Track progress as clips complete (for more frequent updates)
             video_progress_tracker = {
                 "completed": 0,
@@ -1509,6 +1539,10 @@ async def execute_pipeline(job_id: str, audio_url: str, user_prompt: str, stop_a
                             # Remove sub-progress tracking for completed clip
                             video_progress_tracker["clip_progress"].pop(clip_index, None)
                             
+                            # Start composer-side download + normalization right away
+                            if clip_pipeline is not None:
+                                clip_pipeline.submit(clip_index, event_data.get("video_url"))
+                            
                             # Accumulate clip data for incremental database persistence
                             accumulated_clips[clip_index] = {
                                 "clip_index": clip_index,
@@ -1809,6 +1843,7 @@ async def execute_pipeline(job_id: str, audio_url: str, user_prompt: str, stop_a
                         "status": "processing",
                         "started_at": datetime.now().isoformat()
                     }).execute()
+                await patch_job_stage(job_id, "lipsync_processor", status="processing")
             except Exception as e:
                 logger.warning("Failed to track lipsync processor start time", exc_info=e, extra={"job_id": job_id})
             
@@ -1829,6 +1864,12 @@ async def execute_pipeline(job_id: str, audio_url: str, user_prompt: str, stop_a
                         await publish_event(job_id, event_type, event_data)
                     except Exception as e:
                         logger.warning(f"Failed to publish lipsync event: {e}")
+                    
+                    # Clips finish out of order; advance stage progress (85-90%) per finished clip
+                    total = event_data.get("total_clips")
+                    if event_type in ("lipsync_complete", "lipsync_failed") and total:
+                        progress = 85 + int(5 * event_data.get("completed_clips", 0) / total)
+                        await update_progress(job_id, min(progress, 90), "lipsync_processor", num_clips=total)
                 
                 # Apply lipsync to clips
                 clips = await process_lipsync_clips(
@@ -1929,6 +1970,7 @@ async def execute_pipeline(job_id: str, audio_url: str, user_prompt: str, stop_a
                     "status": "processing",
                     "started_at": datetime.now().isoformat()
                 }).execute()
+            await patch_job_stage(job_id, "composer", status="processing")
         except Exception as e:
             logger.warning("Failed to track composer start time", exc_info=e, extra={"job_id": job_id})
         
@@ -1953,7 +1995,8 @@ async def execute_pipeline(job_id: str, audio_url: str, user_prompt: str, stop_a
                 audio_url,
                 transitions,
                 beat_timestamps,
-                aspect_ratio
+                aspect_ratio,
+                clip_pipeline=clip_pipeline
             )
         except ImportError:
             logger.warning("Composer module not found, using stub", extra={"job_id": job_id})
@@ -1979,7 +2022,7 @@ async def execute_pipeline(job_id: str, audio_url: str, user_prompt: str, stop_a
         total_cost = job_result.data[0].get("total_cost", 0) if job_result.data else 0
         
         # Update job as completed
-        await db_client.table("jobs").update({
+        completed_update = {
             "status": "completed",
             "progress": 100,
             "current_stage": "composer",
@@ -1987,11 +2030,9 @@ async def execute_pipeline(job_id: str, audio_url: str, user_prompt: str, stop_a
             "total_cost": total_cost,
             "completed_at": "now()",
             "updated_at": "now()"
-        }).eq("id", job_id).execute()
-        
-        # Invalidate cache
-        cache_key = f"job_status:{job_id}"
-        await redis_client.client.delete(cache_key)
+        }
+        await db_client.table("jobs").update(completed_update).eq("id", job_id).execute()
+        await patch_job_status(job_id, completed_update)
         
         await update_progress(job_id, 100, "composer", audio_duration=audio_data.duration if hasattr(audio_data, 'duration') else None)
         
@@ -2007,6 +2048,9 @@ async def execute_pipeline(job_id: str, audio_url: str, user_prompt: str, stop_a
         })
         
         
+    except RetryableError:
+        # The worker schedules a delayed retry; it marks the job failed only once attempts run out
+        raise
     except (BudgetExceededError, PipelineError) as e:
         await error_handler(job_id, e)
         raise
@@ -2014,3 +2058,9 @@ async def execute_pipeline(job_id: str, audio_url: str, user_prompt: str, stop_a
         logger.error("Pipeline execution failed", exc_info=e, extra={"job_id": job_id})
         await error_handler(job_id, PipelineError(f"Pipeline execution failed: {str(e)}"))
         raise
+    finally:
+        if reference_prefetcher is not None:
+            # No-op if already closed after the reference stage
+            await reference_prefetcher.close()
+        if clip_pipeline is not None:
+            await clip_pipeline.close()
@@ -20,11 +20,13 @@ from shared.logging import get_logger
 from shared.errors import ValidationError, GenerationError
 from api_gateway.dependencies import get_current_user, verify_job_ownership
 from api_gateway.services.event_publisher import publish_event
+from api_gateway.services.job_status_store import patch_job_stage, patch_job_status
 from api_gateway.services.queue_service import enqueue_regeneration_job
 from modules.clip_regenerator.data_loader import (
     load_clips_from_job_stages,
     load_clip_prompts_from_job_stages,
-    load_audio_data_from_job_stages
+    load_audio_data_from_job_stages,
+    invalidate_job_artifacts
 )
 from modules.clip_regenerator.process import regenerate_clip_with_recomposition
 from modules.clip_regenerator.status_manager import acquire_job_lock, update_job_status
@@ -1211,11 +1213,13 @@ async def revert_clip_to_version(
         aspect_ratio = await get_aspect_ratio(UUID(job_id))
         
         # Update job status to processing
-        await db_client.table("jobs").update({
+        processing_update = {
             "status": "processing",
             "current_stage": "composer",
             "updated_at": "now()"
-        }).eq("id", job_id).execute()
+        }
+        await db_client.table("jobs").update(processing_update).eq("id", job_id).execute()
+        await patch_job_status(job_id, processing_update)
         
         # Publish event
         await publish_event(job_id, "message", {
@@ -1265,24 +1269,28 @@ async def revert_clip_to_version(
                 exc_info=True
             )
             # Update job status to failed
-            await db_client.table("jobs").update({
+            failure_update = {
                 "status": "failed",
                 "error_message": f"Failed to re-stitch video: {str(e)}",
                 "updated_at": "now()"
-            }).eq("id", job_id).execute()
+            }
+            await db_client.table("jobs").update(failure_update).eq("id", job_id).execute()
+            await patch_job_status(job_id, failure_update)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to re-stitch video: {str(e)}"
             )
         
         # Update job with new video URL and mark as completed
-        await db_client.table("jobs").update({
+        completed_update = {
             "status": "completed",
             "progress": 100,
             "current_stage": "composer",
             "video_url": video_output.video_url,
             "updated_at": "now()"
-        }).eq("id", job_id).execute()
+        }
+        await db_client.table("jobs").update(completed_update).eq("id", job_id).execute()
+        await patch_job_status(job_id, completed_update)
         
         # CRITICAL: Update job_stages.metadata to reflect the reverted clip
         # This ensures the comparison modal knows which version is active
@@ -1343,6 +1351,8 @@ async def revert_clip_to_version(
                     await db_client.table("job_stages").update({
                         "metadata": metadata
                     }).eq("job_id", job_id).eq("stage_name", "video_generator").execute()
+                    await patch_job_stage(job_id, "video_generator", metadata=metadata)
+                    invalidate_job_artifacts(job_id)
                     
                     logger.info(
                         f"✅ Updated job_stages.metadata with reverted clip URL",
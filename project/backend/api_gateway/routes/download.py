@@ -7,6 +7,7 @@ Generate signed URLs for video downloads.
 import re
 from fastapi import APIRouter, Path, Depends, HTTPException, status
 from shared.storage import StorageClient
+from shared.signed_urls import get_signed_url
 from shared.logging import get_logger
 from api_gateway.dependencies import get_current_user, verify_job_ownership
 
@@ -101,11 +102,12 @@ async def download_video(
                 detail="Invalid video URL format"
             )
         
-        # Generate signed URL (1 hour expiration)
-        signed_url = await storage_client.get_signed_url(
+        # Generate signed URL (1 hour expiration, reused across repeat downloads)
+        signed_url = await get_signed_url(
             bucket=bucket,
             path=path,
-            expires_in=3600  # 1 hour
+            expires_in=3600,  # 1 hour
+            storage=storage_client
         )
         
         # Extract filename from path for download
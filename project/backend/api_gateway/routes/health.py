@@ -9,7 +9,10 @@ from datetime import datetime
 from fastapi import APIRouter, Response
 from shared.database import DatabaseClient
 from shared.redis_client import RedisClient
+from shared.supabase_pool import pool_stats
+from shared.llm_cache import llm_cache
 from shared.logging import get_logger
+from api_gateway.services.event_dispatcher import event_dispatcher
 from api_gateway.services.queue_service import get_queue_size
 
 logger = get_logger(__name__)
@@ -63,7 +66,10 @@ async def health_check():
             "workers": 2  # TODO: Track actual worker count
         },
         "database": "connected" if db_healthy else "disconnected",
-        "redis": "connected" if redis_healthy else "disconnected"
+        "redis": "connected" if redis_healthy else "disconnected",
+        "supabase_pool": pool_stats(),
+        "sse": event_dispatcher.stats(),
+        "llm_cache": llm_cache.stats()
     }
     
     if issues:
@@ -6,14 +6,23 @@ Job status, list, and cancellation.
 
 import asyncio
 import json
+import re
 from typing import Optional
 from fastapi import APIRouter, Path, Query, Depends, HTTPException, status
 from shared.database import DatabaseClient
 from shared.redis_client import RedisClient
 from shared.errors import ValidationError
 from shared.logging import get_logger
+from shared.signed_urls import get_signed_urls
+from shared.storage import storage
 from api_gateway.dependencies import get_current_user, verify_job_ownership
 from api_gateway.services.queue_service import remove_job
+from api_gateway.services.job_status_store import (
+    get_job_status_document,
+    get_job_status_version,
+    patch_job_status,
+    store_job_status_document
+)
 
 logger = get_logger(__name__)
 
@@ -37,55 +46,21 @@ async def get_job_status(
     Returns:
         Job status with all fields
     """
-    # Check Redis cache first (30s TTL) - before any database queries
-    cache_key = f"job_status:{job_id}"
+    # Materialized status document (kept current by the pipeline) - before any database queries
+    version = "0"
     try:
-        cached = await redis_client.get(cache_key)
-        if cached:
-            cached_data = json.loads(cached)
-            # Verify ownership from cached data (quick check)
-            if cached_data.get("user_id") == current_user["user_id"]:
-                # If cached data doesn't have stages or stages don't have metadata, fetch them (for backward compatibility with old cache)
-                if "stages" not in cached_data or not any(s.get("metadata") for s in cached_data.get("stages", {}).values()):
-                    try:
-                        stages_result = await db_client.table("job_stages").select("*").eq("job_id", job_id).execute()
-                        stages = {}
-                        if stages_result.data:
-                            for stage in stages_result.data:
-                                stage_name = stage.get("stage_name")
-                                if stage_name:
-                                    stage_info = {
-                                        "status": stage.get("status", "pending"),
-                                        "duration": stage.get("duration_seconds"),
-                                        "progress": None,
-                                    }
-                                    # Include metadata if available
-                                    metadata = stage.get("metadata")
-                                    if metadata:
-                                        try:
-                                            if isinstance(metadata, str):
-                                                metadata = json.loads(metadata)
-                                            stage_info["metadata"] = metadata
-                                        except (json.JSONDecodeError, TypeError):
-                                            pass
-                                    stages[stage_name] = stage_info
-                        cached_data["stages"] = stages
-                        # Update cache with stages included
-                        await redis_client.set(cache_key, json.dumps(cached_data), ex=30)
-                    except Exception as e:
-                        logger.warning("Failed to fetch stages for cached job", exc_info=e, extra={"job_id": job_id})
-                        if "stages" not in cached_data:
-                            cached_data["stages"] = {}
-                logger.debug("Job status retrieved from cache", extra={"job_id": job_id})
-                return cached_data
-            else:
-                # Cache hit but wrong user - clear cache and fetch from DB
-                logger.warning("Cached job belongs to different user, fetching from DB", extra={"job_id": job_id})
-                await redis_client.client.delete(cache_key)
+        document = await get_job_status_document(job_id)
+        if document:
+            # Verify ownership from the document (quick check)
+            if document.get("user_id") == current_user["user_id"]:
+                logger.debug("Job status retrieved from status document", extra={"job_id": job_id})
+                return document
+            logger.warning("Job status document belongs to different user, checking ownership", extra={"job_id": job_id})
+        version = await get_job_status_version(job_id)
     except Exception as e:
-        logger.warning("Failed to get job status from cache", exc_info=e)
+        logger.warning("Failed to get job status document", exc_info=e)
     
-    # Cache miss or ownership mismatch - fetch from database
+    # Not materialized yet (or ownership mismatch) - build from database
     # Verify ownership (this also fetches the job)
     job = await verify_job_ownership(job_id, current_user)
     
@@ -121,9 +96,6 @@ async def get_job_status(
         # Overall timeout: 3 seconds for entire reconstruction to prevent blocking
         if not stages.get("reference_generator", {}).get("metadata", {}).get("reference_images"):
             try:
-                from shared.storage import storage
-                import re
-                
                 # Wrap entire reconstruction in overall timeout (3 seconds)
                 async def _reconstruct_reference_images():
                     # List files in reference-images bucket for this job
@@ -140,51 +112,50 @@ async def get_job_status(
                         char_refs = []
                         
                         # Limit to first 10 files to avoid timeout (process most important ones)
-                        for file_info in reference_files[:10]:
-                            if not isinstance(file_info, dict):
-                                continue
-                            file_name = file_info.get("name", "")
-                            
-                            # Skip directories (user_uploaded folder, etc.) - only process actual image files
-                            # Directories don't have file extensions, or might be indicated differently
-                            if not file_name or "/" in file_name or not file_name.endswith((".png", ".jpg", ".jpeg")):
+                        # Skip directories (user_uploaded folder, etc.) - only process actual image files
+                        # Directories don't have file extensions, or might be indicated differently
+                        file_names = [
+                            file_info.get("name", "")
+                            for file_info in reference_files[:10]
+                            if isinstance(file_info, dict)
+                        ]
+                        file_names = [
+                            file_name for file_name in file_names
+                            if file_name and "/" not in file_name and file_name.endswith((".png", ".jpg", ".jpeg"))
+                        ]
+                        
+                        # One bulk request signs every file (cached URLs need none)
+                        signed_urls = await get_signed_urls(
+                            "reference-images",
+                            [f"{job_id}/{file_name}" for file_name in file_names],
+                            expires_in=3600
+                        )
+                        
+                        for file_name in file_names:
+                            signed_url = signed_urls.get(f"{job_id}/{file_name}")
+                            if not signed_url:
+                                logger.debug(f"No signed URL for {file_name}, skipping")
                                 continue
                             
-                            # Generate signed URL for the file (with timeout)
-                            try:
-                                signed_url = await asyncio.wait_for(
-                                    storage.get_signed_url(
-                                        bucket="reference-images",
-                                        path=f"{job_id}/{file_name}",
-                                        expires_in=3600
-                                    ),
-                                    timeout=0.5  # 500ms per URL generation
-                                )
-                                
-                                # Determine if it's a scene or character reference based on filename
-                                if file_name.startswith("scene_"):
-                                    scene_id = file_name.replace("scene_", "").replace(".png", "")
-                                    scene_refs.append({
-                                        "scene_id": scene_id,
-                                        "image_url": signed_url,
-                                        "prompt_used": "",
-                                        "generation_time": 0,
-                                        "cost": "0"
-                                    })
-                                elif file_name.startswith("char_"):
-                                    char_id = file_name.replace("char_", "").replace(".png", "")
-                                    char_refs.append({
-                                        "character_id": char_id,
-                                        "image_url": signed_url,
-                                        "prompt_used": "",
-                                        "generation_time": 0,
-                                        "cost": "0"
-                                    })
-                            except asyncio.TimeoutError:
-                                logger.debug(f"Timeout generating signed URL for {file_name}, skipping")
-                                continue
-                            except Exception as url_error:
-                                logger.warning(f"Failed to generate signed URL for {file_name}", exc_info=url_error)
+                            # Determine if it's a scene or character reference based on filename
+                            if file_name.startswith("scene_"):
+                                scene_id = file_name.replace("scene_", "").replace(".png", "")
+                                scene_refs.append({
+                                    "scene_id": scene_id,
+                                    "image_url": signed_url,
+                                    "prompt_used": "",
+                                    "generation_time": 0,
+                                    "cost": "0"
+                                })
+                            elif file_name.startswith("char_"):
+                                char_id = file_name.replace("char_", "").replace(".png", "")
+                                char_refs.append({
+                                    "character_id": char_id,
+                                    "image_url": signed_url,
+                                    "prompt_used": "",
+                                    "generation_time": 0,
+                                    "cost": "0"
+                                })
                         
                         if scene_refs or char_refs:
                             # Reconstruct metadata from storage
@@ -217,8 +188,6 @@ async def get_job_status(
         # Overall timeout: 3 seconds for entire reconstruction to prevent blocking
         if not stages.get("video_generator", {}).get("metadata", {}).get("clips"):
             try:
-                from shared.storage import storage
-                
                 # Wrap entire reconstruction in overall timeout (3 seconds)
                 async def _reconstruct_video_clips():
                     def _list_video_clips():
@@ -233,6 +202,7 @@ async def get_job_status(
                         completed = 0
                         
                         # Limit to first 20 clips to avoid timeout (process most important ones)
+                        clip_files_by_index = {}
                         for file_info in clip_files[:20]:
                             if not isinstance(file_info, dict):
                                 continue
@@ -240,33 +210,32 @@ async def get_job_status(
                             # Extract clip index from filename (e.g., "clip_0.mp4" -> 0)
                             match = re.search(r"clip_(\d+)\.mp4", file_name)
                             if match:
-                                clip_index = int(match.group(1))
-                                try:
-                                    signed_url = await asyncio.wait_for(
-                                        storage.get_signed_url(
-                                            bucket="video-clips",
-                                            path=f"{job_id}/{file_name}",
-                                            expires_in=3600
-                                        ),
-                                        timeout=0.5  # 500ms per URL generation
-                                    )
-                                    clips.append({
-                                        "clip_index": clip_index,
-                                        "video_url": signed_url,
-                                        "actual_duration": 5.0,  # Unknown, use default
-                                        "target_duration": 5.0,
-                                        "duration_diff": 0.0,
-                                        "status": "success",
-                                        "cost": "0",
-                                        "retry_count": 0,
-                                        "generation_time": 0
-                                    })
-                                    completed += 1
-                                except asyncio.TimeoutError:
-                                    logger.debug(f"Timeout generating signed URL for {file_name}, skipping")
-                                    continue
-                                except Exception as url_error:
-                                    logger.warning(f"Failed to generate signed URL for {file_name}", exc_info=url_error)
+                                clip_files_by_index[int(match.group(1))] = file_name
+                        
+                        # One bulk request signs every clip (cached URLs need none)
+                        signed_urls = await get_signed_urls(
+                            "video-clips",
+                            [f"{job_id}/{file_name}" for file_name in clip_files_by_index.values()],
+                            expires_in=3600
+                        )
+                        
+                        for clip_index, file_name in clip_files_by_index.items():
+                            signed_url = signed_urls.get(f"{job_id}/{file_name}")
+                            if not signed_url:
+                                logger.debug(f"No signed URL for {file_name}, skipping")
+                                continue
+                            clips.append({
+                                "clip_index": clip_index,
+                                "video_url": signed_url,
+                                "actual_duration": 5.0,  # Unknown, use default
+                                "target_duration": 5.0,
+                                "duration_diff": 0.0,
+                                "status": "success",
+                                "cost": "0",
+                                "retry_count": 0,
+                                "generation_time": 0
+                            })
+                            completed += 1
                         
                         if clips:
                             # Sort by clip_index
@@ -303,11 +272,8 @@ async def get_job_status(
         # If stages fetch fails, set empty dict to avoid breaking frontend
         job["stages"] = {}
     
-    # Cache result (30s TTL)
-    try:
-        await redis_client.set(cache_key, json.dumps(job), ex=30)
-    except Exception as e:
-        logger.warning("Failed to cache job status", exc_info=e)
+    # Materialize; later changes arrive as patches. Skipped if a patch landed while building.
+    await store_job_status_document(job_id, job, version)
     
     return job
 
@@ -405,15 +371,17 @@ async def cancel_job(
         )
     
     try:
+        cancelled = {
+            "status": "failed",
+            "error_message": "Job cancelled by user"
+        }
+        
         if job_status == "queued":
             # Remove from queue
             await remove_job(job_id)
             
             # Mark as failed in database
-            await db_client.table("jobs").update({
-                "status": "failed",
-                "error_message": "Job cancelled by user"
-            }).eq("id", job_id).execute()
+            await db_client.table("jobs").update(cancelled).eq("id", job_id).execute()
             
         elif job_status == "processing":
             # Set cancellation flag in Redis (TTL: 15min)
@@ -421,14 +389,9 @@ async def cancel_job(
             await redis_client.set(cancel_key, "1", ex=900)  # 15 minutes
             
             # Mark as failed in database immediately
-            await db_client.table("jobs").update({
-                "status": "failed",
-                "error_message": "Job cancelled by user"
-            }).eq("id", job_id).execute()
+            await db_client.table("jobs").update(cancelled).eq("id", job_id).execute()
         
-        # Invalidate cache
-        cache_key = f"job_status:{job_id}"
-        await redis_client.client.delete(cache_key)
+        await patch_job_status(job_id, cancelled)
         
         logger.info("Job cancelled", extra={"job_id": job_id, "status": job_status})
         
@@ -5,17 +5,22 @@ Real-time progress updates via Server-Sent Events.
 """
 
 import asyncio
-import json
+from datetime import datetime
 from typing import Optional
-from fastapi import APIRouter, Path, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Path, Depends, HTTPException, status, Query, Header
 from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPAuthorizationCredentials
-from shared.redis_client import RedisClient
 from shared.logging import get_logger
 from api_gateway.dependencies import get_current_user, verify_job_ownership, security
+from api_gateway.services.event_dispatcher import event_dispatcher
+from api_gateway.services.event_publisher import is_event_id, read_event_log
 from api_gateway.services.sse_manager import (
+    ClientQueue,
     add_connection,
     remove_connection,
+    format_sse,
+    sse_event_id,
+    event_id_order,
     get_initial_state,
     get_connections,
     cleanup_stale_connections,
@@ -26,77 +31,55 @@ from api_gateway.services.sse_manager import (
 logger = get_logger(__name__)
 
 router = APIRouter()
-redis_client = RedisClient()
 
 
-async def event_generator(job_id: str):
+async def event_generator(job_id: str, last_event_id: Optional[str] = None):
     """
     Generate SSE events for a job.
     
+    Events reach this connection's bounded queue through the process-wide
+    event dispatcher; no per-connection Redis subscription is opened. A
+    reconnecting client that sends its Last-Event-ID gets the events it
+    missed replayed from the job's event log instead of a fresh snapshot.
+    
     Args:
         job_id: Job ID to stream events for
+        last_event_id: Last event log ID the client received (resume point)
         
     Yields:
         SSE formatted event strings
     """
-    queue = asyncio.Queue()
-    pubsub = None
+    queue = ClientQueue()
+    # Newest event log ID already sent; live events up to it were replayed
+    last_sent_id = None
     
     try:
-        # Add connection
+        # Register before reading state or the log so no published event is missed
         await add_connection(job_id, queue)
+        event_dispatcher.ensure_started()
         
-        # Send initial state
-        initial_state = await get_initial_state(job_id)
-        initial_event = f"event: progress\ndata: {json.dumps(initial_state)}\n\n"
-        yield initial_event
-        
-        # Start background task to subscribe to Redis pub/sub and forward to queue
-        pubsub = redis_client.client.pubsub()
-        channel = f"job_events:{job_id}"
-        await pubsub.subscribe(channel)
-        
-        # Background task to listen to Redis pub/sub and forward to queue
-        async def pubsub_listener():
+        replay = []
+        contiguous = False
+        if last_event_id:
             try:
-                while True:
-                    try:
-                        message = await pubsub.get_message(timeout=1.0)
-                        if message and message.get("type") == "message":
-                            # Parse and format event
-                            event_data_str = message.get("data")
-                            if event_data_str:
-                                if isinstance(event_data_str, bytes):
-                                    event_data_str = event_data_str.decode("utf-8")
-                                event_data = json.loads(event_data_str)
-                                event_type = event_data.get("event_type")
-                                data = event_data.get("data", {})
-                                
-                                # Format as SSE and put in queue
-                                sse_message = f"event: {event_type}\ndata: {json.dumps(data)}\n\n"
-                                await queue.put(sse_message)
-                    except asyncio.TimeoutError:
-                        continue
-                    except Exception as e:
-                        logger.debug("Pub/sub listener error", exc_info=e)
-                        await asyncio.sleep(0.1)
-            except asyncio.CancelledError:
-                pass
+                contiguous, replay = await read_event_log(job_id, last_event_id)
+            except Exception as e:
+                logger.warning("Failed to read event log, sending current state", exc_info=e, extra={"job_id": job_id})
         
-        listener_task = asyncio.create_task(pubsub_listener())
+        if not contiguous:
+            # New client, or the log no longer reaches back to the client's position
+            initial_state = await get_initial_state(job_id)
+            yield format_sse("progress", initial_state)
         
-        # Background cleanup task - more frequent cleanup
-        async def cleanup_task():
-            try:
-                while True:
-                    await asyncio.sleep(15)  # Run every 15 seconds (reduced from 30)
-                    removed = await cleanup_stale_connections(timeout_seconds=30)  # More aggressive: 30s timeout
-                    if removed > 0:
-                        logger.info(f"Cleaned up {removed} stale SSE connections")
-            except asyncio.CancelledError:
-                pass
+        for event_id, event_type, data in replay:
+            yield format_sse(event_type, data, event_id)
+            last_sent_id = event_id
         
-        cleanup_task_obj = asyncio.create_task(cleanup_task())
+        if last_event_id:
+            logger.info(
+                f"SSE stream resumed with {len(replay)} replayed events",
+                extra={"job_id": job_id, "last_event_id": last_event_id, "contiguous": contiguous}
+            )
         
         logger.info("SSE stream started", extra={"job_id": job_id})
         
@@ -115,59 +98,43 @@ async def event_generator(job_id: str):
                 # Wait for event from queue or timeout for heartbeat
                 try:
                     event_message = await asyncio.wait_for(queue.get(), timeout=timeout)
+                    if last_sent_id is not None:
+                        event_id = sse_event_id(event_message)
+                        if event_id and event_id_order(event_id) <= event_id_order(last_sent_id):
+                            continue  # Already replayed from the event log
                     yield event_message
                 except asyncio.TimeoutError:
                     # Send heartbeat
-                    from datetime import datetime
                     heartbeat_data = {"timestamp": datetime.utcnow().isoformat()}
-                    heartbeat_event = f"event: heartbeat\ndata: {json.dumps(heartbeat_data)}\n\n"
-                    yield heartbeat_event
+                    yield format_sse("heartbeat", heartbeat_data)
                     last_heartbeat = asyncio.get_event_loop().time()
-                    
-                    # Update connection timestamp
-                    update_connection_timestamp(job_id, queue)
+                
+                # Client is consuming; keep it out of the stale sweep
+                update_connection_timestamp(job_id, queue)
                 
             except asyncio.CancelledError:
                 logger.info("SSE stream cancelled", extra={"job_id": job_id})
                 break
             except Exception as e:
                 logger.error("Error in SSE stream", exc_info=e, extra={"job_id": job_id})
-                error_event = f"event: error\ndata: {json.dumps({'error': 'Stream error'})}\n\n"
-                yield error_event
+                yield format_sse("error", {"error": "Stream error"})
                 break
         
     finally:
-        # Cancel background tasks
-        if 'listener_task' in locals():
-            listener_task.cancel()
-            try:
-                await listener_task
-            except asyncio.CancelledError:
-                pass
-        
-        if 'cleanup_task_obj' in locals():
-            cleanup_task_obj.cancel()
-            try:
-                await cleanup_task_obj
-            except asyncio.CancelledError:
-                pass
-        
-        # Cleanup
         await remove_connection(job_id, queue)
-        if pubsub:
-            try:
-                await pubsub.unsubscribe(channel)
-                await pubsub.close()
-            except Exception as e:
-                logger.warning("Failed to cleanup pub/sub", exc_info=e)
         
-        logger.info("SSE stream ended", extra={"job_id": job_id})
+        logger.info(
+            "SSE stream ended",
+            extra={"job_id": job_id, "coalesced": queue.coalesced, "dropped": queue.dropped}
+        )
 
 
 @router.get("/jobs/{job_id}/stream")
 async def stream_progress(
     job_id: str = Path(...),
     token: Optional[str] = Query(None, alias="token"),  # Token from query parameter
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),  # Set by EventSource on reconnect
+    last_event_id_param: Optional[str] = Query(None, alias="last_event_id"),  # For clients that reconnect manually
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)  # Token from header
 ):
     """
@@ -176,6 +143,8 @@ async def stream_progress(
     Args:
         job_id: Job ID to stream events for
         token: Optional token from query parameter (for SSE, since EventSource can't send headers)
+        last_event_id: Last-Event-ID header (resume point after a reconnect)
+        last_event_id_param: Resume point as a query parameter
         credentials: Optional token from Authorization header
         request: FastAPI request object
         
@@ -220,8 +189,12 @@ async def stream_progress(
             detail=f"Maximum {MAX_CONNECTIONS_PER_JOB} connections per job exceeded"
         )
     
+    resume_from = last_event_id or last_event_id_param
+    if not is_event_id(resume_from):
+        resume_from = None
+    
     return StreamingResponse(
-        event_generator(job_id),
+        event_generator(job_id, resume_from),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
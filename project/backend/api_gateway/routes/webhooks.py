@@ -0,0 +1,62 @@
+"""
+Replicate webhook endpoint.
+
+Receives prediction completion callbacks and hands them to waiting generators via Redis.
+"""
+
+import json
+from fastapi import APIRouter, Request, HTTPException, status
+from shared.config import settings
+from shared.logging import get_logger
+from shared.replicate_completion import (
+    TERMINAL_STATUSES,
+    publish_prediction_result,
+    verify_webhook_signature,
+)
+
+logger = get_logger(__name__)
+
+router = APIRouter()
+
+
+@router.post("/webhooks/replicate")
+async def replicate_webhook(request: Request):
+    """
+    Replicate prediction webhook.
+
+    Registered on predictions via the "webhook" create parameter (REPLICATE_WEBHOOK_URL).
+    Every callback must carry a valid signature for REPLICATE_WEBHOOK_SECRET; without
+    a secret no webhooks are registered and all callbacks are rejected.
+
+    Args:
+        request: FastAPI request (raw body is needed for signature verification)
+
+    Returns:
+        Acknowledgement
+    """
+    body = await request.body()
+
+    if not settings.replicate_webhook_secret:
+        logger.warning("Rejected Replicate webhook: REPLICATE_WEBHOOK_SECRET is not configured")
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid webhook signature")
+    if not verify_webhook_signature(request.headers, body, settings.replicate_webhook_secret):
+        logger.warning("Rejected Replicate webhook with invalid signature")
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid webhook signature")
+
+    try:
+        payload = json.loads(body)
+    except json.JSONDecodeError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid JSON payload")
+
+    prediction_id = payload.get("id") if isinstance(payload, dict) else None
+    if not prediction_id:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Missing prediction id")
+
+    if payload.get("status") in TERMINAL_STATUSES:
+        await publish_prediction_result(payload)
+        logger.info(
+            f"Replicate prediction {prediction_id} {payload.get('status')}",
+            extra={"prediction_id": prediction_id, "status": payload.get("status")}
+        )
+
+    return {"received": True}
@@ -10,13 +10,12 @@ from uuid import UUID
 from decimal import Decimal
 from datetime import datetime, date
 from shared.database import DatabaseClient
-from shared.redis_client import RedisClient
 from shared.logging import get_logger
+from api_gateway.services.job_status_store import invalidate_job_status, patch_job_stage
 
 logger = get_logger(__name__)
 
 db_client = DatabaseClient()
-redis_client = RedisClient()
 
 
 def make_json_serializable(obj: Any) -> Any:
@@ -54,16 +53,14 @@ def make_json_serializable(obj: Any) -> Any:
 
 async def invalidate_job_cache(job_id: str) -> None:
     """
-    Invalidate Redis cache for a job.
+    Drop the materialized status document for a job.
+    
+    Prefer patch_job_status / patch_job_stage, which keep the document current.
     
     Args:
         job_id: Job ID
     """
-    try:
-        cache_key = f"job_status:{job_id}"
-        await redis_client.client.delete(cache_key)
-    except Exception as e:
-        logger.warning("Failed to invalidate job cache", exc_info=e, extra={"job_id": job_id})
+    await invalidate_job_status(job_id)
 
 
 async def update_job_stage(
@@ -88,6 +85,7 @@ async def update_job_stage(
             "status": status
         }
         
+        serializable_metadata = None
         if metadata:
             # Convert metadata to JSON-serializable format (recursively convert UUIDs, Decimals, etc. to strings)
             # PostgREST will handle JSON serialization for JSONB fields, but we need to ensure all values are JSON-serializable
@@ -107,6 +105,9 @@ async def update_job_stage(
             # Insert new
             await db_client.table("job_stages").insert(stage_data).execute()
         
+        # Keep the materialized status document current
+        await patch_job_stage(job_id, stage_name, status=status, metadata=serializable_metadata)
+        
         logger.debug("Job stage updated", extra={"job_id": job_id, "stage_name": stage_name, "status": status})
         
     except Exception as e:
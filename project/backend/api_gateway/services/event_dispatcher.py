@@ -0,0 +1,168 @@
+"""
+SSE event dispatcher.
+
+One Redis pattern subscription (job_events:*) per gateway process instead of
+one subscription per browser connection. Each published event is parsed and
+formatted once, then fanned out to the job's local SSE clients through their
+bounded queues, so slow viewers never hold up the subscription or each other.
+"""
+
+import asyncio
+import json
+from typing import Any, Dict, Optional, Union
+from shared.redis_client import RedisClient
+from shared.logging import get_logger
+from api_gateway.services.sse_manager import (
+    connections,
+    cleanup_stale_connections,
+    deliver,
+    format_sse
+)
+
+logger = get_logger(__name__)
+
+redis_client = RedisClient()
+
+CHANNEL_PREFIX = "job_events:"
+CHANNEL_PATTERN = f"{CHANNEL_PREFIX}*"
+
+# Resubscribe backoff after a lost Redis connection
+RECONNECT_DELAY_SECONDS = 0.5
+MAX_RECONNECT_DELAY_SECONDS = 10.0
+
+# Stale connection sweep (one task per process, not per connection)
+STALE_CLEANUP_INTERVAL_SECONDS = 15
+STALE_CONNECTION_TIMEOUT_SECONDS = 30
+
+
+class EventDispatcher:
+    """Process-wide Redis pub/sub listener that fans job events out to SSE clients."""
+
+    def __init__(self):
+        self._listener_task: Optional[asyncio.Task] = None
+        self._cleanup_task: Optional[asyncio.Task] = None
+        self._subscribed = False
+        self._stats = {"messages": 0, "delivered": 0, "reconnects": 0}
+
+    def ensure_started(self) -> None:
+        """Start the subscription and the stale-connection sweep if not running."""
+        if self._listener_task is None or self._listener_task.done():
+            self._listener_task = asyncio.create_task(self._listen())
+        if self._cleanup_task is None or self._cleanup_task.done():
+            self._cleanup_task = asyncio.create_task(self._cleanup_stale())
+
+    async def stop(self) -> None:
+        """Cancel the subscription and the sweep (application shutdown)."""
+        for task in (self._listener_task, self._cleanup_task):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._listener_task = None
+        self._cleanup_task = None
+
+    def dispatch(self, channel: Union[str, bytes], data: Union[str, bytes]) -> int:
+        """
+        Fan one published event out to the job's local connections.
+
+        Runs without awaiting, so the connection registry can't change mid-dispatch.
+
+        Args:
+            channel: Redis channel (job_events:{job_id})
+            data: JSON message from event_publisher.publish_event
+
+        Returns:
+            Number of connections the event was handed to
+        """
+        if isinstance(channel, bytes):
+            channel = channel.decode("utf-8")
+        job_id = channel[len(CHANNEL_PREFIX):]
+        self._stats["messages"] += 1
+
+        queues = connections.get(job_id)
+        if not queues:
+            return 0  # No viewers in this process, skip parsing
+
+        try:
+            event = json.loads(data)
+            event_type = event.get("event_type")
+            message = format_sse(event_type, event.get("data", {}), event.get("id"))
+        except (ValueError, TypeError, AttributeError) as e:
+            logger.debug("Ignoring malformed job event", exc_info=e, extra={"job_id": job_id})
+            return 0
+
+        for queue in list(queues):
+            try:
+                deliver(queue, event_type, message)
+            except Exception as e:
+                logger.warning("Failed to send event to connection", exc_info=e, extra={"job_id": job_id})
+
+        self._stats["delivered"] += len(queues)
+        return len(queues)
+
+    async def _listen(self) -> None:
+        """Hold the pattern subscription, resubscribing with backoff if Redis drops it."""
+        delay = RECONNECT_DELAY_SECONDS
+        while True:
+            pubsub = redis_client.client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.psubscribe(CHANNEL_PATTERN)
+                self._subscribed = True
+                delay = RECONNECT_DELAY_SECONDS
+                logger.info("Subscribed to job events", extra={"pattern": CHANNEL_PATTERN})
+
+                async for message in pubsub.listen():
+                    if message.get("type") == "pmessage":
+                        self.dispatch(message.get("channel"), message.get("data"))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._stats["reconnects"] += 1
+                logger.warning(
+                    f"Job event subscription lost, resubscribing in {delay:.1f}s",
+                    exc_info=e
+                )
+            finally:
+                self._subscribed = False
+                try:
+                    await pubsub.close()
+                except Exception:
+                    pass
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_RECONNECT_DELAY_SECONDS)
+
+    async def _cleanup_stale(self) -> None:
+        """Periodically drop connections that stopped heartbeating."""
+        while True:
+            await asyncio.sleep(STALE_CLEANUP_INTERVAL_SECONDS)
+            try:
+                removed = await cleanup_stale_connections(timeout_seconds=STALE_CONNECTION_TIMEOUT_SECONDS)
+                if removed > 0:
+                    logger.info(f"Cleaned up {removed} stale SSE connections")
+            except Exception as e:
+                logger.warning("Stale SSE connection cleanup failed", exc_info=e)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Snapshot of the dispatcher for health checks.
+
+        Returns:
+            Subscription state, message and delivery counts, connected clients,
+            and events coalesced / dropped for slow clients
+        """
+        queues = [queue for job_queues in connections.values() for queue in job_queues]
+        return {
+            **self._stats,
+            "subscribed": self._subscribed,
+            "jobs": len(connections),
+            "clients": len(queues),
+            "coalesced": sum(getattr(queue, "coalesced", 0) for queue in queues),
+            "dropped": sum(getattr(queue, "dropped", 0) for queue in queues)
+        }
+
+
+# Singleton instance
+event_dispatcher = EventDispatcher()
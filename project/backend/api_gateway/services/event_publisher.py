@@ -1,11 +1,14 @@
 """
 Event publisher service.
 
-Publishes pipeline events to Redis pub/sub for SSE distribution.
+Publishes pipeline events to Redis pub/sub for SSE distribution. Every event
+is also appended to a capped per-job Redis Stream, whose entry ID becomes the
+SSE event ID, so reconnecting clients can replay what they missed.
 """
 
 import json
-from typing import Dict, Any
+import re
+from typing import Dict, Any, List, Optional, Tuple
 from shared.redis_client import RedisClient
 from shared.logging import get_logger
 
@@ -13,6 +16,90 @@ logger = get_logger(__name__)
 
 redis_client = RedisClient()
 
+# Event log per job: approximate cap on entries, and lifetime after the last event
+EVENT_LOG_MAXLEN = 1000
+EVENT_LOG_TTL_SECONDS = 24 * 3600
+
+_EVENT_ID_PATTERN = re.compile(r"^\d+-\d+$")
+
+
+def event_log_key(job_id: str) -> str:
+    """Redis Stream key holding a job's event log."""
+    return f"job_event_log:{job_id}"
+
+
+def is_event_id(value: Optional[str]) -> bool:
+    """Check that a client-supplied Last-Event-ID is a stream entry ID."""
+    return bool(value) and bool(_EVENT_ID_PATTERN.match(value))
+
+
+def _decode(value: Any) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else str(value)
+
+
+async def append_event_log(job_id: str, message_json: str) -> Optional[str]:
+    """
+    Append an event to the job's capped event log.
+    
+    Args:
+        job_id: Job ID
+        message_json: JSON event ({"event_type", "data"})
+        
+    Returns:
+        Stream entry ID, or None if the log couldn't be written
+    """
+    key = event_log_key(job_id)
+    try:
+        entry_id = await redis_client.client.xadd(
+            key,
+            {"event": message_json},
+            maxlen=EVENT_LOG_MAXLEN,
+            approximate=True
+        )
+        await redis_client.client.expire(key, EVENT_LOG_TTL_SECONDS)
+        return _decode(entry_id)
+    except Exception as e:
+        logger.warning(
+            "Failed to append event log",
+            exc_info=e,
+            extra={"job_id": job_id}
+        )
+        return None
+
+
+async def read_event_log(
+    job_id: str,
+    last_event_id: str
+) -> Tuple[bool, List[Tuple[str, str, Dict[str, Any]]]]:
+    """
+    Read the events a client missed since last_event_id.
+    
+    Args:
+        job_id: Job ID
+        last_event_id: Last stream entry ID the client received
+        
+    Returns:
+        (contiguous, events): contiguous is False when last_event_id is no longer
+        in the log (trimmed or expired), so events after it may be missing.
+        events are (event_id, event_type, data) in publish order.
+    """
+    entries = await redis_client.client.xrange(event_log_key(job_id), min=last_event_id, max="+")
+    
+    contiguous = False
+    events = []
+    for entry_id, fields in entries:
+        entry_id = _decode(entry_id)
+        if entry_id == last_event_id:
+            contiguous = True
+            continue
+        try:
+            event = json.loads(_decode(fields.get(b"event", fields.get("event"))))
+            events.append((entry_id, event.get("event_type"), event.get("data", {})))
+        except (ValueError, TypeError, AttributeError) as e:
+            logger.debug("Skipping malformed event log entry", exc_info=e, extra={"job_id": job_id})
+    
+    return contiguous, events
+
 
 async def publish_event(job_id: str, event_type: str, data: Dict[str, Any]) -> None:
     """
@@ -31,9 +118,16 @@ async def publish_event(job_id: str, event_type: str, data: Dict[str, Any]) -> N
     }
     
     try:
+        message_json = json.dumps(message)
+        
+        # Log first so the published event carries its replay position
+        event_id = await append_event_log(job_id, message_json)
+        if event_id:
+            message["id"] = event_id
+            message_json = json.dumps(message)
+        
         # Publish to Redis pub/sub channel
         # Note: Redis pub/sub requires bytes, so we encode the JSON string
-        message_json = json.dumps(message)
         await redis_client.client.publish(channel, message_json)
         
         logger.debug(
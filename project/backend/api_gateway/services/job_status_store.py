@@ -0,0 +1,228 @@
+"""
+Materialized job status documents.
+
+One precomputed status document per job in Redis, in the shape returned by
+GET /jobs/{id} (job row plus per-stage status and metadata). Writers patch it
+as the job and its stages change instead of invalidating it, so status reads
+are a single HGETALL however often clients poll.
+
+The document is a hash with one field per job column (job:<column>) and per
+stage attribute (stage:<name>:<attr>), so a patch is a plain HSET with no
+read-modify-write. Patches only apply to an existing document; a missing one
+is built from the database by the status endpoint. Every patch also bumps a
+per-job version, and a document built from the database is only stored if no
+patch landed while it was being built, so it can't overwrite newer state.
+"""
+
+import json
+from datetime import datetime
+from typing import Any, Dict, Optional
+from shared.redis_client import RedisClient
+from shared.logging import get_logger
+
+logger = get_logger(__name__)
+
+redis_client = RedisClient()
+
+KEY_PREFIX = "videogen:job_status:"
+
+# Lifetime after the last write (refreshed by every patch)
+DOCUMENT_TTL_SECONDS = 1800
+
+# Keys: document hash, version counter. ARGV: ttl, then field/value pairs.
+PATCH_SCRIPT = """
+redis.call('INCR', KEYS[2])
+redis.call('EXPIRE', KEYS[2], ARGV[1])
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    redis.call('HSET', KEYS[1], unpack(ARGV, 2))
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+    return 1
+end
+return 0
+"""
+
+# Keys: document hash, version counter. ARGV: ttl, expected version, then field/value pairs.
+STORE_SCRIPT = """
+if (redis.call('GET', KEYS[2]) or '0') ~= ARGV[2] then
+    return 0
+end
+redis.call('DEL', KEYS[1])
+redis.call('HSET', KEYS[1], unpack(ARGV, 3))
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return 1
+"""
+
+# Keys: document hash, version counter. ARGV: ttl.
+INVALIDATE_SCRIPT = """
+redis.call('INCR', KEYS[2])
+redis.call('EXPIRE', KEYS[2], ARGV[1])
+return redis.call('DEL', KEYS[1])
+"""
+
+
+def _document_key(job_id: str) -> str:
+    return f"{KEY_PREFIX}{job_id}"
+
+
+def _version_key(job_id: str) -> str:
+    return f"{KEY_PREFIX}{job_id}:version"
+
+
+def _decode(value: Any) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else str(value)
+
+
+def _encode(value: Any) -> str:
+    # "now()" is a PostgREST default in update payloads; store the actual time
+    if value == "now()":
+        value = datetime.utcnow().isoformat()
+    return json.dumps(value, default=str)
+
+
+def _flatten(fields: Dict[str, Any]) -> list:
+    return [item for field, value in fields.items() for item in (field, _encode(value))]
+
+
+def _stage_fields(
+    stage_name: str,
+    status: Optional[str] = None,
+    metadata: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Document fields for a stage change (only the attributes that changed)."""
+    fields = {}
+    if status is not None:
+        fields[f"stage:{stage_name}:status"] = status
+    if metadata is not None:
+        fields[f"stage:{stage_name}:metadata"] = metadata
+    return fields
+
+
+async def get_job_status_document(job_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Read a job's status document.
+
+    Args:
+        job_id: Job ID
+
+    Returns:
+        Job status (job columns plus "stages"), or None if not materialized
+    """
+    raw = await redis_client.client.hgetall(_document_key(job_id))
+    if not raw:
+        return None
+
+    job: Dict[str, Any] = {}
+    stages: Dict[str, Dict[str, Any]] = {}
+    for field, value in raw.items():
+        kind, _, name = _decode(field).partition(":")
+        value = json.loads(_decode(value))
+        if kind == "job":
+            job[name] = value
+        elif kind == "stage":
+            stage_name, _, attribute = name.rpartition(":")
+            stage = stages.setdefault(stage_name, {"status": "pending", "duration": None, "progress": None})
+            stage[attribute] = value
+
+    job["stages"] = stages
+    return job
+
+
+async def get_job_status_version(job_id: str) -> str:
+    """
+    Current patch version of a job; pass it to store_job_status_document.
+
+    Args:
+        job_id: Job ID
+
+    Returns:
+        Version string ("0" if the job was never patched)
+    """
+    version = await redis_client.client.get(_version_key(job_id))
+    return _decode(version) if version is not None else "0"
+
+
+async def store_job_status_document(job_id: str, job: Dict[str, Any], version: str) -> bool:
+    """
+    Materialize a status document built from the database.
+
+    Args:
+        job_id: Job ID
+        job: Job status (job columns plus "stages")
+        version: Version read before the database reads began
+
+    Returns:
+        True if stored, False if a patch landed meanwhile (the document would be stale)
+    """
+    fields = {f"job:{column}": value for column, value in job.items() if column != "stages"}
+    for stage_name, stage in (job.get("stages") or {}).items():
+        for attribute, value in stage.items():
+            fields[f"stage:{stage_name}:{attribute}"] = value
+
+    try:
+        stored = await redis_client.client.eval(
+            STORE_SCRIPT, 2, _document_key(job_id), _version_key(job_id),
+            DOCUMENT_TTL_SECONDS, version, *_flatten(fields)
+        )
+        return bool(stored)
+    except Exception as e:
+        logger.warning("Failed to store job status document", exc_info=e, extra={"job_id": job_id})
+        return False
+
+
+async def _patch(job_id: str, fields: Dict[str, Any]) -> None:
+    if not fields:
+        return
+    try:
+        await redis_client.client.eval(
+            PATCH_SCRIPT, 2, _document_key(job_id), _version_key(job_id),
+            DOCUMENT_TTL_SECONDS, *_flatten(fields)
+        )
+    except Exception as e:
+        # Without the version bump a concurrent rebuild could keep older state, so drop it
+        logger.warning("Failed to patch job status document", exc_info=e, extra={"job_id": job_id})
+        await invalidate_job_status(job_id)
+
+
+async def patch_job_status(job_id: str, updates: Dict[str, Any]) -> None:
+    """
+    Apply a jobs-table update to the job's status document.
+
+    Args:
+        job_id: Job ID
+        updates: Columns written to the jobs row
+    """
+    await _patch(str(job_id), {f"job:{column}": value for column, value in updates.items()})
+
+
+async def patch_job_stage(
+    job_id: str,
+    stage_name: str,
+    status: Optional[str] = None,
+    metadata: Optional[Dict[str, Any]] = None
+) -> None:
+    """
+    Apply a job_stages change to the job's status document.
+
+    Args:
+        job_id: Job ID
+        stage_name: Stage name
+        status: New stage status (unchanged if None)
+        metadata: New stage metadata (unchanged if None)
+    """
+    await _patch(str(job_id), _stage_fields(stage_name, status, metadata))
+
+
+async def invalidate_job_status(job_id: str) -> None:
+    """
+    Drop a job's status document (for writes that can't be expressed as a patch).
+
+    Args:
+        job_id: Job ID
+    """
+    try:
+        await redis_client.client.eval(
+            INVALIDATE_SCRIPT, 2, _document_key(str(job_id)), _version_key(str(job_id)),
+            DOCUMENT_TTL_SECONDS
+        )
+    except Exception as e:
+        logger.warning("Failed to invalidate job status document", exc_info=e, extra={"job_id": str(job_id)})
@@ -5,9 +5,11 @@ Job queue management using Redis (BullMQ-like behavior).
 """
 
 import json
+import os
+import time
 import uuid
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from shared.redis_client import RedisClient
 from shared.logging import get_logger
 from shared.config import settings
@@ -19,6 +21,227 @@ redis_client = RedisClient()
 # Local workers will use "video_generation_development", production uses "video_generation_production"
 QUEUE_NAME = settings.queue_name
 
+# Reliable queue configuration
+# A worker holds a lease while it is alive; if the lease expires, the reaper moves
+# everything in that worker's processing list back onto the queue.
+LEASE_TTL_SECONDS = int(os.getenv("QUEUE_LEASE_TTL_SECONDS", "60"))
+MAX_JOB_ATTEMPTS = int(os.getenv("QUEUE_MAX_JOB_ATTEMPTS", "3"))
+RETRY_BASE_DELAY_SECONDS = float(os.getenv("QUEUE_RETRY_BASE_DELAY_SECONDS", "30"))
+RETRY_MAX_DELAY_SECONDS = float(os.getenv("QUEUE_RETRY_MAX_DELAY_SECONDS", "600"))
+
+# Priority classes, highest first. Within a class, users are served round-robin.
+# The recovery lane (requeued, reaped and retried jobs) is always drained
+# before any class lane.
+PRIORITY_INTERACTIVE = "interactive"  # Clip regenerations
+PRIORITY_GENERATION = "generation"  # Full video generations
+PRIORITY_TEST = "test"  # Generations with stop_at_stage set
+PRIORITY_CLASSES = [PRIORITY_INTERACTIVE, PRIORITY_GENERATION, PRIORITY_TEST]
+RECOVERY_LANE = "recovery"
+
+# Every key touched by the queue scripts shares this hash tag, so each script
+# runs against a single slot on Redis Cluster.
+QUEUE_KEY_PREFIX = f"{{{QUEUE_NAME}}}"
+
+# Single FIFO list used before the priority lanes; nothing claims from it any
+# more, so workers drain it into the lanes on startup (migrate_legacy_queue)
+LEGACY_QUEUE_KEY = f"{QUEUE_NAME}:queue"
+
+# Wake-up tokens kept per notify list; extra tokens only cause a spurious re-check
+NOTIFY_TOKEN_CAP = 1000
+
+# Job data keys outlive the worst-case queue wait; in-flight jobs refresh them on heartbeat
+JOB_DATA_TTL_SECONDS = 3600
+
+# Pushes wake-up tokens for workers blocked in claim_job()
+_NOTIFY_LUA = f"""
+local function notify(key, count)
+    for _ = 1, count do
+        redis.call('LPUSH', key, '1')
+    end
+    redis.call('LTRIM', key, 0, {NOTIFY_TOKEN_CAP - 1})
+end
+"""
+
+# KEYS[1] = user lane, KEYS[2] = user ring, KEYS[3] = class notify list
+# ARGV[1] = payload, ARGV[2] = user id
+_ENQUEUE_SCRIPT = _NOTIFY_LUA + """
+redis.call('LPUSH', KEYS[1], ARGV[1])
+if not redis.call('LPOS', KEYS[2], ARGV[2]) then
+    redis.call('RPUSH', KEYS[2], ARGV[2])
+end
+notify(KEYS[3], 1)
+return 1
+"""
+
+# KEYS[1] = recovery queue, KEYS[2] = processing list, then per priority class
+# KEYS[2i+1] = user ring, KEYS[2i+2] = lane of the user at the head of the ring
+# ARGV[1] = '1' to include the recovery lane, ARGV[i+1] = user expected at the head
+# of ring i ('' if it was empty).
+# Returns the payload, false if nothing is queued, or 0 if a ring head changed
+# since it was read (the caller reads the rings again and retries).
+_CLAIM_SCRIPT = """
+if ARGV[1] == '1' then
+    local payload = redis.call('RPOP', KEYS[1])
+    if payload then
+        redis.call('LPUSH', KEYS[2], payload)
+        return payload
+    end
+end
+for i = 2, #ARGV do
+    local ring = KEYS[2 * i - 1]
+    local lane = KEYS[2 * i]
+    local user = redis.call('LINDEX', ring, 0)
+    if (user or '') ~= ARGV[i] then
+        return 0
+    end
+    if user then
+        local payload = redis.call('RPOP', lane)
+        if redis.call('LLEN', lane) == 0 then
+            redis.call('LPOP', ring)
+        else
+            redis.call('LMOVE', ring, ring, 'LEFT', 'RIGHT')
+        end
+        if not payload then
+            return 0
+        end
+        redis.call('LPUSH', KEYS[2], payload)
+        return payload
+    end
+end
+return false
+"""
+
+# KEYS = recovery queue followed by every user lane
+_QUEUE_SIZE_SCRIPT = """
+local total = 0
+for _, key in ipairs(KEYS) do
+    total = total + redis.call('LLEN', key)
+end
+return total
+"""
+
+# KEYS[1] = delayed zset, KEYS[2] = queue, KEYS[3] = recovery notify list
+# ARGV[1] = now, ARGV[2] = batch size
+_PROMOTE_DELAYED_SCRIPT = _NOTIFY_LUA + """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+for _, payload in ipairs(due) do
+    redis.call('ZREM', KEYS[1], payload)
+    redis.call('LPUSH', KEYS[2], payload)
+end
+notify(KEYS[3], #due)
+return #due
+"""
+
+# KEYS[1] = lease, KEYS[2] = processing list, KEYS[3] = queue, KEYS[4] = workers set,
+# KEYS[5] = recovery notify list; ARGV[1] = worker id
+_REAP_WORKER_SCRIPT = _NOTIFY_LUA + """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return -1
+end
+local moved = 0
+while redis.call('LMOVE', KEYS[2], KEYS[3], 'LEFT', 'RIGHT') do
+    moved = moved + 1
+end
+redis.call('SREM', KEYS[4], ARGV[1])
+notify(KEYS[5], moved)
+return moved
+"""
+
+# KEYS[1] = processing list, KEYS[2] = destination, KEYS[3] = recovery notify list
+# ARGV[1] = old payload, ARGV[2] = new payload,
+# ARGV[3] = score (zset destination) or empty string (list destination, pushed to the head)
+_MOVE_FROM_PROCESSING_SCRIPT = _NOTIFY_LUA + """
+redis.call('LREM', KEYS[1], 1, ARGV[1])
+if ARGV[3] ~= '' then
+    redis.call('ZADD', KEYS[2], tonumber(ARGV[3]), ARGV[2])
+else
+    redis.call('RPUSH', KEYS[2], ARGV[2])
+    notify(KEYS[3], 1)
+end
+return 1
+"""
+
+
+def _queue_key() -> str:
+    return f"{QUEUE_KEY_PREFIX}:queue"
+
+
+def _delayed_key() -> str:
+    return f"{QUEUE_KEY_PREFIX}:delayed"
+
+
+def _workers_key() -> str:
+    return f"{QUEUE_KEY_PREFIX}:workers"
+
+
+def _processing_list_key(worker_id: str) -> str:
+    return f"{QUEUE_KEY_PREFIX}:processing:{worker_id}"
+
+
+def _lease_key(worker_id: str) -> str:
+    return f"{QUEUE_KEY_PREFIX}:lease:{worker_id}"
+
+
+def _lane_key(priority_class: str, user_id: str) -> str:
+    return f"{QUEUE_KEY_PREFIX}:lane:{priority_class}:{user_id}"
+
+
+def _user_ring_key(priority_class: str) -> str:
+    return f"{QUEUE_KEY_PREFIX}:users:{priority_class}"
+
+
+def _notify_key(lane: str) -> str:
+    return f"{QUEUE_KEY_PREFIX}:notify:{lane}"
+
+
+def _decode(value: Any) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+def get_priority_class(job_data: Dict[str, Any]) -> str:
+    """
+    Get the scheduling class for a job.
+    
+    Interactive clip regenerations outrank full generations, and test jobs
+    (stop_at_stage set) rank lowest.
+    
+    Args:
+        job_data: Job data dictionary
+        
+    Returns:
+        One of PRIORITY_CLASSES
+    """
+    if job_data.get("job_type") == "regeneration":
+        return PRIORITY_INTERACTIVE
+    if job_data.get("stop_at_stage"):
+        return PRIORITY_TEST
+    return PRIORITY_GENERATION
+
+
+async def _push_job(job_data: Dict[str, Any], job_json: str) -> str:
+    """
+    Push a job onto its user's lane in its priority class.
+    
+    Args:
+        job_data: Job data dictionary (must contain user_id)
+        job_json: Serialized job data
+        
+    Returns:
+        Priority class the job was queued under
+    """
+    priority_class = get_priority_class(job_data)
+    user_id = str(job_data["user_id"])
+    await redis_client.client.eval(
+        _ENQUEUE_SCRIPT,
+        3,
+        _lane_key(priority_class, user_id),
+        _user_ring_key(priority_class),
+        _notify_key(priority_class),
+        job_json.encode("utf-8"),
+        user_id
+    )
+    return priority_class
+
 
 async def enqueue_job(
     job_id: str,
@@ -57,17 +280,16 @@ async def enqueue_job(
     }
     
     try:
-        # Add to queue (using Redis list as queue)
+        # Add to the user's lane in the job's priority class
         # Encode as bytes since Redis client has decode_responses=False
-        queue_key = f"{QUEUE_NAME}:queue"
         job_json = json.dumps(job_data)
-        await redis_client.client.lpush(queue_key, job_json.encode('utf-8'))
+        priority_class = await _push_job(job_data, job_json)
         
         # Store job data for worker to retrieve
         job_key = f"{QUEUE_NAME}:job:{job_id}"
-        await redis_client.client.set(job_key, job_json.encode('utf-8'), ex=900)  # 15 min TTL
+        await redis_client.client.set(job_key, job_json.encode('utf-8'), ex=JOB_DATA_TTL_SECONDS)
         
-        logger.info("Job enqueued", extra={"job_id": job_id, "user_id": user_id})
+        logger.info("Job enqueued", extra={"job_id": job_id, "user_id": user_id, "priority_class": priority_class})
         
     except Exception as e:
         logger.error("Failed to enqueue job", exc_info=e, extra={"job_id": job_id})
@@ -132,15 +354,14 @@ async def enqueue_regeneration_job(
     }
     
     try:
-        # Add to queue (using Redis list as queue)
+        # Add to the user's interactive lane so edits skip ahead of full generations
         # Encode as bytes since Redis client has decode_responses=False
-        queue_key = f"{QUEUE_NAME}:queue"
         job_json = json.dumps(job_data)
-        await redis_client.client.lpush(queue_key, job_json.encode('utf-8'))
+        await _push_job(job_data, job_json)
         
         # Store job data for worker to retrieve
         regen_key = f"{QUEUE_NAME}:regeneration:{regeneration_id}"
-        await redis_client.client.set(regen_key, job_json.encode('utf-8'), ex=900)  # 15 min TTL
+        await redis_client.client.set(regen_key, job_json.encode('utf-8'), ex=JOB_DATA_TTL_SECONDS)
         
         logger.info(
             "Regeneration job enqueued", 
@@ -161,18 +382,382 @@ async def enqueue_regeneration_job(
         raise
 
 
+async def migrate_legacy_queue() -> int:
+    """
+    Move jobs left in the legacy single-list queue onto the priority lanes.
+    
+    Jobs are popped oldest first and pushed onto their user's lane in their
+    priority class, as if they had just been enqueued. Payloads without a
+    user go to the recovery lane, where the worker handles them as before.
+    Each pop is atomic, so several workers starting at once is safe.
+    
+    Returns:
+        Number of jobs moved
+    """
+    client = redis_client.client
+    moved = 0
+    while True:
+        payload = await client.rpop(LEGACY_QUEUE_KEY)
+        if payload is None:
+            break
+        try:
+            try:
+                job_data = json.loads(payload)
+                has_user = isinstance(job_data, dict) and bool(job_data.get("user_id"))
+            except ValueError:
+                has_user = False
+            if has_user:
+                await _push_job(job_data, _decode(payload))
+            else:
+                await client.lpush(_queue_key(), payload)
+                await client.lpush(_notify_key(RECOVERY_LANE), b"1")
+        except Exception:
+            # Put it back (as the next to migrate) rather than lose it
+            await client.rpush(LEGACY_QUEUE_KEY, payload)
+            raise
+        moved += 1
+    
+    if moved:
+        logger.warning("Migrated jobs from legacy queue", extra={"jobs_migrated": moved})
+    return moved
+
+
+async def _get_ring_users(priority_class: str) -> List[str]:
+    """
+    Get the users with queued jobs in a priority class, in round-robin order.
+    
+    Args:
+        priority_class: One of PRIORITY_CLASSES
+        
+    Returns:
+        User IDs
+    """
+    users = await redis_client.client.lrange(_user_ring_key(priority_class), 0, -1)
+    return [_decode(user) for user in users or []]
+
+
 async def get_queue_size() -> int:
     """
-    Get the current queue size.
+    Get the current queue size across the recovery lane and all priority lanes.
     
     Returns:
         Number of jobs in queue
     """
     try:
-        queue_key = f"{QUEUE_NAME}:queue"
-        size = await redis_client.client.llen(queue_key)
+        lane_keys = []
+        for priority_class in PRIORITY_CLASSES:
+            lane_keys.extend(_lane_key(priority_class, user) for user in await _get_ring_users(priority_class))
+        size = await redis_client.client.eval(
+            _QUEUE_SIZE_SCRIPT,
+            1 + len(lane_keys),
+            _queue_key(),
+            *lane_keys
+        )
         return size
     except Exception as e:
         logger.error("Failed to get queue size", exc_info=e)
         return 0
 
+
+async def get_queue_contents() -> Dict[str, Any]:
+    """
+    Get every job the queue holds, for monitoring and maintenance scripts.
+    
+    Returns:
+        Dictionary with:
+            recovery: Payloads in the recovery lane, next to be claimed first
+            lanes: {priority class: {user ID: payloads, next to be claimed first}}
+            delayed: (payload, unix time it becomes claimable) for pending retries
+            processing: {worker ID: payloads claimed by that worker}
+            legacy: Payloads still in the legacy queue list, awaiting
+                migrate_legacy_queue()
+    """
+    client = redis_client.client
+    recovery = await client.lrange(_queue_key(), 0, -1)
+    
+    lanes: Dict[str, Dict[str, List[bytes]]] = {}
+    for priority_class in PRIORITY_CLASSES:
+        lanes[priority_class] = {}
+        for user in await _get_ring_users(priority_class):
+            payloads = await client.lrange(_lane_key(priority_class, user), 0, -1)
+            lanes[priority_class][user] = list(reversed(payloads or []))
+    
+    delayed = await client.zrange(_delayed_key(), 0, -1, withscores=True)
+    
+    processing: Dict[str, List[bytes]] = {}
+    for worker_id in await client.smembers(_workers_key()) or []:
+        worker_id = _decode(worker_id)
+        processing[worker_id] = await client.lrange(_processing_list_key(worker_id), 0, -1) or []
+    
+    legacy = await client.lrange(LEGACY_QUEUE_KEY, 0, -1)
+    
+    return {
+        "recovery": list(reversed(recovery or [])),
+        "lanes": lanes,
+        "delayed": [(payload, float(score)) for payload, score in delayed or []],
+        "processing": processing,
+        "legacy": list(reversed(legacy or []))
+    }
+
+
+async def clear_queue() -> int:
+    """
+    Drop every waiting job (recovery lane, priority lanes, delayed retries and
+    the legacy queue list).
+    
+    Jobs already claimed by a worker are left alone.
+    
+    Returns:
+        Number of jobs removed
+    """
+    contents = await get_queue_contents()
+    removed = len(contents["recovery"]) + len(contents["delayed"]) + len(contents["legacy"])
+    keys = [_queue_key(), _delayed_key(), _notify_key(RECOVERY_LANE)]
+    for priority_class, users in contents["lanes"].items():
+        keys.extend([_user_ring_key(priority_class), _notify_key(priority_class)])
+        for user, payloads in users.items():
+            keys.append(_lane_key(priority_class, user))
+            removed += len(payloads)
+    await redis_client.client.delete(*keys)
+    # Not hash-tagged like the lane keys, so deleted on its own (one slot per call on Redis Cluster)
+    await redis_client.client.delete(LEGACY_QUEUE_KEY)
+    logger.warning("Queue cleared", extra={"jobs_removed": removed})
+    return removed
+
+
+async def _try_claim(worker_id: str, classes: List[str], include_recovery: str) -> Any:
+    """
+    Run one claim attempt against the current head of each user ring.
+    
+    Args:
+        worker_id: Unique ID of the claiming worker
+        classes: Priority classes to scan, highest first
+        include_recovery: "1" to take from the recovery lane first
+        
+    Returns:
+        Payload, None if nothing is queued, or 0 if a ring changed concurrently
+    """
+    keys = [_queue_key(), _processing_list_key(worker_id)]
+    heads = []
+    for priority_class in classes:
+        head = _decode(await redis_client.client.lindex(_user_ring_key(priority_class), 0)) or ""
+        keys.extend([_user_ring_key(priority_class), _lane_key(priority_class, head)])
+        heads.append(head)
+    return await redis_client.client.eval(
+        _CLAIM_SCRIPT,
+        len(keys),
+        *keys,
+        include_recovery,
+        *heads
+    )
+
+
+async def claim_job(
+    worker_id: str,
+    timeout: float = 5,
+    priority_classes: Optional[List[str]] = None
+) -> Optional[bytes]:
+    """
+    Atomically move the next scheduled job into this worker's processing list.
+    
+    Jobs are taken from the recovery lane first, then from the highest
+    non-empty priority class, rotating between users within that class so a
+    single user's backlog cannot starve everyone else. The job stays in the
+    processing list until ack_job(), retry_job() or requeue_job() is called,
+    so a worker that dies mid-pipeline does not lose it.
+    
+    While nothing is claimable the call blocks on the notify lists that
+    enqueues, requeues and promoted retries push to, rather than polling.
+    
+    Args:
+        worker_id: Unique ID of the claiming worker
+        timeout: Seconds to wait for a job
+        priority_classes: Restrict claiming to these classes (default: all).
+            The recovery lane is only used when all classes are allowed.
+        
+    Returns:
+        Raw job payload, or None if nothing was claimable before the timeout
+    """
+    classes = priority_classes or PRIORITY_CLASSES
+    include_recovery = "1" if priority_classes is None else "0"
+    notify_keys = [_notify_key(priority_class) for priority_class in classes]
+    if priority_classes is None:
+        notify_keys.insert(0, _notify_key(RECOVERY_LANE))
+    deadline = time.monotonic() + timeout
+    
+    while True:
+        payload = await _try_claim(worker_id, classes, include_recovery)
+        if payload:
+            return payload
+        
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        if payload is None:
+            # BLPOP treats 0 as "forever", so never pass less than 10ms
+            await redis_client.client.blpop(notify_keys, timeout=max(remaining, 0.01))
+
+
+async def ack_job(worker_id: str, payload: bytes) -> None:
+    """
+    Acknowledge a finished job by removing it from the processing list.
+    
+    Args:
+        worker_id: Worker that claimed the job
+        payload: Raw job payload returned by claim_job()
+    """
+    await redis_client.client.lrem(_processing_list_key(worker_id), 1, payload)
+
+
+async def requeue_job(worker_id: str, payload: bytes) -> None:
+    """
+    Move a claimed job back to the head of the queue (next to be claimed).
+    
+    Args:
+        worker_id: Worker that claimed the job
+        payload: Raw job payload returned by claim_job()
+    """
+    await redis_client.client.eval(
+        _MOVE_FROM_PROCESSING_SCRIPT,
+        3,
+        _processing_list_key(worker_id),
+        _queue_key(),
+        _notify_key(RECOVERY_LANE),
+        payload,
+        payload,
+        ""
+    )
+
+
+def get_retry_delay(attempt: int) -> float:
+    """
+    Get exponential backoff delay for a retry attempt.
+    
+    Args:
+        attempt: Attempt number that just failed (1-indexed)
+        
+    Returns:
+        Delay in seconds before the job becomes claimable again
+    """
+    return min(RETRY_BASE_DELAY_SECONDS * (2 ** (attempt - 1)), RETRY_MAX_DELAY_SECONDS)
+
+
+async def retry_job(worker_id: str, payload: bytes) -> bool:
+    """
+    Schedule a delayed retry for a job that failed with a retryable error.
+    
+    Args:
+        worker_id: Worker that claimed the job
+        payload: Raw job payload returned by claim_job()
+        
+    Returns:
+        True if a retry was scheduled, False if MAX_JOB_ATTEMPTS is exhausted
+        (the job is then removed from the processing list)
+    """
+    job_data = json.loads(payload)
+    attempt = int(job_data.get("attempts", 0)) + 1
+    job_id = job_data.get("job_id")
+    
+    if attempt >= MAX_JOB_ATTEMPTS:
+        await ack_job(worker_id, payload)
+        logger.error(
+            "Job exhausted retry attempts",
+            extra={"job_id": job_id, "attempts": attempt}
+        )
+        return False
+    
+    delay = get_retry_delay(attempt)
+    job_data["attempts"] = attempt
+    new_payload = json.dumps(job_data).encode("utf-8")
+    await redis_client.client.eval(
+        _MOVE_FROM_PROCESSING_SCRIPT,
+        3,
+        _processing_list_key(worker_id),
+        _delayed_key(),
+        _notify_key(RECOVERY_LANE),
+        payload,
+        new_payload,
+        str(time.time() + delay)
+    )
+    logger.warning(
+        "Job scheduled for retry",
+        extra={"job_id": job_id, "attempt": attempt, "delay_seconds": delay}
+    )
+    return True
+
+
+async def heartbeat_lease(worker_id: str, job_ids: List[str] = None) -> None:
+    """
+    Renew this worker's lease and keep its in-flight job data alive.
+    
+    Args:
+        worker_id: Worker ID
+        job_ids: Job IDs currently being processed by this worker
+    """
+    await redis_client.client.set(_lease_key(worker_id), b"1", ex=LEASE_TTL_SECONDS)
+    await redis_client.client.sadd(_workers_key(), worker_id)
+    for job_id in job_ids or []:
+        await redis_client.client.expire(f"{QUEUE_NAME}:job:{job_id}", JOB_DATA_TTL_SECONDS)
+
+
+async def release_lease(worker_id: str) -> None:
+    """
+    Drop this worker's lease on clean shutdown.
+    
+    Anything left in the processing list is requeued by the next reaper pass.
+    
+    Args:
+        worker_id: Worker ID
+    """
+    await redis_client.client.delete(_lease_key(worker_id))
+
+
+async def reap_expired_leases() -> int:
+    """
+    Requeue jobs held by workers whose lease has expired.
+    
+    Returns:
+        Number of jobs moved back onto the queue
+    """
+    worker_ids = await redis_client.client.smembers(_workers_key())
+    total = 0
+    for raw_worker_id in worker_ids or []:
+        worker_id = _decode(raw_worker_id)
+        moved = await redis_client.client.eval(
+            _REAP_WORKER_SCRIPT,
+            5,
+            _lease_key(worker_id),
+            _processing_list_key(worker_id),
+            _queue_key(),
+            _workers_key(),
+            _notify_key(RECOVERY_LANE),
+            worker_id
+        )
+        if moved and moved > 0:
+            logger.warning(
+                "Requeued jobs from expired worker lease",
+                extra={"worker_id": worker_id, "jobs_requeued": moved}
+            )
+            total += moved
+    return total
+
+
+async def promote_delayed_jobs(batch_size: int = 100) -> int:
+    """
+    Move delayed retries whose backoff has elapsed back onto the queue.
+    
+    Args:
+        batch_size: Maximum number of jobs to promote in one call
+        
+    Returns:
+        Number of jobs promoted
+    """
+    return await redis_client.client.eval(
+        _PROMOTE_DELAYED_SCRIPT,
+        3,
+        _delayed_key(),
+        _queue_key(),
+        _notify_key(RECOVERY_LANE),
+        str(time.time()),
+        str(batch_size)
+    )
@@ -1,13 +1,15 @@
 """
 SSE manager service.
 
-Manages SSE connections and broadcasts events from Redis pub/sub.
+Manages SSE connections and their bounded per-client event queues. Events
+from Redis pub/sub are fanned out to these queues by the process-wide
+event dispatcher (see event_dispatcher.py).
 """
 
 import json
 import asyncio
 import time
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from fastapi.responses import StreamingResponse
 from shared.redis_client import RedisClient
 from shared.database import DatabaseClient
@@ -27,6 +29,96 @@ connection_timestamps: Dict[str, Dict[asyncio.Queue, float]] = {}
 
 MAX_CONNECTIONS_PER_JOB = 10
 
+# Events buffered per client before backpressure applies
+CLIENT_QUEUE_SIZE = 100
+
+# Latest-state events: a newer one replaces the one still pending for a slow client
+COALESCED_EVENT_TYPES = frozenset({"progress", "cost_update"})
+
+
+class ClientQueue(asyncio.Queue):
+    """
+    Bounded event queue for one SSE client.
+
+    Consumers get formatted SSE strings, as from a plain asyncio.Queue. Events
+    are added with offer(), which never blocks the dispatcher: a progress-style
+    event replaces the pending one of the same type, and when the queue is
+    still full the oldest pending event (progress-style first) is dropped.
+    """
+
+    def __init__(self, maxsize: int = CLIENT_QUEUE_SIZE):
+        super().__init__(maxsize)
+        self.coalesced = 0
+        self.dropped = 0
+
+    def _get(self) -> str:
+        # Items are (event_type, message) pairs; consumers only need the message
+        return self._queue.popleft()[1]
+
+    def offer(self, event_type: str, message: str) -> None:
+        """
+        Queue an event without waiting.
+
+        Args:
+            event_type: SSE event type
+            message: Formatted SSE message
+        """
+        if event_type in COALESCED_EVENT_TYPES:
+            for pending in self._queue:
+                if pending[0] == event_type:
+                    # Move to the back so it stays ordered after events queued since
+                    self._queue.remove(pending)
+                    self._queue.append((event_type, message))
+                    self.coalesced += 1
+                    return
+
+        if self.full():
+            victim = next(
+                (pending for pending in self._queue if pending[0] in COALESCED_EVENT_TYPES),
+                self._queue[0]
+            )
+            self._queue.remove(victim)
+            self.dropped += 1
+
+        self.put_nowait((event_type, message))
+
+
+def format_sse(event_type: str, data: dict, event_id: Optional[str] = None) -> str:
+    """Format an event as an SSE message (with its event log ID, when it has one)."""
+    id_line = f"id: {event_id}\n" if event_id else ""
+    return f"{id_line}event: {event_type}\ndata: {json.dumps(data)}\n\n"
+
+
+def sse_event_id(message: str) -> Optional[str]:
+    """Event log ID of a message built by format_sse, if any."""
+    if not message.startswith("id: "):
+        return None
+    return message[4:message.index("\n")]
+
+
+def event_id_order(event_id: str) -> Tuple[int, int]:
+    """Sort key for Redis Stream entry IDs ("<ms>-<seq>")."""
+    millis, _, seq = event_id.partition("-")
+    return int(millis), int(seq or 0)
+
+
+def deliver(queue: asyncio.Queue, event_type: str, message: str) -> None:
+    """
+    Hand an event to one connection without blocking on slow clients.
+
+    Args:
+        queue: Connection queue (ClientQueue applies coalescing and drops)
+        event_type: SSE event type
+        message: Formatted SSE message
+    """
+    if isinstance(queue, ClientQueue):
+        queue.offer(event_type, message)
+        return
+    try:
+        queue.put_nowait(message)
+    except asyncio.QueueFull:
+        logger.warning("SSE connection queue full, dropping event", extra={"event_type": event_type})
+
 
 async def add_connection(job_id: str, queue: asyncio.Queue) -> None:
     """
@@ -110,12 +202,12 @@ async def broadcast_event(job_id: str, event_type: str, data: dict) -> None:
         return  # No connections, discard event
     
     # Format as SSE message
-    message = f"event: {event_type}\ndata: {json.dumps(data)}\n\n"
+    message = format_sse(event_type, data)
     
     # Broadcast to all connections
     for queue in connections_list:
         try:
-            await queue.put(message)
+            deliver(queue, event_type, message)
         except Exception as e:
             logger.warning("Failed to send event to connection", exc_info=e, extra={"job_id": job_id})
 
@@ -31,6 +31,10 @@ def pytest_configure(config):
     mock_redis.brpop = AsyncMock(return_value=None)
     mock_redis.sadd = AsyncMock(return_value=1)
     mock_redis.srem = AsyncMock(return_value=1)
+    mock_redis.eval = AsyncMock(return_value=0)
+    mock_redis.lrange = AsyncMock(return_value=[])
+    mock_redis.lindex = AsyncMock(return_value=None)
+    mock_redis.blpop = AsyncMock(return_value=None)
     
     # Mock pubsub
     mock_pubsub = AsyncMock()
@@ -136,11 +140,16 @@ def mock_redis_client():
     mock_client.expire = AsyncMock(return_value=True)
     mock_client.ping = AsyncMock(return_value=True)
     mock_client.publish = AsyncMock(return_value=1)
+    mock_client.xadd = AsyncMock(return_value=b"1700000000000-0")
+    mock_client.xrange = AsyncMock(return_value=[])
     mock_client.lpush = AsyncMock(return_value=1)
     mock_client.llen = AsyncMock(return_value=0)
     mock_client.brpop = AsyncMock(return_value=None)
     mock_client.sadd = AsyncMock(return_value=1)
     mock_client.srem = AsyncMock(return_value=1)
+    mock_client.lrange = AsyncMock(return_value=[])
+    mock_client.lindex = AsyncMock(return_value=None)
+    mock_client.blpop = AsyncMock(return_value=None)
     
     # Mock pubsub
     mock_pubsub = AsyncMock()
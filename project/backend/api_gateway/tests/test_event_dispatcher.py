@@ -0,0 +1,57 @@
+"""
+Tests for the SSE event dispatcher.
+"""
+
+import json
+import pytest
+from api_gateway.services.event_dispatcher import EventDispatcher
+from api_gateway.services.sse_manager import (
+    ClientQueue,
+    add_connection,
+    remove_connection,
+    connections,
+    connections_lock
+)
+
+
+@pytest.mark.asyncio
+async def test_dispatch_fans_out_to_job_connections():
+    """One published event reaches every connection of that job, and only that job."""
+    async with connections_lock:
+        connections.clear()
+    
+    dispatcher = EventDispatcher()
+    queue1, queue2, other = ClientQueue(), ClientQueue(), ClientQueue()
+    await add_connection("job_a", queue1)
+    await add_connection("job_a", queue2)
+    await add_connection("job_b", other)
+    
+    data = json.dumps({"event_type": "progress", "data": {"progress": 40}}).encode("utf-8")
+    delivered = dispatcher.dispatch(b"job_events:job_a", data)
+    
+    assert delivered == 2
+    for queue in (queue1, queue2):
+        message = queue.get_nowait()
+        assert message.startswith("event: progress\n")
+        assert '"progress": 40' in message
+    assert other.empty()
+    
+    stats = dispatcher.stats()
+    assert stats["messages"] == 1
+    assert stats["delivered"] == 2
+    assert stats["clients"] == 3
+    
+    for job_id, queue in (("job_a", queue1), ("job_a", queue2), ("job_b", other)):
+        await remove_connection(job_id, queue)
+
+
+@pytest.mark.asyncio
+async def test_dispatch_without_local_connections():
+    """Events for jobs nobody watches in this process are skipped."""
+    async with connections_lock:
+        connections.clear()
+    
+    dispatcher = EventDispatcher()
+    
+    assert dispatcher.dispatch("job_events:job_a", "not json") == 0
+    assert dispatcher.stats()["messages"] == 1
@@ -71,3 +71,62 @@ async def test_publish_event_channel_format(mock_redis_client):
         channel = call_args[0][0]
         
         assert channel == f"job_events:{job_id}"
+
+
+@pytest.mark.asyncio
+async def test_publish_event_appends_to_event_log(mock_redis_client):
+    """Events are logged to the job's capped stream and published with their log ID."""
+    with patch("api_gateway.services.event_publisher.redis_client") as mock_redis:
+        mock_redis.client = mock_redis_client
+        
+        job_id = "test_job_id"
+        await publish_event(job_id, "progress", {"progress": 10})
+        
+        xadd_args = mock_redis_client.xadd.call_args
+        assert xadd_args[0][0] == f"job_event_log:{job_id}"
+        assert xadd_args.kwargs["approximate"] is True
+        mock_redis_client.expire.assert_called_once()
+        
+        published = json.loads(mock_redis_client.publish.call_args[0][1])
+        assert published["id"] == "1700000000000-0"
+        assert published["event_type"] == "progress"
+
+
+@pytest.mark.asyncio
+async def test_publish_event_when_event_log_fails(mock_redis_client):
+    """A failed log write still publishes the event live (without an ID)."""
+    with patch("api_gateway.services.event_publisher.redis_client") as mock_redis:
+        mock_redis.client = mock_redis_client
+        mock_redis_client.xadd.side_effect = Exception("XADD failed")
+        
+        await publish_event("test_job_id", "progress", {"progress": 10})
+        
+        published = json.loads(mock_redis_client.publish.call_args[0][1])
+        assert "id" not in published
+
+
+@pytest.mark.asyncio
+async def test_read_event_log_replays_after_last_event_id(mock_redis_client):
+    """Replay skips the client's last event and reports whether the log still reaches it."""
+    from api_gateway.services.event_publisher import read_event_log
+    
+    def entry(entry_id, event_type, progress):
+        event = json.dumps({"event_type": event_type, "data": {"progress": progress}})
+        return (entry_id.encode("utf-8"), {b"event": event.encode("utf-8")})
+    
+    with patch("api_gateway.services.event_publisher.redis_client") as mock_redis:
+        mock_redis.client = mock_redis_client
+        mock_redis_client.xrange.return_value = [
+            entry("5-0", "progress", 10),
+            entry("6-0", "progress", 20),
+            entry("6-1", "completed", 100),
+        ]
+        
+        contiguous, events = await read_event_log("test_job_id", "5-0")
+        
+        assert contiguous is True
+        assert events == [("6-0", "progress", {"progress": 20}), ("6-1", "completed", {"progress": 100})]
+        
+        contiguous, events = await read_event_log("test_job_id", "4-0")
+        assert contiguous is False
+        assert len(events) == 3
@@ -0,0 +1,92 @@
+"""
+Tests for materialized job status documents.
+"""
+
+import json
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from api_gateway.services.job_status_store import (
+    DOCUMENT_TTL_SECONDS,
+    get_job_status_document,
+    patch_job_stage,
+    patch_job_status,
+    store_job_status_document
+)
+
+
+@pytest.fixture
+def mock_store_redis():
+    """Redis client used by the status store."""
+    with patch("api_gateway.services.job_status_store.redis_client") as mock_redis:
+        mock_redis.client = MagicMock()
+        mock_redis.client.hgetall = AsyncMock(return_value={})
+        mock_redis.client.eval = AsyncMock(return_value=1)
+        yield mock_redis.client
+
+
+@pytest.mark.asyncio
+async def test_document_assembled_from_fields(mock_store_redis):
+    """Job columns and stage attributes come back in the status endpoint's shape."""
+    mock_store_redis.hgetall.return_value = {
+        b"job:id": b'"job-1"',
+        b"job:progress": b"40",
+        b"stage:video_generator:status": b'"processing"',
+        b"stage:video_generator:metadata": json.dumps({"clips": {"total_clips": 3}}).encode(),
+    }
+    
+    document = await get_job_status_document("job-1")
+    
+    assert document["id"] == "job-1"
+    assert document["progress"] == 40
+    assert document["stages"]["video_generator"] == {
+        "status": "processing",
+        "duration": None,
+        "progress": None,
+        "metadata": {"clips": {"total_clips": 3}}
+    }
+
+
+@pytest.mark.asyncio
+async def test_missing_document(mock_store_redis):
+    """An unmaterialized job returns None so the endpoint builds it."""
+    assert await get_job_status_document("job-1") is None
+
+
+@pytest.mark.asyncio
+async def test_patch_job_status_sends_changed_columns(mock_store_redis):
+    """A jobs-table update becomes one HSET of the changed columns."""
+    await patch_job_status("job-1", {"progress": 55, "updated_at": "now()"})
+    
+    args = mock_store_redis.eval.await_args.args
+    assert args[1:5] == (2, "videogen:job_status:job-1", "videogen:job_status:job-1:version", DOCUMENT_TTL_SECONDS)
+    fields = dict(zip(args[5::2], args[6::2]))
+    assert fields["job:progress"] == "55"
+    assert json.loads(fields["job:updated_at"]) != "now()"
+
+
+@pytest.mark.asyncio
+async def test_patch_job_stage_only_changed_attributes(mock_store_redis):
+    """Stage patches leave metadata untouched when only the status changes."""
+    await patch_job_stage("job-1", "composer", status="completed")
+    
+    args = mock_store_redis.eval.await_args.args
+    assert args[5:] == ("stage:composer:status", '"completed"')
+
+
+@pytest.mark.asyncio
+async def test_store_is_conditional_on_version(mock_store_redis):
+    """A document built from the database is only stored if no patch landed meanwhile."""
+    mock_store_redis.eval.return_value = 0
+    job = {"id": "job-1", "stages": {"audio_parser": {"status": "completed", "duration": 4.2}}}
+    
+    stored = await store_job_status_document("job-1", job, "7")
+    
+    assert stored is False
+    args = mock_store_redis.eval.await_args.args
+    assert args[5] == "7"
+    fields = dict(zip(args[6::2], args[7::2]))
+    assert fields == {
+        "job:id": '"job-1"',
+        "stage:audio_parser:status": '"completed"',
+        "stage:audio_parser:duration": "4.2"
+    }
@@ -42,7 +42,8 @@ async def test_update_progress(mock_database_client, mock_redis_client, test_env
     with patch("api_gateway.orchestrator.db_client") as mock_db, \
          patch("api_gateway.orchestrator.redis_client") as mock_redis_wrapper, \
          patch("api_gateway.orchestrator.publish_event") as mock_publish, \
-         patch("api_gateway.orchestrator.broadcast_event") as mock_broadcast:
+         patch("api_gateway.orchestrator.broadcast_event") as mock_broadcast, \
+         patch("api_gateway.orchestrator.patch_job_status", new_callable=AsyncMock) as mock_patch_status:
         
         # Mock database
         mock_result = MagicMock()
@@ -63,8 +64,11 @@ async def test_update_progress(mock_database_client, mock_redis_client, test_env
         
         # Verify database update was called
         assert mock_table.update.called
-        # Verify cache invalidation
-        assert mock_redis_client.delete.called
+        # Verify the status document was patched with the same update
+        mock_patch_status.assert_awaited_once()
+        patched = mock_patch_status.await_args.args[1]
+        assert patched["progress"] == 50
+        assert patched["current_stage"] == "video_generation"
         # Verify events published
         assert mock_publish.called
         assert mock_broadcast.called
@@ -75,7 +79,8 @@ async def test_handle_pipeline_error(mock_database_client, mock_redis_client, te
     """Test pipeline error handling."""
     with patch("api_gateway.orchestrator.db_client") as mock_db, \
          patch("api_gateway.orchestrator.redis_client") as mock_redis_wrapper, \
-         patch("api_gateway.orchestrator.publish_event") as mock_publish:
+         patch("api_gateway.orchestrator.publish_event") as mock_publish, \
+         patch("api_gateway.orchestrator.patch_job_status", new_callable=AsyncMock) as mock_patch_status:
         
         from shared.errors import PipelineError
         
@@ -97,8 +102,9 @@ async def test_handle_pipeline_error(mock_database_client, mock_redis_client, te
         
         # Verify database update was called
         assert mock_table.update.called
-        # Verify cache invalidation
-        assert mock_redis_client.delete.called
+        # Verify the status document was patched to failed
+        mock_patch_status.assert_awaited_once()
+        assert mock_patch_status.await_args.args[1]["status"] == "failed"
         # Verify error event published
         assert mock_publish.called
 
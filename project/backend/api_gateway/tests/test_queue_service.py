@@ -5,7 +5,21 @@ Tests for queue service.
 import pytest
 import json
 from unittest.mock import AsyncMock, patch
-from api_gateway.services.queue_service import enqueue_job, remove_job, get_queue_size, QUEUE_NAME
+from api_gateway.services.queue_service import (
+    enqueue_job,
+    remove_job,
+    get_queue_size,
+    claim_job,
+    retry_job,
+    get_retry_delay,
+    reap_expired_leases,
+    get_priority_class,
+    migrate_legacy_queue,
+    MAX_JOB_ATTEMPTS,
+    PRIORITY_CLASSES,
+    QUEUE_KEY_PREFIX,
+    LEGACY_QUEUE_KEY,
+)
 
 
 @pytest.mark.asyncio
@@ -26,13 +40,15 @@ async def test_enqueue_job(mock_redis_client):
         set_call = mock_redis_client.set.call_args_list[0]
         assert "job:test_job_id" in set_call[0][0]  # Key contains job_id
         
-        # Verify job was added to queue
-        assert mock_redis_client.lpush.called
-        lpush_call = mock_redis_client.lpush.call_args
-        assert f"{QUEUE_NAME}:queue" in lpush_call[0][0]
+        # Verify job was added to the user's generation lane
+        assert mock_redis_client.eval.called
+        eval_args = mock_redis_client.eval.call_args[0]
+        assert eval_args[2] == f"{QUEUE_KEY_PREFIX}:lane:generation:{user_id}"
+        assert eval_args[3] == f"{QUEUE_KEY_PREFIX}:users:generation"
+        assert eval_args[4] == f"{QUEUE_KEY_PREFIX}:notify:generation"
         
         # Verify job data structure
-        job_data_str = lpush_call[0][1]
+        job_data_str = eval_args[5]
         if isinstance(job_data_str, bytes):
             job_data_str = job_data_str.decode("utf-8")
         job_data = json.loads(job_data_str)
@@ -59,14 +75,184 @@ async def test_remove_job(mock_redis_client):
 
 @pytest.mark.asyncio
 async def test_get_queue_size(mock_redis_client):
-    """Test queue size retrieval."""
+    """Queue size covers the recovery lane and every user lane, all declared as keys."""
     with patch("api_gateway.services.queue_service.redis_client") as mock_redis:
         mock_redis.client = mock_redis_client
-        mock_redis_client.llen.return_value = 5
+        mock_redis_client.eval = AsyncMock(return_value=5)
+        
+        async def fake_lrange(key, start, end):
+            return [b"u1", b"u2"] if key == f"{QUEUE_KEY_PREFIX}:users:generation" else []
+        
+        mock_redis_client.lrange = AsyncMock(side_effect=fake_lrange)
         
         size = await get_queue_size()
         
         assert size == 5
-        assert mock_redis_client.llen.called
-        llen_call = mock_redis_client.llen.call_args
-        assert f"{QUEUE_NAME}:queue" in llen_call[0][0]
+        eval_args = mock_redis_client.eval.call_args[0]
+        assert eval_args[1] == 3
+        assert eval_args[2:] == (
+            f"{QUEUE_KEY_PREFIX}:queue",
+            f"{QUEUE_KEY_PREFIX}:lane:generation:u1",
+            f"{QUEUE_KEY_PREFIX}:lane:generation:u2",
+        )
+
+
+@pytest.mark.asyncio
+async def test_claim_job_moves_into_worker_processing_list(mock_redis_client):
+    """Claiming atomically moves the job into the worker's processing list."""
+    with patch("api_gateway.services.queue_service.redis_client") as mock_redis:
+        mock_redis.client = mock_redis_client
+        mock_redis_client.eval = AsyncMock(return_value=b'{"job_id": "j1"}')
+        
+        async def fake_lindex(key, index):
+            return b"u1" if key == f"{QUEUE_KEY_PREFIX}:users:generation" else None
+        
+        mock_redis_client.lindex = AsyncMock(side_effect=fake_lindex)
+        
+        payload = await claim_job("worker-a", timeout=5)
+        
+        assert payload == b'{"job_id": "j1"}'
+        args = mock_redis_client.eval.call_args[0]
+        assert args[1] == 2 + 2 * len(PRIORITY_CLASSES)
+        keys = args[2:2 + args[1]]
+        assert keys[:2] == (f"{QUEUE_KEY_PREFIX}:queue", f"{QUEUE_KEY_PREFIX}:processing:worker-a")
+        # Each class passes its ring and the lane of the user at the head of the ring
+        assert keys[4:6] == (f"{QUEUE_KEY_PREFIX}:users:generation", f"{QUEUE_KEY_PREFIX}:lane:generation:u1")
+        assert all(key.startswith(QUEUE_KEY_PREFIX) for key in keys)
+        assert args[2 + args[1]:] == ("1", "", "u1", "")
+
+
+@pytest.mark.asyncio
+async def test_claim_job_blocks_until_notified(mock_redis_client):
+    """An empty queue blocks on the notify lists instead of polling, then claims."""
+    with patch("api_gateway.services.queue_service.redis_client") as mock_redis:
+        mock_redis.client = mock_redis_client
+        mock_redis_client.eval = AsyncMock(side_effect=[None, b'{"job_id": "j1"}'])
+        mock_redis_client.blpop = AsyncMock(return_value=(f"{QUEUE_KEY_PREFIX}:notify:generation".encode(), b"1"))
+        
+        payload = await claim_job("worker-a", timeout=5)
+        
+        assert payload == b'{"job_id": "j1"}'
+        mock_redis_client.blpop.assert_called_once()
+        notify_keys = mock_redis_client.blpop.call_args[0][0]
+        assert notify_keys == [f"{QUEUE_KEY_PREFIX}:notify:recovery"] + [
+            f"{QUEUE_KEY_PREFIX}:notify:{priority_class}" for priority_class in PRIORITY_CLASSES
+        ]
+        assert 0 < mock_redis_client.blpop.call_args[1]["timeout"] <= 5
+
+
+@pytest.mark.asyncio
+async def test_claim_job_retries_when_ring_changed(mock_redis_client):
+    """A ring that changed between reading its head and claiming is re-read without blocking."""
+    with patch("api_gateway.services.queue_service.redis_client") as mock_redis:
+        mock_redis.client = mock_redis_client
+        mock_redis_client.eval = AsyncMock(side_effect=[0, b'{"job_id": "j1"}'])
+        
+        payload = await claim_job("worker-a", timeout=5)
+        
+        assert payload == b'{"job_id": "j1"}'
+        assert mock_redis_client.eval.call_count == 2
+        assert not mock_redis_client.blpop.called
+
+
+@pytest.mark.asyncio
+async def test_retry_job_schedules_with_backoff(mock_redis_client):
+    """Retryable failures are delayed with exponential backoff until attempts run out."""
+    with patch("api_gateway.services.queue_service.redis_client") as mock_redis:
+        mock_redis.client = mock_redis_client
+        mock_redis_client.eval = AsyncMock(return_value=1)
+        mock_redis_client.lrem = AsyncMock(return_value=1)
+        
+        payload = json.dumps({"job_id": "j1"}).encode("utf-8")
+        assert await retry_job("worker-a", payload) is True
+        
+        eval_args = mock_redis_client.eval.call_args[0]
+        assert eval_args[2] == f"{QUEUE_KEY_PREFIX}:processing:worker-a"
+        assert eval_args[3] == f"{QUEUE_KEY_PREFIX}:delayed"
+        assert json.loads(eval_args[6])["attempts"] == 1
+        
+        exhausted = json.dumps({"job_id": "j1", "attempts": MAX_JOB_ATTEMPTS - 1}).encode("utf-8")
+        assert await retry_job("worker-a", exhausted) is False
+        mock_redis_client.lrem.assert_called_once_with(f"{QUEUE_KEY_PREFIX}:processing:worker-a", 1, exhausted)
+    
+    assert get_retry_delay(2) == 2 * get_retry_delay(1)
+
+
+@pytest.mark.asyncio
+async def test_reap_expired_leases(mock_redis_client):
+    """Jobs held by workers without a live lease are requeued."""
+    with patch("api_gateway.services.queue_service.redis_client") as mock_redis:
+        mock_redis.client = mock_redis_client
+        mock_redis_client.smembers = AsyncMock(return_value={b"alive", b"dead"})
+        
+        async def fake_eval(script, numkeys, lease_key, *args):
+            return -1 if lease_key.endswith(":alive") else 2
+        
+        mock_redis_client.eval = AsyncMock(side_effect=fake_eval)
+        
+        assert await reap_expired_leases() == 2
+
+
+def test_get_priority_class():
+    """Regenerations outrank generations; stop_at_stage test jobs rank lowest."""
+    assert get_priority_class({"job_type": "regeneration"}) == "interactive"
+    assert get_priority_class({"job_type": "generation"}) == "generation"
+    assert get_priority_class({"job_type": "generation", "stop_at_stage": "scene_planner"}) == "test"
+    assert PRIORITY_CLASSES.index("interactive") < PRIORITY_CLASSES.index("generation") < PRIORITY_CLASSES.index("test")
+
+
+@pytest.mark.asyncio
+async def test_claim_job_restricted_to_priority_classes(mock_redis_client):
+    """Restricted claims skip the recovery lane and only scan the given classes."""
+    with patch("api_gateway.services.queue_service.redis_client") as mock_redis:
+        mock_redis.client = mock_redis_client
+        mock_redis_client.eval = AsyncMock(return_value=None)
+        
+        payload = await claim_job("worker-a", timeout=0, priority_classes=["interactive"])
+        
+        assert payload is None
+        args = mock_redis_client.eval.call_args[0]
+        assert args[1] == 4  # Recovery lane, processing list, interactive ring and lane
+        assert args[6:] == ("0", "")  # Recovery lane excluded, interactive ring empty
+        assert not mock_redis_client.blpop.called  # Never blocks past the timeout
+
+
+@pytest.mark.asyncio
+async def test_migrate_legacy_queue(mock_redis_client):
+    """Jobs left in the legacy list move onto their class and user lanes, oldest first."""
+    with patch("api_gateway.services.queue_service.redis_client") as mock_redis:
+        mock_redis.client = mock_redis_client
+        generation = json.dumps({"job_id": "j1", "user_id": "u1", "job_type": "generation"}).encode()
+        regeneration = json.dumps({"job_id": "j2", "user_id": "u2", "job_type": "regeneration"}).encode()
+        mock_redis_client.rpop = AsyncMock(side_effect=[generation, regeneration, b"not json", None])
+        mock_redis_client.eval = AsyncMock(return_value=1)
+        
+        assert await migrate_legacy_queue() == 3
+        
+        assert all(call[0][0] == LEGACY_QUEUE_KEY for call in mock_redis_client.rpop.call_args_list)
+        lanes = [call[0][2] for call in mock_redis_client.eval.call_args_list]
+        assert lanes == [
+            f"{QUEUE_KEY_PREFIX}:lane:generation:u1",
+            f"{QUEUE_KEY_PREFIX}:lane:interactive:u2"
+        ]
+        # The payload is queued unchanged
+        assert mock_redis_client.eval.call_args_list[0][0][5] == generation
+        # Payloads without a user go to the recovery lane, which the worker handles as before
+        mock_redis_client.lpush.assert_any_call(f"{QUEUE_KEY_PREFIX}:queue", b"not json")
+        mock_redis_client.lpush.assert_any_call(f"{QUEUE_KEY_PREFIX}:notify:recovery", b"1")
+
+
+@pytest.mark.asyncio
+async def test_migrate_legacy_queue_puts_back_on_failure(mock_redis_client):
+    """A job that can't be pushed onto its lane goes back on the legacy list."""
+    with patch("api_gateway.services.queue_service.redis_client") as mock_redis:
+        mock_redis.client = mock_redis_client
+        payload = json.dumps({"job_id": "j1", "user_id": "u1"}).encode()
+        mock_redis_client.rpop = AsyncMock(side_effect=[payload, None])
+        mock_redis_client.rpush = AsyncMock(return_value=1)
+        mock_redis_client.eval = AsyncMock(side_effect=ConnectionError("Redis unavailable"))
+        
+        with pytest.raises(ConnectionError):
+            await migrate_legacy_queue()
+        
+        mock_redis_client.rpush.assert_called_once_with(LEGACY_QUEUE_KEY, payload)
@@ -156,3 +156,46 @@ async def test_get_initial_state(mock_database_client):
         assert state["stage"] == "video_generation"
         assert state["status"] == "processing"
         assert state["total_cost"] == 150.50
+
+
+@pytest.mark.asyncio
+async def test_client_queue_coalesces_progress():
+    """A slow client gets the latest progress instead of a backlog."""
+    from api_gateway.services.sse_manager import ClientQueue, format_sse
+    
+    queue = ClientQueue(maxsize=10)
+    queue.offer("progress", format_sse("progress", {"progress": 10}))
+    queue.offer("stage_update", format_sse("stage_update", {"stage": "composer"}))
+    queue.offer("progress", format_sse("progress", {"progress": 20}))
+    
+    assert queue.qsize() == 2
+    assert queue.coalesced == 1
+    assert "stage_update" in await queue.get()
+    assert '"progress": 20' in await queue.get()
+
+
+@pytest.mark.asyncio
+async def test_client_queue_drops_progress_before_other_events_when_full():
+    """A full queue makes room by dropping progress-style events first."""
+    from api_gateway.services.sse_manager import ClientQueue
+    
+    queue = ClientQueue(maxsize=2)
+    queue.offer("message", "event: message\n\n")
+    queue.offer("progress", "event: progress\n\n")
+    queue.offer("completed", "event: completed\n\n")
+    
+    assert queue.dropped == 1
+    assert await queue.get() == "event: message\n\n"
+    assert await queue.get() == "event: completed\n\n"
+
+
+def test_format_sse_with_event_id():
+    """Logged events carry their stream entry ID so clients can resume from it."""
+    from api_gateway.services.sse_manager import format_sse, sse_event_id, event_id_order
+    
+    message = format_sse("progress", {"progress": 5}, "1700000000000-2")
+    
+    assert message.startswith("id: 1700000000000-2\nevent: progress\n")
+    assert sse_event_id(message) == "1700000000000-2"
+    assert sse_event_id(format_sse("heartbeat", {})) is None
+    assert event_id_order("1700000000000-10") > event_id_order("1700000000000-9")
@@ -2,6 +2,7 @@
 Tests for worker process.
 """
 
+import json
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
 from api_gateway.worker import process_job
@@ -97,3 +98,168 @@ async def test_process_job_invalid_data(test_env_vars):
             pass
         # No exception should propagate, just logged
 
+
+
+@pytest.mark.asyncio
+async def test_worker_loop_runs_jobs_concurrently(test_env_vars):
+    """Popped jobs run as parallel tasks instead of one at a time."""
+    import asyncio
+    import json
+    from api_gateway import worker
+    
+    payloads = [
+        json.dumps({"job_id": f"job_{i}", "user_id": "u"}).encode("utf-8")
+        for i in range(3)
+    ]
+    running = []
+    release = asyncio.Event()
+    
+    async def fake_process_job(job_data):
+        running.append(job_data["job_id"])
+        await release.wait()
+    
+    async def fake_claim_job(worker_id, timeout, priority_classes=None):
+        if payloads:
+            return payloads.pop(0)
+        await asyncio.sleep(0.01)
+        return None
+    
+    mock_client = AsyncMock()
+    
+    with patch("api_gateway.worker.process_job", side_effect=fake_process_job), \
+         patch("api_gateway.worker.claim_job", side_effect=fake_claim_job), \
+         patch("api_gateway.worker.ack_job", new=AsyncMock()) as mock_ack, \
+         patch("api_gateway.worker.redis_client") as mock_redis_wrapper, \
+         patch("api_gateway.services.event_publisher.publish_event", new=AsyncMock()), \
+         patch("api_gateway.worker.shutdown_event", asyncio.Event()) as shutdown, \
+         patch("api_gateway.worker.semaphore", asyncio.Semaphore(worker.MAX_CONCURRENT_JOBS)):
+        mock_redis_wrapper.client = mock_client
+        
+        loop_task = asyncio.create_task(worker.worker_loop())
+        for _ in range(50):
+            if len(running) == 3:
+                break
+            await asyncio.sleep(0.01)
+        
+        # All three jobs are running at once
+        assert sorted(running) == ["job_0", "job_1", "job_2"]
+        assert worker.get_slot_utilization()["busy_slots"] == 3
+        
+        shutdown.set()
+        release.set()
+        await asyncio.wait_for(loop_task, timeout=1)
+        await worker.drain_in_flight(timeout=1)
+        
+        assert worker.get_slot_utilization()["busy_slots"] == 0
+        assert mock_ack.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_drain_requeues_unfinished_jobs(test_env_vars):
+    """Jobs still running after the drain timeout are cancelled and requeued."""
+    import asyncio
+    from api_gateway import worker
+    
+    async def never_finishes(job_data):
+        await asyncio.Event().wait()
+    
+    mock_client = AsyncMock()
+    with patch("api_gateway.worker.process_job", side_effect=never_finishes), \
+         patch("api_gateway.worker.requeue_job", new=AsyncMock()) as mock_requeue, \
+         patch("api_gateway.worker.ack_job", new=AsyncMock()) as mock_ack, \
+         patch("api_gateway.worker.redis_client") as mock_redis_wrapper, \
+         patch("api_gateway.worker.semaphore", asyncio.Semaphore(worker.MAX_CONCURRENT_JOBS)) as sem:
+        mock_redis_wrapper.client = mock_client
+        
+        await sem.acquire()
+        worker.dispatch_job({"job_id": "stuck_job", "user_id": "u"}, b'{"job_id": "stuck_job"}')
+        await asyncio.sleep(0)
+        
+        await worker.drain_in_flight(timeout=0.05)
+        
+        mock_requeue.assert_called_once_with(worker.WORKER_ID, b'{"job_id": "stuck_job"}')
+        assert not mock_ack.called  # Cancelled jobs stay claimed until requeued
+        assert not worker.in_flight
+        assert sem._value == worker.MAX_CONCURRENT_JOBS
+
+
+@pytest.mark.asyncio
+async def test_retryable_error_schedules_retry(test_env_vars):
+    """A RetryableError from a pipeline stage schedules a delayed retry without failing the job."""
+    import asyncio
+    from api_gateway import worker
+    from shared.errors import RetryableError
+    
+    mock_db = MagicMock()
+    mock_db.table.return_value.select.return_value.eq.return_value.eq.return_value.execute = AsyncMock(
+        return_value=MagicMock(data=[])
+    )
+    mock_db.table.return_value.insert.return_value.execute = AsyncMock()
+    mock_db.table.return_value.update.return_value.eq.return_value.execute = AsyncMock()
+    
+    with patch("modules.audio_parser.main.process_audio_analysis",
+               new=AsyncMock(side_effect=RetryableError("Replicate timeout"))), \
+         patch("api_gateway.orchestrator.db_client", mock_db), \
+         patch("api_gateway.orchestrator.publish_event", new=AsyncMock()), \
+         patch("api_gateway.orchestrator.patch_job_stage", new=AsyncMock()), \
+         patch("api_gateway.orchestrator.patch_job_status", new=AsyncMock()), \
+         patch("api_gateway.orchestrator.update_progress", new=AsyncMock()), \
+         patch("api_gateway.orchestrator.check_cancellation", new=AsyncMock(return_value=False)), \
+         patch("api_gateway.orchestrator.handle_pipeline_error", new=AsyncMock()) as mock_pipeline_error, \
+         patch("api_gateway.worker.handle_pipeline_error", new=AsyncMock()) as mock_worker_error, \
+         patch("api_gateway.services.event_publisher.publish_event", new=AsyncMock()), \
+         patch("api_gateway.worker.retry_job", new=AsyncMock(return_value=True)) as mock_retry, \
+         patch("api_gateway.worker.ack_job", new=AsyncMock()) as mock_ack, \
+         patch("api_gateway.worker.redis_client") as mock_redis_wrapper, \
+         patch("api_gateway.worker.semaphore", asyncio.Semaphore(worker.MAX_CONCURRENT_JOBS)) as sem:
+        mock_redis_wrapper.get = AsyncMock(return_value=None)  # Not cancelled
+        mock_redis_wrapper.client = AsyncMock()
+        
+        await sem.acquire()
+        job_data = {
+            "job_id": "00000000-0000-0000-0000-000000000001",
+            "user_id": "u",
+            "audio_url": "https://storage.supabase.co/test.mp3",
+            "user_prompt": "Test prompt with at least 50 characters to pass validation"
+        }
+        payload = json.dumps(job_data).encode()
+        await worker.run_job_in_slot(job_data, payload)
+        
+        mock_retry.assert_called_once_with(worker.WORKER_ID, payload)
+        assert not mock_ack.called
+        # The job is neither marked failed nor reported as an error while a retry is pending
+        assert not mock_pipeline_error.called
+        assert not mock_worker_error.called
+
+
+@pytest.mark.asyncio
+async def test_retryable_error_fails_job_when_attempts_exhausted(test_env_vars):
+    """Once retries are exhausted the job is failed and acknowledged."""
+    import asyncio
+    from api_gateway import worker
+    from shared.errors import RetryableError
+    
+    with patch("api_gateway.worker.execute_pipeline",
+               new=AsyncMock(side_effect=RetryableError("Replicate timeout"))), \
+         patch("api_gateway.services.event_publisher.publish_event", new=AsyncMock()), \
+         patch("api_gateway.worker.handle_pipeline_error", new=AsyncMock()) as mock_error, \
+         patch("api_gateway.worker.retry_job", new=AsyncMock(return_value=False)), \
+         patch("api_gateway.worker.ack_job", new=AsyncMock()) as mock_ack, \
+         patch("api_gateway.worker.redis_client") as mock_redis_wrapper, \
+         patch("api_gateway.worker.semaphore", asyncio.Semaphore(worker.MAX_CONCURRENT_JOBS)) as sem:
+        mock_redis_wrapper.get = AsyncMock(return_value=None)
+        mock_redis_wrapper.client = AsyncMock()
+        
+        await sem.acquire()
+        job_data = {
+            "job_id": "flaky_job",
+            "user_id": "u",
+            "audio_url": "https://storage.supabase.co/test.mp3",
+            "user_prompt": "Test prompt with at least 50 characters to pass validation"
+        }
+        await worker.run_job_in_slot(job_data, b'{"job_id": "flaky_job"}')
+        
+        mock_error.assert_called_once()
+        assert mock_error.call_args[0][0] == "flaky_job"
+        assert f"{worker.MAX_JOB_ATTEMPTS} attempts" in str(mock_error.call_args[0][1])
+        mock_ack.assert_called_once()
@@ -6,14 +6,36 @@ Processes jobs from the queue and executes the video generation pipeline.
 
 import asyncio
 import json
+import os
+import signal
+import socket
+import time
+from typing import Dict, List, Optional
+from datetime import datetime
 from uuid import UUID
 from decimal import Decimal
 from shared.redis_client import RedisClient
 from shared.database import DatabaseClient
 from shared.errors import RetryableError, PipelineError, BudgetExceededError
 from shared.logging import get_logger
-from api_gateway.orchestrator import execute_pipeline
-from api_gateway.services.queue_service import QUEUE_NAME
+from api_gateway.orchestrator import execute_pipeline, handle_pipeline_error
+from api_gateway.services.job_status_store import patch_job_status
+from api_gateway.services.queue_service import (
+    QUEUE_NAME,
+    LEASE_TTL_SECONDS,
+    PRIORITY_INTERACTIVE,
+    MAX_JOB_ATTEMPTS,
+    claim_job,
+    get_priority_class,
+    ack_job,
+    requeue_job,
+    retry_job,
+    heartbeat_lease,
+    release_lease,
+    reap_expired_leases,
+    promote_delayed_jobs,
+    migrate_legacy_queue,
+)
 
 logger = get_logger(__name__)
 
@@ -21,9 +43,31 @@ redis_client = RedisClient()
 db_client = DatabaseClient()
 
 # Max concurrent jobs per worker (PRD: 5 per worker, 2 workers = 10 total)
-MAX_CONCURRENT_JOBS = 5
+MAX_CONCURRENT_JOBS = int(os.getenv("WORKER_MAX_CONCURRENT_JOBS", "5"))
 semaphore = asyncio.Semaphore(MAX_CONCURRENT_JOBS)
 
+# Slots kept free for interactive clip regenerations so edits never wait behind long generations
+RESERVED_INTERACTIVE_SLOTS = min(int(os.getenv("WORKER_RESERVED_INTERACTIVE_SLOTS", "1")), MAX_CONCURRENT_JOBS - 1)
+
+# Seconds to wait for in-flight jobs on SIGTERM before cancelling and requeueing them
+DRAIN_TIMEOUT_SECONDS = float(os.getenv("WORKER_DRAIN_TIMEOUT_SECONDS", "300"))
+LEASE_HEARTBEAT_INTERVAL = LEASE_TTL_SECONDS / 3
+UTILIZATION_REPORT_INTERVAL = float(os.getenv("WORKER_UTILIZATION_REPORT_INTERVAL", "30"))
+
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+# Running job tasks mapped to their raw queue payload (for requeue on shutdown/crash)
+in_flight: Dict[asyncio.Task, bytes] = {}
+
+# Per-slot bookkeeping for utilization reporting
+slots: List[dict] = [
+    {"job_id": None, "started_at": None, "busy_seconds": 0.0, "jobs_completed": 0}
+    for _ in range(MAX_CONCURRENT_JOBS)
+]
+worker_started_at = time.monotonic()
+
+shutdown_event = asyncio.Event()
+
 
 async def process_job(job_data: dict) -> None:
     """
@@ -59,20 +103,22 @@ async def process_job(job_data: dict) -> None:
         
         logger.info("Job processed successfully", extra={"job_id": job_id, "job_type": job_type})
         
-    except (BudgetExceededError, PipelineError) as e:
-        logger.error("Job failed", exc_info=e, extra={"job_id": job_id, "job_type": job_type})
-        # Error handling is done in respective handlers
     except RetryableError as e:
+        # Must precede PipelineError (its base class); re-raised for the queue retry mechanism
         logger.warning("Retryable error occurred", exc_info=e, extra={"job_id": job_id, "job_type": job_type})
-        # Re-raise for queue retry mechanism
         raise
+    except (BudgetExceededError, PipelineError) as e:
+        logger.error("Job failed", exc_info=e, extra={"job_id": job_id, "job_type": job_type})
+        # Error handling is done in respective handlers
     except Exception as e:
         logger.error("Unexpected error processing job", exc_info=e, extra={"job_id": job_id, "job_type": job_type})
         # Mark as failed
-        await db_client.table("jobs").update({
+        failure_update = {
             "status": "failed",
             "error_message": f"Unexpected error: {str(e)}"
-        }).eq("id", job_id).execute()
+        }
+        await db_client.table("jobs").update(failure_update).eq("id", job_id).execute()
+        await patch_job_status(job_id, failure_update)
 
 
 async def process_generation_job(job_data: dict) -> None:
@@ -118,10 +164,12 @@ async def process_generation_job(job_data: dict) -> None:
     cancel_key = f"job_cancel:{job_id}"
     if await redis_client.get(cancel_key):
         logger.info("Job cancelled before processing", extra={"job_id": job_id})
-        await db_client.table("jobs").update({
+        cancelled = {
             "status": "failed",
             "error_message": "Job cancelled by user"
-        }).eq("id", job_id).execute()
+        }
+        await db_client.table("jobs").update(cancelled).eq("id", job_id).execute()
+        await patch_job_status(job_id, cancelled)
         return
     
     # Execute pipeline (pass stop_at_stage, video_model, aspect_ratio, and template)
@@ -577,126 +625,421 @@ async def regenerate_single_clip(
     }
 
 
-async def process_job_with_limit(job_data: dict) -> None:
+def _claim_slot(job_id: str) -> int:
     """
-    Process job with concurrency limit.
+    Assign a free execution slot to a job for utilization reporting.
     
-    Wraps process_job() with semaphore to limit concurrent execution.
+    Args:
+        job_id: Job ID occupying the slot
+        
+    Returns:
+        Index of the claimed slot
+    """
+    for index, slot in enumerate(slots):
+        if slot["job_id"] is None:
+            slot["job_id"] = job_id
+            slot["started_at"] = time.monotonic()
+            return index
+    # Should not happen: admission is gated by the semaphore
+    raise RuntimeError("No free worker slot available")
+
+
+def _release_slot(index: int) -> None:
+    """
+    Release an execution slot and accumulate its busy time.
     
     Args:
-        job_data: Job data dictionary
+        index: Slot index returned by _claim_slot()
+    """
+    slot = slots[index]
+    if slot["started_at"] is not None:
+        slot["busy_seconds"] += time.monotonic() - slot["started_at"]
+    slot["job_id"] = None
+    slot["started_at"] = None
+    slot["jobs_completed"] += 1
+
+
+def get_slot_utilization() -> dict:
+    """
+    Get per-slot utilization for this worker process.
+    
+    Utilization is the fraction of worker uptime a slot has spent running jobs.
+    
+    Returns:
+        Dictionary with worker ID, busy slot count, and per-slot statistics
+    """
+    now = time.monotonic()
+    uptime = max(now - worker_started_at, 1e-6)
+    slot_stats = []
+    for index, slot in enumerate(slots):
+        busy_seconds = slot["busy_seconds"]
+        running_seconds = None
+        if slot["started_at"] is not None:
+            running_seconds = now - slot["started_at"]
+            busy_seconds += running_seconds
+        slot_stats.append({
+            "slot": index,
+            "job_id": slot["job_id"],
+            "running_seconds": round(running_seconds, 1) if running_seconds is not None else None,
+            "jobs_completed": slot["jobs_completed"],
+            "utilization": round(min(busy_seconds / uptime, 1.0), 3)
+        })
+    
+    busy_slots = sum(1 for slot in slots if slot["job_id"] is not None)
+    return {
+        "worker_id": WORKER_ID,
+        "total_slots": MAX_CONCURRENT_JOBS,
+        "busy_slots": busy_slots,
+        "utilization": round(sum(s["utilization"] for s in slot_stats) / MAX_CONCURRENT_JOBS, 3),
+        "slots": slot_stats
+    }
+
+
+async def run_job_in_slot(job_data: dict, job_payload: bytes) -> None:
+    """
+    Run a job in an execution slot that was admitted by worker_loop().
+    
+    The caller has already acquired the semaphore; it is released here when
+    the job finishes so the loop can pull the next job from Redis. The job is
+    acknowledged on completion, or scheduled for a delayed retry if it raised
+    a RetryableError.
+    
+    Args:
+        job_data: Parsed job data dictionary
+        job_payload: Raw queue payload held in this worker's processing list
     """
     job_id = job_data.get("job_id")
+    slot_index = _claim_slot(job_id)
+    finished = True
+    
+    try:
+        logger.info(
+            "Processing job (slot acquired)",
+            extra={"job_id": job_id, "slot": slot_index, "available_slots": semaphore._value}
+        )
+        await process_job(job_data)
+        logger.info(
+            "Job completed (slot released)",
+            extra={"job_id": job_id, "slot": slot_index}
+        )
+    except asyncio.CancelledError:
+        # Cancelled during shutdown - the caller requeues the payload
+        finished = False
+        logger.warning("Job cancelled during worker shutdown", extra={"job_id": job_id, "slot": slot_index})
+        raise
+    except RetryableError as e:
+        try:
+            finished = not await retry_job(WORKER_ID, job_payload)
+        except Exception as retry_error:
+            logger.error("Failed to schedule job retry", exc_info=retry_error, extra={"job_id": job_id})
+        if finished:
+            # Out of attempts: fail the job the way the pipeline does for permanent errors
+            await handle_pipeline_error(
+                job_id,
+                PipelineError(f"Job failed after {MAX_JOB_ATTEMPTS} attempts: {str(e)}")
+            )
+    except Exception as e:
+        logger.error(
+            "Job failed (slot released)",
+            exc_info=e,
+            extra={"job_id": job_id, "slot": slot_index}
+        )
+    finally:
+        _release_slot(slot_index)
+        semaphore.release()
+        try:
+            if finished:
+                await ack_job(WORKER_ID, job_payload)
+                
+                # Remove job data
+                job_data_key = f"{QUEUE_NAME}:job:{job_id}"
+                await redis_client.client.delete(job_data_key)
+        except Exception as e:
+            logger.warning("Failed to clean up job queue keys", extra={"job_id": job_id, "error": str(e)})
+
+
+def dispatch_job(job_data: dict, job_payload: bytes) -> asyncio.Task:
+    """
+    Start a job as a supervised background task.
+    
+    Args:
+        job_data: Parsed job data dictionary
+        job_payload: Raw queue payload (kept for requeueing)
+        
+    Returns:
+        The asyncio task running the job
+    """
+    task = asyncio.create_task(
+        run_job_in_slot(job_data, job_payload),
+        name=f"job:{job_data.get('job_id')}"
+    )
+    in_flight[task] = job_payload
+    task.add_done_callback(lambda t: in_flight.pop(t, None))
+    return task
+
+
+async def _acquire_slot() -> bool:
+    """
+    Wait until a slot is free or shutdown is requested.
+    
+    Returns:
+        True if a slot was acquired, False if the worker is shutting down
+    """
+    if shutdown_event.is_set():
+        return False
+    
+    acquire_task = asyncio.ensure_future(semaphore.acquire())
+    shutdown_task = asyncio.ensure_future(shutdown_event.wait())
+    try:
+        await asyncio.wait({acquire_task, shutdown_task}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        shutdown_task.cancel()
+        if not acquire_task.done():
+            acquire_task.cancel()
+        try:
+            await acquire_task
+        except asyncio.CancelledError:
+            pass
+    
+    acquired = acquire_task.done() and not acquire_task.cancelled()
+    if acquired and shutdown_event.is_set():
+        semaphore.release()
+        return False
+    return acquired
+
+
+async def requeue_payloads(payloads: List[bytes]) -> None:
+    """
+    Move claimed job payloads from this worker's processing list back onto the queue.
+    
+    Requeued jobs are the next ones claimed by any worker.
+    
+    Args:
+        payloads: Raw queue payloads to requeue
+    """
+    for payload in payloads:
+        try:
+            await requeue_job(WORKER_ID, payload)
+            logger.warning("Requeued in-flight job", extra={"job_payload": payload[:200]})
+        except Exception as e:
+            # Left in the processing list; the reaper requeues it once our lease expires
+            logger.error("Failed to requeue in-flight job", exc_info=e, extra={"job_payload": payload[:200]})
+
+
+async def drain_in_flight(timeout: float) -> None:
+    """
+    Wait for in-flight jobs to finish, then cancel and requeue the rest.
+    
+    Args:
+        timeout: Seconds to wait before cancelling remaining jobs
+    """
+    if not in_flight:
+        return
     
-    # Log when acquiring semaphore
-    available_slots = semaphore._value
     logger.info(
-        "Acquiring semaphore for job",
-        extra={"job_id": job_id, "available_slots": available_slots}
+        "Draining in-flight jobs",
+        extra={"in_flight": len(in_flight), "timeout_seconds": timeout}
     )
+    _, pending = await asyncio.wait(list(in_flight.keys()), timeout=timeout)
+    if not pending:
+        return
     
-    async with semaphore:
+    payloads = [in_flight[task] for task in pending if task in in_flight]
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+    await requeue_payloads(payloads)
+
+
+async def report_utilization(interval: float = UTILIZATION_REPORT_INTERVAL) -> None:
+    """
+    Periodically log slot utilization and publish it to Redis.
+    
+    Args:
+        interval: Seconds between reports
+    """
+    stats_key = f"{QUEUE_NAME}:worker:{WORKER_ID}"
+    while True:
+        await asyncio.sleep(interval)
+        stats = get_slot_utilization()
+        logger.info("Worker slot utilization", extra=stats)
         try:
-            logger.info(
-                "Processing job (semaphore acquired)",
-                extra={"job_id": job_id}
-            )
-            await process_job(job_data)
-            logger.info(
-                "Job completed (semaphore released)",
-                extra={"job_id": job_id}
-            )
+            await redis_client.client.set(stats_key, json.dumps(stats).encode("utf-8"), ex=int(interval * 3))
         except Exception as e:
-            logger.error(
-                "Job failed (semaphore released)",
-                exc_info=e,
-                extra={"job_id": job_id}
-            )
-            raise
+            logger.warning("Failed to publish worker utilization", extra={"error": str(e)})
+
+
+async def maintain_queue(interval: float = LEASE_HEARTBEAT_INTERVAL) -> None:
+    """
+    Keep this worker's lease alive and recover jobs from dead workers.
+    
+    Every worker runs the reaper and delayed-retry promoter; both are atomic
+    Redis scripts, so running them on several workers is safe.
+    
+    Args:
+        interval: Seconds between heartbeats
+    """
+    while True:
+        try:
+            job_ids = [slot["job_id"] for slot in slots if slot["job_id"] is not None]
+            await heartbeat_lease(WORKER_ID, job_ids)
+            await reap_expired_leases()
+            await promote_delayed_jobs()
+        except Exception as e:
+            logger.warning("Queue maintenance failed", extra={"error": str(e)})
+        await asyncio.sleep(interval)
+
+
+def _get_queue_wait_seconds(job_data: dict) -> Optional[float]:
+    """
+    Get how long a job waited in the queue, from its created_at timestamp.
+    
+    Args:
+        job_data: Parsed job data dictionary
+        
+    Returns:
+        Wait time in seconds, or None if created_at is missing or invalid
+    """
+    try:
+        created_at = datetime.fromisoformat(job_data["created_at"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    return round((datetime.utcnow() - created_at).total_seconds(), 2)
 
 
 async def worker_loop():
     """
     Main worker loop that processes jobs from the queue.
     
-    This is a simplified implementation using Redis list as queue.
-    In production, this would use BullMQ or a similar queue system.
+    A job is only popped from Redis once an execution slot is free, and each
+    popped job runs as its own task so up to MAX_CONCURRENT_JOBS pipelines run
+    in parallel. The loop exits when shutdown_event is set.
     """
-    logger.info("Worker started", extra={"queue_name": QUEUE_NAME})
-    
-    queue_key = f"{QUEUE_NAME}:queue"
-    processing_key = f"{QUEUE_NAME}:processing"
+    logger.info(
+        "Worker started",
+        extra={"queue_name": QUEUE_NAME, "worker_id": WORKER_ID, "max_concurrent_jobs": MAX_CONCURRENT_JOBS}
+    )
     
     while True:
         try:
-            # Pop job from queue (blocking with timeout)
-            logger.info(f"Waiting for job from queue: {queue_key} (timeout=5s)")
+            # Wait for a free slot before claiming so queued jobs stay visible to other workers
+            if not await _acquire_slot():
+                logger.info("Worker loop stopping (shutdown requested)")
+                break
+            
+            # Only interactive jobs may take the last reserved slot(s)
+            priority_classes = None
+            if semaphore._value < RESERVED_INTERACTIVE_SLOTS:
+                priority_classes = [PRIORITY_INTERACTIVE]
+            
+            # Atomically move the next scheduled job into our processing list (blocking with timeout)
             try:
-                job_json = await redis_client.client.brpop(queue_key, timeout=5)
+                job_payload = await claim_job(WORKER_ID, timeout=5, priority_classes=priority_classes)
             except Exception as e:
-                logger.error(f"Error during brpop: {e}", exc_info=e)
+                semaphore.release()
+                logger.error(f"Error claiming job: {e}", exc_info=e)
                 await asyncio.sleep(5)
                 continue
             
-            if job_json:
-                logger.info(f"Job popped from queue: {queue_key}")
-                # job_json is a tuple: (queue_key, job_data)
-                job_data_str = job_json[1]
-                try:
-                    job_data = json.loads(job_data_str)
-                except json.JSONDecodeError as e:
-                    logger.error(f"Failed to parse job data JSON: {e}", extra={"job_data_str": job_data_str[:200]})
-                    continue
-                
-                job_id = job_data.get("job_id")
-                logger.info(
-                    f"Parsed job data for job {job_id}",
-                    extra={
-                        "job_id": job_id,
-                        "has_audio_url": bool(job_data.get("audio_url")),
-                        "has_user_prompt": bool(job_data.get("user_prompt")),
-                        "stop_at_stage": job_data.get("stop_at_stage")
-                    }
-                )
-                
-                # Publish message that worker picked up the job
-                from api_gateway.services.event_publisher import publish_event
+            if not job_payload:
+                semaphore.release()
+                continue
+            
+            if shutdown_event.is_set():
+                # Popped while shutting down - hand it back to the queue
+                semaphore.release()
+                await requeue_payloads([job_payload])
+                break
+            
+            try:
+                job_data = json.loads(job_payload)
+            except json.JSONDecodeError as e:
+                semaphore.release()
+                logger.error(f"Failed to parse job data JSON: {e}", extra={"job_data_str": job_payload[:200]})
+                await ack_job(WORKER_ID, job_payload)  # Drop unparseable payloads
+                continue
+            
+            job_id = job_data.get("job_id")
+            logger.info(
+                f"Parsed job data for job {job_id}",
+                extra={
+                    "job_id": job_id,
+                    "priority_class": get_priority_class(job_data),
+                    "queue_wait_seconds": _get_queue_wait_seconds(job_data),
+                    "has_audio_url": bool(job_data.get("audio_url")),
+                    "has_user_prompt": bool(job_data.get("user_prompt")),
+                    "stop_at_stage": job_data.get("stop_at_stage")
+                }
+            )
+            
+            # Publish message that worker picked up the job
+            from api_gateway.services.event_publisher import publish_event
+            try:
                 await publish_event(job_id, "message", {
                     "text": "Worker picked up job, starting pipeline...",
                     "stage": "queue"
                 })
-                
-                # Move to processing set
-                await redis_client.client.sadd(processing_key, job_id)
-                
-                try:
-                    # Process job with concurrency limit
-                    await process_job_with_limit(job_data)
-                finally:
-                    # Remove from processing set
-                    await redis_client.client.srem(processing_key, job_id)
-                    
-                    # Remove job data
-                    job_data_key = f"{QUEUE_NAME}:job:{job_id}"
-                    await redis_client.client.delete(job_data_key)
+            except Exception as e:
+                logger.warning("Failed to publish pickup event", extra={"job_id": job_id, "error": str(e)})
+            
+            dispatch_job(job_data, job_payload)
             
         except asyncio.CancelledError:
             logger.info("Worker loop cancelled")
-            break
+            raise
         except Exception as e:
-            logger.error("Error in worker loop", exc_info=e, extra={"queue_key": queue_key})
+            logger.error("Error in worker loop", exc_info=e, extra={"queue_name": QUEUE_NAME})
             await asyncio.sleep(5)  # Wait before retrying
 
 
+def request_shutdown(sig: Optional[signal.Signals] = None) -> None:
+    """
+    Stop pulling new jobs; in-flight jobs are drained by main().
+    
+    Args:
+        sig: Signal that triggered shutdown (for logging)
+    """
+    if not shutdown_event.is_set():
+        logger.info("Shutdown requested", extra={"signal": sig.name if sig else None})
+        shutdown_event.set()
+
+
 async def main():
     """Main entry point for worker."""
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(sig, request_shutdown, sig)
+        except NotImplementedError:
+            pass  # Signal handlers not supported (e.g. Windows)
+    
+    # Jobs still in the pre-lane queue list would otherwise never be claimed
     try:
-        await worker_loop()
-    except KeyboardInterrupt:
-        logger.info("Worker stopped by user")
+        await migrate_legacy_queue()
     except Exception as e:
-        logger.error("Worker crashed", exc_info=e)
-        raise
+        logger.error("Failed to migrate legacy queue", exc_info=e, extra={"queue_name": QUEUE_NAME})
+    
+    reporter = asyncio.create_task(report_utilization())
+    maintenance = asyncio.create_task(maintain_queue())
+    try:
+        await worker_loop()
+        await drain_in_flight(DRAIN_TIMEOUT_SECONDS)
+        await release_lease(WORKER_ID)
+        logger.info("Worker stopped gracefully")
+    except BaseException as e:
+        # Crash or hard cancel: don't lose jobs that were mid-pipeline
+        logger.error("Worker crashed, requeueing in-flight jobs", exc_info=e)
+        tasks = list(in_flight.keys())
+        payloads = list(in_flight.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await requeue_payloads(payloads)
+        if not isinstance(e, (KeyboardInterrupt, asyncio.CancelledError)):
+            raise
+    finally:
+        reporter.cancel()
+        maintenance.cancel()
 
 
 if __name__ == "__main__":
@@ -17,74 +17,87 @@ from datetime import datetime
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-from shared.redis_client import RedisClient
 from shared.logging import get_logger
 from shared.config import settings
+from api_gateway.services.queue_service import get_queue_contents, clear_queue
 
 logger = get_logger(__name__)
-redis_client = RedisClient()
+
+
+def _describe_job(index: int, job_json: bytes, note: str = None) -> None:
+    """Print one queued job."""
+    try:
+        job_data = json.loads(job_json)
+        job_id = job_data.get('job_id', 'unknown')
+        created_at = job_data.get('created_at', 'unknown')
+        stop_at_stage = job_data.get('stop_at_stage')
+        
+        # Parse created_at to show age
+        age_str = "unknown"
+        if created_at != "unknown":
+            try:
+                created_dt = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
+                age = datetime.now(created_dt.tzinfo) - created_dt
+                age_str = f"{age.total_seconds():.0f} seconds ago"
+            except:
+                age_str = created_at
+        
+        print(f"  [{index}] Job ID: {job_id} ({job_data.get('job_type', 'generation')})")
+        print(f"      Created: {created_at} ({age_str})")
+        if stop_at_stage:
+            print(f"      Stop at stage: {stop_at_stage}")
+        if note:
+            print(f"      {note}")
+        print()
+        
+    except Exception as e:
+        print(f"  [{index}] ⚠️  Invalid job data: {str(e)[:100]}")
+        print()
 
 
 async def check_queue(clear: bool = False):
     """Check and optionally clear the queue."""
     # Use environment-aware queue name
     queue_name = settings.queue_name
-    queue_key = f"{queue_name}:queue"
     
     try:
-        length = await redis_client.client.llen(queue_key)
+        contents = await get_queue_contents()
+        ready = [(job, "Lane: recovery") for job in contents["recovery"]]
+        # Left over from the single-list queue; moved onto the lanes when a worker starts
+        ready.extend((job, "Legacy queue (migrated on worker startup)") for job in contents["legacy"])
+        for priority_class, users in contents["lanes"].items():
+            for user_id, jobs in users.items():
+                ready.extend((job, f"Lane: {priority_class} (user {user_id})") for job in jobs)
+        delayed = contents["delayed"]
+        length = len(ready) + len(delayed)
+        
         print(f"\n{'='*60}")
-        print(f"Queue Status: {length} job(s) in queue")
+        print(f"Queue Status ({queue_name}): {len(ready)} ready, {len(delayed)} waiting to retry")
         print(f"{'='*60}\n")
         
         if length == 0:
             print("✅ Queue is empty - no jobs to process")
             return
         
-        # Get all jobs
-        jobs = await redis_client.client.lrange(queue_key, 0, -1)
-        
-        print(f"Found {len(jobs)} job(s):\n")
-        for i, job_json in enumerate(jobs, 1):
-            try:
-                job_data = json.loads(job_json)
-                job_id = job_data.get('job_id', 'unknown')
-                created_at = job_data.get('created_at', 'unknown')
-                stop_at_stage = job_data.get('stop_at_stage')
-                
-                # Parse created_at to show age
-                age_str = "unknown"
-                if created_at != "unknown":
-                    try:
-                        created_dt = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-                        age = datetime.now(created_dt.tzinfo) - created_dt
-                        age_str = f"{age.total_seconds():.0f} seconds ago"
-                    except:
-                        age_str = created_at
-                
-                print(f"  [{i}] Job ID: {job_id}")
-                print(f"      Created: {created_at} ({age_str})")
-                if stop_at_stage:
-                    print(f"      Stop at stage: {stop_at_stage}")
-                print()
-                
-            except Exception as e:
-                print(f"  [{i}] ⚠️  Invalid job data: {str(e)[:100]}")
-                print()
+        print(f"Found {length} job(s):\n")
+        for i, (job_json, note) in enumerate(ready, 1):
+            _describe_job(i, job_json, note)
+        for i, (job_json, ready_at) in enumerate(delayed, len(ready) + 1):
+            retry_at = datetime.fromtimestamp(ready_at).isoformat(timespec="seconds")
+            _describe_job(i, job_json, f"Retry scheduled: {retry_at}")
         
         if clear:
             print(f"\n{'='*60}")
             print("⚠️  CLEARING QUEUE...")
             print(f"{'='*60}\n")
             
-            cleared = await redis_client.client.delete(queue_key)
+            cleared = await clear_queue()
             if cleared:
-                print(f"✅ Cleared {length} job(s) from queue")
+                print(f"✅ Cleared {cleared} job(s) from queue")
             else:
                 print("⚠️  Queue was already empty or couldn't be cleared")
         else:
             print(f"\n💡 To clear the queue, run: python check_queue.py --clear")
-            print(f"   Or manually: redis-cli DEL video_generation:queue")
         
     except Exception as e:
         print(f"❌ Error checking queue: {e}")
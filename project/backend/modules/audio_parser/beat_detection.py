@@ -6,19 +6,25 @@ Extract BPM and precise beat timestamps using Librosa.
 
 import librosa
 import numpy as np
-from typing import Tuple, List
+from typing import Tuple, List, Optional
 from shared.logging import get_logger
+from modules.audio_parser.features import SpectralFeatures
 
 logger = get_logger("audio_parser")
 
 
-def detect_beats(audio: np.ndarray, sr: int = 22050) -> Tuple[float, List[float], float]:
+def detect_beats(
+    audio: np.ndarray,
+    sr: int = 22050,
+    features: Optional[SpectralFeatures] = None
+) -> Tuple[float, List[float], float]:
     """
     Detect beats in audio using Librosa.
     
     Args:
         audio: Audio signal (numpy array)
         sr: Sample rate (default: 22050)
+        features: Precomputed spectral features (reuses the onset envelope)
         
     Returns:
         (bpm, beat_timestamps, confidence)
@@ -27,7 +33,12 @@ def detect_beats(audio: np.ndarray, sr: int = 22050) -> Tuple[float, List[float]
     
     try:
         # Extract tempo and beats
-        tempo, beats = librosa.beat.beat_track(y=audio, sr=sr)
+        if features is not None:
+            tempo, beats = librosa.beat.beat_track(
+                onset_envelope=features.onset_envelope, sr=sr, hop_length=features.hop_length
+            )
+        else:
+            tempo, beats = librosa.beat.beat_track(y=audio, sr=sr)
         
         # Convert tempo to scalar (librosa may return numpy array)
         # Use .item() to extract scalar from numpy array to avoid deprecation warning
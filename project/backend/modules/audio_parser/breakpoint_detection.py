@@ -5,10 +5,10 @@ Detects logical audio breakpoints from lyrics, energy, silence, and harmonic cha
 """
 
 import numpy as np
-import librosa
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from shared.models.audio import Breakpoint, Lyric, SongStructure
 from shared.logging import get_logger
+from modules.audio_parser.features import SpectralFeatures, get_segment_features
 
 logger = get_logger("audio_parser")
 
@@ -87,7 +87,8 @@ def detect_energy_breakpoints(
     sr: int,
     segment_start: float,
     segment_end: float,
-    hop_length: int = 512
+    hop_length: int = 512,
+    features: Optional[SpectralFeatures] = None
 ) -> List[Breakpoint]:
     """
     Detect breakpoints from energy transitions.
@@ -100,27 +101,18 @@ def detect_energy_breakpoints(
         segment_start: Segment start time in seconds
         segment_end: Segment end time in seconds
         hop_length: Hop length for feature extraction
+        features: Precomputed full-track spectral features (sliced to the segment)
         
     Returns:
         List of Breakpoint objects
     """
-    # Extract segment audio
-    start_frame = int(segment_start * sr)
-    end_frame = int(segment_end * sr)
-    if end_frame > len(audio):
-        end_frame = len(audio)
-    if start_frame >= end_frame:
+    # Slice segment features (absolute frame times)
+    segment_features = get_segment_features(audio, sr, segment_start, segment_end, features, hop_length)
+    if segment_features is None:
         return []
     
-    segment_audio = audio[start_frame:end_frame]
-    
-    if len(segment_audio) == 0:
-        return []
-    
-    # Compute RMS energy
-    rms = librosa.feature.rms(y=segment_audio, hop_length=hop_length)[0]
-    times = librosa.frames_to_time(np.arange(len(rms)), sr=sr, hop_length=hop_length)
-    times = times + segment_start  # Convert to absolute time
+    rms = segment_features.rms
+    times = segment_features.times
     
     if len(rms) < 3:
         return []
@@ -184,7 +176,7 @@ def detect_energy_breakpoints(
             ))
     
     # Detect significant energy transitions (>30% change over 1s window)
-    window_frames = int(1.0 * sr / hop_length)  # 1 second window
+    window_frames = int(1.0 * sr / segment_features.hop_length)  # 1 second window
     for i in range(len(rms_norm) - window_frames):
         energy_start = rms_norm[i]
         energy_end = rms_norm[i + window_frames]
@@ -215,7 +207,8 @@ def detect_silence_breakpoints(
     sr: int,
     segment_start: float,
     segment_end: float,
-    hop_length: int = 512
+    hop_length: int = 512,
+    features: Optional[SpectralFeatures] = None
 ) -> List[Breakpoint]:
     """
     Detect breakpoints from silence/pause regions.
@@ -228,27 +221,18 @@ def detect_silence_breakpoints(
         segment_start: Segment start time in seconds
         segment_end: Segment end time in seconds
         hop_length: Hop length for feature extraction
+        features: Precomputed full-track spectral features (sliced to the segment)
         
     Returns:
         List of Breakpoint objects
     """
-    # Extract segment audio
-    start_frame = int(segment_start * sr)
-    end_frame = int(segment_end * sr)
-    if end_frame > len(audio):
-        end_frame = len(audio)
-    if start_frame >= end_frame:
+    # Slice segment features (absolute frame times)
+    segment_features = get_segment_features(audio, sr, segment_start, segment_end, features, hop_length)
+    if segment_features is None:
         return []
     
-    segment_audio = audio[start_frame:end_frame]
-    
-    if len(segment_audio) == 0:
-        return []
-    
-    # Compute RMS energy
-    rms = librosa.feature.rms(y=segment_audio, hop_length=hop_length)[0]
-    times = librosa.frames_to_time(np.arange(len(rms)), sr=sr, hop_length=hop_length)
-    times = times + segment_start  # Convert to absolute time
+    rms = segment_features.rms
+    times = segment_features.times
     
     if len(rms) == 0:
         return []
@@ -330,7 +314,8 @@ def detect_harmonic_breakpoints(
     segment_start: float,
     segment_end: float,
     structure_segments: List[SongStructure],
-    hop_length: int = 512
+    hop_length: int = 512,
+    features: Optional[SpectralFeatures] = None
 ) -> List[Breakpoint]:
     """
     Detect breakpoints from harmonic/chroma changes.
@@ -344,6 +329,7 @@ def detect_harmonic_breakpoints(
         segment_end: Segment end time in seconds
         structure_segments: List of song structure segments
         hop_length: Hop length for feature extraction
+        features: Precomputed full-track spectral features (sliced to the segment)
         
     Returns:
         List of Breakpoint objects
@@ -374,22 +360,12 @@ def detect_harmonic_breakpoints(
                 ))
     
     # Detect chroma changes within segment
-    start_frame = int(segment_start * sr)
-    end_frame = int(segment_end * sr)
-    if end_frame > len(audio):
-        end_frame = len(audio)
-    if start_frame >= end_frame:
-        return breakpoints
-    
-    segment_audio = audio[start_frame:end_frame]
-    
-    if len(segment_audio) < hop_length * 2:
+    segment_features = get_segment_features(audio, sr, segment_start, segment_end, features, hop_length)
+    if segment_features is None:
         return breakpoints
     
-    # Extract chroma features
-    chroma = librosa.feature.chroma_stft(y=segment_audio, sr=sr, hop_length=hop_length)
-    times = librosa.frames_to_time(np.arange(chroma.shape[1]), sr=sr, hop_length=hop_length)
-    times = times + segment_start  # Convert to absolute time
+    chroma = segment_features.chroma
+    times = segment_features.times
     
     if chroma.shape[1] < 3:
         return breakpoints
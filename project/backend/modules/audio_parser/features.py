@@ -0,0 +1,165 @@
+"""
+Shared spectral feature extraction.
+
+Computes every STFT-derived feature the audio parser needs in a single pass,
+so beat detection, structure analysis, breakpoint detection and mood
+classification slice one bundle instead of recomputing features per segment.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+import librosa
+import numpy as np
+
+from shared.logging import get_logger
+
+logger = get_logger("audio_parser")
+
+HOP_LENGTH = 512
+N_FFT = 2048
+
+
+@dataclass
+class SpectralFeatures:
+    """
+    Frame-aligned spectral features for a signal (or a slice of one).
+
+    All arrays share the same frame grid: frame i is centred at
+    start_time + i * hop_length / sr seconds.
+    """
+    sr: int
+    hop_length: int
+    rms: np.ndarray  # (n_frames,)
+    centroid: np.ndarray  # (n_frames,)
+    rolloff: np.ndarray  # (n_frames,)
+    chroma: np.ndarray  # (12, n_frames)
+    onset_envelope: np.ndarray  # (n_frames,)
+    start_time: float = 0.0
+
+    @property
+    def n_frames(self) -> int:
+        return len(self.rms)
+
+    @property
+    def times(self) -> np.ndarray:
+        """Absolute time in seconds of each frame."""
+        return self.start_time + np.arange(self.n_frames) * self.hop_length / self.sr
+
+    def segment(self, start: float, end: float) -> "SpectralFeatures":
+        """
+        Slice the features to frames centred within [start, end].
+
+        Slicing is a view, so segments cost nothing beyond index arithmetic.
+
+        Args:
+            start: Segment start time in seconds (absolute)
+            end: Segment end time in seconds (absolute)
+
+        Returns:
+            SpectralFeatures for the segment (may have zero frames)
+        """
+        frames_per_second = self.sr / self.hop_length
+        first = max(0, int(np.ceil((start - self.start_time) * frames_per_second - 1e-9)))
+        last = min(self.n_frames, int(np.floor((end - self.start_time) * frames_per_second + 1e-9)) + 1)
+        last = max(first, last)
+        return SpectralFeatures(
+            sr=self.sr,
+            hop_length=self.hop_length,
+            rms=self.rms[first:last],
+            centroid=self.centroid[first:last],
+            rolloff=self.rolloff[first:last],
+            chroma=self.chroma[:, first:last],
+            onset_envelope=self.onset_envelope[first:last],
+            start_time=self.start_time + first / frames_per_second
+        )
+
+
+def compute_spectral_features(
+    y: np.ndarray,
+    sr: int,
+    hop_length: int = HOP_LENGTH,
+    n_fft: int = N_FFT,
+    start_time: float = 0.0
+) -> SpectralFeatures:
+    """
+    Compute the shared feature bundle from one STFT.
+
+    Centroid, rolloff, chroma and the onset envelope are all derived from the
+    same magnitude spectrogram and match librosa's defaults for y-based calls.
+    RMS is computed from time-domain frames on the same grid, which keeps the
+    absolute scale the energy thresholds were calibrated against.
+
+    Args:
+        y: Audio signal array
+        sr: Sample rate
+        hop_length: Hop length in samples
+        n_fft: FFT window size
+        start_time: Absolute time of the first sample (for segment-level calls)
+
+    Returns:
+        SpectralFeatures bundle
+    """
+    magnitude = np.abs(librosa.stft(y, n_fft=n_fft, hop_length=hop_length))
+    power = magnitude ** 2
+
+    rms = librosa.feature.rms(y=y, frame_length=n_fft, hop_length=hop_length)[0]
+    centroid = librosa.feature.spectral_centroid(S=magnitude, sr=sr, n_fft=n_fft, hop_length=hop_length)[0]
+    rolloff = librosa.feature.spectral_rolloff(S=magnitude, sr=sr, n_fft=n_fft, hop_length=hop_length)[0]
+    chroma = librosa.feature.chroma_stft(S=power, sr=sr, n_fft=n_fft, hop_length=hop_length)
+    mel_db = librosa.power_to_db(librosa.feature.melspectrogram(S=power, sr=sr))
+    onset_envelope = librosa.onset.onset_strength(S=mel_db, sr=sr, hop_length=hop_length)
+
+    logger.debug(
+        f"Computed spectral features: frames={magnitude.shape[1]}, "
+        f"hop_length={hop_length}, n_fft={n_fft}"
+    )
+
+    return SpectralFeatures(
+        sr=sr,
+        hop_length=hop_length,
+        rms=rms,
+        centroid=centroid,
+        rolloff=rolloff,
+        chroma=chroma,
+        onset_envelope=onset_envelope,
+        start_time=start_time
+    )
+
+
+def get_segment_features(
+    audio: np.ndarray,
+    sr: int,
+    segment_start: float,
+    segment_end: float,
+    features: Optional[SpectralFeatures] = None,
+    hop_length: int = HOP_LENGTH
+) -> Optional[SpectralFeatures]:
+    """
+    Get features for a segment, slicing the shared bundle when available.
+
+    Without a bundle (e.g. a detector called on its own), features are
+    computed from the segment audio only.
+
+    Args:
+        audio: Full audio signal array
+        sr: Sample rate
+        segment_start: Segment start time in seconds
+        segment_end: Segment end time in seconds
+        features: Precomputed full-track features (optional)
+        hop_length: Hop length used when computing features
+
+    Returns:
+        SpectralFeatures for the segment, or None if the segment has no audio
+    """
+    if features is not None:
+        return features.segment(segment_start, segment_end)
+
+    start_idx = int(segment_start * sr)
+    end_idx = min(int(segment_end * sr), len(audio))
+    if start_idx >= end_idx:
+        return None
+
+    return compute_spectral_features(
+        audio[start_idx:end_idx], sr, hop_length=hop_length, start_time=segment_start
+    )
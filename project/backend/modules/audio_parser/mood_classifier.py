@@ -4,11 +4,11 @@ Mood classification component.
 Rule-based mood classification using BPM, energy, and spectral features.
 """
 
-import librosa
 import numpy as np
-from typing import List
+from typing import List, Optional
 from shared.models.audio import Mood, SongStructure, EnergyLevel
 from shared.logging import get_logger
+from modules.audio_parser.features import SpectralFeatures, compute_spectral_features
 
 logger = get_logger("audio_parser")
 
@@ -17,7 +17,8 @@ def classify_mood(
     audio: np.ndarray,
     sr: int,
     bpm: float,
-    song_structure: List[SongStructure]
+    song_structure: List[SongStructure],
+    features: Optional[SpectralFeatures] = None
 ) -> Mood:
     """
     Classify mood using rule-based approach.
@@ -27,6 +28,7 @@ def classify_mood(
         sr: Sample rate
         bpm: Beats per minute
         song_structure: List of song structure segments with energy
+        features: Precomputed full-track spectral features (computed if omitted)
         
     Returns:
         Mood object with primary, secondary, energy_level, confidence
@@ -36,17 +38,17 @@ def classify_mood(
         # Energy: Mean energy from structure analysis segments
         energy_mean = np.mean([_energy_to_float(seg.energy) for seg in song_structure]) if song_structure else 0.5
         
+        if features is None:
+            features = compute_spectral_features(audio, sr)
+        
         # Spectral Centroid: Mean frequency (brightness indicator)
-        spectral_centroid = librosa.feature.spectral_centroid(y=audio, sr=sr)[0]
-        centroid_mean = np.mean(spectral_centroid)
+        centroid_mean = np.mean(features.centroid)
         
         # Spectral Rolloff: Frequency below which 85% of energy is contained
-        spectral_rolloff = librosa.feature.spectral_rolloff(y=audio, sr=sr)[0]
-        rolloff_mean = np.mean(spectral_rolloff)
+        rolloff_mean = np.mean(features.rolloff)
         
         # Chroma variance (for complexity)
-        chroma = librosa.feature.chroma(y=audio, sr=sr)
-        chroma_variance = np.var(chroma)
+        chroma_variance = np.var(features.chroma)
         
         logger.debug(
             f"Mood features: BPM={bpm:.1f}, energy={energy_mean:.2f}, "
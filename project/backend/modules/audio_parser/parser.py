@@ -4,14 +4,20 @@ Core audio parser orchestration.
 Coordinates all audio analysis components.
 """
 
+import asyncio
 import librosa
-import io
 import math
+from dataclasses import dataclass, field
 from uuid import UUID
-from typing import List, Tuple
-from shared.models.audio import AudioAnalysis, ClipBoundary, SongStructure
-from shared.logging import get_logger
+from typing import Any, Dict, List, Tuple
 
+import numpy as np
+
+from shared.models.audio import AudioAnalysis, ClipBoundary, Lyric, Mood, SongStructure
+from shared.logging import get_logger, set_job_id
+
+from modules.audio_parser.features import SpectralFeatures, compute_spectral_features
+from modules.audio_parser.process_pool import SharedAudioBuffer, open_shared_audio, run_in_process_pool
 from modules.audio_parser.beat_detection import detect_beats, detect_beat_subdivisions, classify_beat_strength
 from modules.audio_parser.structure_analysis import analyze_structure, analyze_segment_appropriateness
 from modules.audio_parser.mood_classifier import classify_mood
@@ -21,6 +27,7 @@ from modules.audio_parser.boundaries import (
     validate_boundaries
 )
 from modules.audio_parser.lyrics_extraction import extract_lyrics
+from modules.audio_parser.utils import probe_audio_duration
 from modules.audio_parser.breakpoint_detection import (
     detect_lyrics_breakpoints,
     detect_energy_breakpoints,
@@ -31,6 +38,9 @@ from modules.audio_parser.breakpoint_detection import (
 
 logger = get_logger("audio_parser")
 
+# Stage 2 detectors read the shared feature bundle, never raw samples
+_NO_SAMPLES = np.empty(0, dtype=np.float32)
+
 
 def ensure_full_coverage(
     clip_boundaries: List[ClipBoundary],
@@ -202,319 +212,450 @@ def ensure_full_coverage(
     return fixed_boundaries, fixes_applied
 
 
-async def parse_audio(audio_bytes: bytes, job_id: UUID) -> AudioAnalysis:
+@dataclass
+class RhythmAnalysis:
+    """Stage 1 results: everything that depends only on the decoded audio."""
+    sr: int
+    duration: float
+    features: SpectralFeatures
+    bpm: float
+    beat_timestamps: List[float]
+    beat_confidence: float
+    subdivisions: Dict[str, List[float]]
+    beat_strength: List[str]
+    song_structure: List[SongStructure]
+    structure_fallback: bool
+    merged_segments: List[SongStructure]
+    mood: Mood
+    fallbacks_used: List[str] = field(default_factory=list)
+
+
+@dataclass
+class BoundaryAnalysis:
+    """Stage 2 results: breakpoints and clip boundaries (needs lyrics)."""
+    clip_boundaries: List[ClipBoundary]
+    breakpoint_stats: Dict[str, int]
+    segment_analyses: Dict[Tuple[float, float], Dict[str, Any]]
+    coverage_fixes_count: int
+
+
+def analyze_rhythm_and_structure(buffer_name: str, buffer_size: int, job_id: UUID) -> RhythmAnalysis:
     """
-    Parse audio file and extract all analysis data.
+    Decode audio and run beat, structure and mood analysis (process pool stage 1).
     
     Args:
-        audio_bytes: Audio file bytes
-        job_id: Job ID for tracking
+        buffer_name: SharedAudioBuffer name holding the encoded audio file
+        buffer_size: Number of valid bytes in the buffer
+        job_id: Job ID for log context
         
     Returns:
-        AudioAnalysis object with all analysis results
+        RhythmAnalysis with the shared spectral features and merged segments
     """
+    set_job_id(job_id)
     fallbacks_used = []
     
-    try:
-        # Load audio
-        audio, sr = librosa.load(io.BytesIO(audio_bytes), sr=22050)
-        duration = len(audio) / sr
-        
-        logger.info(f"Loaded audio: duration={duration:.2f}s, sample_rate={sr}Hz, samples={len(audio)}")
-        
-        # 1. Beat Detection
-        bpm, beat_timestamps, beat_confidence = detect_beats(audio, sr)
-        if beat_confidence < 0.6:
-            fallbacks_used.append("beat_detection")
-        logger.info(f"Beat detection: BPM={bpm:.1f}, beats={len(beat_timestamps)}, confidence={beat_confidence:.2f}")
-        
-        # 1a. Beat Subdivisions (eighth and sixteenth notes)
-        subdivisions = detect_beat_subdivisions(beat_timestamps, bpm, duration)
-        logger.info(f"Beat subdivisions: {len(subdivisions['eighth_notes'])} eighth, {len(subdivisions['sixteenth_notes'])} sixteenth notes")
-        
-        # 1b. Beat Strength Classification (downbeat/upbeat)
-        beat_strength = classify_beat_strength(beat_timestamps, audio, sr, bpm)
-        downbeat_count = sum(1 for s in beat_strength if s == "downbeat")
-        logger.info(f"Beat strength: {downbeat_count} downbeats, {len(beat_strength) - downbeat_count} upbeats")
+    # Load audio (decoded from shared memory, never pickled)
+    with open_shared_audio(buffer_name, buffer_size) as audio_file:
+        audio, sr = librosa.load(audio_file, sr=22050)
+    duration = len(audio) / sr
+    
+    logger.info(f"Loaded audio: duration={duration:.2f}s, sample_rate={sr}Hz, samples={len(audio)}")
+    
+    # 0. Shared spectral features (one STFT, sliced by every detector below)
+    features = compute_spectral_features(audio, sr)
+    
+    # 1. Beat Detection
+    bpm, beat_timestamps, beat_confidence = detect_beats(audio, sr, features)
+    if beat_confidence < 0.6:
+        fallbacks_used.append("beat_detection")
+    logger.info(f"Beat detection: BPM={bpm:.1f}, beats={len(beat_timestamps)}, confidence={beat_confidence:.2f}")
+    
+    # 1a. Beat Subdivisions (eighth and sixteenth notes)
+    subdivisions = detect_beat_subdivisions(beat_timestamps, bpm, duration)
+    logger.info(f"Beat subdivisions: {len(subdivisions['eighth_notes'])} eighth, {len(subdivisions['sixteenth_notes'])} sixteenth notes")
+    
+    # 1b. Beat Strength Classification (downbeat/upbeat)
+    beat_strength = classify_beat_strength(beat_timestamps, audio, sr, bpm)
+    downbeat_count = sum(1 for s in beat_strength if s == "downbeat")
+    logger.info(f"Beat strength: {downbeat_count} downbeats, {len(beat_strength) - downbeat_count} upbeats")
 
-        # 2. Structure Analysis (FIRST - to determine segment types and intensities)
-        structure_result = analyze_structure(audio, sr, beat_timestamps, duration)
-        if isinstance(structure_result, tuple):
-            song_structure, structure_fallback = structure_result
-        else:
-            # Handle case where it returns just the list (backward compatibility)
-            song_structure = structure_result
-            structure_fallback = False
+    # 2. Structure Analysis (FIRST - to determine segment types and intensities)
+    structure_result = analyze_structure(audio, sr, beat_timestamps, duration, features)
+    if isinstance(structure_result, tuple):
+        song_structure, structure_fallback = structure_result
+    else:
+        # Handle case where it returns just the list (backward compatibility)
+        song_structure = structure_result
+        structure_fallback = False
 
-        if structure_fallback:
-            fallbacks_used.append("structure_analysis")
-        logger.info(f"Structure analysis: {len(song_structure)} segments detected")
+    if structure_fallback:
+        fallbacks_used.append("structure_analysis")
+    logger.info(f"Structure analysis: {len(song_structure)} segments detected")
 
-        # 3. Clip Boundaries (generate AFTER structure, using segment-specific parameters)
-        # Generate boundaries for each structure segment with content-based durations
+    # 3. Clip Boundaries (generate AFTER structure, using segment-specific parameters)
+    # Generate boundaries for each structure segment with content-based durations
 
-        # PHASE 2.4: Preprocess segments to merge very short ones (<4s) with adjacent segments
-        # This ensures we don't lose audio and don't create clips < 4s (production quality minimum)
-        MIN_SEGMENT_DURATION = 4.0  # Production quality minimum
-        merged_segments = []
-        i = 0
-        while i < len(song_structure):
-            segment = song_structure[i]
-            segment_duration = segment.end - segment.start
+    # PHASE 2.4: Preprocess segments to merge very short ones (<4s) with adjacent segments
+    # This ensures we don't lose audio and don't create clips < 4s (production quality minimum)
+    MIN_SEGMENT_DURATION = 4.0  # Production quality minimum
+    merged_segments = []
+    i = 0
+    while i < len(song_structure):
+        segment = song_structure[i]
+        segment_duration = segment.end - segment.start
 
-            # If segment is too short, try to merge with next or previous
-            if segment_duration < MIN_SEGMENT_DURATION:
-                if i < len(song_structure) - 1:
-                    # Merge with next segment (prefer forward merge)
-                    next_segment = song_structure[i + 1]
-                    # Create merged segment using current segment's type (first segment dominates)
-                    merged = SongStructure(
-                        type=segment.type,
-                        start=segment.start,
-                        end=next_segment.end,
-                        energy=segment.energy,
-                        beat_intensity=segment.beat_intensity or next_segment.beat_intensity
-                    )
-                    merged_segments.append(merged)
-                    logger.info(f"Merged short segment {segment.type}({segment_duration:.1f}s) with next segment, new duration: {merged.end - merged.start:.1f}s")
-                    i += 2  # Skip next segment since we merged it
-                elif len(merged_segments) > 0:
-                    # Merge with previous segment (last segment, merge backward)
-                    prev_segment = merged_segments[-1]
-                    # Update previous segment to extend to current segment's end
-                    merged = SongStructure(
-                        type=prev_segment.type,
-                        start=prev_segment.start,
-                        end=segment.end,
-                        energy=prev_segment.energy,
-                        beat_intensity=prev_segment.beat_intensity or segment.beat_intensity
-                    )
-                    merged_segments[-1] = merged
-                    logger.info(f"Merged short segment {segment.type}({segment_duration:.1f}s) with previous segment, new duration: {merged.end - merged.start:.1f}s")
-                    i += 1
-                else:
-                    # Only one segment and it's short - keep it anyway
-                    merged_segments.append(segment)
-                    logger.warning(f"Single short segment {segment.type}({segment_duration:.1f}s), keeping as-is")
-                    i += 1
+        # If segment is too short, try to merge with next or previous
+        if segment_duration < MIN_SEGMENT_DURATION:
+            if i < len(song_structure) - 1:
+                # Merge with next segment (prefer forward merge)
+                next_segment = song_structure[i + 1]
+                # Create merged segment using current segment's type (first segment dominates)
+                merged = SongStructure(
+                    type=segment.type,
+                    start=segment.start,
+                    end=next_segment.end,
+                    energy=segment.energy,
+                    beat_intensity=segment.beat_intensity or next_segment.beat_intensity
+                )
+                merged_segments.append(merged)
+                logger.info(f"Merged short segment {segment.type}({segment_duration:.1f}s) with next segment, new duration: {merged.end - merged.start:.1f}s")
+                i += 2  # Skip next segment since we merged it
+            elif len(merged_segments) > 0:
+                # Merge with previous segment (last segment, merge backward)
+                prev_segment = merged_segments[-1]
+                # Update previous segment to extend to current segment's end
+                merged = SongStructure(
+                    type=prev_segment.type,
+                    start=prev_segment.start,
+                    end=segment.end,
+                    energy=prev_segment.energy,
+                    beat_intensity=prev_segment.beat_intensity or segment.beat_intensity
+                )
+                merged_segments[-1] = merged
+                logger.info(f"Merged short segment {segment.type}({segment_duration:.1f}s) with previous segment, new duration: {merged.end - merged.start:.1f}s")
+                i += 1
             else:
-                # Segment is long enough, keep as-is
+                # Only one segment and it's short - keep it anyway
                 merged_segments.append(segment)
+                logger.warning(f"Single short segment {segment.type}({segment_duration:.1f}s), keeping as-is")
                 i += 1
+        else:
+            # Segment is long enough, keep as-is
+            merged_segments.append(segment)
+            i += 1
 
-        logger.info(f"Segment preprocessing: {len(song_structure)} original segments → {len(merged_segments)} merged segments")
+    logger.info(f"Segment preprocessing: {len(song_structure)} original segments → {len(merged_segments)} merged segments")
 
-        # 4. Lyrics Extraction (needed for breakpoint detection)
-        lyrics = await extract_lyrics(audio_bytes, job_id, duration)
-        if len(lyrics) == 0:
-            # Check if this was a fallback (instrumental) or actual failure
-            # For now, empty lyrics is valid (instrumental tracks)
-            pass
+    # 6. Mood Classification (uses BPM, structure energy, spectral features)
+    mood = classify_mood(audio, sr, bpm, song_structure, features)
+    if mood.confidence < 0.3:
+        fallbacks_used.append("mood_classification")
+    logger.info(f"Mood classification: {mood.primary}, confidence={mood.confidence:.2f}")
+    
+    return RhythmAnalysis(
+        sr=sr,
+        duration=duration,
+        features=features,
+        bpm=bpm,
+        beat_timestamps=beat_timestamps,
+        beat_confidence=beat_confidence,
+        subdivisions=subdivisions,
+        beat_strength=beat_strength,
+        song_structure=song_structure,
+        structure_fallback=structure_fallback,
+        merged_segments=merged_segments,
+        mood=mood,
+        fallbacks_used=fallbacks_used
+    )
+
+
+def detect_clip_boundaries(rhythm: RhythmAnalysis, lyrics: List[Lyric], job_id: UUID) -> BoundaryAnalysis:
+    """
+    Detect breakpoints and generate clip boundaries (process pool stage 2).
+    
+    Every detector here slices rhythm.features, so the decoded samples from
+    stage 1 are not shipped back into the pool.
+    
+    Args:
+        rhythm: Stage 1 results
+        lyrics: Extracted lyrics (may be empty for instrumentals)
+        job_id: Job ID for log context
         
-        # Calculate average lyrics confidence
-        lyrics_confidence = 0.0
+    Returns:
+        BoundaryAnalysis with validated, full-coverage clip boundaries
+    """
+    set_job_id(job_id)
+    audio = _NO_SAMPLES
+    sr = rhythm.sr
+    duration = rhythm.duration
+    features = rhythm.features
+    bpm = rhythm.bpm
+    beat_timestamps = rhythm.beat_timestamps
+    song_structure = rhythm.song_structure
+    merged_segments = rhythm.merged_segments
+    
+    # 3a. Analyze long segments for appropriateness
+    LONG_SEGMENT_THRESHOLD = 20.0  # Segments >20s should be analyzed
+    segment_analyses = {}  # Key: (start, end) tuple, Value: analysis dict
+    
+    for segment in merged_segments:
+        segment_duration = segment.end - segment.start
+        if segment_duration > LONG_SEGMENT_THRESHOLD:
+            analysis = analyze_segment_appropriateness(
+                segment, audio, sr, beat_timestamps, lyrics, duration, features
+            )
+            # Use (start, end) tuple as key since SongStructure is not hashable
+            segment_key = (segment.start, segment.end)
+            segment_analyses[segment_key] = analysis
+            
+            if not analysis["is_appropriate"]:
+                logger.warning(
+                    f"Long segment [{segment.start:.1f}s - {segment.end:.1f}s] "
+                    f"({segment_duration:.1f}s) may be inappropriate: "
+                    f"confidence={analysis['confidence']:.2f}, "
+                    f"reasons={analysis['reasons'][:2]}"
+                )
+                
+                # If very inappropriate and very long, consider forcing subdivision
+                if analysis["recommendation"] == "force_subdivision":
+                    logger.warning(
+                        f"⚠️ FORCING SUBDIVISION for segment [{segment.start:.1f}s - {segment.end:.1f}s] "
+                        f"due to low appropriateness (confidence={analysis['confidence']:.2f})"
+                    )
+            else:
+                logger.info(
+                    f"Long segment [{segment.start:.1f}s - {segment.end:.1f}s] "
+                    f"({segment_duration:.1f}s) is appropriate: "
+                    f"confidence={analysis['confidence']:.2f}"
+                )
+    
+    # 5. Breakpoint Detection and Boundary Generation
+    # Detect breakpoints for each merged structure segment
+    clip_boundaries = []
+    breakpoint_stats = {
+        "total_detected": 0,
+        "lyrics": 0,
+        "energy": 0,
+        "silence": 0,
+        "harmonic": 0
+    }
+    
+    for segment in merged_segments:
+        # Extract beats within this segment and make them relative to segment start
+        segment_beats_absolute = [b for b in beat_timestamps if segment.start <= b <= segment.end]
+        segment_beats = [b - segment.start for b in segment_beats_absolute]  # Make relative
+        segment_duration = segment.end - segment.start
+        
+        # Detect breakpoints for this segment
+        segment_breakpoints = []
+        
+        # Lyrics breakpoints
         if lyrics:
-            lyrics_confidence = sum(
-                lyric.confidence or 0.5 for lyric in lyrics
-            ) / len(lyrics)
+            lyrics_bps = detect_lyrics_breakpoints(lyrics, segment.start, segment.end)
+            segment_breakpoints.extend(lyrics_bps)
+            breakpoint_stats["lyrics"] += len(lyrics_bps)
         
-        logger.info(
-            f"Lyrics extraction: {len(lyrics)} words, "
-            f"avg confidence={lyrics_confidence:.2f}"
+        # Energy breakpoints
+        energy_bps = detect_energy_breakpoints(audio, sr, segment.start, segment.end, features=features)
+        segment_breakpoints.extend(energy_bps)
+        breakpoint_stats["energy"] += len(energy_bps)
+        
+        # Silence breakpoints
+        silence_bps = detect_silence_breakpoints(audio, sr, segment.start, segment.end, features=features)
+        segment_breakpoints.extend(silence_bps)
+        breakpoint_stats["silence"] += len(silence_bps)
+        
+        # Harmonic breakpoints
+        harmonic_bps = detect_harmonic_breakpoints(
+            audio, sr, segment.start, segment.end, song_structure, features=features
         )
+        segment_breakpoints.extend(harmonic_bps)
+        breakpoint_stats["harmonic"] += len(harmonic_bps)
         
-        # 3a. Analyze long segments for appropriateness
-        LONG_SEGMENT_THRESHOLD = 20.0  # Segments >20s should be analyzed
-        segment_analyses = {}  # Key: (start, end) tuple, Value: analysis dict
+        # Aggregate breakpoints (merge nearby ones, weight by confidence)
+        aggregated_breakpoints = aggregate_breakpoints(
+            segment_breakpoints, segment.start, segment.end
+        )
+        breakpoint_stats["total_detected"] += len(aggregated_breakpoints)
         
-        for segment in merged_segments:
-            segment_duration = segment.end - segment.start
-            if segment_duration > LONG_SEGMENT_THRESHOLD:
-                analysis = analyze_segment_appropriateness(
-                    segment, audio, sr, beat_timestamps, lyrics, duration
-                )
-                # Use (start, end) tuple as key since SongStructure is not hashable
-                segment_key = (segment.start, segment.end)
-                segment_analyses[segment_key] = analysis
-                
-                if not analysis["is_appropriate"]:
-                    logger.warning(
-                        f"Long segment [{segment.start:.1f}s - {segment.end:.1f}s] "
-                        f"({segment_duration:.1f}s) may be inappropriate: "
-                        f"confidence={analysis['confidence']:.2f}, "
-                        f"reasons={analysis['reasons'][:2]}"
-                    )
-                    
-                    # If very inappropriate and very long, consider forcing subdivision
-                    if analysis["recommendation"] == "force_subdivision":
-                        logger.warning(
-                            f"⚠️ FORCING SUBDIVISION for segment [{segment.start:.1f}s - {segment.end:.1f}s] "
-                            f"due to low appropriateness (confidence={analysis['confidence']:.2f})"
-                        )
-                else:
-                    logger.info(
-                        f"Long segment [{segment.start:.1f}s - {segment.end:.1f}s] "
-                        f"({segment_duration:.1f}s) is appropriate: "
-                        f"confidence={analysis['confidence']:.2f}"
-                    )
+        # Convert breakpoints to segment-relative coordinates
+        from shared.models.audio import Breakpoint
+        relative_breakpoints = [
+            Breakpoint(
+                timestamp=bp.timestamp - segment.start,
+                confidence=bp.confidence,
+                source=bp.source,
+                type=bp.type,
+                metadata=bp.metadata
+            )
+            for bp in aggregated_breakpoints
+        ]
         
-        # 5. Breakpoint Detection and Boundary Generation
-        # Detect breakpoints for each merged structure segment
-        clip_boundaries = []
-        breakpoint_stats = {
-            "total_detected": 0,
-            "lyrics": 0,
-            "energy": 0,
-            "silence": 0,
-            "harmonic": 0
-        }
+        # Generate boundaries with breakpoints (or fallback to beat-aligned if no breakpoints)
+        # If segment is inappropriate, force more aggressive subdivision
+        segment_key = (segment.start, segment.end)
+        segment_analysis = segment_analyses.get(segment_key)
+        max_clips_override = None
         
-        for segment in merged_segments:
-            # Extract beats within this segment and make them relative to segment start
-            segment_beats_absolute = [b for b in beat_timestamps if segment.start <= b <= segment.end]
-            segment_beats = [b - segment.start for b in segment_beats_absolute]  # Make relative
-            segment_duration = segment.end - segment.start
-            
-            # Detect breakpoints for this segment
-            segment_breakpoints = []
-            
-            # Lyrics breakpoints
-            if lyrics:
-                lyrics_bps = detect_lyrics_breakpoints(lyrics, segment.start, segment.end)
-                segment_breakpoints.extend(lyrics_bps)
-                breakpoint_stats["lyrics"] += len(lyrics_bps)
-            
-            # Energy breakpoints
-            energy_bps = detect_energy_breakpoints(audio, sr, segment.start, segment.end)
-            segment_breakpoints.extend(energy_bps)
-            breakpoint_stats["energy"] += len(energy_bps)
-            
-            # Silence breakpoints
-            silence_bps = detect_silence_breakpoints(audio, sr, segment.start, segment.end)
-            segment_breakpoints.extend(silence_bps)
-            breakpoint_stats["silence"] += len(silence_bps)
-            
-            # Harmonic breakpoints
-            harmonic_bps = detect_harmonic_breakpoints(
-                audio, sr, segment.start, segment.end, song_structure
+        if segment_analysis and segment_analysis["recommendation"] == "force_subdivision":
+            # Force subdivision by ensuring max_clips is high enough
+            min_clips_needed = math.ceil(segment_duration / 8.0)  # At least 8s per clip
+            max_clips_override = max(min_clips_needed, 10)  # Force at least 10 clips for long segments
+            logger.info(
+                f"Forcing subdivision: segment {segment_duration:.1f}s "
+                f"will generate at least {min_clips_needed} clips"
             )
-            segment_breakpoints.extend(harmonic_bps)
-            breakpoint_stats["harmonic"] += len(harmonic_bps)
-            
-            # Aggregate breakpoints (merge nearby ones, weight by confidence)
-            aggregated_breakpoints = aggregate_breakpoints(
-                segment_breakpoints, segment.start, segment.end
+        
+        if relative_breakpoints:
+            segment_boundaries = generate_boundaries_with_breakpoints(
+                beat_timestamps=segment_beats,
+                bpm=bpm,
+                total_duration=segment_duration,
+                breakpoints=relative_breakpoints,
+                max_clips=max_clips_override,  # Use override if forcing subdivision
+                segment_type=segment.type.value if hasattr(segment.type, 'value') else segment.type,
+                beat_intensity=segment.beat_intensity or "medium"
+            )
+        else:
+            # Fallback to beat-aligned generation if no breakpoints detected
+            logger.debug(
+                f"No breakpoints detected for segment [{segment.start:.1f}s - {segment.end:.1f}s], "
+                f"using beat-aligned generation"
+            )
+            segment_boundaries = generate_boundaries(
+                beat_timestamps=segment_beats,
+                bpm=bpm,
+                total_duration=segment_duration,
+                max_clips=max_clips_override,  # Use override if forcing subdivision
+                segment_type=segment.type.value if hasattr(segment.type, 'value') else segment.type,
+                beat_intensity=segment.beat_intensity or "medium"
             )
-            breakpoint_stats["total_detected"] += len(aggregated_breakpoints)
-            
-            # Convert breakpoints to segment-relative coordinates
-            from shared.models.audio import Breakpoint
-            relative_breakpoints = [
-                Breakpoint(
-                    timestamp=bp.timestamp - segment.start,
-                    confidence=bp.confidence,
-                    source=bp.source,
-                    type=bp.type,
-                    metadata=bp.metadata
-                )
-                for bp in aggregated_breakpoints
-            ]
-            
-            # Generate boundaries with breakpoints (or fallback to beat-aligned if no breakpoints)
-            # If segment is inappropriate, force more aggressive subdivision
-            segment_key = (segment.start, segment.end)
-            segment_analysis = segment_analyses.get(segment_key)
-            max_clips_override = None
-            
-            if segment_analysis and segment_analysis["recommendation"] == "force_subdivision":
-                # Force subdivision by ensuring max_clips is high enough
-                min_clips_needed = math.ceil(segment_duration / 8.0)  # At least 8s per clip
-                max_clips_override = max(min_clips_needed, 10)  # Force at least 10 clips for long segments
-                logger.info(
-                    f"Forcing subdivision: segment {segment_duration:.1f}s "
-                    f"will generate at least {min_clips_needed} clips"
-                )
-            
-            if relative_breakpoints:
-                segment_boundaries = generate_boundaries_with_breakpoints(
-                    beat_timestamps=segment_beats,
-                    bpm=bpm,
-                    total_duration=segment_duration,
-                    breakpoints=relative_breakpoints,
-                    max_clips=max_clips_override,  # Use override if forcing subdivision
-                    segment_type=segment.type.value if hasattr(segment.type, 'value') else segment.type,
-                    beat_intensity=segment.beat_intensity or "medium"
-                )
-            else:
-                # Fallback to beat-aligned generation if no breakpoints detected
-                logger.debug(
-                    f"No breakpoints detected for segment [{segment.start:.1f}s - {segment.end:.1f}s], "
-                    f"using beat-aligned generation"
-                )
-                segment_boundaries = generate_boundaries(
-                    beat_timestamps=segment_beats,
-                    bpm=bpm,
-                    total_duration=segment_duration,
-                    max_clips=max_clips_override,  # Use override if forcing subdivision
-                    segment_type=segment.type.value if hasattr(segment.type, 'value') else segment.type,
-                    beat_intensity=segment.beat_intensity or "medium"
-                )
-            
-            # Offset boundaries to match segment start time and add to list
-            for boundary in segment_boundaries:
-                # Create new ClipBoundary with offset times (Pydantic models are immutable)
-                offset_boundary = ClipBoundary(
-                    start=boundary.start + segment.start,
-                    end=boundary.end + segment.start,
-                    duration=boundary.duration,  # Duration stays the same
-                    metadata={
-                        **boundary.metadata,
-                        "segment_type": segment.type.value if hasattr(segment.type, 'value') else segment.type,
-                        "breakpoints_used": len([bp for bp in relative_breakpoints 
-                                               if boundary.start <= bp.timestamp <= boundary.end])
-                    }
-                )
-                clip_boundaries.append(offset_boundary)
         
+        # Offset boundaries to match segment start time and add to list
+        for boundary in segment_boundaries:
+            # Create new ClipBoundary with offset times (Pydantic models are immutable)
+            offset_boundary = ClipBoundary(
+                start=boundary.start + segment.start,
+                end=boundary.end + segment.start,
+                duration=boundary.duration,  # Duration stays the same
+                metadata={
+                    **boundary.metadata,
+                    "segment_type": segment.type.value if hasattr(segment.type, 'value') else segment.type,
+                    "breakpoints_used": len([bp for bp in relative_breakpoints 
+                                           if boundary.start <= bp.timestamp <= boundary.end])
+                }
+            )
+            clip_boundaries.append(offset_boundary)
+    
+    logger.info(
+        f"Clip boundaries: {len(clip_boundaries)} clips generated from {len(merged_segments)} structure segments. "
+        f"Breakpoints detected: {breakpoint_stats['total_detected']} total "
+        f"(lyrics={breakpoint_stats['lyrics']}, energy={breakpoint_stats['energy']}, "
+        f"silence={breakpoint_stats['silence']}, harmonic={breakpoint_stats['harmonic']})"
+    )
+    
+    # 5a. Post-processing: Ensure full coverage
+    clip_boundaries, coverage_fixes = ensure_full_coverage(clip_boundaries, duration)
+    coverage_fixes_count = len(coverage_fixes) if coverage_fixes else 0
+    
+    if coverage_fixes:
         logger.info(
-            f"Clip boundaries: {len(clip_boundaries)} clips generated from {len(merged_segments)} structure segments. "
-            f"Breakpoints detected: {breakpoint_stats['total_detected']} total "
-            f"(lyrics={breakpoint_stats['lyrics']}, energy={breakpoint_stats['energy']}, "
-            f"silence={breakpoint_stats['silence']}, harmonic={breakpoint_stats['harmonic']})"
+            f"Post-processing applied {coverage_fixes_count} fixes to ensure full coverage: "
+            f"{'; '.join(coverage_fixes[:3])}" + 
+            (f" (and {coverage_fixes_count - 3} more)" if coverage_fixes_count > 3 else "")
         )
+    else:
+        logger.debug("Post-processing: All boundaries already have full coverage")
+    
+    # Validate all boundaries meet requirements (4-8s, full coverage, no gaps)
+    is_valid, validation_errors = validate_boundaries(clip_boundaries, duration)
+    if not is_valid:
+        logger.warning(
+            f"Boundary validation found {len(validation_errors)} issues: "
+            f"{'; '.join(validation_errors[:3])}" + 
+            (f" (and {len(validation_errors) - 3} more)" if len(validation_errors) > 3 else "")
+        )
+        # Log all errors for debugging
+        for error in validation_errors:
+            logger.debug(f"Validation error: {error}")
+    else:
+        logger.info("All boundaries validated successfully (4-8s range, full coverage, no gaps)")
+    
+    return BoundaryAnalysis(
+        clip_boundaries=clip_boundaries,
+        breakpoint_stats=breakpoint_stats,
+        segment_analyses=segment_analyses,
+        coverage_fixes_count=coverage_fixes_count
+    )
+
+
+async def parse_audio(audio_bytes: bytes, job_id: UUID) -> AudioAnalysis:
+    """
+    Parse audio file and extract all analysis data.
+    
+    CPU-bound analysis runs in the audio process pool so the event loop stays
+    responsive; only the Whisper call runs here.
+    
+    Args:
+        audio_bytes: Audio file bytes
+        job_id: Job ID for tracking
         
-        # 5a. Post-processing: Ensure full coverage
-        clip_boundaries, coverage_fixes = ensure_full_coverage(clip_boundaries, duration)
-        coverage_fixes_count = len(coverage_fixes) if coverage_fixes else 0
+    Returns:
+        AudioAnalysis object with all analysis results
+    """
+    lyrics_task = None
+    
+    try:
+        # Start Whisper right away so the round-trip overlaps the DSP stage.
+        # Duration comes from the header; if it can't be probed, start once stage 1 has decoded.
+        header_duration = await asyncio.to_thread(probe_audio_duration, audio_bytes)
+        if header_duration:
+            lyrics_task = asyncio.create_task(extract_lyrics(audio_bytes, job_id, header_duration))
         
-        if coverage_fixes:
-            logger.info(
-                f"Post-processing applied {coverage_fixes_count} fixes to ensure full coverage: "
-                f"{'; '.join(coverage_fixes[:3])}" + 
-                (f" (and {coverage_fixes_count - 3} more)" if coverage_fixes_count > 3 else "")
+        with SharedAudioBuffer(audio_bytes) as buffer:
+            rhythm = await run_in_process_pool(
+                analyze_rhythm_and_structure, buffer.name, buffer.size, job_id
             )
-        else:
-            logger.debug("Post-processing: All boundaries already have full coverage")
         
-        # Validate all boundaries meet requirements (4-8s, full coverage, no gaps)
-        is_valid, validation_errors = validate_boundaries(clip_boundaries, duration)
-        if not is_valid:
-            logger.warning(
-                f"Boundary validation found {len(validation_errors)} issues: "
-                f"{'; '.join(validation_errors[:3])}" + 
-                (f" (and {len(validation_errors) - 3} more)" if len(validation_errors) > 3 else "")
-            )
-            # Log all errors for debugging
-            for error in validation_errors:
-                logger.debug(f"Validation error: {error}")
-        else:
-            logger.info("All boundaries validated successfully (4-8s range, full coverage, no gaps)")
+        if lyrics_task is None:
+            lyrics_task = asyncio.create_task(extract_lyrics(audio_bytes, job_id, rhythm.duration))
         
-        # 6. Mood Classification (uses BPM, structure energy, spectral features)
-        mood = classify_mood(audio, sr, bpm, song_structure)
-        if mood.confidence < 0.3:
-            fallbacks_used.append("mood_classification")
-        logger.info(f"Mood classification: {mood.primary}, confidence={mood.confidence:.2f}")
+        bpm = rhythm.bpm
+        duration = rhythm.duration
+        beat_timestamps = rhythm.beat_timestamps
+        beat_confidence = rhythm.beat_confidence
+        subdivisions = rhythm.subdivisions
+        beat_strength = rhythm.beat_strength
+        song_structure = rhythm.song_structure
+        structure_fallback = rhythm.structure_fallback
+        mood = rhythm.mood
+        fallbacks_used = list(rhythm.fallbacks_used)
+        
+        # 4. Lyrics Extraction (join here: breakpoint detection is the first consumer)
+        lyrics = await lyrics_task
+        if len(lyrics) == 0:
+            # Check if this was a fallback (instrumental) or actual failure
+            # For now, empty lyrics is valid (instrumental tracks)
+            pass
+        
+        # Calculate average lyrics confidence
+        lyrics_confidence = 0.0
+        if lyrics:
+            lyrics_confidence = sum(
+                lyric.confidence or 0.5 for lyric in lyrics
+            ) / len(lyrics)
+        
+        logger.info(
+            f"Lyrics extraction: {len(lyrics)} words, "
+            f"avg confidence={lyrics_confidence:.2f}"
+        )
+        
+        # 5. Breakpoint Detection and Boundary Generation
+        boundaries = await run_in_process_pool(detect_clip_boundaries, rhythm, lyrics, job_id)
+        clip_boundaries = boundaries.clip_boundaries
+        breakpoint_stats = boundaries.breakpoint_stats
+        segment_analyses = boundaries.segment_analyses
+        coverage_fixes_count = boundaries.coverage_fixes_count
         
         # Create AudioAnalysis object
         analysis = AudioAnalysis(
@@ -568,3 +709,7 @@ async def parse_audio(audio_bytes: bytes, job_id: UUID) -> AudioAnalysis:
     except Exception as e:
         logger.error(f"Failed to parse audio for job {job_id}: {str(e)}")
         raise
+    finally:
+        # Don't leave a Whisper call running if DSP failed or the job was cancelled
+        if lyrics_task is not None and not lyrics_task.done():
+            lyrics_task.cancel()
@@ -0,0 +1,134 @@
+"""
+Process pool for CPU-bound audio analysis.
+
+Librosa decoding, beat tracking, clustering and breakpoint detection hold the
+GIL for seconds at a time. Running them in worker processes keeps the event
+loop free for SSE publishing, Replicate polling and other concurrent jobs.
+"""
+
+import asyncio
+import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from functools import partial
+from multiprocessing import shared_memory
+from typing import Any, Callable, Iterator, Optional
+
+from shared.logging import get_logger
+
+logger = get_logger("audio_parser")
+
+# Number of audio analyses that may run in parallel (one per worker process)
+# Default: half the cores, leaving room for FFmpeg and the event loop
+AUDIO_ANALYSIS_MAX_WORKERS = max(
+    1, int(os.getenv("AUDIO_ANALYSIS_MAX_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+)
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+class SharedAudioBuffer:
+    """
+    Encoded audio bytes placed in shared memory for pool workers.
+
+    Workers attach by name instead of receiving the file as pickled bytes.
+    The creating process owns the block and unlinks it on exit.
+    """
+
+    def __init__(self, audio_bytes: bytes):
+        self.size = len(audio_bytes)
+        self._shm = shared_memory.SharedMemory(create=True, size=max(1, self.size))
+        self._shm.buf[:self.size] = audio_bytes
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def close(self) -> None:
+        """Release and unlink the shared memory block."""
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self) -> "SharedAudioBuffer":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+@contextmanager
+def open_shared_audio(name: str, size: int) -> Iterator[io.BytesIO]:
+    """
+    Attach to a SharedAudioBuffer from a worker process.
+
+    Args:
+        name: Shared memory block name
+        size: Number of valid bytes in the block
+
+    Yields:
+        File-like object over the encoded audio, for librosa.load
+    """
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        # BytesIO takes its own copy, so no view into the block outlives close()
+        yield io.BytesIO(shm.buf[:size])
+    finally:
+        shm.close()
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """
+    Get the audio analysis process pool, creating it on first use.
+
+    Workers are spawned rather than forked: the parent runs an event loop and
+    background threads, which are not safe to fork.
+
+    Returns:
+        ProcessPoolExecutor bounded to AUDIO_ANALYSIS_MAX_WORKERS
+    """
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=AUDIO_ANALYSIS_MAX_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+        logger.info(f"Started audio analysis process pool: max_workers={AUDIO_ANALYSIS_MAX_WORKERS}")
+    return _executor
+
+
+async def run_in_process_pool(fn: Callable[..., Any], *args: Any) -> Any:
+    """
+    Run a picklable, module-level function in the audio analysis pool.
+
+    Calls beyond AUDIO_ANALYSIS_MAX_WORKERS queue inside the pool. If a worker
+    dies (e.g. OOM on a very long track) the pool is discarded so the next
+    call starts a fresh one, and the error propagates to the caller.
+
+    Args:
+        fn: Function to run
+        *args: Positional arguments (must be picklable)
+
+    Returns:
+        Function result
+    """
+    global _executor
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(get_process_pool(), partial(fn, *args))
+    except BrokenProcessPool:
+        logger.error("Audio analysis process pool broke, restarting on next call")
+        broken, _executor = _executor, None
+        if broken is not None:
+            broken.shutdown(wait=False, cancel_futures=True)
+        raise
+
+
+def shutdown_process_pool() -> None:
+    """Shut down the audio analysis pool (waits for running analyses)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
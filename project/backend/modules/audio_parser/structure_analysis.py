@@ -5,37 +5,38 @@ Analyze song structure (intro/verse/chorus/bridge/outro) using chroma features a
 """
 
 import numpy as np
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Optional
 
-import librosa
 from sklearn.cluster import AgglomerativeClustering
 
 from shared.models.audio import SongStructure, ClipBoundary, Lyric
 from shared.logging import get_logger
+from modules.audio_parser.features import SpectralFeatures, compute_spectral_features, get_segment_features
 
 logger = get_logger("audio_parser")
 
 
-def _calculate_segment_energy(y_segment: np.ndarray, sr: int, max_rms: float = None, max_centroid: float = None) -> float:
+def _calculate_segment_energy(
+    segment_features: SpectralFeatures,
+    max_rms: float = None,
+    max_centroid: float = None
+) -> float:
     """
     Calculate energy level for segment classification (low/medium/high).
     
     Args:
-        y_segment: Audio segment signal
-        sr: Sample rate
+        segment_features: Spectral features sliced to the segment
         max_rms: Maximum RMS from full track (for normalization)
         max_centroid: Maximum spectral centroid from full track (for normalization)
         
     Returns:
         Energy value (0.0-1.0)
     """
-    # Compute RMS
-    rms = librosa.feature.rms(y=y_segment)[0]
-    rms_mean = np.mean(rms)
+    if segment_features.n_frames == 0:
+        return 0.0
     
-    # Compute spectral centroid
-    centroid = librosa.feature.spectral_centroid(y=y_segment, sr=sr)[0]
-    centroid_mean = np.mean(centroid)
+    rms_mean = np.mean(segment_features.rms)
+    centroid_mean = np.mean(segment_features.centroid)
     
     # Normalize RMS
     max_rms = max_rms or 1.0
@@ -58,7 +59,8 @@ def calculate_segment_beat_intensity(
     segment: SongStructure,
     beat_timestamps: List[float],
     audio: np.ndarray,
-    sr: int
+    sr: int,
+    features: Optional[SpectralFeatures] = None
 ) -> str:
     """
     Calculate beat intensity (high/medium/low) for a segment.
@@ -70,6 +72,7 @@ def calculate_segment_beat_intensity(
         beat_timestamps: All beat timestamps
         audio: Full audio signal
         sr: Sample rate
+        features: Precomputed full-track spectral features (sliced to the segment)
         
     Returns:
         'high', 'medium', or 'low'
@@ -92,15 +95,11 @@ def calculate_segment_beat_intensity(
     bpm_equivalent = beats_per_second * 60
     
     # Calculate energy for segment
-    start_frame = int(segment.start * sr)
-    end_frame = int(segment.end * sr)
-    if end_frame > len(audio):
-        end_frame = len(audio)
-    if start_frame >= end_frame:
+    segment_features = get_segment_features(audio, sr, segment.start, segment.end, features)
+    if segment_features is None or segment_features.n_frames == 0:
         return "low"
     
-    segment_audio = audio[start_frame:end_frame]
-    energy = _calculate_segment_energy(segment_audio, sr)
+    energy = _calculate_segment_energy(segment_features)
     
     # Classification rules
     if bpm_equivalent > 120 and energy > 0.7:
@@ -301,7 +300,8 @@ def analyze_structure(
     y: np.ndarray,
     sr: int,
     beat_timestamps: List[float],
-    duration: float
+    duration: float,
+    features: Optional[SpectralFeatures] = None
 ) -> Tuple[List[SongStructure], bool]:
     """
     Classify song sections with energy levels.
@@ -311,6 +311,7 @@ def analyze_structure(
         sr: Sample rate
         beat_timestamps: List of beat timestamps
         duration: Total duration in seconds
+        features: Precomputed full-track spectral features (computed if omitted)
         
     Returns:
         Tuple of (List of SongStructure objects, fallback_used flag)
@@ -323,8 +324,11 @@ def analyze_structure(
     )
     
     try:
+        if features is None:
+            features = compute_spectral_features(y, sr)
+        
         # 1. Extract chroma features
-        chroma = librosa.feature.chroma_stft(y=y, sr=sr, hop_length=512)
+        chroma = features.chroma
         logger.info(
             f"Extracted chroma features: shape={chroma.shape}, "
             f"time_frames={chroma.shape[1]}, "
@@ -481,27 +485,18 @@ def analyze_structure(
                 segments.append((start, end, i))
             
             # Classify segments
-            try:
-                rms_features = librosa.feature.rms(y=y)[0]
-                centroid_features = librosa.feature.spectral_centroid(y=y, sr=sr)[0]
-                max_rms = np.max(rms_features) if len(rms_features) > 0 else 1.0
-                max_centroid = np.max(centroid_features) if len(centroid_features) > 0 else 5000.0
-            except Exception:
-                # If feature extraction fails, use defaults
-                max_rms = 1.0
-                max_centroid = 5000.0
+            max_rms = float(np.max(features.rms)) if features.n_frames > 0 else 1.0
+            max_centroid = float(np.max(features.centroid)) if features.n_frames > 0 else 5000.0
             
             song_structure = []
             for i, (start, end, label) in enumerate(segments):
-                start_idx = int(start * sr)
-                end_idx = int(end * sr)
-                y_segment = y[start_idx:end_idx]
+                segment_features = features.segment(start, end)
                 
-                if len(y_segment) == 0:
+                if segment_features.n_frames == 0:
                     # Skip empty segments, but ensure we have at least one
                     continue
                 
-                energy = _calculate_segment_energy(y_segment, sr, max_rms, max_centroid)
+                energy = _calculate_segment_energy(segment_features, max_rms, max_centroid)
                 
                 # Classify type
                 if i == 0 and end - start < 15 and energy < 0.4:
@@ -534,7 +529,7 @@ def analyze_structure(
                 # Calculate beat intensity if beat_timestamps are provided
                 if beat_timestamps:
                     beat_intensity = calculate_segment_beat_intensity(
-                        segment_obj, beat_timestamps, y, sr
+                        segment_obj, beat_timestamps, y, sr, features
                     )
                     segment_obj.beat_intensity = beat_intensity
 
@@ -577,10 +572,8 @@ def analyze_structure(
         
         # 4. Classify segments
         # Calculate max values for normalization (use full track)
-        rms_full = librosa.feature.rms(y=y)[0]
-        centroid_full = librosa.feature.spectral_centroid(y=y, sr=sr)[0]
-        max_rms = float(np.max(rms_full)) if len(rms_full) > 0 else 1.0
-        max_centroid = float(np.max(centroid_full)) if len(centroid_full) > 0 else 5000.0
+        max_rms = float(np.max(features.rms)) if features.n_frames > 0 else 1.0
+        max_centroid = float(np.max(features.centroid)) if features.n_frames > 0 else 5000.0
         
         logger.info(
             f"Energy normalization values: max_rms={max_rms:.4f}, max_centroid={max_centroid:.2f}Hz"
@@ -593,15 +586,13 @@ def analyze_structure(
                 logger.warning(f"Skipping zero-duration segment: {start:.1f}-{end:.1f}s")
                 continue
             
-            start_idx = int(start * sr)
-            end_idx = int(end * sr)
-            y_segment = y[start_idx:end_idx]
+            segment_features = features.segment(start, end)
             
-            if len(y_segment) == 0:
+            if segment_features.n_frames == 0:
                 logger.warning(f"Skipping empty segment: {start:.1f}-{end:.1f}s (no audio samples)")
                 continue
             
-            energy = _calculate_segment_energy(y_segment, sr, max_rms, max_centroid)
+            energy = _calculate_segment_energy(segment_features, max_rms, max_centroid)
             
             # Classify type using heuristics
             segment_duration = end - start
@@ -662,7 +653,7 @@ def analyze_structure(
             # Calculate beat intensity if beat_timestamps are provided
             if beat_timestamps:
                 beat_intensity = calculate_segment_beat_intensity(
-                    segment_obj, beat_timestamps, y, sr
+                    segment_obj, beat_timestamps, y, sr, features
                 )
                 segment_obj.beat_intensity = beat_intensity
                 logger.debug(
@@ -722,7 +713,8 @@ def analyze_structure_from_clips(
     sr: int,
     clip_boundaries: List[ClipBoundary],
     duration: float,
-    beat_timestamps: List[float] = None
+    beat_timestamps: List[float] = None,
+    features: Optional[SpectralFeatures] = None
 ) -> Tuple[List[SongStructure], bool]:
     """
     Analyze song structure using clip boundaries as the base segments.
@@ -736,6 +728,8 @@ def analyze_structure_from_clips(
         sr: Sample rate
         clip_boundaries: List of ClipBoundary objects (beat-aligned)
         duration: Total duration in seconds
+        beat_timestamps: Beat timestamps for beat intensity (optional)
+        features: Precomputed full-track spectral features (computed if omitted)
         
     Returns:
         Tuple of (List of SongStructure objects, fallback_used flag)
@@ -755,11 +749,12 @@ def analyze_structure_from_clips(
         )], True)
     
     try:
+        if features is None:
+            features = compute_spectral_features(y, sr)
+        
         # Calculate max values for normalization (use full track)
-        rms_full = librosa.feature.rms(y=y)[0]
-        centroid_full = librosa.feature.spectral_centroid(y=y, sr=sr)[0]
-        max_rms = float(np.max(rms_full)) if len(rms_full) > 0 else 1.0
-        max_centroid = float(np.max(centroid_full)) if len(centroid_full) > 0 else 5000.0
+        max_rms = float(np.max(features.rms)) if features.n_frames > 0 else 1.0
+        max_centroid = float(np.max(features.centroid)) if features.n_frames > 0 else 5000.0
         
         logger.info(
             f"Energy normalization values: max_rms={max_rms:.4f}, max_centroid={max_centroid:.2f}Hz"
@@ -776,17 +771,15 @@ def analyze_structure_from_clips(
                 logger.warning(f"Skipping invalid clip boundary: {start:.1f}-{end:.1f}s")
                 continue
             
-            # Extract audio segment
-            start_idx = int(start * sr)
-            end_idx = int(end * sr)
-            y_segment = y[start_idx:end_idx]
+            # Slice features for this segment
+            segment_features = features.segment(start, end)
             
-            if len(y_segment) == 0:
+            if segment_features.n_frames == 0:
                 logger.warning(f"Skipping empty segment: {start:.1f}-{end:.1f}s (no audio samples)")
                 continue
             
             # Calculate energy for this segment
-            energy = _calculate_segment_energy(y_segment, sr, max_rms, max_centroid)
+            energy = _calculate_segment_energy(segment_features, max_rms, max_centroid)
             
             # Classify type using heuristics based on position and energy
             n_clips = len(clip_boundaries)
@@ -826,7 +819,7 @@ def analyze_structure_from_clips(
             # Calculate beat intensity if beat_timestamps are provided
             if beat_timestamps:
                 beat_intensity = calculate_segment_beat_intensity(
-                    segment_obj, beat_timestamps, y, sr
+                    segment_obj, beat_timestamps, y, sr, features
                 )
                 segment_obj.beat_intensity = beat_intensity
                 logger.debug(
@@ -875,7 +868,7 @@ def analyze_structure_from_clips(
             # Calculate beat intensity if beat_timestamps are provided
             if beat_timestamps:
                 beat_intensity = calculate_segment_beat_intensity(
-                    segment_obj, beat_timestamps, y, sr
+                    segment_obj, beat_timestamps, y, sr, features
                 )
                 segment_obj.beat_intensity = beat_intensity
             
@@ -889,7 +882,8 @@ def analyze_segment_appropriateness(
     sr: int,
     beat_timestamps: List[float],
     lyrics: List[Lyric],
-    total_duration: float
+    total_duration: float,
+    features: Optional[SpectralFeatures] = None
 ) -> Dict[str, Any]:
     """
     Analyze if a long segment (e.g., 26s) is musically appropriate.
@@ -913,6 +907,7 @@ def analyze_segment_appropriateness(
         beat_timestamps: All beat timestamps
         lyrics: All lyrics (if available)
         total_duration: Total song duration
+        features: Precomputed full-track spectral features (sliced to the segment)
         
     Returns:
         Dict with:
@@ -925,12 +920,9 @@ def analyze_segment_appropriateness(
     metrics = {}
     reasons = []
     
-    # Extract segment audio
-    start_idx = int(segment.start * sr)
-    end_idx = int(segment.end * sr)
-    if end_idx > len(audio):
-        end_idx = len(audio)
-    if start_idx >= end_idx:
+    # Slice segment features
+    segment_features = get_segment_features(audio, sr, segment.start, segment.end, features)
+    if segment_features is None:
         # Invalid segment
         return {
             "is_appropriate": False,
@@ -941,9 +933,7 @@ def analyze_segment_appropriateness(
             "recommendation": "review"
         }
     
-    segment_audio = audio[start_idx:end_idx]
-    
-    if len(segment_audio) == 0:
+    if segment_features.n_frames == 0:
         return {
             "is_appropriate": False,
             "confidence": 0.0,
@@ -955,7 +945,7 @@ def analyze_segment_appropriateness(
     
     # Metric 1: Energy variation (appropriate if has variation)
     try:
-        rms = librosa.feature.rms(y=segment_audio)[0]
+        rms = segment_features.rms
         energy_std = float(np.std(rms))
         energy_mean = float(np.mean(rms))
         energy_variation = energy_std / (energy_mean + 1e-10)  # Coefficient of variation
@@ -967,7 +957,7 @@ def analyze_segment_appropriateness(
     
     # Metric 2: Spectral variation (appropriate if has harmonic changes)
     try:
-        chroma = librosa.feature.chroma_stft(y=segment_audio, sr=sr)
+        chroma = segment_features.chroma
         chroma_std = float(np.std(chroma))
         chroma_mean = float(np.mean(chroma))
         spectral_variation = chroma_std / (chroma_mean + 1e-10)
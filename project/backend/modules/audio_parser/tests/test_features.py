@@ -0,0 +1,59 @@
+"""
+Tests for shared spectral feature extraction.
+"""
+
+import numpy as np
+import librosa
+from modules.audio_parser.features import compute_spectral_features, get_segment_features
+from modules.audio_parser.breakpoint_detection import detect_energy_breakpoints, detect_harmonic_breakpoints
+
+
+def test_features_match_librosa_defaults(sample_audio_signal):
+    """Bundle features match the y-based librosa calls they replace."""
+    audio, sr = sample_audio_signal
+    features = compute_spectral_features(audio, sr)
+    
+    np.testing.assert_allclose(features.centroid, librosa.feature.spectral_centroid(y=audio, sr=sr)[0], rtol=1e-4)
+    np.testing.assert_allclose(features.rolloff, librosa.feature.spectral_rolloff(y=audio, sr=sr)[0], rtol=1e-4)
+    np.testing.assert_allclose(features.chroma, librosa.feature.chroma_stft(y=audio, sr=sr), rtol=1e-4, atol=1e-6)
+    np.testing.assert_allclose(features.rms, librosa.feature.rms(y=audio)[0], rtol=1e-4)
+    np.testing.assert_allclose(features.onset_envelope, librosa.onset.onset_strength(y=audio, sr=sr), rtol=1e-4, atol=1e-6)
+    
+    assert features.chroma.shape == (12, features.n_frames)
+
+
+def test_segment_slices_by_time(sample_audio_signal):
+    """Segment slices keep absolute frame times within the requested range."""
+    audio, sr = sample_audio_signal
+    features = compute_spectral_features(audio, sr)
+    
+    segment = features.segment(2.0, 5.0)
+    
+    assert segment.n_frames > 0
+    assert segment.times[0] >= 2.0
+    assert segment.times[-1] <= 5.0
+    assert segment.chroma.shape[1] == segment.n_frames
+    assert np.shares_memory(segment.rms, features.rms)  # View, not a copy
+
+
+def test_get_segment_features_without_bundle(sample_audio_signal):
+    """Without a bundle, features are computed from the segment audio only."""
+    audio, sr = sample_audio_signal
+    
+    segment = get_segment_features(audio, sr, 3.0, 6.0)
+    
+    assert segment.start_time == 3.0
+    assert segment.n_frames == 1 + (3 * sr) // segment.hop_length
+    assert get_segment_features(audio, sr, 20.0, 25.0) is None
+
+
+def test_detectors_accept_shared_features(sample_audio_signal):
+    """Detectors return absolute-time breakpoints from the shared bundle."""
+    audio, sr = sample_audio_signal
+    features = compute_spectral_features(audio, sr)
+    
+    energy_bps = detect_energy_breakpoints(audio, sr, 2.0, 8.0, features=features)
+    harmonic_bps = detect_harmonic_breakpoints(audio, sr, 2.0, 8.0, [], features=features)
+    
+    for bp in energy_bps + harmonic_bps:
+        assert 2.0 <= bp.timestamp <= 8.0
@@ -0,0 +1,39 @@
+"""
+Tests for the audio analysis process pool.
+"""
+
+import pytest
+from modules.audio_parser.process_pool import (
+    SharedAudioBuffer,
+    open_shared_audio,
+    run_in_process_pool,
+    shutdown_process_pool
+)
+
+
+def test_shared_audio_buffer_round_trip():
+    """Workers read back exactly the bytes the owner wrote."""
+    audio_bytes = b"RIFF" + bytes(range(256)) * 4
+    
+    with SharedAudioBuffer(audio_bytes) as buffer:
+        with open_shared_audio(buffer.name, buffer.size) as audio_file:
+            assert audio_file.read() == audio_bytes
+
+
+def test_shared_audio_buffer_unlinks_on_exit():
+    """The block is gone once the owner's context exits."""
+    with SharedAudioBuffer(b"data") as buffer:
+        name = buffer.name
+    
+    with pytest.raises(FileNotFoundError):
+        with open_shared_audio(name, 4):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_run_in_process_pool():
+    """Functions run in a worker process and return their result."""
+    try:
+        assert await run_in_process_pool(sum, [1, 2, 3]) == 6
+    finally:
+        shutdown_process_pool()
@@ -4,9 +4,12 @@ Tests for utility functions.
 
 import pytest
 import io
+import numpy as np
+import soundfile as sf
 from modules.audio_parser.utils import (
     calculate_file_hash,
     extract_hash_from_url,
+    probe_audio_duration,
     validate_audio_file_bytes
 )
 from shared.errors import ValidationError
@@ -86,3 +89,15 @@ def test_validate_audio_file_bytes_empty():
     with pytest.raises(ValidationError):
         validate_audio_file_bytes(empty_data, max_size_mb=10)
 
+
+def test_probe_audio_duration_wav():
+    """Duration is read from the WAV header."""
+    buffer = io.BytesIO()
+    sf.write(buffer, np.zeros(22050 * 3), 22050, format='WAV')
+    
+    assert probe_audio_duration(buffer.getvalue()) == pytest.approx(3.0)
+
+
+def test_probe_audio_duration_unreadable():
+    """Unprobeable data returns None instead of raising."""
+    assert probe_audio_duration(b"not audio") is None
@@ -127,6 +127,26 @@ def validate_audio_file_bytes(audio_bytes: bytes, max_size_mb: int = 10) -> None
     validate_audio_file_shared(file_obj, max_size_mb=max_size_mb)
 
 
+def probe_audio_duration(audio_bytes: bytes) -> Optional[float]:
+    """
+    Read audio duration from the container header without decoding.
+    
+    Args:
+        audio_bytes: Audio file bytes
+        
+    Returns:
+        Duration in seconds, or None if the format can't be probed
+    """
+    try:
+        import soundfile as sf
+        info = sf.info(io.BytesIO(audio_bytes))
+        if info.samplerate > 0 and info.frames > 0:
+            return info.frames / info.samplerate
+    except Exception as e:
+        logger.debug(f"Could not probe audio duration from header: {str(e)}")
+    return None
+
+
 def calculate_file_hash(audio_bytes: bytes) -> str:
     """
     Calculate MD5 hash of audio file bytes.
@@ -9,6 +9,9 @@ from modules.clip_regenerator.template_matcher import match_template, apply_temp
 from modules.clip_regenerator.llm_modifier import modify_prompt_with_llm
 from modules.clip_regenerator.context_builder import build_llm_context
 from modules.clip_regenerator.data_loader import (
+    JobArtifacts,
+    load_job_artifacts,
+    invalidate_job_artifacts,
     load_clips_from_job_stages,
     load_clips_with_latest_versions,
     load_clip_prompts_from_job_stages,
@@ -29,6 +32,9 @@ __all__ = [
     "TemplateMatch",
     "modify_prompt_with_llm",
     "build_llm_context",
+    "JobArtifacts",
+    "load_job_artifacts",
+    "invalidate_job_artifacts",
     "load_clips_from_job_stages",
     "load_clips_with_latest_versions",
     "load_clip_prompts_from_job_stages",
@@ -10,6 +10,7 @@ from uuid import UUID
 from shared.database import DatabaseClient
 from shared.logging import get_logger
 from shared.errors import ValidationError
+from api_gateway.services.job_status_store import patch_job_status
 
 logger = get_logger("clip_regenerator.cost_tracker")
 
@@ -96,6 +97,7 @@ async def track_regeneration_cost(
         await db_client.table("jobs").update({
             "total_cost": float(new_total)
         }).eq("id", str(job_id)).execute()
+        await patch_job_status(str(job_id), {"total_cost": float(new_total)})
         
         logger.info(
             f"Updated job total_cost",
@@ -3,9 +3,18 @@ Data loading from job_stages table.
 
 Loads clip data, prompts, scene plans, and reference images from job_stages.metadata.
 All data is stored as JSON in the metadata column, not in separate tables.
+
+Every artifact of a job is loaded together (load_job_artifacts): one job_stages
+query for all stage rows, each metadata blob parsed once into its model. The
+result is memoized per job status version, which every stage write bumps
+(api_gateway.services.job_status_store), so the per-artifact loaders below
+share one database round trip until a stage changes.
 """
 import json
-from typing import Optional, List, Dict
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Optional, List, Dict, Tuple
 from uuid import UUID
 
 from shared.database import DatabaseClient
@@ -16,51 +25,61 @@ from shared.logging import get_logger
 
 logger = get_logger("clip_regenerator.data_loader")
 
+# Memoized artifacts per process: a few jobs are being edited at any time, and an entry
+# is only reused while the job's status version is unchanged
+ARTIFACTS_CACHE_SIZE = 32
+ARTIFACTS_CACHE_TTL_SECONDS = 60
 
-async def load_clips_from_job_stages(job_id: UUID) -> Optional[Clips]:
+_artifacts_cache: "OrderedDict[str, Tuple[str, float, JobArtifacts]]" = OrderedDict()
+
+
+@dataclass
+class JobArtifacts:
+    """Every job_stages artifact of a job, parsed once."""
+    job_id: UUID
+    stage_metadata: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    clips: Optional[Clips] = None
+    clip_prompts: Optional[ClipPrompts] = None
+    scene_plan: Optional[ScenePlan] = None
+    reference_images: Optional[ReferenceImages] = None
+    transitions: List[Transition] = field(default_factory=list)
+    beat_timestamps: Optional[List[float]] = None
+    audio_analysis: Optional[AudioAnalysis] = None
+    aspect_ratio: str = "16:9"
+
+
+def _decode_metadata(stage_name: str, metadata: Any, job_id: UUID) -> Optional[Dict[str, Any]]:
+    """Decode a stage's metadata column (JSON string or dict)."""
+    if not metadata:
+        logger.debug(
+            f"Empty metadata for {stage_name} stage, job {job_id}",
+            extra={"job_id": str(job_id)}
+        )
+        return None
+    
+    # Handle JSON string or dict
+    if isinstance(metadata, str):
+        try:
+            metadata = json.loads(metadata)
+        except json.JSONDecodeError as e:
+            logger.error(
+                f"Failed to parse metadata JSON: {e}",
+                extra={"job_id": str(job_id), "stage_name": stage_name}
+            )
+            return None
+    
+    return metadata if isinstance(metadata, dict) else None
+
+
+def _parse_clips(job_id: UUID, metadata: Optional[Dict[str, Any]]) -> Optional[Clips]:
     """
-    Load Clips object from job_stages.metadata.
+    Build the Clips model from video_generator metadata.
     
     Metadata structure: {"clips": {"clips": [...], "total_clips": 6, ...}}
-    
-    Args:
-        job_id: Job ID to load clips for
-        
-    Returns:
-        Clips object if found, None if stage not found or invalid
     """
+    if metadata is None:
+        return None
     try:
-        db = DatabaseClient()
-        result = await db.table("job_stages").select("metadata").eq(
-            "job_id", str(job_id)
-        ).eq("stage_name", "video_generator").execute()
-        
-        if not result.data or len(result.data) == 0:
-            logger.debug(
-                f"No video_generator stage found for job {job_id}",
-                extra={"job_id": str(job_id)}
-            )
-            return None
-        
-        metadata = result.data[0].get("metadata")
-        if not metadata:
-            logger.warning(
-                f"Empty metadata for video_generator stage, job {job_id}",
-                extra={"job_id": str(job_id)}
-            )
-            return None
-        
-        # Handle JSON string or dict
-        if isinstance(metadata, str):
-            try:
-                metadata = json.loads(metadata)
-            except json.JSONDecodeError as e:
-                logger.error(
-                    f"Failed to parse metadata JSON: {e}",
-                    extra={"job_id": str(job_id)}
-                )
-                return None
-        
         # Access nested structure: metadata['clips']['clips']
         clips_data = metadata.get("clips")
         if not clips_data:
@@ -124,16 +143,16 @@ async def load_clips_from_job_stages(job_id: UUID) -> Optional[Clips]:
                 clip_data["cost"] = Decimal(0)
             
             # Ensure numeric fields are the right type
-            for field in ["actual_duration", "target_duration", "original_target_duration", "duration_diff", "generation_time"]:
-                if field in clip_data and clip_data[field] is not None:
+            for field_name in ["actual_duration", "target_duration", "original_target_duration", "duration_diff", "generation_time"]:
+                if field_name in clip_data and clip_data[field_name] is not None:
                     try:
-                        clip_data[field] = float(clip_data[field])
+                        clip_data[field_name] = float(clip_data[field_name])
                     except (ValueError, TypeError):
                         # For original_target_duration, default to target_duration if conversion fails
-                        if field == "original_target_duration":
-                            clip_data[field] = clip_data.get("target_duration", 0.0)
+                        if field_name == "original_target_duration":
+                            clip_data[field_name] = clip_data.get("target_duration", 0.0)
                         else:
-                            clip_data[field] = 0.0
+                            clip_data[field_name] = 0.0
             
             # Ensure metadata is a dict (default to empty dict if missing or invalid)
             if "metadata" not in clip_data or not isinstance(clip_data.get("metadata"), dict):
@@ -227,48 +246,11 @@ async def load_clips_from_job_stages(job_id: UUID) -> Optional[Clips]:
         return None
 
 
-async def load_clip_prompts_from_job_stages(job_id: UUID) -> Optional[ClipPrompts]:
-    """
-    Load ClipPrompts object from job_stages.metadata.
-    
-    Args:
-        job_id: Job ID to load prompts for
-        
-    Returns:
-        ClipPrompts object if found, None if stage not found or invalid
-    """
+def _parse_clip_prompts(job_id: UUID, metadata: Optional[Dict[str, Any]]) -> Optional[ClipPrompts]:
+    """Build the ClipPrompts model from prompt_generator metadata."""
+    if metadata is None:
+        return None
     try:
-        db = DatabaseClient()
-        result = await db.table("job_stages").select("metadata").eq(
-            "job_id", str(job_id)
-        ).eq("stage_name", "prompt_generator").execute()
-        
-        if not result.data or len(result.data) == 0:
-            logger.debug(
-                f"No prompt_generator stage found for job {job_id}",
-                extra={"job_id": str(job_id)}
-            )
-            return None
-        
-        metadata = result.data[0].get("metadata")
-        if not metadata:
-            logger.warning(
-                f"Empty metadata for prompt_generator stage, job {job_id}",
-                extra={"job_id": str(job_id)}
-            )
-            return None
-        
-        # Handle JSON string or dict
-        if isinstance(metadata, str):
-            try:
-                metadata = json.loads(metadata)
-            except json.JSONDecodeError as e:
-                logger.error(
-                    f"Failed to parse metadata JSON: {e}",
-                    extra={"job_id": str(job_id)}
-                )
-                return None
-        
         # The orchestrator saves metadata as {"clip_prompts": clip_prompts_dict}
         # Check if we have a nested structure and extract the actual clip_prompts dict
         if "clip_prompts" in metadata and isinstance(metadata.get("clip_prompts"), dict):
@@ -328,50 +310,15 @@ async def load_clip_prompts_from_job_stages(job_id: UUID) -> Optional[ClipPrompt
         return None
 
 
-async def load_scene_plan_from_job_stages(job_id: UUID) -> Optional[ScenePlan]:
+def _parse_scene_plan(job_id: UUID, metadata: Optional[Dict[str, Any]]) -> Optional[ScenePlan]:
     """
-    Load ScenePlan object from job_stages.metadata.
+    Build the ScenePlan model from scene_planner metadata.
     
     Metadata structure: {"scene_plan": {"job_id": ..., "video_summary": ..., ...}}
-    
-    Args:
-        job_id: Job ID to load scene plan for
-        
-    Returns:
-        ScenePlan object if found, None if stage not found or invalid
     """
+    if metadata is None:
+        return None
     try:
-        db = DatabaseClient()
-        result = await db.table("job_stages").select("metadata").eq(
-            "job_id", str(job_id)
-        ).eq("stage_name", "scene_planner").execute()
-        
-        if not result.data or len(result.data) == 0:
-            logger.debug(
-                f"No scene_planner stage found for job {job_id}",
-                extra={"job_id": str(job_id)}
-            )
-            return None
-        
-        metadata = result.data[0].get("metadata")
-        if not metadata:
-            logger.warning(
-                f"Empty metadata for scene_planner stage, job {job_id}",
-                extra={"job_id": str(job_id)}
-            )
-            return None
-        
-        # Handle JSON string or dict
-        if isinstance(metadata, str):
-            try:
-                metadata = json.loads(metadata)
-            except json.JSONDecodeError as e:
-                logger.error(
-                    f"Failed to parse metadata JSON: {e}",
-                    extra={"job_id": str(job_id)}
-                )
-                return None
-        
         # The orchestrator saves metadata as {"scene_plan": scene_plan_dict}
         # Check if we have a nested structure and extract the actual scene_plan dict
         if "scene_plan" in metadata and isinstance(metadata.get("scene_plan"), dict):
@@ -410,73 +357,294 @@ async def load_scene_plan_from_job_stages(job_id: UUID) -> Optional[ScenePlan]:
         return None
 
 
-async def load_reference_images_from_job_stages(job_id: UUID) -> Optional[ReferenceImages]:
+def _parse_reference_images(job_id: UUID, metadata: Optional[Dict[str, Any]]) -> Optional[ReferenceImages]:
+    """Build the ReferenceImages model from reference_generator metadata."""
+    if metadata is None:
+        return None
+    try:
+        reference_images = ReferenceImages(**metadata)
+        logger.debug(
+            f"Successfully loaded reference images from job_stages",
+            extra={"job_id": str(job_id)}
+        )
+        return reference_images
+    except Exception as e:
+        logger.error(
+            f"Failed to reconstruct ReferenceImages model: {e}",
+            extra={"job_id": str(job_id)},
+            exc_info=True
+        )
+        return None
+
+
+def _parse_transitions(
+    job_id: UUID,
+    metadata: Optional[Dict[str, Any]],
+    scene_plan: Optional[ScenePlan]
+) -> List[Transition]:
     """
-    Load ReferenceImages object from job_stages.metadata.
+    Transitions from the scene plan, or straight from scene_planner metadata.
     
-    Args:
-        job_id: Job ID to load reference images for
-        
-    Returns:
-        ReferenceImages object if found, None if stage not found or invalid
+    Metadata structure: {"scene_plan": {"transitions": [...], ...}}
     """
-    try:
-        db = DatabaseClient()
-        result = await db.table("job_stages").select("metadata").eq(
-            "job_id", str(job_id)
-        ).eq("stage_name", "reference_generator").execute()
-        
-        if not result.data or len(result.data) == 0:
+    if scene_plan:
+        return scene_plan.transitions
+    if metadata is None:
+        return []
+    
+    # Fallback: the scene plan didn't validate, but its transitions may
+    scene_plan_data = metadata.get("scene_plan")
+    if isinstance(scene_plan_data, dict) and "transitions" in scene_plan_data:
+        try:
+            transitions = [Transition(**t) for t in scene_plan_data["transitions"]]
             logger.debug(
-                f"No reference_generator stage found for job {job_id}",
-                extra={"job_id": str(job_id)}
+                f"Successfully loaded {len(transitions)} transitions from job_stages",
+                extra={"job_id": str(job_id), "transition_count": len(transitions)}
             )
-            return None
-        
-        metadata = result.data[0].get("metadata")
-        if not metadata:
+            return transitions
+        except Exception as e:
             logger.warning(
-                f"Empty metadata for reference_generator stage, job {job_id}",
+                f"Failed to reconstruct transitions: {e}",
                 extra={"job_id": str(job_id)}
             )
-            return None
-        
-        # Handle JSON string or dict
-        if isinstance(metadata, str):
-            try:
-                metadata = json.loads(metadata)
-            except json.JSONDecodeError as e:
-                logger.error(
-                    f"Failed to parse metadata JSON: {e}",
-                    extra={"job_id": str(job_id)}
-                )
-                return None
-        
-        # Reconstruct Pydantic model
-        try:
-            reference_images = ReferenceImages(**metadata)
+    return []
+
+
+def _parse_beat_timestamps(job_id: UUID, metadata: Optional[Dict[str, Any]]) -> Optional[List[float]]:
+    """
+    Beat timestamps from audio_parser metadata.
+    
+    Metadata structure: {"audio_analysis": {"beat_timestamps": [...], ...}}
+    """
+    if metadata is None:
+        return None
+    
+    # Check if beat_timestamps are nested under audio_analysis
+    audio_analysis = metadata.get("audio_analysis")
+    if isinstance(audio_analysis, dict) and "beat_timestamps" in audio_analysis:
+        beat_timestamps = audio_analysis["beat_timestamps"]
+        if isinstance(beat_timestamps, list) and all(isinstance(ts, (int, float)) for ts in beat_timestamps):
             logger.debug(
-                f"Successfully loaded reference images from job_stages",
-                extra={"job_id": str(job_id)}
-            )
-            return reference_images
-        except Exception as e:
-            logger.error(
-                f"Failed to reconstruct ReferenceImages model: {e}",
-                extra={"job_id": str(job_id)},
-                exc_info=True
+                f"Successfully loaded {len(beat_timestamps)} beat timestamps from job_stages",
+                extra={"job_id": str(job_id), "beat_count": len(beat_timestamps)}
             )
-            return None
+            return [float(ts) for ts in beat_timestamps]
+    
+    # Fallback: Check if beat_timestamps are at top level
+    if "beat_timestamps" in metadata:
+        beat_timestamps = metadata["beat_timestamps"]
+        if isinstance(beat_timestamps, list) and all(isinstance(ts, (int, float)) for ts in beat_timestamps):
+            return [float(ts) for ts in beat_timestamps]
+    
+    return None
+
+
+def _parse_audio_analysis(job_id: UUID, metadata: Optional[Dict[str, Any]]) -> Optional[AudioAnalysis]:
+    """Build the AudioAnalysis model from audio_parser metadata."""
+    if metadata is None:
+        return None
+    
+    # Check if audio_analysis is nested or at top level (copied: the beat parser reads the same blob)
+    audio_data = dict(metadata.get("audio_analysis") or metadata)
+    
+    # Fill in missing required fields
+    if "job_id" not in audio_data:
+        audio_data["job_id"] = str(job_id)
+    
+    # Reconstruct Pydantic model
+    try:
+        audio_analysis = AudioAnalysis(**audio_data)
+        logger.debug(
+            f"Successfully loaded audio analysis from job_stages",
+            extra={"job_id": str(job_id), "bpm": audio_analysis.bpm}
+        )
+        return audio_analysis
+    except Exception as e:
+        logger.error(
+            f"Failed to reconstruct AudioAnalysis model: {e}",
+            extra={
+                "job_id": str(job_id),
+                "audio_data_keys": list(audio_data.keys())
+            },
+            exc_info=True
+        )
+        return None
+
+
+def _parse_artifacts(job_id: UUID, rows: List[Dict[str, Any]]) -> JobArtifacts:
+    """Parse every stage row of a job once."""
+    stage_metadata = {}
+    for row in rows:
+        stage_name = row.get("stage_name")
+        metadata = _decode_metadata(stage_name, row.get("metadata"), job_id)
+        if stage_name and metadata is not None:
+            stage_metadata.setdefault(stage_name, metadata)
+    
+    artifacts = JobArtifacts(job_id=job_id, stage_metadata=stage_metadata)
+    video_metadata = stage_metadata.get("video_generator")
+    scene_metadata = stage_metadata.get("scene_planner")
+    audio_metadata = stage_metadata.get("audio_parser")
+    
+    artifacts.clips = _parse_clips(job_id, video_metadata)
+    artifacts.clip_prompts = _parse_clip_prompts(job_id, stage_metadata.get("prompt_generator"))
+    artifacts.scene_plan = _parse_scene_plan(job_id, scene_metadata)
+    artifacts.reference_images = _parse_reference_images(job_id, stage_metadata.get("reference_generator"))
+    artifacts.transitions = _parse_transitions(job_id, scene_metadata, artifacts.scene_plan)
+    artifacts.beat_timestamps = _parse_beat_timestamps(job_id, audio_metadata)
+    artifacts.audio_analysis = _parse_audio_analysis(job_id, audio_metadata)
+    if video_metadata and video_metadata.get("aspect_ratio"):
+        artifacts.aspect_ratio = video_metadata["aspect_ratio"]
+    return artifacts
+
+
+async def _get_job_version(job_id: UUID) -> Optional[str]:
+    """Job status version (bumped by every stage write), None if unknown."""
+    from api_gateway.services.job_status_store import get_job_status_version
+    try:
+        version = await get_job_status_version(str(job_id))
+    except Exception as e:
+        logger.debug(f"Job version unavailable, not memoizing artifacts: {e}", extra={"job_id": str(job_id)})
+        return None
+    # "0" means the version key expired (or never existed); a later write could
+    # recreate the same number, so don't memoize against it
+    return version if version != "0" else None
+
+
+async def load_job_artifacts(job_id: UUID) -> JobArtifacts:
+    """
+    Load every job_stages artifact of a job with one query.
+    
+    Memoized while the job's status version is unchanged; any stage write bumps
+    the version, so the next call reloads. Callers must not mutate the returned
+    models (the per-artifact loaders hand out copies).
+    
+    Args:
+        job_id: Job ID to load artifacts for
+        
+    Returns:
+        JobArtifacts (artifacts that are missing or invalid are None / empty)
         
+    Raises:
+        Exception: If the job_stages query fails
+    """
+    key = str(job_id)
+    version = await _get_job_version(job_id)
+    
+    cached = _artifacts_cache.get(key)
+    if cached is not None and version is not None:
+        cached_version, loaded_at, artifacts = cached
+        if cached_version == version and time.monotonic() - loaded_at < ARTIFACTS_CACHE_TTL_SECONDS:
+            _artifacts_cache.move_to_end(key)
+            return artifacts
+    
+    db = DatabaseClient()
+    result = await db.table("job_stages").select("stage_name, metadata").eq(
+        "job_id", key
+    ).execute()
+    
+    artifacts = _parse_artifacts(job_id, result.data or [])
+    logger.debug(
+        f"Loaded job artifacts from {len(result.data or [])} stages",
+        extra={"job_id": key, "stages": list(artifacts.stage_metadata)}
+    )
+    
+    _artifacts_cache.pop(key, None)
+    if version is not None:
+        _artifacts_cache[key] = (version, time.monotonic(), artifacts)
+        while len(_artifacts_cache) > ARTIFACTS_CACHE_SIZE:
+            _artifacts_cache.popitem(last=False)
+    return artifacts
+
+
+def invalidate_job_artifacts(job_id: UUID) -> None:
+    """
+    Drop a job's memoized artifacts in this process.
+    
+    Stage writes already invalidate through the job status version; use this
+    after writes that bypass it.
+    
+    Args:
+        job_id: Job ID
+    """
+    _artifacts_cache.pop(str(job_id), None)
+
+
+async def _load_artifacts_or_none(job_id: UUID, artifact: str) -> Optional[JobArtifacts]:
+    try:
+        return await load_job_artifacts(job_id)
     except Exception as e:
         logger.error(
-            f"Failed to load reference images from job_stages: {e}",
+            f"Failed to load {artifact} from job_stages: {e}",
             extra={"job_id": str(job_id)},
             exc_info=True
         )
         return None
 
 
+def _copy(model):
+    return model.model_copy(deep=True) if model is not None else None
+
+
+async def load_clips_from_job_stages(job_id: UUID) -> Optional[Clips]:
+    """
+    Load Clips object from job_stages.metadata.
+    
+    Metadata structure: {"clips": {"clips": [...], "total_clips": 6, ...}}
+    
+    Args:
+        job_id: Job ID to load clips for
+        
+    Returns:
+        Clips object if found, None if stage not found or invalid
+    """
+    artifacts = await _load_artifacts_or_none(job_id, "clips")
+    return _copy(artifacts.clips) if artifacts else None
+
+
+async def load_clip_prompts_from_job_stages(job_id: UUID) -> Optional[ClipPrompts]:
+    """
+    Load ClipPrompts object from job_stages.metadata.
+    
+    Args:
+        job_id: Job ID to load prompts for
+        
+    Returns:
+        ClipPrompts object if found, None if stage not found or invalid
+    """
+    artifacts = await _load_artifacts_or_none(job_id, "clip prompts")
+    return _copy(artifacts.clip_prompts) if artifacts else None
+
+
+async def load_scene_plan_from_job_stages(job_id: UUID) -> Optional[ScenePlan]:
+    """
+    Load ScenePlan object from job_stages.metadata.
+    
+    Metadata structure: {"scene_plan": {"job_id": ..., "video_summary": ..., ...}}
+    
+    Args:
+        job_id: Job ID to load scene plan for
+        
+    Returns:
+        ScenePlan object if found, None if stage not found or invalid
+    """
+    artifacts = await _load_artifacts_or_none(job_id, "scene plan")
+    return _copy(artifacts.scene_plan) if artifacts else None
+
+
+async def load_reference_images_from_job_stages(job_id: UUID) -> Optional[ReferenceImages]:
+    """
+    Load ReferenceImages object from job_stages.metadata.
+    
+    Args:
+        job_id: Job ID to load reference images for
+        
+    Returns:
+        ReferenceImages object if found, None if stage not found or invalid
+    """
+    artifacts = await _load_artifacts_or_none(job_id, "reference images")
+    return _copy(artifacts.reference_images) if artifacts else None
+
+
 async def load_transitions_from_job_stages(job_id: UUID) -> List[Transition]:
     """
     Load transitions from job_stages.metadata (scene_planner stage).
@@ -490,62 +658,8 @@ async def load_transitions_from_job_stages(job_id: UUID) -> List[Transition]:
     Returns:
         List of Transition objects if found, empty list if not found or invalid
     """
-    try:
-        scene_plan = await load_scene_plan_from_job_stages(job_id)
-        if scene_plan:
-            return scene_plan.transitions
-        
-        # Fallback: Try to load directly from metadata
-        db = DatabaseClient()
-        result = await db.table("job_stages").select("metadata").eq(
-            "job_id", str(job_id)
-        ).eq("stage_name", "scene_planner").execute()
-        
-        if not result.data or len(result.data) == 0:
-            logger.debug(
-                f"No scene_planner stage found for job {job_id}",
-                extra={"job_id": str(job_id)}
-            )
-            return []
-        
-        metadata = result.data[0].get("metadata")
-        if not metadata:
-            return []
-        
-        # Handle JSON string or dict
-        if isinstance(metadata, str):
-            try:
-                metadata = json.loads(metadata)
-            except json.JSONDecodeError:
-                return []
-        
-        # Check if transitions are nested under scene_plan
-        scene_plan_data = metadata.get("scene_plan")
-        if scene_plan_data and "transitions" in scene_plan_data:
-            transitions_data = scene_plan_data["transitions"]
-            try:
-                transitions = [Transition(**t) for t in transitions_data]
-                logger.debug(
-                    f"Successfully loaded {len(transitions)} transitions from job_stages",
-                    extra={"job_id": str(job_id), "transition_count": len(transitions)}
-                )
-                return transitions
-            except Exception as e:
-                logger.warning(
-                    f"Failed to reconstruct transitions: {e}",
-                    extra={"job_id": str(job_id)}
-                )
-                return []
-        
-        return []
-        
-    except Exception as e:
-        logger.error(
-            f"Failed to load transitions from job_stages: {e}",
-            extra={"job_id": str(job_id)},
-            exc_info=True
-        )
-        return []
+    artifacts = await _load_artifacts_or_none(job_id, "transitions")
+    return [_copy(transition) for transition in artifacts.transitions] if artifacts else []
 
 
 async def load_beat_timestamps_from_job_stages(job_id: UUID) -> Optional[List[float]]:
@@ -561,60 +675,10 @@ async def load_beat_timestamps_from_job_stages(job_id: UUID) -> Optional[List[fl
     Returns:
         List of beat timestamps (floats) if found, None if not found or invalid
     """
-    try:
-        db = DatabaseClient()
-        result = await db.table("job_stages").select("metadata").eq(
-            "job_id", str(job_id)
-        ).eq("stage_name", "audio_parser").execute()
-        
-        if not result.data or len(result.data) == 0:
-            logger.debug(
-                f"No audio_parser stage found for job {job_id}",
-                extra={"job_id": str(job_id)}
-            )
-            return None
-        
-        metadata = result.data[0].get("metadata")
-        if not metadata:
-            return None
-        
-        # Handle JSON string or dict
-        if isinstance(metadata, str):
-            try:
-                metadata = json.loads(metadata)
-            except json.JSONDecodeError as e:
-                logger.error(
-                    f"Failed to parse metadata JSON: {e}",
-                    extra={"job_id": str(job_id)}
-                )
-                return None
-        
-        # Check if beat_timestamps are nested under audio_analysis
-        audio_analysis = metadata.get("audio_analysis")
-        if audio_analysis and "beat_timestamps" in audio_analysis:
-            beat_timestamps = audio_analysis["beat_timestamps"]
-            if isinstance(beat_timestamps, list) and all(isinstance(ts, (int, float)) for ts in beat_timestamps):
-                logger.debug(
-                    f"Successfully loaded {len(beat_timestamps)} beat timestamps from job_stages",
-                    extra={"job_id": str(job_id), "beat_count": len(beat_timestamps)}
-                )
-                return [float(ts) for ts in beat_timestamps]
-        
-        # Fallback: Check if beat_timestamps are at top level
-        if "beat_timestamps" in metadata:
-            beat_timestamps = metadata["beat_timestamps"]
-            if isinstance(beat_timestamps, list) and all(isinstance(ts, (int, float)) for ts in beat_timestamps):
-                return [float(ts) for ts in beat_timestamps]
-        
-        return None
-        
-    except Exception as e:
-        logger.error(
-            f"Failed to load beat timestamps from job_stages: {e}",
-            extra={"job_id": str(job_id)},
-            exc_info=True
-        )
+    artifacts = await _load_artifacts_or_none(job_id, "beat timestamps")
+    if not artifacts or artifacts.beat_timestamps is None:
         return None
+    return list(artifacts.beat_timestamps)
 
 
 async def get_audio_url(job_id: UUID) -> str:
@@ -678,74 +742,8 @@ async def load_audio_data_from_job_stages(job_id: UUID) -> Optional[AudioAnalysi
     Returns:
         AudioAnalysis object if found, None if stage not found or invalid
     """
-    try:
-        db = DatabaseClient()
-        result = await db.table("job_stages").select("metadata").eq(
-            "job_id", str(job_id)
-        ).eq("stage_name", "audio_parser").execute()
-        
-        if not result.data or len(result.data) == 0:
-            logger.debug(
-                f"No audio_parser stage found for job {job_id}",
-                extra={"job_id": str(job_id)}
-            )
-            return None
-        
-        metadata = result.data[0].get("metadata")
-        if not metadata:
-            logger.warning(
-                f"Empty metadata for audio_parser stage, job {job_id}",
-                extra={"job_id": str(job_id)}
-            )
-            return None
-        
-        # Handle JSON string or dict
-        if isinstance(metadata, str):
-            try:
-                metadata = json.loads(metadata)
-            except json.JSONDecodeError as e:
-                logger.error(
-                    f"Failed to parse metadata JSON: {e}",
-                    extra={"job_id": str(job_id)}
-                )
-                return None
-        
-        # Check if audio_analysis is nested or at top level
-        audio_data = metadata.get("audio_analysis")
-        if not audio_data:
-            # Try top level
-            audio_data = metadata
-        
-        # Fill in missing required fields
-        if "job_id" not in audio_data:
-            audio_data["job_id"] = str(job_id)
-        
-        # Reconstruct Pydantic model
-        try:
-            audio_analysis = AudioAnalysis(**audio_data)
-            logger.debug(
-                f"Successfully loaded audio analysis from job_stages",
-                extra={"job_id": str(job_id), "bpm": audio_analysis.bpm}
-            )
-            return audio_analysis
-        except Exception as e:
-            logger.error(
-                f"Failed to reconstruct AudioAnalysis model: {e}",
-                extra={
-                    "job_id": str(job_id),
-                    "audio_data_keys": list(audio_data.keys()) if isinstance(audio_data, dict) else "not_a_dict"
-                },
-                exc_info=True
-            )
-            return None
-        
-    except Exception as e:
-        logger.error(
-            f"Failed to load audio data from job_stages: {e}",
-            extra={"job_id": str(job_id)},
-            exc_info=True
-        )
-        return None
+    artifacts = await _load_artifacts_or_none(job_id, "audio data")
+    return _copy(artifacts.audio_analysis) if artifacts else None
 
 
 async def get_aspect_ratio(job_id: UUID) -> str:
@@ -761,36 +759,7 @@ async def get_aspect_ratio(job_id: UUID) -> str:
         Aspect ratio string (default: "16:9")
     """
     try:
-        # Try to get from job_stages metadata (video_generator stage)
-        db = DatabaseClient()
-        result = await db.table("job_stages").select("metadata").eq(
-            "job_id", str(job_id)
-        ).eq("stage_name", "video_generator").execute()
-        
-        if result.data and len(result.data) > 0:
-            metadata = result.data[0].get("metadata")
-            if isinstance(metadata, str):
-                try:
-                    metadata = json.loads(metadata)
-                except json.JSONDecodeError:
-                    pass
-            
-            if isinstance(metadata, dict):
-                aspect_ratio = metadata.get("aspect_ratio")
-                if aspect_ratio:
-                    logger.debug(
-                        f"Successfully loaded aspect ratio from job_stages",
-                        extra={"job_id": str(job_id), "aspect_ratio": aspect_ratio}
-                    )
-                    return aspect_ratio
-        
-        # Fallback to default
-        logger.debug(
-            f"Aspect ratio not found, using default 16:9",
-            extra={"job_id": str(job_id)}
-        )
-        return "16:9"
-        
+        return (await load_job_artifacts(job_id)).aspect_ratio
     except Exception as e:
         logger.warning(
             f"Failed to load aspect ratio: {e}, using default 16:9",
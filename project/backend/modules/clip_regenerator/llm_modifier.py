@@ -17,11 +17,15 @@ from openai import APIError, RateLimitError, APITimeoutError
 from shared.config import settings
 from shared.cost_tracking import cost_tracker
 from shared.errors import GenerationError, RetryableError
+from shared.llm_cache import llm_cache
 from shared.logging import get_logger
 from shared.retry import retry_with_backoff
 
 logger = get_logger("clip_regenerator.llm_modifier")
 
+# Cached modifications, suggestions and style extractions are reused for a day
+LLM_CACHE_TTL_SECONDS = 86400
+
 
 # Initialize OpenAI client
 _openai_client: Optional[AsyncOpenAI] = None
@@ -430,7 +434,12 @@ async def modify_prompt_with_llm(
         # Call OpenAI API
         client = get_openai_client()
         
-        response = await client.chat.completions.create(
+        completion = await llm_cache.complete(
+            client,
+            stage_name="clip_regeneration",
+            job_id=job_id,
+            cost_fn=_calculate_llm_cost,
+            ttl=LLM_CACHE_TTL_SECONDS,
             model=model,
             messages=[
                 {"role": "system", "content": system_prompt},
@@ -443,7 +452,7 @@ async def modify_prompt_with_llm(
         )
         
         # Extract response
-        content = response.choices[0].message.content
+        content = completion.content
         if not content:
             raise GenerationError("Empty response from LLM", job_id=job_id)
         
@@ -534,10 +543,10 @@ async def modify_prompt_with_llm(
                 reasoning
             )
         
-        # Track cost
-        if job_id:
-            input_tokens = response.usage.prompt_tokens
-            output_tokens = response.usage.completion_tokens
+        # Track cost (cached modifications were free; the LLM cache records the saving)
+        if job_id and not completion.cached:
+            input_tokens = completion.input_tokens
+            output_tokens = completion.output_tokens
             cost = _calculate_llm_cost(model, input_tokens, output_tokens)
             
             await cost_tracker.track_cost(
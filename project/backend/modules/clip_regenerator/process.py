@@ -25,9 +25,10 @@ from modules.clip_regenerator.data_loader import (
     load_transitions_from_job_stages,
     load_beat_timestamps_from_job_stages,
     get_audio_url,
-    get_aspect_ratio
+    get_aspect_ratio,
+    invalidate_job_artifacts,
+    load_job_artifacts
 )
-from modules.lipsync_processor.process import process_single_clip_lipsync
 from modules.clip_regenerator.template_matcher import match_template, apply_template, is_lipsync_request
 from modules.clip_regenerator.llm_modifier import modify_prompt_with_llm, estimate_llm_cost
 from modules.clip_regenerator.context_builder import build_llm_context
@@ -712,20 +713,12 @@ async def _get_job_config(job_id: UUID) -> Dict[str, str]:
     Returns:
         Dictionary with video_model and aspect_ratio
     """
-    db = DatabaseClient()
-    
-    # Try to get from job_stages metadata (video_generator stage)
+    # Try to get from job_stages metadata (video_generator stage, shared with the other loaders)
     try:
-        result = await db.table("job_stages").select("metadata").eq(
-            "job_id", str(job_id)
-        ).eq("stage_name", "video_generator").execute()
+        artifacts = await load_job_artifacts(job_id)
+        metadata = artifacts.stage_metadata.get("video_generator")
         
-        if result.data and len(result.data) > 0:
-            metadata = result.data[0].get("metadata")
-            if isinstance(metadata, str):
-                import json
-                metadata = json.loads(metadata)
-            
+        if metadata:
             # Check if video_model and aspect_ratio are in metadata
             video_model = metadata.get("video_model") or metadata.get("model")
             aspect_ratio = metadata.get("aspect_ratio")
@@ -1022,7 +1015,9 @@ async def regenerate_clip(
                     }
                 )
         
-        # Process through lipsync processor
+        # Process through lipsync processor (imported here: lipsync_processor imports
+        # clip_regenerator.data_loader, so a module-level import would be circular)
+        from modules.lipsync_processor.process import process_single_clip_lipsync
         lipsynced_clip = await process_single_clip_lipsync(
             clip=original_clip,
             clip_index=clip_index,
@@ -2458,8 +2453,8 @@ async def regenerate_clip_with_recomposition(
             }
         )
         
-        # Pass changed_clip_index to composer for potential optimization
-        # (Currently composer doesn't use this, but it's available for future optimization)
+        # Unchanged clips come from the composer's normalized segment cache, so only
+        # the regenerated clip is normalized; everything else is stream copied
         video_output = await composer_process(
             job_id=str(job_id),
             clips=updated_clips_obj,
@@ -2615,6 +2610,8 @@ async def regenerate_clip_with_recomposition(
         status="completed",
         video_url=video_output.video_url
     )
+    # New clip versions and the recomposed video were written outside the stage writes
+    invalidate_job_artifacts(job_id)
     
     # Verify the update worked
     try:
@@ -2839,7 +2836,7 @@ async def recompose_after_regenerations(
             transitions=transitions,
             beat_timestamps=beat_timestamps,
             aspect_ratio=aspect_ratio,
-            changed_clip_index=None  # Multiple clips changed
+            changed_clip_index=None  # Multiple clips changed (unchanged ones still hit the segment cache)
         )
         
         logger.info(
@@ -2933,6 +2930,7 @@ async def recompose_after_regenerations(
             status="completed",
             video_url=video_output.video_url
         )
+        invalidate_job_artifacts(job_id)
     except Exception as e:
         logger.error(
             f"Failed to update job status/URL: {e}",
@@ -9,6 +9,7 @@ from uuid import UUID
 from shared.database import DatabaseClient
 from shared.logging import get_logger
 from shared.errors import ValidationError
+from api_gateway.services.job_status_store import patch_job_status
 
 logger = get_logger("clip_regenerator.status_manager")
 
@@ -153,6 +154,8 @@ async def acquire_job_lock(job_id: UUID) -> bool:
             )
             return False
         
+        await patch_job_status(str(job_id), {"status": "regenerating"})
+        
         logger.info(
             f"Successfully acquired lock for job {job_id}",
             extra={"job_id": str(job_id), "previous_status": current_status}
@@ -381,6 +384,7 @@ async def update_job_status(
     
     try:
         await db_client.table("jobs").update(update_data).eq("id", str(job_id)).execute()
+        await patch_job_status(str(job_id), update_data)
         
         logger.info(
             f"Updated job status to '{status}'",
@@ -7,8 +7,13 @@ import json
 from typing import List, Optional
 from pydantic import BaseModel, Field
 
+from shared.llm_cache import llm_cache
 from shared.logging import get_logger
-from modules.clip_regenerator.llm_modifier import get_openai_client
+from modules.clip_regenerator.llm_modifier import (
+    LLM_CACHE_TTL_SECONDS,
+    _calculate_llm_cost,
+    get_openai_client
+)
 
 logger = get_logger("clip_regenerator.style_analyzer")
 
@@ -122,7 +127,11 @@ Do not include any explanation or markdown formatting, only the JSON object."""
 
     try:
         client = get_openai_client()
-        response = await client.chat.completions.create(
+        completion = await llm_cache.complete(
+            client,
+            stage_name="clip_regeneration",
+            cost_fn=_calculate_llm_cost,
+            ttl=LLM_CACHE_TTL_SECONDS,
             model="gpt-4o",
             messages=[
                 {"role": "system", "content": "You are a video style analyzer. Extract visual style keywords from prompts and return only valid JSON."},
@@ -132,7 +141,7 @@ Do not include any explanation or markdown formatting, only the JSON object."""
             temperature=0.3
         )
         
-        content = response.choices[0].message.content.strip()
+        content = completion.content.strip()
         
         # Remove markdown code blocks if present
         if content.startswith("```"):
@@ -153,6 +162,7 @@ Do not include any explanation or markdown formatting, only the JSON object."""
             f"Failed to parse LLM response as JSON",
             extra={"error": str(e), "response": content[:200]}
         )
+        await llm_cache.discard(completion)
         # Return empty keywords on parse failure
         return StyleKeywords()
     except Exception as e:
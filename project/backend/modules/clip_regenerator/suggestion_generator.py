@@ -7,13 +7,18 @@ from typing import List, Dict, Any, Optional
 from uuid import UUID
 from pydantic import BaseModel, Field
 
+from shared.llm_cache import llm_cache
 from shared.logging import get_logger
 from modules.clip_regenerator.data_loader import (
     load_clips_from_job_stages,
     load_clip_prompts_from_job_stages,
     load_audio_data_from_job_stages
 )
-from modules.clip_regenerator.llm_modifier import get_openai_client
+from modules.clip_regenerator.llm_modifier import (
+    LLM_CACHE_TTL_SECONDS,
+    _calculate_llm_cost,
+    get_openai_client
+)
 
 logger = get_logger("clip_regenerator.suggestion_generator")
 
@@ -97,7 +102,7 @@ async def generate_suggestions(
     }
     
     # Generate suggestions with LLM
-    suggestions = await call_llm_for_suggestions(context)
+    suggestions = await call_llm_for_suggestions(context, job_id=job_id)
     
     logger.info(
         f"Generated {len(suggestions)} suggestions",
@@ -107,12 +112,16 @@ async def generate_suggestions(
     return suggestions
 
 
-async def call_llm_for_suggestions(context: Dict[str, Any]) -> List[Suggestion]:
+async def call_llm_for_suggestions(
+    context: Dict[str, Any],
+    job_id: Optional[UUID] = None
+) -> List[Suggestion]:
     """
     Call LLM to generate suggestions.
     
     Args:
         context: Context dictionary with clip_prompt, other_clips, audio_context
+        job_id: Optional job ID (credited with the saved cost on an LLM cache hit)
         
     Returns:
         List of Suggestion objects
@@ -166,7 +175,12 @@ Do not include any explanation or markdown formatting, only the JSON array."""
 
     try:
         client = get_openai_client()
-        response = await client.chat.completions.create(
+        completion = await llm_cache.complete(
+            client,
+            stage_name="clip_regeneration",
+            job_id=job_id,
+            cost_fn=_calculate_llm_cost,
+            ttl=LLM_CACHE_TTL_SECONDS,
             model="gpt-4o",
             messages=[
                 {"role": "system", "content": "You are a video editing assistant. Analyze clips and suggest improvements. Return only valid JSON arrays."},
@@ -176,7 +190,7 @@ Do not include any explanation or markdown formatting, only the JSON array."""
             temperature=0.7
         )
         
-        content = response.choices[0].message.content.strip()
+        content = completion.content.strip()
         
         # Remove markdown code blocks if present
         if content.startswith("```"):
@@ -197,6 +211,7 @@ Do not include any explanation or markdown formatting, only the JSON array."""
             f"Failed to parse LLM response as JSON",
             extra={"error": str(e), "response": content[:200]}
         )
+        await llm_cache.discard(completion)
         return []
     except Exception as e:
         logger.error(
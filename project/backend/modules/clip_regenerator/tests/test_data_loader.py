@@ -9,16 +9,27 @@ from uuid import UUID, uuid4
 from unittest.mock import AsyncMock, MagicMock, patch
 from decimal import Decimal
 
+from modules.clip_regenerator import data_loader
 from modules.clip_regenerator.data_loader import (
     load_clips_from_job_stages,
     load_clip_prompts_from_job_stages,
     load_scene_plan_from_job_stages,
-    load_reference_images_from_job_stages
+    load_reference_images_from_job_stages,
+    load_job_artifacts
 )
 from shared.models.video import Clips, Clip, ClipPrompts, ClipPrompt
 from shared.models.scene import ScenePlan, ReferenceImages
 
 
+@pytest.fixture(autouse=True)
+def no_artifacts_memo():
+    """Each test reads from its mocked database (no job version, so nothing is memoized)."""
+    data_loader._artifacts_cache.clear()
+    with patch("modules.clip_regenerator.data_loader._get_job_version", new=AsyncMock(return_value=None)):
+        yield
+    data_loader._artifacts_cache.clear()
+
+
 @pytest.fixture
 def sample_job_id():
     """Sample job ID for testing."""
@@ -107,7 +118,7 @@ async def test_load_clips_from_job_stages_success(sample_job_id, sample_clips_me
     """Test loading clips with valid metadata."""
     # Mock database response
     mock_result = MagicMock()
-    mock_result.data = [{"metadata": sample_clips_metadata}]
+    mock_result.data = [{"stage_name": "video_generator", "metadata": sample_clips_metadata}]
     
     mock_table = mock_database_client.table.return_value
     mock_table.execute = AsyncMock(return_value=mock_result)
@@ -145,7 +156,7 @@ async def test_load_clips_from_job_stages_invalid_json(sample_job_id, mock_datab
     """Test loading clips with invalid JSON metadata."""
     # Mock database response with invalid JSON string
     mock_result = MagicMock()
-    mock_result.data = [{"metadata": "invalid json {["}]
+    mock_result.data = [{"stage_name": "video_generator", "metadata": "invalid json {["}]
     
     mock_table = mock_database_client.table.return_value
     mock_table.execute = AsyncMock(return_value=mock_result)
@@ -161,7 +172,7 @@ async def test_load_clips_from_job_stages_missing_clips_key(sample_job_id, mock_
     """Test loading clips when metadata doesn't have clips key."""
     # Mock database response with metadata missing clips
     mock_result = MagicMock()
-    mock_result.data = [{"metadata": {"other_data": "value"}}]
+    mock_result.data = [{"stage_name": "video_generator", "metadata": {"other_data": "value"}}]
     
     mock_table = mock_database_client.table.return_value
     mock_table.execute = AsyncMock(return_value=mock_result)
@@ -183,7 +194,7 @@ async def test_load_clips_from_job_stages_pydantic_validation_error(sample_job_i
     }
     
     mock_result = MagicMock()
-    mock_result.data = [{"metadata": invalid_metadata}]
+    mock_result.data = [{"stage_name": "video_generator", "metadata": invalid_metadata}]
     
     mock_table = mock_database_client.table.return_value
     mock_table.execute = AsyncMock(return_value=mock_result)
@@ -199,7 +210,7 @@ async def test_load_clips_from_job_stages_json_string(sample_job_id, sample_clip
     """Test loading clips when metadata is JSON string."""
     # Mock database response with JSON string metadata
     mock_result = MagicMock()
-    mock_result.data = [{"metadata": json.dumps(sample_clips_metadata)}]
+    mock_result.data = [{"stage_name": "video_generator", "metadata": json.dumps(sample_clips_metadata)}]
     
     mock_table = mock_database_client.table.return_value
     mock_table.execute = AsyncMock(return_value=mock_result)
@@ -217,7 +228,7 @@ async def test_load_clip_prompts_from_job_stages_success(sample_job_id, sample_c
     """Test loading clip prompts with valid metadata."""
     # Mock database response
     mock_result = MagicMock()
-    mock_result.data = [{"metadata": sample_clip_prompts_metadata}]
+    mock_result.data = [{"stage_name": "prompt_generator", "metadata": sample_clip_prompts_metadata}]
     
     mock_table = mock_database_client.table.return_value
     mock_table.execute = AsyncMock(return_value=mock_result)
@@ -237,7 +248,7 @@ async def test_load_clip_prompts_from_job_stages_nested_structure(sample_job_id,
     # Mock database response with nested structure: {"clip_prompts": {...}}
     nested_metadata = {"clip_prompts": sample_clip_prompts_metadata}
     mock_result = MagicMock()
-    mock_result.data = [{"metadata": nested_metadata}]
+    mock_result.data = [{"stage_name": "prompt_generator", "metadata": nested_metadata}]
     
     mock_table = mock_database_client.table.return_value
     mock_table.execute = AsyncMock(return_value=mock_result)
@@ -291,7 +302,7 @@ async def test_load_scene_plan_from_job_stages_success(sample_job_id, mock_datab
     
     # Mock database response
     mock_result = MagicMock()
-    mock_result.data = [{"metadata": scene_plan_metadata}]
+    mock_result.data = [{"stage_name": "scene_planner", "metadata": scene_plan_metadata}]
     
     mock_table = mock_database_client.table.return_value
     mock_table.execute = AsyncMock(return_value=mock_result)
@@ -319,7 +330,7 @@ async def test_load_reference_images_from_job_stages_success(sample_job_id, mock
     
     # Mock database response
     mock_result = MagicMock()
-    mock_result.data = [{"metadata": reference_images_metadata}]
+    mock_result.data = [{"stage_name": "reference_generator", "metadata": reference_images_metadata}]
     
     mock_table = mock_database_client.table.return_value
     mock_table.execute = AsyncMock(return_value=mock_result)
@@ -336,7 +347,7 @@ async def test_load_clips_nested_structure(sample_job_id, sample_clips_metadata,
     """Test that nested structure metadata['clips']['clips'] is correctly accessed."""
     # Mock database response
     mock_result = MagicMock()
-    mock_result.data = [{"metadata": sample_clips_metadata}]
+    mock_result.data = [{"stage_name": "video_generator", "metadata": sample_clips_metadata}]
     
     mock_table = mock_database_client.table.return_value
     mock_table.execute = AsyncMock(return_value=mock_result)
@@ -350,3 +361,58 @@ async def test_load_clips_nested_structure(sample_job_id, sample_clips_metadata,
     assert clips.clips[0].clip_index == 0
     assert clips.clips[1].clip_index == 1
 
+
+@pytest.mark.asyncio
+async def test_load_job_artifacts_single_query(sample_job_id, sample_clips_metadata, sample_clip_prompts_metadata, mock_database_client):
+    """All stage rows come from one query and each blob is parsed once."""
+    mock_result = MagicMock()
+    mock_result.data = [
+        {"stage_name": "video_generator", "metadata": json.dumps({**sample_clips_metadata, "aspect_ratio": "9:16"})},
+        {"stage_name": "prompt_generator", "metadata": sample_clip_prompts_metadata},
+        {"stage_name": "audio_parser", "metadata": {"audio_analysis": {"beat_timestamps": [0.5, 1, 1.5]}}},
+        {"stage_name": "composer", "metadata": None},
+    ]
+    
+    mock_table = mock_database_client.table.return_value
+    mock_table.execute = AsyncMock(return_value=mock_result)
+    
+    with patch("modules.clip_regenerator.data_loader.DatabaseClient", return_value=mock_database_client):
+        artifacts = await load_job_artifacts(sample_job_id)
+    
+    mock_table.execute.assert_awaited_once()
+    mock_table.eq.assert_called_once_with("job_id", str(sample_job_id))
+    assert len(artifacts.clips.clips) == 2
+    assert artifacts.clip_prompts.total_clips == 1
+    assert artifacts.scene_plan is None and artifacts.transitions == []
+    assert artifacts.beat_timestamps == [0.5, 1.0, 1.5]
+    assert artifacts.aspect_ratio == "9:16"
+    assert set(artifacts.stage_metadata) == {"video_generator", "prompt_generator", "audio_parser"}
+
+
+@pytest.mark.asyncio
+async def test_loaders_share_memoized_artifacts(sample_job_id, sample_clips_metadata, sample_clip_prompts_metadata, mock_database_client):
+    """Loaders reuse one load while the job version is unchanged, and reload after a stage write."""
+    mock_result = MagicMock()
+    mock_result.data = [
+        {"stage_name": "video_generator", "metadata": sample_clips_metadata},
+        {"stage_name": "prompt_generator", "metadata": sample_clip_prompts_metadata},
+    ]
+    
+    mock_table = mock_database_client.table.return_value
+    mock_table.execute = AsyncMock(return_value=mock_result)
+    version = AsyncMock(return_value="7")
+    
+    with patch("modules.clip_regenerator.data_loader.DatabaseClient", return_value=mock_database_client), \
+         patch("modules.clip_regenerator.data_loader._get_job_version", new=version):
+        clips = await load_clips_from_job_stages(sample_job_id)
+        await load_clip_prompts_from_job_stages(sample_job_id)
+        await load_clips_from_job_stages(sample_job_id)
+        assert mock_table.execute.await_count == 1
+        
+        # Copies are handed out, so callers can't corrupt the memoized models
+        clips.clips[0].video_url = "https://changed"
+        assert (await load_clips_from_job_stages(sample_job_id)).clips[0].video_url != "https://changed"
+        
+        version.return_value = "8"  # A stage was written
+        await load_clips_from_job_stages(sample_job_id)
+        assert mock_table.execute.await_count == 2
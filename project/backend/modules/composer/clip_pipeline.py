@@ -0,0 +1,107 @@
+"""
+Pipelined clip preparation for composer module.
+
+Downloads and normalizes each clip as soon as the video generator finishes it,
+so normalization overlaps with the clips still rendering on Replicate and the
+final composition only has to trim, concatenate and mux audio.
+"""
+import asyncio
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional
+from uuid import UUID
+
+from shared.logging import get_logger
+
+from .config import get_output_dimensions_from_aspect_ratio, MAX_CONCURRENT_NORMALIZATIONS
+from .downloader import download_clip
+from .normalizer import normalize_clip
+
+logger = get_logger("composer.clip_pipeline")
+
+
+class ClipPipeline:
+    """
+    Background download + normalization of clips, keyed by video URL.
+
+    Call submit() from the video generator's completion callback, pass the
+    pipeline to composer.process(), then close() once composition is done.
+    Clips are keyed by URL, so a clip replaced later (e.g. by lipsync) is
+    simply prepared inline by the composer instead.
+    """
+
+    def __init__(self, job_id: UUID, aspect_ratio: str = "16:9"):
+        self.job_id = job_id
+        try:
+            self.output_width, self.output_height = get_output_dimensions_from_aspect_ratio(aspect_ratio)
+        except ValueError:
+            self.output_width, self.output_height = 1920, 1080
+        self.temp_dir = Path(tempfile.mkdtemp(prefix=f"composer_pipeline_{job_id}_"))
+        self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_NORMALIZATIONS)
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def submit(self, clip_index: int, video_url: str) -> None:
+        """
+        Start preparing a finished clip in the background.
+
+        Args:
+            clip_index: Clip index (for file naming and logging)
+            video_url: Clip video URL in Supabase Storage
+        """
+        if not video_url or video_url in self._tasks:
+            return
+        self._tasks[video_url] = asyncio.create_task(self._prepare(clip_index, video_url))
+        logger.info(
+            f"Queued clip {clip_index} for pipelined normalization",
+            extra={"job_id": str(self.job_id), "clip_index": clip_index, "queued": len(self._tasks)}
+        )
+
+    async def _prepare(self, clip_index: int, video_url: str) -> Path:
+        """Download and normalize one clip (bounded by MAX_CONCURRENT_NORMALIZATIONS)."""
+        async with self._semaphore:
+            clip_path = await download_clip(video_url, clip_index, self.temp_dir, self.job_id)
+            return await normalize_clip(
+                clip_path, clip_index, self.temp_dir, self.job_id, self.output_width, self.output_height
+            )
+
+    def matches(self, output_width: int, output_height: int) -> bool:
+        """Whether prepared clips were normalized to the given output size."""
+        return (self.output_width, self.output_height) == (output_width, output_height)
+
+    async def get_normalized(self, video_url: str) -> Optional[Path]:
+        """
+        Wait for a submitted clip and return its normalized path.
+
+        Args:
+            video_url: Clip video URL
+
+        Returns:
+            Normalized clip path, or None if the clip was never submitted or
+            its preparation failed (the composer then prepares it inline)
+        """
+        task = self._tasks.get(video_url)
+        if task is None:
+            return None
+        try:
+            return await task
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(
+                f"Pipelined normalization failed, composer will retry inline: {e}",
+                extra={"job_id": str(self.job_id), "video_url": video_url}
+            )
+            return None
+
+    async def close(self) -> None:
+        """Cancel outstanding work and delete the pipeline's temp directory."""
+        pending = [task for task in self._tasks.values() if not task.done()]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        # Retrieve exceptions of failed tasks nobody awaited (avoids "never retrieved" warnings)
+        for task in self._tasks.values():
+            if task.done() and not task.cancelled():
+                task.exception()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
@@ -25,6 +25,23 @@ FFMPEG_CRF = int(os.getenv("FFMPEG_CRF", "23"))  # High quality
 # With 5 concurrent processes × 4 threads each = 20 threads max (safe for most systems)
 MAX_CONCURRENT_NORMALIZATIONS = int(os.getenv("MAX_CONCURRENT_NORMALIZATIONS", "5"))
 
+# Clip downloads stream straight to the composer temp directory in chunks,
+# so peak memory per composition is bounded by chunk size, not total video size
+MAX_CONCURRENT_DOWNLOADS = int(os.getenv("MAX_CONCURRENT_DOWNLOADS", "5"))
+DOWNLOAD_CHUNK_SIZE = int(os.getenv("DOWNLOAD_CHUNK_SIZE", str(1024 * 1024)))  # 1MB
+DOWNLOAD_TIMEOUT = float(os.getenv("DOWNLOAD_TIMEOUT", "300"))  # 5 minutes per clip
+# Hand FFmpeg a signed URL instead of downloading clips first (skips the temp file entirely)
+FFMPEG_DIRECT_URL_INPUT = os.getenv("FFMPEG_DIRECT_URL_INPUT", "false").lower() == "true"
+
+# Pipelined composition: download and normalize each clip as soon as it finishes generating
+# (overlaps normalization with Replicate rendering instead of running it after the last clip)
+PIPELINED_COMPOSITION = os.getenv("PIPELINED_COMPOSITION", "true").lower() == "true"
+
+# Normalized segment cache: keep each normalized clip in storage, keyed by clip content version,
+# so recomposition after a clip regeneration only normalizes the changed clip
+SEGMENT_CACHE_ENABLED = os.getenv("SEGMENT_CACHE_ENABLED", "true").lower() == "true"
+SEGMENT_CACHE_PREFIX = "normalized"  # {job_id}/normalized/{clip}/{key}.mp4 in the video-clips bucket
+
 # Video output settings
 OUTPUT_WIDTH = 1920
 OUTPUT_HEIGHT = 1080
@@ -33,6 +50,8 @@ OUTPUT_VIDEO_BITRATE = "5000k"
 OUTPUT_AUDIO_BITRATE = "192k"
 OUTPUT_VIDEO_CODEC = "libx264"
 OUTPUT_AUDIO_CODEC = "aac"
+OUTPUT_PIX_FMT = "yuv420p"
+OUTPUT_VIDEO_TIMESCALE = 15360  # Shared MP4 track timescale so concat can stream copy
 
 # Duration handling
 DURATION_TOLERANCE = 0.5  # 0.5s tolerance for duration matching
@@ -1,74 +1,190 @@
 """
 File download logic for composer module.
 
-Downloads clips and audio from Supabase Storage in parallel.
+Streams clips from Supabase Storage straight to disk in parallel; downloads audio.
 """
 import asyncio
-from typing import List
+from pathlib import Path
+from typing import Dict, List, Optional
 from uuid import UUID
 
+import httpx
+
 from shared.storage import StorageClient
+from shared.signed_urls import get_signed_url, get_signed_urls
 from modules.video_generator.image_handler import parse_supabase_url
 from shared.errors import RetryableError, CompositionError
 from shared.logging import get_logger
 from shared.models.video import Clip
 
+from .config import MAX_CONCURRENT_DOWNLOADS, DOWNLOAD_CHUNK_SIZE, DOWNLOAD_TIMEOUT
+
 logger = get_logger("composer.downloader")
 
 
-async def download_all_clips(clips: List[Clip], job_id: UUID) -> List[bytes]:
+async def get_clip_source_url(
+    video_url: str,
+    job_id: UUID,
+    storage: Optional[StorageClient] = None
+) -> str:
     """
-    Download all clips in parallel from Supabase Storage.
+    Get a signed URL for a clip (buckets are private).
+    
+    Args:
+        video_url: Clip video URL
+        job_id: Job ID for logging
+        storage: Storage client to reuse (created if omitted)
+        
+    Returns:
+        Signed URL that HTTP clients and FFmpeg can read directly
+    """
+    bucket, path = parse_supabase_url(video_url)
+    return await get_signed_url(bucket, path, storage=storage or StorageClient())
+
+
+async def download_clip(
+    video_url: str,
+    clip_index: int,
+    temp_dir: Path,
+    job_id: UUID,
+    storage: Optional[StorageClient] = None,
+    source_url: Optional[str] = None
+) -> Path:
+    """
+    Stream a single clip from Supabase Storage to a file in temp_dir.
+    
+    The response is written chunk by chunk, so memory use is bounded by
+    DOWNLOAD_CHUNK_SIZE regardless of clip size.
+    
+    Args:
+        video_url: Clip video URL
+        clip_index: Clip index for naming and logging
+        temp_dir: Directory to write the clip to
+        job_id: Job ID for logging
+        storage: Storage client to reuse (created if omitted)
+        source_url: Already signed URL for the clip (signed here if omitted)
+        
+    Returns:
+        Path to the downloaded clip file
+        
+    Raises:
+        RetryableError: If download fails
+    """
+    output_path = temp_dir / f"clip_{clip_index}_input.mp4"
+    try:
+        source_url = source_url or await get_clip_source_url(video_url, job_id, storage)
+        logger.info(
+            f"Downloading clip {clip_index} to {output_path.name}",
+            extra={"job_id": str(job_id), "clip_index": clip_index}
+        )
+        
+        size = 0
+        async with httpx.AsyncClient(timeout=DOWNLOAD_TIMEOUT, follow_redirects=True) as client:
+            async with client.stream("GET", source_url) as response:
+                response.raise_for_status()
+                with open(output_path, "wb") as f:
+                    async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
+                        size += len(chunk)
+        
+        # Validate file size
+        if size < 1024:  # Less than 1KB is suspicious
+            raise CompositionError(f"Clip {clip_index} file too small: {size} bytes")
+        if size > 200 * 1024 * 1024:  # Warn if >200MB
+            logger.warning(
+                f"Clip {clip_index} is large: {size / 1024 / 1024:.2f} MB",
+                extra={"job_id": str(job_id), "clip_index": clip_index}
+            )
+        
+        return output_path
+    except Exception as e:
+        output_path.unlink(missing_ok=True)
+        logger.error(
+            f"Failed to download clip {clip_index}: {e}",
+            extra={"job_id": str(job_id), "clip_index": clip_index, "error": str(e)}
+        )
+        raise RetryableError(f"Failed to download clip {clip_index}: {e}") from e
+
+
+async def download_all_clips(clips: List[Clip], temp_dir: Path, job_id: UUID) -> List[Path]:
+    """
+    Stream all clips to temp_dir in parallel (at most MAX_CONCURRENT_DOWNLOADS at once).
     
     Args:
         clips: List of Clip objects (already sorted by clip_index)
+        temp_dir: Directory to write the clips to
         job_id: Job ID for logging
         
     Returns:
-        List of clip file bytes (in order)
+        List of downloaded clip paths (in order)
         
     Raises:
         RetryableError: If download fails
     """
     storage = StorageClient()
+    source_urls = await get_all_clip_source_urls(clips, job_id, storage)
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_DOWNLOADS)
     
-    async def download_clip(clip: Clip) -> bytes:
-        """Download single clip."""
-        try:
-            bucket, path = parse_supabase_url(clip.video_url)
-            logger.info(
-                f"Downloading clip {clip.clip_index} from {bucket}/{path}",
-                extra={"job_id": str(job_id), "clip_index": clip.clip_index}
-            )
-            clip_bytes = await storage.download_file(bucket, path)
-            
-            # Validate file size
-            if len(clip_bytes) < 1024:  # Less than 1KB is suspicious
-                raise CompositionError(f"Clip {clip.clip_index} file too small: {len(clip_bytes)} bytes")
-            if len(clip_bytes) > 200 * 1024 * 1024:  # Warn if >200MB
-                logger.warning(
-                    f"Clip {clip.clip_index} is large: {len(clip_bytes) / 1024 / 1024:.2f} MB",
-                    extra={"job_id": str(job_id), "clip_index": clip.clip_index}
-                )
-            
-            return clip_bytes
-        except Exception as e:
-            logger.error(
-                f"Failed to download clip {clip.clip_index}: {e}",
-                extra={"job_id": str(job_id), "clip_index": clip.clip_index, "error": str(e)}
-            )
-            raise RetryableError(f"Failed to download clip {clip.clip_index}: {e}") from e
+    async def download(clip: Clip, source_url: str) -> Path:
+        async with semaphore:
+            return await download_clip(clip.video_url, clip.clip_index, temp_dir, job_id, storage, source_url)
     
-    # Download all clips in parallel
-    tasks = [download_clip(clip) for clip in clips]
-    clip_bytes_list = await asyncio.gather(*tasks)
+    clip_paths = await asyncio.gather(*(download(clip, url) for clip, url in zip(clips, source_urls)))
     
     logger.info(
-        f"Downloaded {len(clip_bytes_list)} clips",
-        extra={"job_id": str(job_id), "count": len(clip_bytes_list)}
+        f"Downloaded {len(clip_paths)} clips",
+        extra={"job_id": str(job_id), "count": len(clip_paths)}
     )
     
-    return clip_bytes_list
+    return clip_paths
+
+
+async def get_all_clip_source_urls(
+    clips: List[Clip],
+    job_id: UUID,
+    storage: Optional[StorageClient] = None
+) -> List[str]:
+    """
+    Get signed URLs for all clips so FFmpeg can read them without a local copy.
+    
+    URLs are minted in one bulk request per bucket (cached URLs need none).
+    
+    Args:
+        clips: List of Clip objects (already sorted by clip_index)
+        job_id: Job ID for logging
+        storage: Storage client to reuse (created if omitted)
+        
+    Returns:
+        List of signed URLs (in order)
+        
+    Raises:
+        RetryableError: If URL generation fails
+    """
+    storage = storage or StorageClient()
+    try:
+        locations = [parse_supabase_url(clip.video_url) for clip in clips]
+        paths_by_bucket: Dict[str, List[str]] = {}
+        for bucket, path in locations:
+            paths_by_bucket.setdefault(bucket, []).append(path)
+        
+        signed_urls = {}
+        for bucket, paths in paths_by_bucket.items():
+            for path, url in (await get_signed_urls(bucket, paths, storage=storage)).items():
+                signed_urls[(bucket, path)] = url
+    except RetryableError:
+        raise
+    except Exception as e:
+        raise RetryableError(f"Failed to resolve clip URLs: {e}") from e
+    
+    missing = [clip.clip_index for clip, location in zip(clips, locations) if location not in signed_urls]
+    if missing:
+        raise RetryableError(f"Empty signed URL for clips {missing}")
+    
+    logger.info(
+        f"Resolved {len(clips)} clip URLs",
+        extra={"job_id": str(job_id), "count": len(clips)}
+    )
+    return [signed_urls[location] for location in locations]
 
 
 async def download_audio(audio_url: str, job_id: UUID) -> bytes:
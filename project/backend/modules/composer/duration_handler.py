@@ -14,6 +14,7 @@ from shared.logging import get_logger
 from shared.models.video import Clip
 from .utils import run_ffmpeg_command, get_video_duration
 from .config import DURATION_TOLERANCE
+from .encoder import video_encode_args
 
 logger = get_logger("composer.duration_handler")
 
@@ -304,8 +305,7 @@ async def extend_last_clip(
             "ffmpeg",
             "-i", str(clip_path),
             "-vf", f"tpad=stop_mode=clone:stop_duration={shortfall_seconds}",
-            "-c:v", "libx264",
-            "-preset", "fast",
+            *video_encode_args(),  # Match the other clips so concat can stream copy
             "-y",
             str(output_path)
         ]
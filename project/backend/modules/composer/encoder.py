@@ -1,9 +1,12 @@
 """
-Final video encoding for composer module.
+Video encoding settings and final output for composer module.
 
-Encodes final MP4 with H.264/AAC at 5000k bitrate.
+Clips are encoded exactly once, during normalization, using video_encode_args().
+Every later step (trim, concat, padding concat, audio mux, faststart) is a
+stream copy, so the final MP4 is a remux rather than a second full encode.
 """
 from pathlib import Path
+from typing import List
 from uuid import UUID
 
 from shared.errors import CompositionError
@@ -11,16 +14,43 @@ from shared.logging import get_logger
 from .utils import run_ffmpeg_command, get_video_duration
 from .config import (
     FFMPEG_THREADS,
+    FFMPEG_CRF,
+    OUTPUT_FPS,
+    OUTPUT_PIX_FMT,
     OUTPUT_VIDEO_CODEC,
-    OUTPUT_AUDIO_CODEC,
     OUTPUT_VIDEO_BITRATE,
-    OUTPUT_AUDIO_BITRATE,
+    OUTPUT_VIDEO_TIMESCALE,
     FFMPEG_PRESET
 )
 
 logger = get_logger("composer.encoder")
 
 
+def video_encode_args() -> List[str]:
+    """
+    FFmpeg output arguments for every H.264 encode in the composer.
+    
+    Identical codec, pixel format, frame rate and track timescale across all
+    segments are what make concat-demuxer stream copy safe. CRF quality is
+    capped at OUTPUT_VIDEO_BITRATE so the final bitrate matches what the
+    old full-length re-encode produced.
+    
+    Returns:
+        List of FFmpeg arguments (audio is dropped; the mux step adds it)
+    """
+    return [
+        "-c:v", OUTPUT_VIDEO_CODEC,
+        "-preset", FFMPEG_PRESET,
+        "-crf", str(FFMPEG_CRF),
+        "-maxrate", OUTPUT_VIDEO_BITRATE,
+        "-bufsize", f"{int(OUTPUT_VIDEO_BITRATE.rstrip('k')) * 2}k",
+        "-pix_fmt", OUTPUT_PIX_FMT,
+        "-r", str(OUTPUT_FPS),
+        "-video_track_timescale", str(OUTPUT_VIDEO_TIMESCALE),
+        "-an",
+    ]
+
+
 async def encode_final_video(
     video_path: Path,
     temp_dir: Path,
@@ -29,10 +59,10 @@ async def encode_final_video(
     target_height: int
 ) -> Path:
     """
-    Encode final video with H.264/AAC at 5000k bitrate.
+    Write the final MP4 with faststart, using stream copy for video and audio.
     
-    Note: Video should already be at target resolution from normalization step.
-    This function just encodes without resizing.
+    Note: Video is already encoded at the output parameters (normalization)
+    and audio is already AAC (sync step), so nothing is re-encoded here.
     
     Args:
         video_path: Path to video with audio
@@ -42,7 +72,7 @@ async def encode_final_video(
         target_height: Expected output height (for validation/logging)
         
     Returns:
-        Path to final encoded video
+        Path to final video
     """
     output_path = temp_dir / "final_video.mp4"
     
@@ -50,18 +80,14 @@ async def encode_final_video(
         "ffmpeg",
         "-threads", str(FFMPEG_THREADS),
         "-i", str(video_path),
-        "-c:v", OUTPUT_VIDEO_CODEC,      # H.264 codec
-        "-c:a", OUTPUT_AUDIO_CODEC,          # AAC codec
-        "-b:v", OUTPUT_VIDEO_BITRATE,        # Video bitrate
-        "-b:a", OUTPUT_AUDIO_BITRATE,         # Audio bitrate
-        "-preset", FFMPEG_PRESET,    # Encoding preset
+        "-c", "copy",               # Stream copy (no generational loss)
         "-movflags", "+faststart",  # Web optimization
         "-y",
         str(output_path)
     ]
     
     logger.info(
-        f"Encoding final video ({target_width}x{target_height})",
+        f"Finalizing video ({target_width}x{target_height}, stream copy + faststart)",
         extra={"job_id": str(job_id), "target_width": target_width, "target_height": target_height}
     )
     
@@ -82,7 +108,7 @@ async def encode_final_video(
             raise CompositionError(f"Invalid video duration: {video_duration}s")
         
         logger.info(
-            f"Final video encoded ({output_size / 1024 / 1024:.2f} MB)",
+            f"Final video written ({output_size / 1024 / 1024:.2f} MB)",
             extra={"job_id": str(job_id), "size_mb": output_size / 1024 / 1024}
         )
         
@@ -90,5 +116,5 @@ async def encode_final_video(
     except Exception as e:
         if isinstance(e, CompositionError):
             raise
-        raise CompositionError(f"Failed to encode final video: {e}") from e
+        raise CompositionError(f"Failed to finalize video: {e}") from e
 
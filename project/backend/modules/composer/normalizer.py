@@ -1,22 +1,24 @@
 """
 Clip normalization for composer module.
 
-Upscales clips to 1080p and normalizes to 30 FPS, but only if needed.
-Uses stream copy when possible to avoid unnecessary re-encoding.
+Scales clips to the output resolution, normalizes to 30 FPS and encodes them
+once with the final codec parameters, so every later step can stream copy.
 """
 from pathlib import Path
+from typing import Union
 from uuid import UUID
 
 from shared.errors import CompositionError
 from shared.logging import get_logger
 from .utils import run_ffmpeg_command, get_video_properties
-from .config import FFMPEG_THREADS, FFMPEG_PRESET, FFMPEG_CRF, OUTPUT_FPS
+from .config import FFMPEG_THREADS, OUTPUT_FPS
+from .encoder import video_encode_args
 
 logger = get_logger("composer.normalizer")
 
 
 async def normalize_clip(
-    clip_bytes: bytes,
+    input_source: Union[Path, str],
     clip_index: int,
     temp_dir: Path,
     job_id: UUID,
@@ -24,13 +26,15 @@ async def normalize_clip(
     target_height: int
 ) -> Path:
     """
-    Normalize clip to target resolution and 30 FPS if needed.
+    Normalize clip to target resolution and 30 FPS with the final encode settings.
     
-    Checks video properties first and only re-encodes if resolution or FPS
-    don't match target. Uses stream copy when possible for speed.
+    This is the only video encode in composition. Clips are always encoded
+    (even when resolution and FPS already match) because generator output
+    varies in profile, pixel format and timescale, and concat stream copy
+    needs identical parameters. Source audio is dropped.
     
     Args:
-        clip_bytes: Original clip file bytes
+        input_source: Downloaded clip file, or a signed URL FFmpeg reads directly
         clip_index: Clip index for naming
         temp_dir: Temporary directory for output
         job_id: Job ID for logging
@@ -38,30 +42,19 @@ async def normalize_clip(
         target_height: Target output height in pixels
         
     Returns:
-        Path to normalized clip file (may be same as input if already normalized)
+        Path to normalized clip file
         
     Raises:
         CompositionError: If normalization fails
     """
-    # Write input clip to temp file
-    input_path = temp_dir / f"clip_{clip_index}_input.mp4"
     output_path = temp_dir / f"clip_{clip_index}_normalized.mp4"
-    
-    input_path.write_bytes(clip_bytes)
+    is_url = isinstance(input_source, str)
     
     # Check if normalization is needed
-    props = await get_video_properties(input_path)
+    props = await get_video_properties(input_source)
     needs_resize = (props.get("width") != target_width or props.get("height") != target_height)
     needs_fps_change = (props.get("fps") is not None and abs(props.get("fps") - OUTPUT_FPS) > 0.5)
     
-    if not needs_resize and not needs_fps_change:
-        # Already at target resolution and FPS, use as-is
-        logger.info(
-            f"Clip {clip_index} already normalized ({props.get('width')}x{props.get('height')} @ {props.get('fps')}fps), using as-is",
-            extra={"job_id": str(job_id), "clip_index": clip_index}
-        )
-        return input_path
-    
     # Build filter based on what's needed
     filters = []
     if needs_resize:
@@ -84,16 +77,17 @@ async def normalize_clip(
     ffmpeg_cmd = [
         "ffmpeg",
         "-threads", str(FFMPEG_THREADS),
-        "-i", str(input_path),
     ]
+    if is_url:
+        # Survive dropped connections while reading from storage over HTTP
+        ffmpeg_cmd.extend(["-reconnect", "1", "-reconnect_streamed", "1", "-reconnect_delay_max", "5"])
+    ffmpeg_cmd.extend(["-i", str(input_source)])
     
     if filter_str:
         ffmpeg_cmd.extend(["-vf", filter_str])
     
+    ffmpeg_cmd.extend(video_encode_args())
     ffmpeg_cmd.extend([
-        "-c:v", "libx264",
-        "-preset", FFMPEG_PRESET,
-        "-crf", str(FFMPEG_CRF),
         "-y",  # Overwrite output
         str(output_path)
     ])
@@ -109,6 +103,10 @@ async def normalize_clip(
         if not output_path.exists():
             raise CompositionError(f"Normalized clip not created: {output_path}")
         
+        # The downloaded original isn't needed any more; free the disk space early
+        if not is_url:
+            Path(input_source).unlink(missing_ok=True)
+        
         logger.info(
             f"Normalized clip {clip_index}",
             extra={"job_id": str(job_id), "clip_index": clip_index}
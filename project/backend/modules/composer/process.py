@@ -12,7 +12,7 @@ import os
 from contextlib import asynccontextmanager
 from pathlib import Path
 from uuid import UUID
-from typing import List, Optional
+from typing import List, Optional, Union, TYPE_CHECKING
 from decimal import Decimal
 
 from shared.errors import CompositionError, RetryableError
@@ -22,23 +22,32 @@ from shared.models.video import VideoOutput, Clips, Clip
 from shared.models.scene import Transition
 from api_gateway.services.event_publisher import publish_event
 from api_gateway.services.sse_manager import broadcast_event
+from api_gateway.services.job_status_store import patch_job_status
 from shared.database import DatabaseClient
-from shared.redis_client import RedisClient
 
-from .config import VIDEO_OUTPUTS_BUCKET, get_output_dimensions_from_aspect_ratio, MAX_CONCURRENT_NORMALIZATIONS
+from .config import (
+    VIDEO_OUTPUTS_BUCKET,
+    get_output_dimensions_from_aspect_ratio,
+    MAX_CONCURRENT_NORMALIZATIONS,
+    SEGMENT_CACHE_ENABLED,
+    FFMPEG_DIRECT_URL_INPUT,
+)
 from .utils import check_ffmpeg_available, get_video_duration
-from .downloader import download_all_clips, download_audio
+from .downloader import download_all_clips, get_all_clip_source_urls, download_audio
 from .normalizer import normalize_clip
 from .duration_handler import handle_cascading_durations, extend_last_clip
 from .transition_applier import apply_transitions
 from .video_padder import pad_video_to_audio
 from .audio_syncer import sync_audio
 from .encoder import encode_final_video
+from .segment_cache import fetch_cached_segments, store_segments
+
+if TYPE_CHECKING:
+    from .clip_pipeline import ClipPipeline
 
 logger = get_logger("composer.process")
 
 db_client = DatabaseClient()
-redis_client = RedisClient()
 
 
 @asynccontextmanager
@@ -88,22 +97,20 @@ async def publish_progress(job_id: UUID, message: str, progress: Optional[int] =
         
         # Also update database for persistence
         try:
-            await db_client.table("jobs").update({
+            progress_update = {
                 "progress": progress,
                 "current_stage": "composer",
                 "updated_at": "now()"
-            }).eq("id", str(job_id)).execute()
-            
-            # Invalidate cache (job_id is UUID, convert to string)
-            cache_key = f"job_status:{str(job_id)}"
-            await redis_client.client.delete(cache_key)
+            }
+            await db_client.table("jobs").update(progress_update).eq("id", str(job_id)).execute()
+            await patch_job_status(str(job_id), progress_update)
         except Exception as e:
             logger.warning(f"Failed to update progress in database: {e}", extra={"job_id": str(job_id)})
 
 
 async def normalize_clip_with_concurrency_limit(
     semaphore: asyncio.Semaphore,
-    clip_bytes: bytes,
+    clip_source: Union[Path, str],
     clip_index: int,
     temp_dir: Path,
     job_id: UUID,
@@ -118,7 +125,7 @@ async def normalize_clip_with_concurrency_limit(
     
     Args:
         semaphore: Asyncio semaphore for concurrency control
-        clip_bytes: Clip file bytes
+        clip_source: Downloaded clip path or signed clip URL
         clip_index: Clip index for naming
         temp_dir: Temporary directory for output
         job_id: Job ID for logging
@@ -130,7 +137,7 @@ async def normalize_clip_with_concurrency_limit(
     """
     async with semaphore:
         return await normalize_clip(
-            clip_bytes, clip_index, temp_dir, job_id, output_width, output_height
+            clip_source, clip_index, temp_dir, job_id, output_width, output_height
         )
 
 
@@ -141,7 +148,8 @@ async def process(
     transitions: List[Transition],
     beat_timestamps: Optional[List[float]] = None,
     aspect_ratio: str = "16:9",
-    changed_clip_index: Optional[int] = None
+    changed_clip_index: Optional[int] = None,
+    clip_pipeline: Optional["ClipPipeline"] = None
 ) -> VideoOutput:
     """
     Main composition function.
@@ -153,7 +161,10 @@ async def process(
         transitions: Transition definitions from Scene Planner (ignored in MVP)
         beat_timestamps: Beat timestamps from Audio Parser (optional, not used in MVP)
         aspect_ratio: Aspect ratio for final video output (default: "16:9")
-        changed_clip_index: Optional index of clip that changed (for future optimization)
+        changed_clip_index: Optional index of clip that changed (for logging; unchanged
+            clips are reused from the normalized segment cache either way)
+        clip_pipeline: Optional ClipPipeline that already downloaded and normalized clips
+            while generation was running; clips it doesn't have are prepared inline
         
     Returns:
         VideoOutput with final video URL and metadata
@@ -205,6 +216,7 @@ async def process(
         "compensation_applied": []
     }
     total_intended = 0.0
+    cache_task: Optional[asyncio.Task] = None
     
     try:
         # Step 1: Input validation
@@ -278,20 +290,54 @@ async def process(
         # Steps 2-8: Processing with temp directory context manager
         async with temp_directory(f"composer_{job_id_uuid}_") as temp_dir:
             # Step 2: Download clips and audio (parallel) - 85-88%
-            await publish_progress(job_id_uuid, f"Downloading clips ({len(sorted_clips)} clips)...", 85)
+            # Clips already normalized by the pipeline (keyed by video_url) skip download and normalization
+            pipelined_paths = {}
+            if clip_pipeline is not None and clip_pipeline.matches(output_width, output_height):
+                ready = await asyncio.gather(*(clip_pipeline.get_normalized(c.video_url) for c in sorted_clips))
+                pipelined_paths = {c.clip_index: path for c, path in zip(sorted_clips, ready) if path is not None}
+                logger.info(
+                    f"Using {len(pipelined_paths)}/{len(sorted_clips)} clips normalized during generation",
+                    extra={"job_id": str(job_id_uuid), "pipelined_clips": len(pipelined_paths)}
+                )
+            # Clips normalized by an earlier composition (e.g. before a clip regeneration) come from the segment cache
+            cached_paths = {}
+            if SEGMENT_CACHE_ENABLED:
+                cached_paths = await fetch_cached_segments(
+                    [(c.clip_index, c.video_url) for c in sorted_clips if c.clip_index not in pipelined_paths],
+                    temp_dir, job_id_uuid, output_width, output_height
+                )
+            pending_clips = [
+                c for c in sorted_clips
+                if c.clip_index not in pipelined_paths and c.clip_index not in cached_paths
+            ]
+            if changed_clip_index is not None:
+                logger.info(
+                    f"Recomposing after change to clip {changed_clip_index}: normalizing {len(pending_clips)} clips",
+                    extra={"job_id": str(job_id_uuid), "changed_clip_index": changed_clip_index}
+                )
+            
+            await publish_progress(job_id_uuid, f"Downloading clips ({len(pending_clips)} clips)...", 85)
             step_start = time.time()
-            clip_bytes_list = await download_all_clips(sorted_clips, job_id_uuid)
+            # Clips stream to temp_dir (or FFmpeg reads them by URL), never held in memory
+            if not pending_clips:
+                clip_sources = []
+            elif FFMPEG_DIRECT_URL_INPUT:
+                clip_sources = await get_all_clip_source_urls(pending_clips, job_id_uuid)
+            else:
+                clip_sources = await download_all_clips(pending_clips, temp_dir, job_id_uuid)
             audio_bytes = await download_audio(audio_url, job_id_uuid)
             timings["download_clips"] = time.time() - step_start
             await publish_progress(job_id_uuid, "Clips downloaded", 88)
             
             # Log download metrics
-            total_download_size = sum(len(b) for b in clip_bytes_list) + len(audio_bytes)
+            total_download_size = sum(
+                source.stat().st_size for source in clip_sources if isinstance(source, Path)
+            ) + len(audio_bytes)
             logger.info(
-                f"Downloaded {len(clip_bytes_list)} clips and audio ({total_download_size / 1024 / 1024:.2f} MB) in {timings['download_clips']:.2f}s",
+                f"Downloaded {len(clip_sources)} clips and audio ({total_download_size / 1024 / 1024:.2f} MB) in {timings['download_clips']:.2f}s",
                 extra={
                     "job_id": str(job_id_uuid),
-                    "clips_count": len(clip_bytes_list),
+                    "clips_count": len(clip_sources),
                     "download_size_mb": total_download_size / 1024 / 1024,
                     "download_time": timings["download_clips"]
                 }
@@ -313,7 +359,7 @@ async def process(
                 f"Starting clip normalization with concurrency limit: {MAX_CONCURRENT_NORMALIZATIONS} concurrent processes",
                 extra={
                     "job_id": str(job_id_uuid),
-                    "clips_count": len(clip_bytes_list),
+                    "clips_count": len(clip_sources),
                     "max_concurrent": MAX_CONCURRENT_NORMALIZATIONS,
                     "ffmpeg_threads": os.getenv("FFMPEG_THREADS", "4")
                 }
@@ -322,11 +368,27 @@ async def process(
             # Parallel normalization with concurrency control (prevents resource exhaustion)
             normalize_tasks = [
                 normalize_clip_with_concurrency_limit(
-                    semaphore, clip_bytes, clip.clip_index, temp_dir, job_id_uuid, output_width, output_height
+                    semaphore, clip_source, clip.clip_index, temp_dir, job_id_uuid, output_width, output_height
                 )
-                for clip_bytes, clip in zip(clip_bytes_list, sorted_clips)
+                for clip_source, clip in zip(clip_sources, pending_clips)
             ]
-            normalized_paths = await asyncio.gather(*normalize_tasks)
+            normalized_by_index = {**pipelined_paths, **cached_paths}
+            normalized_by_index.update(zip(
+                [clip.clip_index for clip in pending_clips],
+                await asyncio.gather(*normalize_tasks)
+            ))
+            normalized_paths = [normalized_by_index[clip.clip_index] for clip in sorted_clips]
+            
+            # Cache freshly normalized clips in the background (awaited before temp dir cleanup)
+            if SEGMENT_CACHE_ENABLED:
+                new_segments = [
+                    (clip.video_url, normalized_by_index[clip.clip_index])
+                    for clip in sorted_clips if clip.clip_index not in cached_paths
+                ]
+                if new_segments:
+                    cache_task = asyncio.create_task(
+                        store_segments(new_segments, job_id_uuid, output_width, output_height)
+                    )
             timings["normalize_clips"] = time.time() - step_start
             await publish_progress(job_id_uuid, "Clips normalized", 91)
             
@@ -512,17 +574,17 @@ async def process(
                 }
             )
             
-            # Step 8: Encode final video - 99-99.5%
-            await publish_progress(job_id_uuid, "Encoding final video...", 99)
+            # Step 8: Finalize video (stream copy + faststart, no re-encode) - 99-99.5%
+            await publish_progress(job_id_uuid, "Finalizing video...", 99)
             step_start = time.time()
             final_video_path = await encode_final_video(
                 video_with_audio_path, temp_dir, job_id_uuid, output_width, output_height
             )
             timings["encode_final"] = time.time() - step_start
-            await publish_progress(job_id_uuid, "Video encoded", 99)
+            await publish_progress(job_id_uuid, "Video finalized", 99)
             
             logger.info(
-                f"Encoded final video in {timings['encode_final']:.2f}s",
+                f"Finalized video in {timings['encode_final']:.2f}s",
                 extra={
                     "job_id": str(job_id_uuid),
                     "encode_time": timings["encode_final"]
@@ -591,6 +653,8 @@ async def process(
                     pass
             
             timings["upload_final"] = time.time() - step_start
+            if cache_task is not None:
+                await cache_task
             await publish_progress(job_id_uuid, "Upload complete", 100)
             
             logger.info(
@@ -684,4 +748,7 @@ async def process(
             extra={"job_id": str(job_id_uuid)}
         )
         raise CompositionError(f"Unexpected error during composition: {e}") from e
+    finally:
+        if cache_task is not None and not cache_task.done():
+            cache_task.cancel()
 
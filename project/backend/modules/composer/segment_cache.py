@@ -0,0 +1,253 @@
+"""
+Persistent normalized segment cache for composer module.
+
+Normalization is the only video encode in composition. Each normalized clip
+is stored next to the job's clips, keyed by clip content version (the storage
+object's ETag), output size and encode settings. Recomposition after a clip
+regeneration downloads the cached segments for unchanged clips and only
+normalizes the regenerated one; everything after that is stream copy.
+
+Each clip keeps at most one cached segment: storing a new version removes the
+segments of earlier versions (e.g. a retried generation that overwrote
+clip_{i}.mp4), and the cache lives under the job's folder so it goes with it.
+"""
+import asyncio
+import hashlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from shared.logging import get_logger
+from shared.storage import StorageClient
+from modules.video_generator.image_handler import parse_supabase_url
+
+from .config import (
+    VIDEO_CLIPS_BUCKET,
+    SEGMENT_CACHE_PREFIX,
+    FFMPEG_PRESET,
+    FFMPEG_CRF,
+    OUTPUT_FPS,
+    OUTPUT_PIX_FMT,
+    OUTPUT_VIDEO_TIMESCALE,
+)
+
+logger = get_logger("composer.segment_cache")
+
+
+def _clip_source(video_url: str) -> Tuple[str, str]:
+    """Get (bucket, path) of a clip URL; signed URL tokens are ignored."""
+    try:
+        return parse_supabase_url(video_url)
+    except ValueError:
+        return "", video_url.split("?", 1)[0]
+
+
+def segment_cache_key(video_url: str, version: str, output_width: int, output_height: int) -> str:
+    """
+    Build the cache key for a normalized clip.
+
+    Clip paths are reused (a retried generation overwrites clip_{i}.mp4), so
+    the content version is part of the key along with the storage path.
+    Encode settings are part of the key so changing them invalidates the cache.
+
+    Args:
+        video_url: Clip video URL
+        version: Content version of the clip object (see get_clip_versions)
+        output_width: Output width in pixels
+        output_height: Output height in pixels
+
+    Returns:
+        Hex digest identifying the normalized segment
+    """
+    bucket, path = _clip_source(video_url)
+    signature = (
+        f"{bucket}/{path}|{version}|{output_width}x{output_height}|{FFMPEG_PRESET}|{FFMPEG_CRF}|"
+        f"{OUTPUT_FPS}|{OUTPUT_PIX_FMT}|{OUTPUT_VIDEO_TIMESCALE}"
+    )
+    return hashlib.sha256(signature.encode("utf-8")).hexdigest()[:32]
+
+
+def segment_cache_folder(job_id: UUID, video_url: str) -> str:
+    """Storage folder holding the cached segment of one clip (all its versions share it)."""
+    bucket, path = _clip_source(video_url)
+    clip_id = hashlib.sha256(f"{bucket}/{path}".encode("utf-8")).hexdigest()[:16]
+    return f"{job_id}/{SEGMENT_CACHE_PREFIX}/{clip_id}"
+
+
+def segment_cache_path(job_id: UUID, video_url: str, key: str) -> str:
+    """Storage path of a cached segment in the video-clips bucket."""
+    return f"{segment_cache_folder(job_id, video_url)}/{key}.mp4"
+
+
+async def get_clip_versions(storage: StorageClient, video_urls: Iterable[str]) -> Dict[str, str]:
+    """
+    Look up the content version of each clip object.
+
+    Lists each clip folder once and uses the object's ETag (falling back to
+    its update timestamp), which changes whenever the clip is re-uploaded.
+
+    Args:
+        storage: Storage client
+        video_urls: Clip video URLs
+
+    Returns:
+        Mapping of video_url to version; clips that could not be resolved are omitted
+    """
+    by_folder: Dict[Tuple[str, str], Dict[str, str]] = {}
+    for video_url in video_urls:
+        bucket, path = _clip_source(video_url)
+        if not bucket:
+            continue
+        folder, _, name = path.rpartition("/")
+        by_folder.setdefault((bucket, folder), {})[name] = video_url
+
+    async def list_folder(bucket: str, folder: str, names: Dict[str, str]) -> Dict[str, str]:
+        try:
+            entries = await storage.list_files(bucket, folder)
+        except Exception as e:
+            logger.debug(f"Could not list {bucket}/{folder} for clip versions: {e}")
+            return {}
+        versions = {}
+        for entry in entries:
+            video_url = names.get(entry.get("name"))
+            version = (entry.get("metadata") or {}).get("eTag") or entry.get("updated_at")
+            if video_url and version:
+                versions[video_url] = str(version).strip('"')
+        return versions
+
+    results = await asyncio.gather(
+        *(list_folder(bucket, folder, names) for (bucket, folder), names in by_folder.items())
+    )
+    return {video_url: version for versions in results for video_url, version in versions.items()}
+
+
+async def fetch_cached_segments(
+    clips: List[Tuple[int, str]],
+    temp_dir: Path,
+    job_id: UUID,
+    output_width: int,
+    output_height: int
+) -> Dict[int, Path]:
+    """
+    Download cached normalized segments for the given clips.
+
+    Args:
+        clips: (clip_index, video_url) pairs
+        temp_dir: Temporary directory for the downloaded segments
+        job_id: Job ID (cache namespace)
+        output_width: Output width in pixels
+        output_height: Output height in pixels
+
+    Returns:
+        Mapping of clip_index to local segment path for cache hits only
+    """
+    if not clips:
+        return {}
+    storage = StorageClient()
+    versions = await get_clip_versions(storage, [video_url for _, video_url in clips])
+
+    async def fetch(clip_index: int, video_url: str) -> Optional[Path]:
+        version = versions.get(video_url)
+        if version is None:
+            return None
+        key = segment_cache_key(video_url, version, output_width, output_height)
+        try:
+            segment_bytes = await storage.download_file(
+                VIDEO_CLIPS_BUCKET, segment_cache_path(job_id, video_url, key)
+            )
+        except Exception as e:
+            logger.debug(
+                f"Segment cache miss for clip {clip_index}: {e}",
+                extra={"job_id": str(job_id), "clip_index": clip_index, "cache_key": key}
+            )
+            return None
+        if len(segment_bytes) < 1024:  # Truncated upload, treat as a miss
+            return None
+        output_path = temp_dir / f"clip_{clip_index}_cached.mp4"
+        output_path.write_bytes(segment_bytes)
+        return output_path
+
+    results = await asyncio.gather(*(fetch(index, url) for index, url in clips))
+    hits = {index: path for (index, _), path in zip(clips, results) if path is not None}
+    logger.info(
+        f"Segment cache: {len(hits)}/{len(clips)} normalized clips reused",
+        extra={"job_id": str(job_id), "cache_hits": len(hits), "cache_lookups": len(clips)}
+    )
+    return hits
+
+
+async def _evict_stale_segments(storage: StorageClient, job_id: UUID, video_url: str, key: str) -> None:
+    """Delete the clip's cached segments other than the current one."""
+    folder = segment_cache_folder(job_id, video_url)
+    for entry in await storage.list_files(VIDEO_CLIPS_BUCKET, folder):
+        name = entry.get("name")
+        if name and name != f"{key}.mp4":
+            await storage.delete_file(VIDEO_CLIPS_BUCKET, f"{folder}/{name}")
+
+
+async def store_segments(
+    segments: List[Tuple[str, Path]],
+    job_id: UUID,
+    output_width: int,
+    output_height: int
+) -> int:
+    """
+    Upload newly normalized segments to the cache.
+
+    Segments of earlier versions of the same clips are removed. Failures are
+    logged and skipped: the cache only speeds up later recompositions and must
+    never fail the current one.
+
+    Args:
+        segments: (video_url, normalized_path) pairs
+        job_id: Job ID (cache namespace)
+        output_width: Output width in pixels
+        output_height: Output height in pixels
+
+    Returns:
+        Number of segments stored
+    """
+    if not segments:
+        return 0
+    storage = StorageClient()
+    versions = await get_clip_versions(storage, [video_url for video_url, _ in segments])
+
+    async def store(video_url: str, segment_path: Path) -> bool:
+        version = versions.get(video_url)
+        if version is None:
+            # Without a content version a later lookup could return a stale segment
+            logger.debug(
+                "Skipping segment cache for clip without a content version",
+                extra={"job_id": str(job_id), "video_url": video_url}
+            )
+            return False
+        key = segment_cache_key(video_url, version, output_width, output_height)
+        try:
+            await storage.upload_file(
+                bucket=VIDEO_CLIPS_BUCKET,
+                path=segment_cache_path(job_id, video_url, key),
+                file_data=segment_path.read_bytes(),
+                content_type="video/mp4",
+                overwrite=True
+            )
+        except Exception as e:
+            logger.warning(
+                f"Failed to cache normalized segment: {e}",
+                extra={"job_id": str(job_id), "video_url": video_url, "cache_key": key}
+            )
+            return False
+        try:
+            await _evict_stale_segments(storage, job_id, video_url, key)
+        except Exception as e:
+            logger.warning(
+                f"Failed to remove stale cached segments: {e}",
+                extra={"job_id": str(job_id), "video_url": video_url, "cache_key": key}
+            )
+        return True
+
+    stored = sum(await asyncio.gather(*(store(url, path) for url, path in segments)))
+    logger.info(
+        f"Cached {stored}/{len(segments)} normalized segments",
+        extra={"job_id": str(job_id), "segments_cached": stored}
+    )
+    return stored
@@ -0,0 +1,62 @@
+"""
+Unit tests for pipelined clip preparation.
+"""
+import pytest
+from pathlib import Path
+from unittest.mock import patch, AsyncMock
+from uuid import uuid4
+
+from modules.composer.clip_pipeline import ClipPipeline
+
+
+CLIP_URL = "https://project.supabase.co/storage/v1/object/public/video-clips/clip0.mp4"
+
+
+class TestClipPipeline:
+    """Tests for ClipPipeline."""
+    
+    @pytest.mark.asyncio
+    @patch('modules.composer.clip_pipeline.normalize_clip', new_callable=AsyncMock)
+    @patch('modules.composer.clip_pipeline.download_clip', new_callable=AsyncMock)
+    async def test_submitted_clip_is_normalized(self, mock_download, mock_normalize):
+        """Submitted clips are downloaded and normalized in the background."""
+        mock_download.return_value = Path("/tmp/clip_0_input.mp4")
+        mock_normalize.return_value = Path("/tmp/clip_0_normalized.mp4")
+        pipeline = ClipPipeline(uuid4(), "16:9")
+        
+        try:
+            pipeline.submit(0, CLIP_URL)
+            pipeline.submit(0, CLIP_URL)  # Duplicate completion events are ignored
+            
+            assert await pipeline.get_normalized(CLIP_URL) == Path("/tmp/clip_0_normalized.mp4")
+            assert mock_download.await_count == 1
+            assert mock_normalize.call_args[0][0] == Path("/tmp/clip_0_input.mp4")
+            assert mock_normalize.call_args[0][4:] == (1920, 1080)
+        finally:
+            await pipeline.close()
+        
+        assert not pipeline.temp_dir.exists()
+    
+    @pytest.mark.asyncio
+    @patch('modules.composer.clip_pipeline.download_clip', new_callable=AsyncMock)
+    async def test_failed_or_unknown_clip_returns_none(self, mock_download):
+        """Failures and unknown URLs fall back to inline preparation."""
+        mock_download.side_effect = Exception("network down")
+        pipeline = ClipPipeline(uuid4(), "16:9")
+        
+        try:
+            pipeline.submit(0, CLIP_URL)
+            
+            assert await pipeline.get_normalized(CLIP_URL) is None
+            assert await pipeline.get_normalized("https://other/clip.mp4") is None
+        finally:
+            await pipeline.close()
+    
+    def test_matches_output_dimensions(self):
+        """Prepared clips are only reused at the size they were normalized to."""
+        pipeline = ClipPipeline(uuid4(), "9:16")
+        try:
+            assert pipeline.matches(pipeline.output_width, pipeline.output_height)
+            assert not pipeline.matches(pipeline.output_height + 1, pipeline.output_width)
+        finally:
+            pipeline.temp_dir.rmdir()
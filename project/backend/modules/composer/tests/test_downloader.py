@@ -1,11 +1,12 @@
 """
 Unit tests for composer downloader.
 """
+import httpx
 import pytest
 from unittest.mock import patch, AsyncMock, MagicMock
 from uuid import uuid4
 
-from modules.composer.downloader import download_all_clips, download_audio
+from modules.composer.downloader import download_all_clips, get_all_clip_source_urls, download_audio
 from shared.models.video import Clip
 from shared.errors import RetryableError, CompositionError
 from decimal import Decimal
@@ -25,74 +26,106 @@ def sample_clip(clip_index: int, video_url: str) -> Clip:
     )
 
 
+def mock_http_client(handler):
+    """Build an httpx.AsyncClient factory that serves requests from handler."""
+    real_client = httpx.AsyncClient
+    
+    def factory(**kwargs):
+        return real_client(transport=httpx.MockTransport(handler), **kwargs)
+    
+    return factory
+
+
+@pytest.fixture(autouse=True)
+def empty_signed_url_cache():
+    """Every signed URL is a cache miss, so it is minted by the storage mock."""
+    with patch("shared.signed_urls.redis_client") as mock_redis_client:
+        mock_redis_client.client.mget = AsyncMock(side_effect=lambda keys: [None] * len(keys))
+        mock_redis_client.client.pipeline.return_value.execute = AsyncMock(return_value=[])
+        yield mock_redis_client
+
+
+def mock_storage_with_signed_urls(mock_storage_class):
+    """Storage client whose signed URLs point at the mocked HTTP transport."""
+    mock_storage = MagicMock()
+    mock_storage.get_signed_urls = AsyncMock(
+        side_effect=lambda bucket, paths, expires_in=3600: {
+            path: f"https://storage.test/{bucket}/{path}?token=abc" for path in paths
+        }
+    )
+    mock_storage_class.return_value = mock_storage
+    return mock_storage
+
+
 class TestDownloadAllClips:
     """Tests for download_all_clips function."""
     
     @pytest.mark.asyncio
     @patch('modules.composer.downloader.StorageClient')
-    @patch('modules.composer.downloader.parse_supabase_url')
-    async def test_download_all_clips_success(self, mock_parse_url, mock_storage_class):
-        """Test successful parallel downloads."""
+    async def test_download_all_clips_success(self, mock_storage_class, tmp_path):
+        """Test clips are streamed to files in order."""
         job_id = uuid4()
         clips = [
             sample_clip(0, "https://project.supabase.co/storage/v1/object/public/video-clips/clip0.mp4"),
             sample_clip(1, "https://project.supabase.co/storage/v1/object/public/video-clips/clip1.mp4"),
         ]
+        mock_storage = mock_storage_with_signed_urls(mock_storage_class)
+        bodies = {"/video-clips/clip0.mp4": b"x" * 2048, "/video-clips/clip1.mp4": b"y" * 4096}
         
-        # Mock storage client
-        mock_storage = MagicMock()
-        mock_storage.download_file = AsyncMock(side_effect=[
-            b"x" * 2048,  # 2KB - valid size
-            b"y" * 2048   # 2KB - valid size
-        ])
-        mock_storage_class.return_value = mock_storage
-        
-        # Mock URL parsing
-        mock_parse_url.side_effect = [
-            ("video-clips", "clip0.mp4"),
-            ("video-clips", "clip1.mp4")
-        ]
+        def handler(request):
+            return httpx.Response(200, content=bodies[request.url.path])
         
-        result = await download_all_clips(clips, job_id)
+        with patch('modules.composer.downloader.httpx.AsyncClient', mock_http_client(handler)):
+            result = await download_all_clips(clips, tmp_path, job_id)
         
-        assert len(result) == 2
-        assert len(result[0]) == 2048
-        assert len(result[1]) == 2048
-        assert mock_storage.download_file.call_count == 2
+        assert result == [tmp_path / "clip_0_input.mp4", tmp_path / "clip_1_input.mp4"]
+        assert result[0].read_bytes() == b"x" * 2048
+        assert result[1].read_bytes() == b"y" * 4096
+        mock_storage.get_signed_urls.assert_awaited_once()  # One bulk request for both clips
+        mock_storage.download_file.assert_not_called()
     
     @pytest.mark.asyncio
     @patch('modules.composer.downloader.StorageClient')
-    @patch('modules.composer.downloader.parse_supabase_url')
-    async def test_download_all_clips_file_too_small(self, mock_parse_url, mock_storage_class):
-        """Test download fails when file is too small."""
+    async def test_download_all_clips_file_too_small(self, mock_storage_class, tmp_path):
+        """Test download fails (and leaves no partial file) when file is too small."""
         job_id = uuid4()
         clips = [sample_clip(0, "https://project.supabase.co/storage/v1/object/public/video-clips/clip0.mp4")]
+        mock_storage_with_signed_urls(mock_storage_class)
         
-        mock_storage = MagicMock()
-        mock_storage.download_file = AsyncMock(return_value=b"x" * 500)  # Less than 1KB
-        mock_storage_class.return_value = mock_storage
+        def handler(request):
+            return httpx.Response(200, content=b"x" * 500)  # Less than 1KB
         
-        mock_parse_url.return_value = ("video-clips", "clip0.mp4")
+        with patch('modules.composer.downloader.httpx.AsyncClient', mock_http_client(handler)):
+            with pytest.raises(RetryableError, match="file too small"):
+                await download_all_clips(clips, tmp_path, job_id)
         
-        with pytest.raises(RetryableError, match="file too small"):
-            await download_all_clips(clips, job_id)
+        assert not (tmp_path / "clip_0_input.mp4").exists()
     
     @pytest.mark.asyncio
     @patch('modules.composer.downloader.StorageClient')
-    @patch('modules.composer.downloader.parse_supabase_url')
-    async def test_download_all_clips_failure(self, mock_parse_url, mock_storage_class):
-        """Test download failure raises RetryableError."""
+    async def test_download_all_clips_failure(self, mock_storage_class, tmp_path):
+        """Test HTTP failure raises RetryableError."""
         job_id = uuid4()
         clips = [sample_clip(0, "https://project.supabase.co/storage/v1/object/public/video-clips/clip0.mp4")]
+        mock_storage_with_signed_urls(mock_storage_class)
         
-        mock_storage = MagicMock()
-        mock_storage.download_file = AsyncMock(side_effect=Exception("Network error"))
-        mock_storage_class.return_value = mock_storage
+        def handler(request):
+            return httpx.Response(503)
         
-        mock_parse_url.return_value = ("video-clips", "clip0.mp4")
+        with patch('modules.composer.downloader.httpx.AsyncClient', mock_http_client(handler)):
+            with pytest.raises(RetryableError):
+                await download_all_clips(clips, tmp_path, job_id)
+    
+    @pytest.mark.asyncio
+    @patch('modules.composer.downloader.StorageClient')
+    async def test_get_all_clip_source_urls(self, mock_storage_class):
+        """Test signed URLs are resolved for direct FFmpeg input."""
+        clips = [sample_clip(0, "https://project.supabase.co/storage/v1/object/public/video-clips/clip0.mp4")]
+        mock_storage_with_signed_urls(mock_storage_class)
         
-        with pytest.raises(RetryableError):
-            await download_all_clips(clips, job_id)
+        result = await get_all_clip_source_urls(clips, uuid4())
+        
+        assert result == ["https://storage.test/video-clips/clip0.mp4?token=abc"]
 
 
 class TestDownloadAudio:
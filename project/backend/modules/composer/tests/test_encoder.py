@@ -6,7 +6,7 @@ from unittest.mock import patch, AsyncMock, MagicMock
 from pathlib import Path
 from uuid import uuid4
 
-from modules.composer.encoder import encode_final_video
+from modules.composer.encoder import encode_final_video, video_encode_args
 from shared.errors import CompositionError, RetryableError
 
 
@@ -31,26 +31,19 @@ class TestEncodeFinalVideo:
         
         mock_get_duration.return_value = 15.0
         
-        result_path = await encode_final_video(video_path, temp_dir, job_id)
+        result_path = await encode_final_video(video_path, temp_dir, job_id, 1920, 1080)
         
         # Verify output path
         assert result_path == temp_dir / "final_video.mp4"
         
-        # Verify FFmpeg was called with correct arguments
+        # Verify FFmpeg remuxes with stream copy (no second encode)
         mock_run_ffmpeg.assert_called_once()
         call_args = mock_run_ffmpeg.call_args[0][0]
         assert call_args[0] == "ffmpeg"
         assert "-threads" in call_args
-        assert "-c:v" in call_args
-        assert "libx264" in call_args
-        assert "-c:a" in call_args
-        assert "aac" in call_args
-        assert "-b:v" in call_args
-        assert "5000k" in call_args
-        assert "-b:a" in call_args
-        assert "192k" in call_args
-        assert "-preset" in call_args
-        assert "medium" in call_args
+        assert call_args[call_args.index("-c") + 1] == "copy"
+        assert "libx264" not in call_args
+        assert "-b:v" not in call_args
         assert "-movflags" in call_args
         assert "+faststart" in call_args
         
@@ -72,7 +65,7 @@ class TestEncodeFinalVideo:
         mock_run_ffmpeg.side_effect = RetryableError("FFmpeg command failed")
         
         with pytest.raises(CompositionError):
-            await encode_final_video(video_path, temp_dir, job_id)
+            await encode_final_video(video_path, temp_dir, job_id, 1920, 1080)
     
     @pytest.mark.asyncio
     @patch('modules.composer.encoder.run_ffmpeg_command', new_callable=AsyncMock)
@@ -89,7 +82,7 @@ class TestEncodeFinalVideo:
         mock_run_ffmpeg.return_value = None
         
         with pytest.raises(CompositionError, match="Final video not created"):
-            await encode_final_video(video_path, temp_dir, job_id)
+            await encode_final_video(video_path, temp_dir, job_id, 1920, 1080)
     
     @pytest.mark.asyncio
     @patch('modules.composer.encoder.run_ffmpeg_command', new_callable=AsyncMock)
@@ -108,7 +101,7 @@ class TestEncodeFinalVideo:
         output_path.write_bytes(b"x" * 500)  # 500 bytes
         
         with pytest.raises(CompositionError, match="Final video too small"):
-            await encode_final_video(video_path, temp_dir, job_id)
+            await encode_final_video(video_path, temp_dir, job_id, 1920, 1080)
     
     @pytest.mark.asyncio
     @patch('modules.composer.encoder.run_ffmpeg_command', new_callable=AsyncMock)
@@ -130,36 +123,20 @@ class TestEncodeFinalVideo:
         mock_get_duration.return_value = 0.0
         
         with pytest.raises(CompositionError, match="Invalid video duration"):
-            await encode_final_video(video_path, temp_dir, job_id)
-    
-    @pytest.mark.asyncio
-    @patch('modules.composer.encoder.run_ffmpeg_command', new_callable=AsyncMock)
-    @patch('modules.composer.encoder.get_video_duration', new_callable=AsyncMock)
-    async def test_encode_final_video_uses_config_constants(self, mock_get_duration, mock_run_ffmpeg):
-        """Test that encoding uses constants from config module."""
-        job_id = uuid4()
-        temp_dir = Path("/tmp/test_encoder_config")
-        temp_dir.mkdir(exist_ok=True)
-        
-        video_path = temp_dir / "video_with_audio.mp4"
-        video_path.touch()
-        
-        output_path = temp_dir / "final_video.mp4"
-        output_path.write_bytes(b"x" * 1024 * 1024)  # 1MB
-        
-        mock_get_duration.return_value = 15.0
-        
-        await encode_final_video(video_path, temp_dir, job_id)
-        
-        # Verify FFmpeg command uses config values
-        call_args = mock_run_ffmpeg.call_args[0][0]
-        
-        # Check that config constants are used (via string matching)
-        cmd_str = " ".join(call_args)
-        assert "libx264" in cmd_str  # OUTPUT_VIDEO_CODEC
-        assert "aac" in cmd_str  # OUTPUT_AUDIO_CODEC
-        assert "5000k" in cmd_str  # OUTPUT_VIDEO_BITRATE
-        assert "192k" in cmd_str  # OUTPUT_AUDIO_BITRATE
-        assert "fast" in cmd_str  # FFMPEG_PRESET (default is now "fast")
-        assert "+faststart" in cmd_str  # Web optimization
+            await encode_final_video(video_path, temp_dir, job_id, 1920, 1080)
 
+
+class TestVideoEncodeArgs:
+    """Tests for the shared encode settings."""
+    
+    def test_video_encode_args_use_config_constants(self):
+        """Every encode uses the output codec, pixel format, FPS and timescale."""
+        args = video_encode_args()
+        
+        assert args[args.index("-c:v") + 1] == "libx264"  # OUTPUT_VIDEO_CODEC
+        assert args[args.index("-pix_fmt") + 1] == "yuv420p"  # OUTPUT_PIX_FMT
+        assert args[args.index("-r") + 1] == "30"  # OUTPUT_FPS
+        assert args[args.index("-maxrate") + 1] == "5000k"  # OUTPUT_VIDEO_BITRATE
+        assert args[args.index("-bufsize") + 1] == "10000k"
+        assert "-video_track_timescale" in args
+        assert "-an" in args  # Audio is added by the mux step
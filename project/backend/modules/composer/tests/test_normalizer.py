@@ -18,7 +18,6 @@ class TestNormalizeClip:
     async def test_normalize_clip_success(self, mock_run_ffmpeg):
         """Test successful clip normalization."""
         job_id = uuid4()
-        clip_bytes = b"fake_video_data" * 1000
         clip_index = 0
         
         # Create temp directory
@@ -26,6 +25,9 @@ class TestNormalizeClip:
         temp_dir = Path(tempfile.mkdtemp())
         
         try:
+            input_path = temp_dir / f"clip_{clip_index}_input.mp4"
+            input_path.write_bytes(b"fake_video_data" * 1000)
+            
             # Mock FFmpeg command success
             mock_run_ffmpeg.return_value = None
             
@@ -33,7 +35,7 @@ class TestNormalizeClip:
             output_path = temp_dir / f"clip_{clip_index}_normalized.mp4"
             output_path.write_bytes(b"normalized_video")
             
-            result = await normalize_clip(clip_bytes, clip_index, temp_dir, job_id)
+            result = await normalize_clip(input_path, clip_index, temp_dir, job_id, 1920, 1080)
             
             assert result == output_path
             assert result.exists()
@@ -44,9 +46,11 @@ class TestNormalizeClip:
             cmd = call_args[0][0]
             assert "ffmpeg" in cmd
             assert "-vf" in cmd
-            assert "scale=1920:1080:flags=lanczos,fps=30" in cmd
+            assert str(input_path) in cmd
+            assert "-reconnect" not in cmd
             assert "-c:v" in cmd
             assert "libx264" in cmd
+            assert not input_path.exists()  # Downloaded original is removed after normalizing
         finally:
             import shutil
             shutil.rmtree(temp_dir, ignore_errors=True)
@@ -56,18 +60,20 @@ class TestNormalizeClip:
     async def test_normalize_clip_output_not_created(self, mock_run_ffmpeg):
         """Test normalization fails when output file not created."""
         job_id = uuid4()
-        clip_bytes = b"fake_video_data" * 1000
         clip_index = 0
         
         import tempfile
         temp_dir = Path(tempfile.mkdtemp())
         
         try:
+            input_path = temp_dir / f"clip_{clip_index}_input.mp4"
+            input_path.write_bytes(b"fake_video_data" * 1000)
+            
             # Mock FFmpeg command success but output file doesn't exist
             mock_run_ffmpeg.return_value = None
             
             with pytest.raises(CompositionError, match="Normalized clip not created"):
-                await normalize_clip(clip_bytes, clip_index, temp_dir, job_id)
+                await normalize_clip(input_path, clip_index, temp_dir, job_id, 1920, 1080)
         finally:
             import shutil
             shutil.rmtree(temp_dir, ignore_errors=True)
@@ -77,20 +83,47 @@ class TestNormalizeClip:
     async def test_normalize_clip_ffmpeg_failure(self, mock_run_ffmpeg):
         """Test normalization fails when FFmpeg fails."""
         job_id = uuid4()
-        clip_bytes = b"fake_video_data" * 1000
         clip_index = 0
         
         import tempfile
         temp_dir = Path(tempfile.mkdtemp())
         
         try:
+            input_path = temp_dir / f"clip_{clip_index}_input.mp4"
+            input_path.write_bytes(b"fake_video_data" * 1000)
+            
             # Mock FFmpeg command failure
             from shared.errors import RetryableError
             mock_run_ffmpeg.side_effect = RetryableError("FFmpeg failed")
             
             with pytest.raises(CompositionError):
-                await normalize_clip(clip_bytes, clip_index, temp_dir, job_id)
+                await normalize_clip(input_path, clip_index, temp_dir, job_id, 1920, 1080)
+        finally:
+            import shutil
+            shutil.rmtree(temp_dir, ignore_errors=True)
+    
+    @pytest.mark.asyncio
+    @patch('modules.composer.normalizer.get_video_properties', new_callable=AsyncMock)
+    @patch('modules.composer.normalizer.run_ffmpeg_command')
+    async def test_normalize_clip_from_url(self, mock_run_ffmpeg, mock_props):
+        """FFmpeg reads signed URLs directly, with reconnects enabled."""
+        job_id = uuid4()
+        source_url = "https://project.supabase.co/storage/v1/object/sign/video-clips/clip0.mp4?token=abc"
+        mock_props.return_value = {"width": 1920, "height": 1080, "fps": 30.0}
+        mock_run_ffmpeg.return_value = None
+        
+        import tempfile
+        temp_dir = Path(tempfile.mkdtemp())
+        
+        try:
+            (temp_dir / "clip_0_normalized.mp4").write_bytes(b"normalized_video")
+            
+            await normalize_clip(source_url, 0, temp_dir, job_id, 1920, 1080)
+            
+            cmd = mock_run_ffmpeg.call_args[0][0]
+            assert cmd[cmd.index("-i") + 1] == source_url
+            assert cmd.index("-reconnect") < cmd.index("-i")
+            mock_props.assert_awaited_once_with(source_url)
         finally:
             import shutil
             shutil.rmtree(temp_dir, ignore_errors=True)
-
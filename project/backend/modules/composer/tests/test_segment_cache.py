@@ -0,0 +1,169 @@
+"""
+Unit tests for the normalized segment cache.
+"""
+import pytest
+from unittest.mock import patch, MagicMock, AsyncMock
+from uuid import uuid4
+
+from modules.composer.segment_cache import (
+    segment_cache_key,
+    segment_cache_folder,
+    segment_cache_path,
+    get_clip_versions,
+    fetch_cached_segments,
+    store_segments,
+)
+
+
+CLIP_URL = "https://project.supabase.co/storage/v1/object/public/video-clips/job/clip_0.mp4"
+SIGNED_CLIP_URL = "https://project.supabase.co/storage/v1/object/sign/video-clips/job/clip_0.mp4?token=abc"
+REGENERATED_CLIP_URL = "https://project.supabase.co/storage/v1/object/public/video-clips/job/clip_0_v2.mp4"
+
+
+def _listing(**etags):
+    """Storage listing of the job folder with the given clip ETags."""
+    return [{"name": name, "metadata": {"eTag": f'"{etag}"'}} for name, etag in etags.items()]
+
+
+class TestSegmentCacheKey:
+    """Tests for segment_cache_key."""
+
+    def test_key_identifies_clip_version(self):
+        """Signed URL tokens don't matter; a regenerated or re-uploaded clip gets a new key."""
+        key = segment_cache_key(CLIP_URL, "etag1", 1920, 1080)
+
+        assert segment_cache_key(SIGNED_CLIP_URL, "etag1", 1920, 1080) == key
+        assert segment_cache_key(REGENERATED_CLIP_URL, "etag1", 1920, 1080) != key
+        # A retry overwrote clip_0.mp4 in place
+        assert segment_cache_key(CLIP_URL, "etag2", 1920, 1080) != key
+
+    def test_key_includes_output_size(self):
+        """Segments normalized to another size are not reused."""
+        assert segment_cache_key(CLIP_URL, "etag1", 1920, 1080) != segment_cache_key(CLIP_URL, "etag1", 1080, 1920)
+
+    def test_cache_path_is_namespaced_by_job_and_clip(self):
+        """All versions of a clip share one folder under the job's folder."""
+        job_id = uuid4()
+        folder = segment_cache_folder(job_id, CLIP_URL)
+
+        assert folder.startswith(f"{job_id}/normalized/")
+        assert segment_cache_folder(job_id, SIGNED_CLIP_URL) == folder
+        assert segment_cache_folder(job_id, REGENERATED_CLIP_URL) != folder
+        assert segment_cache_path(job_id, CLIP_URL, "abc") == f"{folder}/abc.mp4"
+
+
+class TestClipVersions:
+    """Tests for get_clip_versions."""
+
+    @pytest.mark.asyncio
+    async def test_versions_come_from_one_listing_per_folder(self):
+        """ETags are read from a single listing of the clips' folder."""
+        storage = MagicMock()
+        storage.list_files = AsyncMock(return_value=_listing(**{"clip_0.mp4": "a", "clip_0_v2.mp4": "b"}))
+
+        versions = await get_clip_versions(storage, [CLIP_URL, REGENERATED_CLIP_URL])
+
+        assert versions == {CLIP_URL: "a", REGENERATED_CLIP_URL: "b"}
+        storage.list_files.assert_called_once_with("video-clips", "job")
+
+    @pytest.mark.asyncio
+    async def test_listing_failure_resolves_no_versions(self):
+        """Unresolved clips are omitted rather than raising."""
+        storage = MagicMock()
+        storage.list_files = AsyncMock(side_effect=Exception("timeout"))
+
+        assert await get_clip_versions(storage, [CLIP_URL]) == {}
+
+
+class TestFetchAndStore:
+    """Tests for fetch_cached_segments and store_segments."""
+
+    @pytest.mark.asyncio
+    @patch('modules.composer.segment_cache.StorageClient')
+    async def test_fetch_returns_only_hits(self, mock_storage_class, tmp_path):
+        """Missing segments are cache misses, not errors."""
+        storage = MagicMock()
+        storage.list_files = AsyncMock(return_value=_listing(**{"clip_0.mp4": "a", "clip_0_v2.mp4": "b"}))
+        storage.download_file = AsyncMock(side_effect=[b"x" * 2048, Exception("Object not found")])
+        mock_storage_class.return_value = storage
+
+        hits = await fetch_cached_segments(
+            [(0, CLIP_URL), (1, REGENERATED_CLIP_URL)], tmp_path, uuid4(), 1920, 1080
+        )
+
+        assert list(hits) == [0]
+        assert hits[0].read_bytes() == b"x" * 2048
+
+    @pytest.mark.asyncio
+    @patch('modules.composer.segment_cache.StorageClient')
+    async def test_fetch_uses_current_clip_version(self, mock_storage_class, tmp_path):
+        """A clip overwritten in place is looked up under its new version; no version is a miss."""
+        job_id = uuid4()
+        storage = MagicMock()
+        storage.list_files = AsyncMock(return_value=_listing(**{"clip_0.mp4": "new"}))
+        storage.download_file = AsyncMock(return_value=b"x" * 2048)
+        mock_storage_class.return_value = storage
+
+        await fetch_cached_segments([(0, CLIP_URL), (1, REGENERATED_CLIP_URL)], tmp_path, job_id, 1920, 1080)
+
+        storage.download_file.assert_called_once_with(
+            "video-clips",
+            segment_cache_path(job_id, CLIP_URL, segment_cache_key(CLIP_URL, "new", 1920, 1080))
+        )
+
+    @pytest.mark.asyncio
+    @patch('modules.composer.segment_cache.StorageClient')
+    async def test_store_failures_do_not_raise(self, mock_storage_class, tmp_path):
+        """Upload failures are logged and skipped."""
+        segment = tmp_path / "clip_0_normalized.mp4"
+        segment.write_bytes(b"x" * 2048)
+        storage = MagicMock()
+        storage.list_files = AsyncMock(return_value=_listing(**{"clip_0.mp4": "a", "clip_0_v2.mp4": "b"}))
+        storage.upload_file = AsyncMock(side_effect=["url", Exception("quota exceeded")])
+        storage.delete_file = AsyncMock(return_value=True)
+        mock_storage_class.return_value = storage
+
+        stored = await store_segments(
+            [(CLIP_URL, segment), (REGENERATED_CLIP_URL, segment)], uuid4(), 1920, 1080
+        )
+
+        assert stored == 1
+        assert storage.upload_file.call_args_list[0].kwargs["bucket"] == "video-clips"
+
+    @pytest.mark.asyncio
+    @patch('modules.composer.segment_cache.StorageClient')
+    async def test_store_removes_segments_of_earlier_versions(self, mock_storage_class, tmp_path):
+        """Only the segment of the clip's current version is kept."""
+        job_id = uuid4()
+        segment = tmp_path / "clip_0_normalized.mp4"
+        segment.write_bytes(b"x" * 2048)
+        key = segment_cache_key(CLIP_URL, "new", 1920, 1080)
+        folder = segment_cache_folder(job_id, CLIP_URL)
+
+        async def list_files(bucket, path):
+            if path == folder:
+                return [{"name": f"{key}.mp4"}, {"name": "stale.mp4"}]
+            return _listing(**{"clip_0.mp4": "new"})
+
+        storage = MagicMock()
+        storage.list_files = AsyncMock(side_effect=list_files)
+        storage.upload_file = AsyncMock(return_value="url")
+        storage.delete_file = AsyncMock(return_value=True)
+        mock_storage_class.return_value = storage
+
+        assert await store_segments([(CLIP_URL, segment)], job_id, 1920, 1080) == 1
+        storage.delete_file.assert_called_once_with("video-clips", f"{folder}/stale.mp4")
+
+    @pytest.mark.asyncio
+    @patch('modules.composer.segment_cache.StorageClient')
+    async def test_store_skips_clips_without_version(self, mock_storage_class, tmp_path):
+        """Segments are not cached under an unknown clip version."""
+        segment = tmp_path / "clip_0_normalized.mp4"
+        segment.write_bytes(b"x" * 2048)
+        storage = MagicMock()
+        storage.list_files = AsyncMock(return_value=[])
+        storage.upload_file = AsyncMock(return_value="url")
+        mock_storage_class.return_value = storage
+
+        assert await store_segments([(CLIP_URL, segment)], uuid4(), 1920, 1080) == 0
+        assert not storage.upload_file.called
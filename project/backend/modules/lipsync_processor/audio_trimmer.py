@@ -1,13 +1,16 @@
 """
 Audio trimming utilities for lipsync processing.
 
-Handles trimming audio files to exact clip boundaries using FFmpeg.
+Handles trimming audio files to exact clip boundaries using FFmpeg. A whole
+job's clips are cut in one FFmpeg run (segment muxer, stream copy) from a
+single copy of the song on disk, and each slice is handed off as soon as
+FFmpeg closes it.
 """
 import asyncio
 import subprocess
 import shutil
 from pathlib import Path
-from typing import Tuple
+from typing import Awaitable, Callable, Dict, List, Tuple
 from uuid import UUID
 
 from shared.logging import get_logger
@@ -16,6 +19,90 @@ from modules.lipsync_processor.config import LIPSYNC_MAX_DURATION
 
 logger = get_logger("lipsync_processor.audio_trimmer")
 
+# Timeout for one FFmpeg run (a single trim, or splitting the whole song)
+TRIM_TIMEOUT_SECONDS = 60
+SEGMENT_TIMEOUT_SECONDS = 120
+
+# Called with (clip_index, trimmed_audio_bytes, duration) for each slice
+SliceCallback = Callable[[int, bytes, float], Awaitable[None]]
+
+
+def _validate_duration(start_time: float, end_time: float) -> float:
+    """Clip duration, or ValueError if lipsync can't use it."""
+    duration = end_time - start_time
+    
+    # Validate duration (pixverse/lipsync max is 30s)
+    if duration > LIPSYNC_MAX_DURATION:
+        raise ValueError(
+            f"Clip duration {duration:.2f}s exceeds {LIPSYNC_MAX_DURATION}s limit for lipsync"
+        )
+    
+    if duration <= 0:
+        raise ValueError(f"Invalid duration: {duration}s (start={start_time}s, end={end_time}s)")
+    
+    return duration
+
+
+async def _trim_file(
+    input_path: Path,
+    output_path: Path,
+    start_time: float,
+    duration: float,
+    job_id: UUID
+) -> bytes:
+    """
+    Cut one slice out of an audio file on disk.
+    
+    Returns:
+        Trimmed audio bytes
+        
+    Raises:
+        RetryableError: If FFmpeg fails or times out
+    """
+    # FFmpeg command to trim audio
+    # -ss: seek to start time
+    # -t: duration to extract
+    # -c:a copy: copy audio codec (fast, no re-encoding)
+    ffmpeg_cmd = [
+        "ffmpeg",
+        "-i", str(input_path),
+        "-ss", str(start_time),
+        "-t", str(duration),
+        "-c:a", "copy",  # Copy audio stream (fast)
+        "-y",  # Overwrite output
+        str(output_path)
+    ]
+    
+    # Execute FFmpeg
+    process = await asyncio.create_subprocess_exec(
+        *ffmpeg_cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=TRIM_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        process.kill()
+        logger.error(
+            f"Audio trimming timeout after {TRIM_TIMEOUT_SECONDS}s",
+            extra={"job_id": str(job_id)}
+        )
+        raise RetryableError(f"Audio trimming timeout after {TRIM_TIMEOUT_SECONDS}s")
+    
+    if process.returncode != 0:
+        error_msg = stderr.decode() if stderr else "Unknown FFmpeg error"
+        logger.error(
+            f"Failed to trim audio: {error_msg}",
+            extra={"job_id": str(job_id), "error": error_msg}
+        )
+        raise RetryableError(f"Audio trimming failed: {error_msg}")
+    
+    # Read trimmed audio
+    if not output_path.exists():
+        raise RetryableError(f"Trimmed audio file not created: {output_path}")
+    
+    return output_path.read_bytes()
+
 
 async def trim_audio_to_clip(
     audio_bytes: bytes,
@@ -27,6 +114,9 @@ async def trim_audio_to_clip(
     """
     Trim audio to exact clip boundaries using FFmpeg.
     
+    For several clips of the same song use slice_audio_to_clips, which writes
+    the song once and cuts every clip in one FFmpeg run.
+    
     Args:
         audio_bytes: Original audio file bytes
         start_time: Start time in seconds
@@ -41,16 +131,7 @@ async def trim_audio_to_clip(
         RetryableError: If trimming fails (retryable)
         ValueError: If duration exceeds limit (non-retryable)
     """
-    duration = end_time - start_time
-    
-    # Validate duration (pixverse/lipsync max is 30s)
-    if duration > LIPSYNC_MAX_DURATION:
-        raise ValueError(
-            f"Clip duration {duration:.2f}s exceeds {LIPSYNC_MAX_DURATION}s limit for lipsync"
-        )
-    
-    if duration <= 0:
-        raise ValueError(f"Invalid duration: {duration}s (start={start_time}s, end={end_time}s)")
+    duration = _validate_duration(start_time, end_time)
     
     # Check if FFmpeg is available
     if not shutil.which("ffmpeg"):
@@ -74,41 +155,7 @@ async def trim_audio_to_clip(
             }
         )
         
-        # FFmpeg command to trim audio
-        # -ss: seek to start time
-        # -t: duration to extract
-        # -c:a copy: copy audio codec (fast, no re-encoding)
-        ffmpeg_cmd = [
-            "ffmpeg",
-            "-i", str(input_path),
-            "-ss", str(start_time),
-            "-t", str(duration),
-            "-c:a", "copy",  # Copy audio stream (fast)
-            "-y",  # Overwrite output
-            str(output_path)
-        ]
-        
-        # Execute FFmpeg
-        process = await asyncio.create_subprocess_exec(
-            *ffmpeg_cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
-        )
-        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=60)
-        
-        if process.returncode != 0:
-            error_msg = stderr.decode() if stderr else "Unknown FFmpeg error"
-            logger.error(
-                f"Failed to trim audio: {error_msg}",
-                extra={"job_id": str(job_id), "error": error_msg}
-            )
-            raise RetryableError(f"Audio trimming failed: {error_msg}")
-        
-        # Read trimmed audio
-        if not output_path.exists():
-            raise RetryableError(f"Trimmed audio file not created: {output_path}")
-        
-        trimmed_bytes = output_path.read_bytes()
+        trimmed_bytes = await _trim_file(input_path, output_path, start_time, duration, job_id)
         
         logger.info(
             f"Audio trimmed successfully: {len(trimmed_bytes)} bytes",
@@ -121,14 +168,7 @@ async def trim_audio_to_clip(
         
         return trimmed_bytes, duration
         
-    except asyncio.TimeoutError:
-        logger.error(
-            "Audio trimming timeout after 60s",
-            extra={"job_id": str(job_id)}
-        )
-        raise RetryableError("Audio trimming timeout after 60s")
-    except ValueError:
-        # Re-raise validation errors as-is
+    except RetryableError:
         raise
     except Exception as e:
         logger.error(
@@ -145,3 +185,203 @@ async def trim_audio_to_clip(
                 except Exception:
                     pass
 
+
+def _is_contiguous_split(spans: List[Tuple[float, float]]) -> bool:
+    """True if the spans don't overlap, so every clip is exactly one segment."""
+    ordered = sorted(spans)
+    return all(ordered[i][1] <= ordered[i + 1][0] for i in range(len(ordered) - 1))
+
+
+def _segment_plan(spans: Dict[int, Tuple[float, float]]) -> Tuple[List[float], Dict[int, int]]:
+    """
+    Cut times for the segment muxer, and the segment number of each clip.
+    
+    Times are rounded to the millisecond precision passed to FFmpeg; a start
+    that rounds to 0 is the start of the song (segment 0), not a cut, or it
+    would add an empty segment and shift every later clip.
+    
+    Returns:
+        (cut times, {segment number: clip index})
+    """
+    def cut_point(t: float) -> float:
+        return max(round(t, 3), 0.0)
+    
+    cut_times = sorted({cut_point(t) for span in spans.values() for t in span} - {0.0})
+    # Segment n starts at the n-th cut (segment 0 starts at 0)
+    segment_starts = [0.0] + cut_times
+    segment_clips = {
+        segment_starts.index(cut_point(start)): index for index, (start, _) in spans.items()
+    }
+    return cut_times, segment_clips
+
+
+async def _split_into_segments(
+    input_path: Path,
+    spans: Dict[int, Tuple[float, float]],
+    job_id: UUID,
+    temp_dir: Path,
+    on_segment: Callable[[int, Path], None]
+) -> None:
+    """
+    Split the song at every clip start and end with the segment muxer.
+    
+    FFmpeg prints each segment to the segment list (stdout) once the segment
+    file is closed; on_segment is called with (clip_index, segment_path) for
+    segments that are clips, other segments (gaps, the tail) are deleted.
+    
+    Raises:
+        RetryableError: If FFmpeg fails or times out
+    """
+    cut_times, segment_clips = _segment_plan(spans)
+    
+    ffmpeg_cmd = [
+        "ffmpeg",
+        "-loglevel", "error",
+        "-i", str(input_path),
+        "-map", "0:a",
+        "-c:a", "copy",  # Copy audio stream (fast, cuts on frame boundaries)
+        "-f", "segment",
+        "-segment_times", ",".join(f"{t:.3f}" for t in cut_times),
+        "-reset_timestamps", "1",
+        "-segment_list", "pipe:1",
+        "-segment_list_type", "csv",
+        "-y",
+        str(temp_dir / f"audio_segment_{job_id}_%03d.mp3")
+    ]
+    
+    process = await asyncio.create_subprocess_exec(
+        *ffmpeg_cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    # Drain stderr alongside stdout so neither pipe fills up
+    stderr_task = asyncio.create_task(process.stderr.read())
+    
+    async def read_segment_list() -> None:
+        segment_number = 0
+        async for line in process.stdout:
+            # CSV entry: segment file name (relative to temp_dir), start, end
+            name = line.decode().strip().split(",")[0]
+            if not name:
+                continue
+            segment_path = temp_dir / name
+            index = segment_clips.get(segment_number)
+            segment_number += 1
+            if index is not None and segment_path.exists():
+                on_segment(index, segment_path)
+            else:
+                segment_path.unlink(missing_ok=True)
+        await process.wait()
+    
+    try:
+        await asyncio.wait_for(read_segment_list(), timeout=SEGMENT_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        process.kill()
+        raise RetryableError(f"Audio segmenting timeout after {SEGMENT_TIMEOUT_SECONDS}s")
+    finally:
+        stderr = await stderr_task
+    
+    if process.returncode != 0:
+        error_msg = stderr.decode() if stderr else "Unknown FFmpeg error"
+        raise RetryableError(f"Audio segmenting failed: {error_msg}")
+
+
+async def slice_audio_to_clips(
+    audio_bytes: bytes,
+    boundaries: List[Tuple[float, float]],
+    job_id: UUID,
+    temp_dir: Path,
+    on_slice: SliceCallback
+) -> Dict[int, Exception]:
+    """
+    Trim audio to every clip's boundaries, writing the song to disk once.
+    
+    Non-overlapping boundaries (the normal case) are cut in a single FFmpeg
+    run and on_slice is started for each slice as soon as FFmpeg finishes it,
+    so callers can upload slices while later ones are still being cut.
+    Overlapping boundaries, and any clips the split did not produce, are
+    trimmed one FFmpeg run per clip from the same input file.
+    
+    Args:
+        audio_bytes: Original audio file bytes
+        boundaries: (start, end) in seconds for each clip, in clip order
+        job_id: Job ID for logging
+        temp_dir: Temporary directory for processing
+        on_slice: Awaited with (clip_index, trimmed_audio_bytes, duration) per slice
+        
+    Returns:
+        Errors by clip index for clips that were not sliced or whose on_slice
+        raised (ValueError for invalid durations, RetryableError for FFmpeg failures)
+    """
+    errors: Dict[int, Exception] = {}
+    spans: Dict[int, Tuple[float, float]] = {}
+    for index, (start_time, end_time) in enumerate(boundaries):
+        try:
+            _validate_duration(start_time, end_time)
+            spans[index] = (start_time, end_time)
+        except ValueError as e:
+            errors[index] = e
+    
+    if not spans:
+        return errors
+    
+    # Check if FFmpeg is available
+    if not shutil.which("ffmpeg"):
+        error = RetryableError("FFmpeg is not available for audio trimming")
+        errors.update({index: error for index in spans})
+        return errors
+    
+    input_path = temp_dir / f"audio_input_{job_id}.mp3"
+    slice_tasks: Dict[int, asyncio.Task] = {}
+    
+    def emit(index: int, output_path: Path) -> None:
+        """Hand a finished slice to on_slice without waiting for the upload."""
+        trimmed_bytes = output_path.read_bytes()
+        output_path.unlink(missing_ok=True)
+        start_time, end_time = spans.pop(index)
+        slice_tasks[index] = asyncio.create_task(on_slice(index, trimmed_bytes, end_time - start_time))
+    
+    try:
+        # Write input audio to temp file (once for all clips)
+        input_path.write_bytes(audio_bytes)
+        
+        logger.info(
+            f"Slicing audio into {len(spans)} clips",
+            extra={"job_id": str(job_id), "num_clips": len(spans)}
+        )
+        
+        if _is_contiguous_split(list(spans.values())):
+            try:
+                await _split_into_segments(input_path, dict(spans), job_id, temp_dir, emit)
+            except Exception as e:
+                logger.warning(
+                    f"Audio segmenting failed, trimming remaining clips individually: {e}",
+                    extra={"job_id": str(job_id), "error": str(e)}
+                )
+        
+        for index, (start_time, end_time) in list(spans.items()):
+            output_path = temp_dir / f"audio_trimmed_{job_id}_{index}.mp3"
+            try:
+                await _trim_file(input_path, output_path, start_time, end_time - start_time, job_id)
+                emit(index, output_path)
+            except Exception as e:
+                errors[index] = e if isinstance(e, RetryableError) else RetryableError(f"Audio trimming error: {str(e)}")
+            finally:
+                output_path.unlink(missing_ok=True)
+        
+        results = await asyncio.gather(*slice_tasks.values(), return_exceptions=True)
+        for index, result in zip(slice_tasks.keys(), results):
+            if isinstance(result, Exception):
+                errors[index] = result
+        
+        logger.info(
+            f"Audio sliced: {len(slice_tasks)} clips, {len(errors)} failed",
+            extra={"job_id": str(job_id), "sliced": len(slice_tasks), "failed": len(errors)}
+        )
+        return errors
+    finally:
+        # Don't leave uploads running if slicing was cancelled
+        for task in slice_tasks.values():
+            if not task.done():
+                task.cancel()
+        input_path.unlink(missing_ok=True)
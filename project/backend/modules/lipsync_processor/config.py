@@ -19,6 +19,12 @@ LIPSYNC_TIMEOUT_SECONDS = int(os.getenv("LIPSYNC_TIMEOUT_SECONDS", "180"))  # 3
 LIPSYNC_MAX_DURATION = 30.0  # Max clip duration in seconds (model limit)
 LIPSYNC_MAX_VIDEO_SIZE_MB = 20  # Max video file size in MB (model limit)
 
+# Concurrency and retries
+# Clips lipsynced at once (Replicate slots are still shared through the Replicate governor)
+LIPSYNC_CONCURRENCY = int(os.getenv("LIPSYNC_CONCURRENCY", "4"))
+# Attempts per clip on retryable errors (rate limits, timeouts, network) before using the original clip
+LIPSYNC_MAX_ATTEMPTS = int(os.getenv("LIPSYNC_MAX_ATTEMPTS", "3"))
+
 # Cost estimation (if not available from Replicate)
 LIPSYNC_ESTIMATED_COST = Decimal(os.getenv("LIPSYNC_ESTIMATED_COST", "0.10"))  # $0.10 per clip
 
@@ -38,6 +44,8 @@ logger.info(
         "timeout": LIPSYNC_TIMEOUT_SECONDS,
         "max_duration": LIPSYNC_MAX_DURATION,
         "max_video_size_mb": LIPSYNC_MAX_VIDEO_SIZE_MB,
+        "concurrency": LIPSYNC_CONCURRENCY,
+        "max_attempts": LIPSYNC_MAX_ATTEMPTS,
         "estimated_cost": float(LIPSYNC_ESTIMATED_COST)
     }
 )
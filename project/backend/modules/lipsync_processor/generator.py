@@ -10,7 +10,6 @@ from typing import Optional, List
 from uuid import UUID
 from decimal import Decimal
 
-import replicate
 import httpx
 
 from shared.models.video import Clip
@@ -18,7 +17,8 @@ from shared.storage import StorageClient
 from shared.cost_tracking import cost_tracker
 from shared.errors import RetryableError, GenerationError
 from shared.logging import get_logger
-from shared.config import settings
+from shared.replicate_completion import create_replicate_client, webhook_kwargs, prediction_waiter
+from shared.replicate_governor import replicate_governor
 from modules.lipsync_processor.config import (
     PIXVERSE_LIPSYNC_MODEL,
     PIXVERSE_LIPSYNC_VERSION,
@@ -34,7 +34,7 @@ logger = get_logger("lipsync_processor.generator")
 
 # Initialize Replicate client
 try:
-    client = replicate.Client(api_token=settings.replicate_api_token)
+    client = create_replicate_client()
 except Exception as e:
     logger.error(f"Failed to initialize Replicate client: {str(e)}")
     raise
@@ -144,6 +144,7 @@ async def generate_lipsync_clip(
     )
     
     start_time = time.time()
+    governor_lease = None
     
     try:
         # Prepare input data for Replicate API
@@ -179,18 +180,25 @@ async def generate_lipsync_clip(
             }
         )
         
+        # Wait for account-wide PixVerse capacity (shared with all workers and jobs)
+        governor_lease = await replicate_governor.acquire(PIXVERSE_LIPSYNC_MODEL, job_id=job_id)
+        
         if PIXVERSE_LIPSYNC_VERSION == "latest":
-            prediction = client.predictions.create(
+            prediction = await asyncio.to_thread(
+                client.predictions.create,
                 model=PIXVERSE_LIPSYNC_MODEL,
-                input=input_data
+                input=input_data,
+                **webhook_kwargs()
             )
         else:
-            prediction = client.predictions.create(
+            prediction = await asyncio.to_thread(
+                client.predictions.create,
                 version=PIXVERSE_LIPSYNC_VERSION,
-                input=input_data
+                input=input_data,
+                **webhook_kwargs()
             )
         
-        # Poll for completion with adaptive interval
+        # Wait for completion, ticking with an adaptive interval for progress updates
         last_progress_update = 0
         progress_update_interval = 3  # Update progress every 3 seconds
         
@@ -207,10 +215,8 @@ async def generate_lipsync_clip(
             else:
                 poll_interval = LIPSYNC_POLL_INTERVAL
             
-            await asyncio.sleep(poll_interval)
-            
-            # Reload to get latest status
-            prediction.reload()
+            # Wait for the completion webhook (or the shared batched poller), at most poll_interval
+            await prediction_waiter.wait(prediction, timeout=poll_interval)
             
             # Early exit if status changed
             if prediction.status in ["succeeded", "failed", "canceled"]:
@@ -250,6 +256,13 @@ async def generate_lipsync_clip(
                     else:
                         progress_callback(progress_event)
         
+        # The prediction has finished on Replicate; free its capacity before downloading the output
+        if prediction.status == "succeeded":
+            governor_lease.succeeded()
+        elif "rate limit" in str(prediction.error).lower() or "429" in str(prediction.error):
+            governor_lease.throttled()
+        await replicate_governor.release(governor_lease)
+        
         # Handle result
         if prediction.status == "succeeded":
             # Get output video URL
@@ -413,6 +426,8 @@ async def generate_lipsync_clip(
     except Exception as e:
         error_str = str(e).lower()
         if "rate limit" in error_str or "429" in error_str:
+            if governor_lease is not None:
+                governor_lease.throttled()
             raise RetryableError(f"Rate limit error: {str(e)}") from e
         elif "timeout" in error_str:
             raise RetryableError(f"Timeout error: {str(e)}") from e
@@ -420,4 +435,7 @@ async def generate_lipsync_clip(
             raise RetryableError(f"Network error: {str(e)}") from e
         else:
             raise GenerationError(f"Lipsync generation error: {str(e)}") from e
+    finally:
+        # No-op if already released after completion
+        await replicate_governor.release(governor_lease)
 
@@ -1,11 +1,17 @@
 """
 Lipsync processor main orchestration.
 
-Orchestrates lipsync processing for multiple video clips.
+Orchestrates lipsync processing for multiple video clips. The song is sliced
+into every clip's audio in one FFmpeg pass and each slice is uploaded as soon
+as it's cut; clips are then processed concurrently (up to LIPSYNC_CONCURRENCY
+at once), each retrying retryable failures and falling back to the original
+clip if it still fails.
 """
 import asyncio
+import random
+import re
 import tempfile
-from typing import List, Optional, Callable, Dict, Any
+from typing import List, Optional, Callable, Dict, Any, Tuple
 from uuid import UUID
 from pathlib import Path
 from decimal import Decimal
@@ -15,7 +21,8 @@ from shared.models.audio import ClipBoundary, AudioAnalysis
 from shared.storage import StorageClient
 from shared.logging import get_logger
 from shared.errors import RetryableError, GenerationError
-from modules.lipsync_processor.audio_trimmer import trim_audio_to_clip
+from modules.lipsync_processor.audio_trimmer import slice_audio_to_clips, trim_audio_to_clip
+from modules.lipsync_processor.config import LIPSYNC_CONCURRENCY, LIPSYNC_MAX_ATTEMPTS
 from modules.lipsync_processor.generator import generate_lipsync_clip
 from modules.clip_regenerator.data_loader import load_audio_data_from_job_stages
 from modules.video_generator.image_handler import parse_supabase_url
@@ -23,6 +30,151 @@ from modules.video_generator.image_handler import parse_supabase_url
 logger = get_logger("lipsync_processor.process")
 
 
+async def _publish(
+    event_publisher: Optional[Callable[[str, Dict[str, Any]], None]],
+    event_type: str,
+    data: Dict[str, Any]
+) -> None:
+    """Publish an event through a sync or async publisher (publish failures are only logged)."""
+    if not event_publisher:
+        return
+    try:
+        if asyncio.iscoroutinefunction(event_publisher):
+            await event_publisher(event_type, data)
+        else:
+            event_publisher(event_type, data)
+    except Exception as e:
+        logger.warning(f"Failed to publish {event_type} event: {e}")
+
+
+def _retry_delay(error_msg: str, attempt: int) -> float:
+    """Backoff before the next attempt, honouring "retry after Ns" from rate limit errors."""
+    retry_after_match = re.search(r'retry after ([\d.]+)s', error_msg, re.IGNORECASE)
+    if retry_after_match:
+        try:
+            retry_after = float(retry_after_match.group(1))
+            # Add jitter (10-20% of retry_after) to desynchronize concurrent retries
+            return retry_after + random.uniform(0.1, 0.2) * retry_after
+        except ValueError:
+            pass
+    # Exponential backoff with jitter: 2s, 4s, 8s + random 0-2s
+    return 2 * (2 ** attempt) + random.uniform(0, 2)
+
+
+async def _upload_trimmed_audio(
+    storage: StorageClient,
+    job_id: UUID,
+    clip_index: int,
+    trimmed_audio_bytes: bytes
+) -> Tuple[str, str]:
+    """Upload a clip's trimmed audio to temporary storage; returns (path, url)."""
+    trimmed_audio_path = f"{job_id}/audio_trimmed_{clip_index}.mp3"
+    trimmed_audio_url = await storage.upload_file(
+        bucket="audio-uploads",
+        path=trimmed_audio_path,
+        file_data=trimmed_audio_bytes,
+        content_type="audio/mpeg"
+    )
+    return trimmed_audio_path, trimmed_audio_url
+
+
+async def _lipsync_clip(
+    clip: Clip,
+    clip_index: int,
+    trimmed_audio: Tuple[str, str],
+    storage: StorageClient,
+    job_id: UUID,
+    environment: str,
+    event_publisher: Optional[Callable[[str, Dict[str, Any]], None]],
+    character_ids: Optional[List[str]] = None
+) -> Clip:
+    """
+    Generate the lipsynced clip from the clip's uploaded trimmed audio.
+
+    Retryable generation failures are retried up to LIPSYNC_MAX_ATTEMPTS times.
+    The trimmed audio is deleted from storage afterwards either way.
+
+    Args:
+        trimmed_audio: (path, url) from _upload_trimmed_audio
+
+    Returns:
+        Lipsynced clip with the original clip's duration metadata
+
+    Raises:
+        Exception: Whatever the last attempt failed with
+    """
+    trimmed_audio_path, trimmed_audio_url = trimmed_audio
+    logger.info(
+        f"Processing lipsync for clip {clip_index}",
+        extra={"job_id": str(job_id), "clip_index": clip_index}
+    )
+
+    # Create progress callback
+    async def progress_callback(event_data: Dict[str, Any]) -> None:
+        """Progress callback for lipsync generation."""
+        await _publish(event_publisher, "lipsync_progress", event_data)
+
+    try:
+        # Generate lipsynced clip (retrying retryable failures)
+        for attempt in range(LIPSYNC_MAX_ATTEMPTS):
+            try:
+                lipsynced_clip = await generate_lipsync_clip(
+                    video_url=clip.video_url,
+                    audio_url=trimmed_audio_url,
+                    clip_index=clip_index,
+                    job_id=job_id,
+                    environment=environment,
+                    progress_callback=progress_callback,
+                    character_ids=character_ids
+                )
+                break
+            except RetryableError as e:
+                if attempt >= LIPSYNC_MAX_ATTEMPTS - 1:
+                    raise
+                delay = _retry_delay(str(e), attempt)
+                logger.warning(
+                    f"Lipsync for clip {clip_index} failed (retryable), retrying in {delay:.1f}s",
+                    extra={
+                        "job_id": str(job_id),
+                        "clip_index": clip_index,
+                        "attempt": attempt + 1,
+                        "error": str(e),
+                        "delay": delay
+                    }
+                )
+                await _publish(event_publisher, "lipsync_retry", {
+                    "clip_index": clip_index,
+                    "attempt": attempt + 1,
+                    "delay_seconds": delay,
+                    "error": str(e)
+                })
+                await asyncio.sleep(delay)
+    finally:
+        # Cleanup: Delete trimmed audio (optional, can keep for debugging)
+        try:
+            await storage.delete_file("audio-uploads", trimmed_audio_path)
+        except Exception:
+            pass
+
+    # Preserve original clip metadata
+    lipsynced_clip.actual_duration = clip.actual_duration
+    lipsynced_clip.target_duration = clip.target_duration
+    lipsynced_clip.original_target_duration = clip.original_target_duration
+    lipsynced_clip.duration_diff = clip.duration_diff
+    lipsynced_clip.clip_index = clip.clip_index  # Preserve clip_index
+
+    logger.info(
+        f"Lipsync processing complete for clip {clip_index}",
+        extra={
+            "job_id": str(job_id),
+            "clip_index": clip_index,
+            "cost": float(lipsynced_clip.cost),
+            "generation_time": lipsynced_clip.generation_time
+        }
+    )
+    return lipsynced_clip
+
+
 async def process_single_clip_lipsync(
     clip: Clip,
     clip_index: int,
@@ -99,122 +251,33 @@ async def process_single_clip_lipsync(
         raise GenerationError(f"Failed to download audio file: {str(e)}") from e
     
     # Publish start event
-    if event_publisher:
-        try:
-            if asyncio.iscoroutinefunction(event_publisher):
-                await event_publisher("lipsync_started", {
-                    "clip_index": clip_index,
-                    "job_id": str(job_id)
-                })
-            else:
-                event_publisher("lipsync_started", {
-                    "clip_index": clip_index,
-                    "job_id": str(job_id)
-                })
-        except Exception as e:
-            logger.warning(f"Failed to publish start event: {e}")
+    await _publish(event_publisher, "lipsync_started", {
+        "clip_index": clip_index,
+        "job_id": str(job_id)
+    })
     
     with tempfile.TemporaryDirectory() as temp_dir:
-        temp_path = Path(temp_dir)
-        
         try:
-            logger.info(
-                f"Processing lipsync for clip {clip_index}",
-                extra={
-                    "job_id": str(job_id),
-                    "clip_index": clip_index,
-                    "start": boundary.start,
-                    "end": boundary.end,
-                    "duration": boundary.duration
-                }
-            )
-            
-            # Step 1: Trim audio to clip boundaries
+            # Trim audio to clip boundaries and upload it
             trimmed_audio_bytes, duration = await trim_audio_to_clip(
                 audio_bytes=audio_bytes,
                 start_time=boundary.start,
                 end_time=boundary.end,
                 job_id=job_id,
-                temp_dir=temp_path
-            )
-            
-            # Step 2: Upload trimmed audio to temporary storage
-            trimmed_audio_path = f"{job_id}/audio_trimmed_{clip_index}.mp3"
-            trimmed_audio_url = await storage.upload_file(
-                bucket="audio-uploads",
-                path=trimmed_audio_path,
-                file_data=trimmed_audio_bytes,
-                content_type="audio/mpeg"
+                temp_dir=Path(temp_dir)
             )
+            trimmed_audio = await _upload_trimmed_audio(storage, job_id, clip_index, trimmed_audio_bytes)
             
-            # Step 3: Create progress callback
-            async def progress_callback(event_data: Dict[str, Any]) -> None:
-                """Progress callback for lipsync generation."""
-                if event_publisher:
-                    try:
-                        if asyncio.iscoroutinefunction(event_publisher):
-                            await event_publisher("lipsync_progress", event_data)
-                        else:
-                            event_publisher("lipsync_progress", event_data)
-                    except Exception as e:
-                        logger.warning(f"Failed to publish progress event: {e}")
-            
-            # Step 4: Generate lipsynced clip
-            lipsynced_clip = await generate_lipsync_clip(
-                video_url=clip.video_url,
-                audio_url=trimmed_audio_url,
+            lipsynced_clip = await _lipsync_clip(
+                clip=clip,
                 clip_index=clip_index,
+                trimmed_audio=trimmed_audio,
+                storage=storage,
                 job_id=job_id,
                 environment=environment,
-                progress_callback=progress_callback,
+                event_publisher=event_publisher,
                 character_ids=character_ids
             )
-            
-            # Preserve original clip metadata
-            lipsynced_clip.actual_duration = clip.actual_duration
-            lipsynced_clip.target_duration = clip.target_duration
-            lipsynced_clip.original_target_duration = clip.original_target_duration
-            lipsynced_clip.duration_diff = clip.duration_diff
-            lipsynced_clip.clip_index = clip.clip_index  # Preserve clip_index
-            
-            # Publish completion event
-            if event_publisher:
-                try:
-                    if asyncio.iscoroutinefunction(event_publisher):
-                        await event_publisher("lipsync_complete", {
-                            "clip_index": clip_index,
-                            "video_url": lipsynced_clip.video_url,
-                            "cost": str(lipsynced_clip.cost),
-                            "generation_time": lipsynced_clip.generation_time
-                        })
-                    else:
-                        event_publisher("lipsync_complete", {
-                            "clip_index": clip_index,
-                            "video_url": lipsynced_clip.video_url,
-                            "cost": str(lipsynced_clip.cost),
-                            "generation_time": lipsynced_clip.generation_time
-                        })
-                except Exception as e:
-                    logger.warning(f"Failed to publish completion event: {e}")
-            
-            # Cleanup: Delete trimmed audio (optional, can keep for debugging)
-            try:
-                await storage.delete_file("audio-uploads", trimmed_audio_path)
-            except Exception:
-                pass
-            
-            logger.info(
-                f"Lipsync processing complete for clip {clip_index}",
-                extra={
-                    "job_id": str(job_id),
-                    "clip_index": clip_index,
-                    "cost": float(lipsynced_clip.cost),
-                    "generation_time": lipsynced_clip.generation_time
-                }
-            )
-            
-            return lipsynced_clip
-            
         except Exception as e:
             logger.error(
                 f"Failed to process lipsync for clip {clip_index}: {e}",
@@ -227,26 +290,25 @@ async def process_single_clip_lipsync(
             )
             
             # Publish failure event
-            if event_publisher:
-                try:
-                    if asyncio.iscoroutinefunction(event_publisher):
-                        await event_publisher("lipsync_failed", {
-                            "clip_index": clip_index,
-                            "error": str(e),
-                            "using_fallback": True
-                        })
-                    else:
-                        event_publisher("lipsync_failed", {
-                            "clip_index": clip_index,
-                            "error": str(e),
-                            "using_fallback": True
-                        })
-                except Exception as e2:
-                    logger.warning(f"Failed to publish failure event: {e2}")
+            await _publish(event_publisher, "lipsync_failed", {
+                "clip_index": clip_index,
+                "error": str(e),
+                "using_fallback": True
+            })
             
             # Re-raise the error - don't fallback to original clip for single-clip processing
             # The caller should handle the error
             raise
+    
+    # Publish completion event
+    await _publish(event_publisher, "lipsync_complete", {
+        "clip_index": clip_index,
+        "video_url": lipsynced_clip.video_url,
+        "cost": str(lipsynced_clip.cost),
+        "generation_time": lipsynced_clip.generation_time
+    })
+    
+    return lipsynced_clip
 
 
 async def process_lipsync_clips(
@@ -321,161 +383,123 @@ async def process_lipsync_clips(
     except Exception as e:
         raise GenerationError(f"Failed to download audio file: {str(e)}") from e
     
-    # Process each clip
-    lipsynced_clips = []
-    total_cost = Decimal("0.00")
-    total_generation_time = 0.0
-    successful_clips = 0
-    failed_clips = 0
-    
     # Publish start event
-    if event_publisher:
+    await _publish(event_publisher, "lipsync_started", {
+        "total_clips": num_to_process,
+        "job_id": str(job_id)
+    })
+    
+    semaphore = asyncio.Semaphore(max(1, LIPSYNC_CONCURRENCY))
+    completed = 0
+    
+    # Trimmed audio (path, url) per clip, resolved as the slicer uploads each slice
+    loop = asyncio.get_running_loop()
+    trimmed_audio_by_clip = {i: loop.create_future() for i in range(num_to_process)}
+    
+    async def upload_slice(i: int, trimmed_audio_bytes: bytes, duration: float) -> None:
+        future = trimmed_audio_by_clip[i]
         try:
-            if asyncio.iscoroutinefunction(event_publisher):
-                await event_publisher("lipsync_started", {
-                    "total_clips": num_to_process,
-                    "job_id": str(job_id)
-                })
-            else:
-                event_publisher("lipsync_started", {
-                    "total_clips": num_to_process,
-                    "job_id": str(job_id)
-                })
+            trimmed_audio = await _upload_trimmed_audio(storage, job_id, i, trimmed_audio_bytes)
         except Exception as e:
-            logger.warning(f"Failed to publish start event: {e}")
+            if not future.done():
+                future.set_exception(e)
+            return
+        if not future.done():
+            future.set_result(trimmed_audio)
     
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_path = Path(temp_dir)
-        
-        for i in range(num_to_process):
-            clip = clips.clips[i]
-            boundary = clip_boundaries[i]
-            
-            try:
-                logger.info(
-                    f"Processing lipsync for clip {i}",
-                    extra={
-                        "job_id": str(job_id),
-                        "clip_index": i,
-                        "start": boundary.start,
-                        "end": boundary.end,
-                        "duration": boundary.duration
-                    }
-                )
-                
-                # Step 1: Trim audio to clip boundaries
-                trimmed_audio_bytes, duration = await trim_audio_to_clip(
-                    audio_bytes=audio_bytes,
-                    start_time=boundary.start,
-                    end_time=boundary.end,
-                    job_id=job_id,
-                    temp_dir=temp_path
-                )
-                
-                # Step 2: Upload trimmed audio to temporary storage
-                trimmed_audio_path = f"{job_id}/audio_trimmed_{i}.mp3"
-                trimmed_audio_url = await storage.upload_file(
-                    bucket="audio-uploads",
-                    path=trimmed_audio_path,
-                    file_data=trimmed_audio_bytes,
-                    content_type="audio/mpeg"
+    async def slice_audio(temp_path: Path) -> None:
+        """Cut every clip's audio in one pass, uploading slices as they're produced."""
+        try:
+            errors = await slice_audio_to_clips(
+                audio_bytes=audio_bytes,
+                boundaries=[(b.start, b.end) for b in clip_boundaries[:num_to_process]],
+                job_id=job_id,
+                temp_dir=temp_path,
+                on_slice=upload_slice
+            )
+        except Exception as e:
+            errors = {i: e for i in range(num_to_process)}
+        for i, future in trimmed_audio_by_clip.items():
+            if not future.done():
+                future.set_exception(
+                    errors.get(i) or RetryableError(f"No trimmed audio produced for clip {i}")
                 )
-                
-                # Step 3: Create progress callback
-                async def progress_callback(event_data: Dict[str, Any]) -> None:
-                    """Progress callback for lipsync generation."""
-                    if event_publisher:
-                        try:
-                            if asyncio.iscoroutinefunction(event_publisher):
-                                await event_publisher("lipsync_progress", event_data)
-                            else:
-                                event_publisher("lipsync_progress", event_data)
-                        except Exception as e:
-                            logger.warning(f"Failed to publish progress event: {e}")
-                
-                # Step 4: Generate lipsynced clip
-                lipsynced_clip = await generate_lipsync_clip(
-                    video_url=clip.video_url,
-                    audio_url=trimmed_audio_url,
+    
+    async def process_clip(i: int) -> Optional[Clip]:
+        """Lipsync one clip; None if it failed (the original clip is used instead)."""
+        nonlocal completed
+        clip = clips.clips[i]
+        try:
+            trimmed_audio = await trimmed_audio_by_clip[i]
+            async with semaphore:
+                lipsynced_clip = await _lipsync_clip(
+                    clip=clip,
                     clip_index=i,
+                    trimmed_audio=trimmed_audio,
+                    storage=storage,
                     job_id=job_id,
                     environment=environment,
-                    progress_callback=progress_callback
+                    event_publisher=event_publisher
                 )
-                
-                # Preserve original clip metadata
-                lipsynced_clip.actual_duration = clip.actual_duration
-                lipsynced_clip.target_duration = clip.target_duration
-                lipsynced_clip.original_target_duration = clip.original_target_duration
-                lipsynced_clip.duration_diff = clip.duration_diff
-                
-                lipsynced_clips.append(lipsynced_clip)
-                total_cost += lipsynced_clip.cost
-                total_generation_time += lipsynced_clip.generation_time
-                successful_clips += 1
-                
-                # Publish completion event
-                if event_publisher:
-                    try:
-                        if asyncio.iscoroutinefunction(event_publisher):
-                            await event_publisher("lipsync_complete", {
-                                "clip_index": i,
-                                "video_url": lipsynced_clip.video_url,
-                                "cost": str(lipsynced_clip.cost),
-                                "generation_time": lipsynced_clip.generation_time
-                            })
-                        else:
-                            event_publisher("lipsync_complete", {
-                                "clip_index": i,
-                                "video_url": lipsynced_clip.video_url,
-                                "cost": str(lipsynced_clip.cost),
-                                "generation_time": lipsynced_clip.generation_time
-                            })
-                    except Exception as e:
-                        logger.warning(f"Failed to publish completion event: {e}")
-                
-                # Cleanup: Delete trimmed audio (optional, can keep for debugging)
-                try:
-                    await storage.delete_file("audio-uploads", trimmed_audio_path)
-                except Exception:
-                    pass
-                
-            except Exception as e:
-                logger.error(
-                    f"Failed to process lipsync for clip {i}: {e}",
-                    extra={
-                        "job_id": str(job_id),
-                        "clip_index": i,
-                        "error": str(e),
-                        "error_type": type(e).__name__
-                    }
-                )
-                
-                # Fallback: Use original clip
-                logger.warning(
-                    f"Using original clip {i} as fallback (lipsync failed)",
-                    extra={"job_id": str(job_id), "clip_index": i}
-                )
-                lipsynced_clips.append(clip)  # Use original clip
-                failed_clips += 1
-                
-                # Publish failure event
-                if event_publisher:
-                    try:
-                        if asyncio.iscoroutinefunction(event_publisher):
-                            await event_publisher("lipsync_failed", {
-                                "clip_index": i,
-                                "error": str(e),
-                                "using_fallback": True
-                            })
-                        else:
-                            event_publisher("lipsync_failed", {
-                                "clip_index": i,
-                                "error": str(e),
-                                "using_fallback": True
-                            })
-                    except Exception as e2:
-                        logger.warning(f"Failed to publish failure event: {e2}")
+        except Exception as e:
+            logger.error(
+                f"Failed to process lipsync for clip {i}: {e}",
+                extra={
+                    "job_id": str(job_id),
+                    "clip_index": i,
+                    "error": str(e),
+                    "error_type": type(e).__name__
+                }
+            )
+            
+            # Fallback: Use original clip
+            logger.warning(
+                f"Using original clip {i} as fallback (lipsync failed)",
+                extra={"job_id": str(job_id), "clip_index": i}
+            )
+            completed += 1
+            await _publish(event_publisher, "lipsync_failed", {
+                "clip_index": i,
+                "error": str(e),
+                "using_fallback": True,
+                "completed_clips": completed,
+                "total_clips": num_to_process
+            })
+            return None
+        
+        # Clips finish out of order; completed_clips lets listeners track stage progress
+        completed += 1
+        await _publish(event_publisher, "lipsync_complete", {
+            "clip_index": i,
+            "video_url": lipsynced_clip.video_url,
+            "cost": str(lipsynced_clip.cost),
+            "generation_time": lipsynced_clip.generation_time,
+            "completed_clips": completed,
+            "total_clips": num_to_process
+        })
+        return lipsynced_clip
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        _, *results = await asyncio.gather(
+            slice_audio(Path(temp_dir)),
+            *(process_clip(i) for i in range(num_to_process))
+        )
+    
+    # Collect results in clip order
+    lipsynced_clips = []
+    total_cost = Decimal("0.00")
+    total_generation_time = 0.0
+    successful_clips = 0
+    failed_clips = 0
+    for i, lipsynced_clip in enumerate(results):
+        if lipsynced_clip is None:
+            lipsynced_clips.append(clips.clips[i])  # Use original clip
+            failed_clips += 1
+        else:
+            lipsynced_clips.append(lipsynced_clip)
+            total_cost += lipsynced_clip.cost
+            total_generation_time += lipsynced_clip.generation_time
+            successful_clips += 1
     
     logger.info(
         f"Lipsync processing complete: {successful_clips} successful, {failed_clips} failed",
@@ -0,0 +1,3 @@
+"""
+Lipsync processor module tests.
+"""
@@ -0,0 +1,197 @@
+"""
+Unit tests for slicing a song into clip audio.
+"""
+import pytest
+from unittest.mock import patch, AsyncMock
+from uuid import uuid4
+
+from modules.lipsync_processor.audio_trimmer import _segment_plan, slice_audio_to_clips
+from shared.errors import RetryableError
+
+
+class FakeSegmenter:
+    """
+    Stand-in for the FFmpeg segment muxer.
+
+    Writes one file per segment, holding the segment's time span ("0-5", the
+    last one open-ended as "15-"), and lists each on stdout as FFmpeg does. A
+    cut at 0 produces an empty "0-0" segment, as with the real muxer.
+    """
+
+    def __init__(self, fail_after=None):
+        self.fail_after = fail_after
+        self.cut_times = None
+        self.runs = 0
+
+    async def __call__(self, *cmd, stdout=None, stderr=None):
+        self.runs += 1
+        args = list(cmd)
+        self.cut_times = [float(t) for t in args[args.index("-segment_times") + 1].split(",")]
+        pattern = args[-1]
+        starts = [0.0] + self.cut_times
+        ends = [f"{t:g}" for t in self.cut_times] + [""]
+        segments = list(zip(starts, ends))
+        if self.fail_after is not None:
+            segments = segments[:self.fail_after]
+
+        lines = []
+        for number, (start, end) in enumerate(segments):
+            path = pattern.replace("%03d", f"{number:03d}")
+            with open(path, "wb") as f:
+                f.write(f"{start:g}-{end}".encode())
+            lines.append(f"{path.rsplit('/', 1)[-1]},{start},{end or 0}\n".encode())
+        return _FakeProcess(lines, returncode=0 if self.fail_after is None else 1)
+
+
+class _FakeProcess:
+    def __init__(self, lines, returncode):
+        self.stdout = _Lines(lines)
+        self.stderr = AsyncMock()
+        self.stderr.read = AsyncMock(return_value=b"" if returncode == 0 else b"Invalid data found")
+        self.returncode = returncode
+
+    async def wait(self):
+        return self.returncode
+
+    def kill(self):
+        pass
+
+
+class _Lines:
+    def __init__(self, lines):
+        self._lines = iter(lines)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._lines)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+async def _trim_file(input_path, output_path, start_time, duration, job_id):
+    """Per-clip trim: writes "trim<start>" to the output file."""
+    data = f"trim{start_time:g}".encode()
+    output_path.write_bytes(data)
+    return data
+
+
+async def _slice(boundaries, tmp_path):
+    slices = {}
+
+    async def on_slice(index, trimmed_bytes, duration):
+        slices[index] = (trimmed_bytes.decode(), duration)
+
+    errors = await slice_audio_to_clips(
+        audio_bytes=b"song",
+        boundaries=boundaries,
+        job_id=uuid4(),
+        temp_dir=tmp_path,
+        on_slice=on_slice
+    )
+    return slices, errors
+
+
+class TestSegmentPlan:
+    """Tests for _segment_plan."""
+
+    def test_clips_map_to_their_segments(self):
+        """Gaps between clips become their own (unused) segments."""
+        cut_times, segment_clips = _segment_plan({0: (0.0, 5.0), 1: (5.0, 10.0), 2: (12.0, 15.0)})
+
+        assert cut_times == [5.0, 10.0, 12.0, 15.0]
+        assert segment_clips == {0: 0, 1: 1, 3: 2}
+
+    def test_first_clip_starting_after_zero(self):
+        """A clip that doesn't start at 0 is the segment after the lead-in."""
+        cut_times, segment_clips = _segment_plan({0: (2.0, 5.0), 1: (5.0, 10.0)})
+
+        assert cut_times == [2.0, 5.0, 10.0]
+        assert segment_clips == {1: 0, 2: 1}
+
+    def test_start_rounding_to_zero_is_not_a_cut(self):
+        """A start just above 0 is the song start, not an empty first segment."""
+        cut_times, segment_clips = _segment_plan({0: (0.0004, 5.0), 1: (5.0, 10.0)})
+
+        assert cut_times == [5.0, 10.0]
+        assert segment_clips == {0: 0, 1: 1}
+
+    def test_times_are_matched_at_cut_precision(self):
+        """Boundaries that differ below a millisecond share one cut."""
+        cut_times, segment_clips = _segment_plan({0: (0.0, 4.9999), 1: (5.0001, 10.0)})
+
+        assert cut_times == [5.0, 10.0]
+        assert segment_clips == {0: 0, 1: 1}
+
+
+class TestSliceAudioToClips:
+    """Tests for slice_audio_to_clips."""
+
+    @pytest.mark.asyncio
+    async def test_clips_are_cut_in_one_pass(self, tmp_path):
+        """Each clip gets its own segment; gap segments are dropped."""
+        segmenter = FakeSegmenter()
+        with patch("modules.lipsync_processor.audio_trimmer.shutil.which", return_value="/usr/bin/ffmpeg"), \
+             patch("asyncio.create_subprocess_exec", new=segmenter), \
+             patch("modules.lipsync_processor.audio_trimmer._trim_file", side_effect=_trim_file) as mock_trim:
+            slices, errors = await _slice([(0.0004, 5.0), (5.0, 10.0), (12.0, 15.0)], tmp_path)
+
+        assert errors == {}
+        assert segmenter.runs == 1
+        mock_trim.assert_not_called()
+        assert segmenter.cut_times == [5.0, 10.0, 12.0, 15.0]
+        # The start just above 0 still gets the song's first 5s, not an empty segment
+        assert slices[0][0] == "0-5"
+        assert slices[1][0] == "5-10"
+        assert slices[2][0] == "12-15"
+        assert slices[2][1] == pytest.approx(3.0)
+        # Segment files and the input are cleaned up
+        assert list(tmp_path.iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_failed_split_falls_back_to_per_clip_trims(self, tmp_path):
+        """Clips the split did not produce are trimmed one at a time."""
+        # FFmpeg fails after writing the first two segments (clips 0 and 1)
+        segmenter = FakeSegmenter(fail_after=2)
+        with patch("modules.lipsync_processor.audio_trimmer.shutil.which", return_value="/usr/bin/ffmpeg"), \
+             patch("asyncio.create_subprocess_exec", new=segmenter), \
+             patch("modules.lipsync_processor.audio_trimmer._trim_file", side_effect=_trim_file) as mock_trim:
+            slices, errors = await _slice([(0.0, 5.0), (5.0, 10.0), (10.0, 15.0)], tmp_path)
+
+        assert errors == {}
+        assert slices[0][0] == "0-5"
+        assert slices[1][0] == "5-10"
+        assert slices[2][0] == "trim10"
+        assert mock_trim.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_overlapping_clips_are_trimmed_individually(self, tmp_path):
+        """Overlapping boundaries can't be one split, so every clip is trimmed."""
+        with patch("modules.lipsync_processor.audio_trimmer.shutil.which", return_value="/usr/bin/ffmpeg"), \
+             patch("asyncio.create_subprocess_exec") as mock_exec, \
+             patch("modules.lipsync_processor.audio_trimmer._trim_file", side_effect=_trim_file):
+            slices, errors = await _slice([(0.0, 6.0), (5.0, 10.0)], tmp_path)
+
+        assert errors == {}
+        mock_exec.assert_not_called()
+        assert {index: data for index, (data, _) in slices.items()} == {0: "trim0", 1: "trim5"}
+
+    @pytest.mark.asyncio
+    async def test_per_clip_errors_are_returned(self, tmp_path):
+        """Invalid durations and failed trims are reported by clip index."""
+        async def trim_file(input_path, output_path, start_time, duration, job_id):
+            if start_time == 5.0:
+                raise RetryableError("Audio trimming failed")
+            return await _trim_file(input_path, output_path, start_time, duration, job_id)
+
+        with patch("modules.lipsync_processor.audio_trimmer.shutil.which", return_value="/usr/bin/ffmpeg"), \
+             patch("modules.lipsync_processor.audio_trimmer._split_into_segments",
+                   AsyncMock(side_effect=RetryableError("Audio segmenting failed"))), \
+             patch("modules.lipsync_processor.audio_trimmer._trim_file", side_effect=trim_file):
+            slices, errors = await _slice([(0.0, 5.0), (5.0, 10.0), (10.0, 50.0)], tmp_path)
+
+        assert set(slices) == {0}
+        assert isinstance(errors[1], RetryableError)
+        assert isinstance(errors[2], ValueError)
@@ -0,0 +1,222 @@
+"""
+Unit tests for concurrent lipsync processing.
+"""
+import asyncio
+import pytest
+from unittest.mock import patch, MagicMock, AsyncMock
+from uuid import uuid4
+from decimal import Decimal
+
+from modules.lipsync_processor.process import process_lipsync_clips
+from shared.models.video import Clips, Clip
+from shared.models.audio import ClipBoundary
+from shared.errors import RetryableError, GenerationError
+
+
+NUM_CLIPS = 4
+
+
+def _clip(clip_index: int, video_url: str) -> Clip:
+    return Clip(
+        clip_index=clip_index,
+        video_url=video_url,
+        actual_duration=5.0,
+        target_duration=5.0,
+        duration_diff=0.0,
+        status="success",
+        cost=Decimal("0.10"),
+        generation_time=10.0
+    )
+
+
+@pytest.fixture
+def sample_job_id():
+    """Sample job ID for testing."""
+    return uuid4()
+
+
+@pytest.fixture
+def sample_clips(sample_job_id):
+    """Generated clips, one per boundary."""
+    clips = [_clip(i, f"https://example.com/clip{i}.mp4") for i in range(NUM_CLIPS)]
+    return Clips(
+        job_id=sample_job_id,
+        clips=clips,
+        total_clips=NUM_CLIPS,
+        successful_clips=NUM_CLIPS,
+        failed_clips=0,
+        total_cost=Decimal("0.40"),
+        total_generation_time=40.0
+    )
+
+
+@pytest.fixture
+def mock_pipeline():
+    """
+    Patch everything around the clip loop.
+
+    The slicer hands out the slices in reverse clip order, as the uploads of
+    concurrent slices may finish in any order.
+    """
+    audio_analysis = MagicMock()
+    audio_analysis.clip_boundaries = [
+        ClipBoundary(start=i * 5.0, end=(i + 1) * 5.0, duration=5.0) for i in range(NUM_CLIPS)
+    ]
+
+    storage = MagicMock()
+    storage.download_file = AsyncMock(return_value=b"song")
+    storage.upload_file = AsyncMock(side_effect=lambda bucket, path, file_data, content_type: f"https://example.com/{path}")
+    storage.delete_file = AsyncMock()
+
+    async def slice_audio_to_clips(audio_bytes, boundaries, job_id, temp_dir, on_slice):
+        for index in reversed(range(len(boundaries))):
+            await on_slice(index, b"slice", 5.0)
+        return {}
+
+    with patch("modules.lipsync_processor.process.load_audio_data_from_job_stages", AsyncMock(return_value=audio_analysis)), \
+         patch("modules.lipsync_processor.process.StorageClient", return_value=storage), \
+         patch("modules.lipsync_processor.process.parse_supabase_url", return_value=("audio-uploads", "song.mp3")), \
+         patch("modules.lipsync_processor.process.slice_audio_to_clips", side_effect=slice_audio_to_clips) as mock_slice, \
+         patch("modules.lipsync_processor.process._retry_delay", return_value=0), \
+         patch("modules.lipsync_processor.process.generate_lipsync_clip") as mock_generate:
+        yield {"storage": storage, "slice": mock_slice, "generate": mock_generate}
+
+
+def _lipsynced(clip_index: int) -> Clip:
+    return _clip(clip_index, f"https://example.com/lipsync{clip_index}.mp4")
+
+
+class TestProcessLipsyncClips:
+    """Tests for process_lipsync_clips."""
+
+    @pytest.mark.asyncio
+    async def test_results_are_in_clip_order(self, sample_clips, sample_job_id, mock_pipeline):
+        """Clips that finish out of order are still returned in clip order."""
+        async def generate(video_url, audio_url, clip_index, **kwargs):
+            # Earlier clips take longest
+            await asyncio.sleep(0.01 * (NUM_CLIPS - clip_index))
+            assert audio_url.endswith(f"audio_trimmed_{clip_index}.mp3")
+            return _lipsynced(clip_index)
+        mock_pipeline["generate"].side_effect = generate
+
+        result = await process_lipsync_clips(sample_clips, "https://example.com/song.mp3", sample_job_id)
+
+        assert [clip.video_url for clip in result.clips] == [
+            f"https://example.com/lipsync{i}.mp4" for i in range(NUM_CLIPS)
+        ]
+        assert [clip.clip_index for clip in result.clips] == list(range(NUM_CLIPS))
+        assert result.successful_clips == NUM_CLIPS
+        assert result.failed_clips == 0
+        assert result.total_cost == Decimal("0.40")
+        # Every trimmed slice is cleaned up
+        assert mock_pipeline["storage"].delete_file.await_count == NUM_CLIPS
+
+    @pytest.mark.asyncio
+    async def test_retryable_failure_is_retried(self, sample_clips, sample_job_id, mock_pipeline):
+        """A retryable failure is retried for that clip only."""
+        attempts = {i: 0 for i in range(NUM_CLIPS)}
+
+        async def generate(video_url, audio_url, clip_index, **kwargs):
+            attempts[clip_index] += 1
+            if clip_index == 1 and attempts[clip_index] == 1:
+                raise RetryableError("Rate limited, retry after 1s")
+            return _lipsynced(clip_index)
+        mock_pipeline["generate"].side_effect = generate
+
+        result = await process_lipsync_clips(sample_clips, "https://example.com/song.mp3", sample_job_id)
+
+        assert attempts == {0: 1, 1: 2, 2: 1, 3: 1}
+        assert result.successful_clips == NUM_CLIPS
+        assert result.clips[1].video_url == "https://example.com/lipsync1.mp4"
+
+    @pytest.mark.asyncio
+    async def test_failed_clip_falls_back_without_cancelling_others(self, sample_clips, sample_job_id, mock_pipeline):
+        """A clip that keeps failing uses the original clip; the others still complete."""
+        events = []
+
+        async def generate(video_url, audio_url, clip_index, **kwargs):
+            if clip_index == 1:
+                raise GenerationError("Lipsync model rejected the video")
+            # Still running when clip 1 fails
+            await asyncio.sleep(0.01)
+            return _lipsynced(clip_index)
+        mock_pipeline["generate"].side_effect = generate
+
+        result = await process_lipsync_clips(
+            sample_clips,
+            "https://example.com/song.mp3",
+            sample_job_id,
+            event_publisher=lambda event_type, data: events.append((event_type, data))
+        )
+
+        assert result.clips[1].video_url == "https://example.com/clip1.mp4"
+        assert [result.clips[i].video_url for i in (0, 2, 3)] == [
+            f"https://example.com/lipsync{i}.mp4" for i in (0, 2, 3)
+        ]
+        assert result.successful_clips == NUM_CLIPS - 1
+        assert result.failed_clips == 1
+        failed = [data for event_type, data in events if event_type == "lipsync_failed"]
+        assert [data["clip_index"] for data in failed] == [1]
+        assert failed[0]["using_fallback"] is True
+        # Non-retryable errors are not retried
+        assert mock_pipeline["generate"].await_count == NUM_CLIPS
+
+    @pytest.mark.asyncio
+    async def test_exhausted_retries_fall_back(self, sample_clips, sample_job_id, mock_pipeline):
+        """A clip is retried LIPSYNC_MAX_ATTEMPTS times before falling back."""
+        attempts = {i: 0 for i in range(NUM_CLIPS)}
+
+        async def generate(video_url, audio_url, clip_index, **kwargs):
+            attempts[clip_index] += 1
+            if clip_index == 2:
+                raise RetryableError("Prediction timed out")
+            return _lipsynced(clip_index)
+        mock_pipeline["generate"].side_effect = generate
+
+        with patch("modules.lipsync_processor.process.LIPSYNC_MAX_ATTEMPTS", 3):
+            result = await process_lipsync_clips(sample_clips, "https://example.com/song.mp3", sample_job_id)
+
+        assert attempts[2] == 3
+        assert result.clips[2].video_url == "https://example.com/clip2.mp4"
+        assert result.failed_clips == 1
+
+    @pytest.mark.asyncio
+    async def test_missing_slice_falls_back(self, sample_clips, sample_job_id, mock_pipeline):
+        """A clip whose audio could not be sliced uses the original clip."""
+        async def slice_audio_to_clips(audio_bytes, boundaries, job_id, temp_dir, on_slice):
+            for index in range(len(boundaries)):
+                if index != 3:
+                    await on_slice(index, b"slice", 5.0)
+            return {3: RetryableError("Audio trimming failed")}
+
+        async def generate(video_url, audio_url, clip_index, **kwargs):
+            return _lipsynced(clip_index)
+        mock_pipeline["slice"].side_effect = slice_audio_to_clips
+        mock_pipeline["generate"].side_effect = generate
+
+        result = await process_lipsync_clips(sample_clips, "https://example.com/song.mp3", sample_job_id)
+
+        assert result.clips[3].video_url == "https://example.com/clip3.mp4"
+        assert result.successful_clips == NUM_CLIPS - 1
+        assert mock_pipeline["generate"].call_count == NUM_CLIPS - 1
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self, sample_clips, sample_job_id, mock_pipeline):
+        """At most LIPSYNC_CONCURRENCY clips are lipsynced at once."""
+        running = 0
+        peak = 0
+
+        async def generate(video_url, audio_url, clip_index, **kwargs):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return _lipsynced(clip_index)
+        mock_pipeline["generate"].side_effect = generate
+
+        with patch("modules.lipsync_processor.process.LIPSYNC_CONCURRENCY", 2):
+            result = await process_lipsync_clips(sample_clips, "https://example.com/song.mp3", sample_job_id)
+
+        assert peak == 2
+        assert result.successful_clips == NUM_CLIPS
@@ -16,6 +16,7 @@ from openai import APIError, APITimeoutError, AsyncOpenAI, RateLimitError
 from shared.config import settings
 from shared.cost_tracking import cost_tracker
 from shared.errors import GenerationError, RetryableError, ValidationError
+from shared.llm_cache import llm_cache
 from shared.logging import get_logger
 from shared.retry import retry_with_backoff
 
@@ -151,7 +152,12 @@ async def _optimize_batch(
                 estimated_tokens = max(12000, batch_size * 700 + 2000)
                 max_tokens = min(estimated_tokens, 16000)  # Cap at 16k for gpt-4o
             
-            response = await client.chat.completions.create(
+            # Cached for identical batches; misses share the account-wide OpenAI rate limiter
+            completion = await llm_cache.complete(
+                client,
+                stage_name="prompt_generator",
+                job_id=job_id,
+                cost_fn=_calculate_llm_cost,
                 model=model,
                 messages=[
                     {"role": "system", "content": system_prompt},
@@ -163,8 +169,8 @@ async def _optimize_batch(
                 timeout=90.0,
             )
             
-            content = response.choices[0].message.content
-            finish_reason = response.choices[0].finish_reason
+            content = completion.content
+            finish_reason = completion.finish_reason
             
             if not content:
                 logger.warning(
@@ -227,6 +233,7 @@ async def _optimize_batch(
                         "likely_truncation": is_truncation,
                     },
                 )
+                await llm_cache.discard(completion)
                 # If truncated and we have retries, retry with maximum max_tokens
                 if is_truncation and attempt < 1:
                     logger.info(
@@ -258,6 +265,7 @@ async def _optimize_batch(
                         "clip_indices": f"{first_clip_idx}-{last_clip_idx}",
                     },
                 )
+                await llm_cache.discard(completion)
                 if attempt < 1:
                     await asyncio.sleep(2 * (attempt + 1))
                     continue
@@ -272,16 +280,18 @@ async def _optimize_batch(
                 text = prompt_dict.get(clip_idx, base_prompt.get("draft_prompt", ""))
                 final_prompts.append(text.strip() if text else "")
             
-            input_tokens = response.usage.prompt_tokens
-            output_tokens = response.usage.completion_tokens
+            # Billed tokens (0 when served from the LLM cache, which records the saving itself)
+            input_tokens = completion.input_tokens
+            output_tokens = completion.output_tokens
             cost = _calculate_llm_cost(model, input_tokens, output_tokens)
             
-            await cost_tracker.track_cost(
-                job_id=job_id,
-                stage_name="prompt_generator",
-                api_name=model,
-                cost=cost,
-            )
+            if not completion.cached:
+                await cost_tracker.track_cost(
+                    job_id=job_id,
+                    stage_name="prompt_generator",
+                    api_name=model,
+                    cost=cost,
+                )
         
             logger.info(
                 "Batch optimization completed",
@@ -293,6 +303,7 @@ async def _optimize_batch(
                     "input_tokens": input_tokens,
                     "output_tokens": output_tokens,
                     "cost": float(cost),
+                    "cached": completion.cached,
                 },
             )
             
@@ -364,6 +375,8 @@ async def optimize_prompts(
     Optimize prompts using LLM with batching support.
     
     Splits prompts into batches of 15 (configurable) to avoid token limits and timeouts.
+    Batches run concurrently (bounded per job, and by the shared OpenAI rate limiter),
+    and results are reassembled in clip order.
     If a batch fails, uses deterministic prompts for that batch only.
     """
     if not base_prompts:
@@ -396,16 +409,23 @@ async def optimize_prompts(
     for i in range(0, total_clips, batch_size):
         batches.append(base_prompts[i:i + batch_size])
     
-    # Process batches sequentially (to avoid rate limits)
+    # Process batches concurrently; rate limits are enforced by the shared OpenAI limiter
+    semaphore = asyncio.Semaphore(max(1, settings.prompt_generator_max_concurrent_batches))
+    
+    async def optimize_batch(batch: List[Dict[str, Any]]) -> Optional[LLMResult]:
+        async with semaphore:
+            return await _optimize_batch(job_id, batch, style_keywords, model)
+    
+    batch_results = await asyncio.gather(*(optimize_batch(batch) for batch in batches))
+    
+    # Reassemble in clip order
     all_prompts = []
     total_input_tokens = 0
     total_output_tokens = 0
     successful_batches = 0
     failed_batches = 0
     
-    for batch_idx, batch in enumerate(batches):
-        batch_result = await _optimize_batch(job_id, batch, style_keywords, model)
-        
+    for batch_idx, (batch, batch_result) in enumerate(zip(batches, batch_results)):
         if batch_result:
             # LLM optimization succeeded for this batch
             all_prompts.extend(batch_result.prompts)
@@ -1,3 +1,4 @@
+import asyncio
 import json
 from types import SimpleNamespace
 
@@ -6,6 +7,13 @@ import pytest
 from modules.prompt_generator import llm_client
 
 
+@pytest.fixture(autouse=True)
+def no_shared_llm_state(monkeypatch):
+    """Keep the account-wide OpenAI limiter and the LLM cache (Redis) out of unit tests."""
+    monkeypatch.setattr(llm_client.settings, "openai_rate_limiter_enabled", False)
+    monkeypatch.setattr(llm_client.settings, "llm_cache_backend", "none")
+
+
 class _FakeCompletions:
     def __init__(self, response):
         self._response = response
@@ -38,3 +46,37 @@ async def test_optimize_prompts_returns_llm_result(monkeypatch, job_uuid):
     assert result.prompts[0] == "Optimized prompt"
     assert result.model == "gpt-4o"
 
+
+
+@pytest.mark.asyncio
+async def test_optimize_prompts_runs_batches_concurrently(monkeypatch, job_uuid):
+    """Batches are in flight together and results come back in clip order, with per-batch fallback."""
+    payload = [{"clip_index": i, "draft_prompt": f"Base {i}"} for i in range(5)]
+    in_flight = 0
+    max_in_flight = 0
+
+    async def fake_optimize_batch(job_id, batch, style_keywords, model):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        # Later batches finish first
+        await asyncio.sleep(0.01 * (5 - batch[0]["clip_index"]))
+        in_flight -= 1
+        if batch[0]["clip_index"] == 2:
+            return None
+        return llm_client.LLMResult(
+            prompts=[f"Optimized {p['clip_index']}" for p in batch],
+            model=model,
+            input_tokens=10,
+            output_tokens=5,
+        )
+
+    monkeypatch.setattr(llm_client.settings, "prompt_generator_batch_size", 2)
+    monkeypatch.setattr(llm_client.settings, "prompt_generator_max_concurrent_batches", 4)
+    monkeypatch.setattr(llm_client, "_optimize_batch", fake_optimize_batch)
+
+    result = await llm_client.optimize_prompts(job_uuid, payload, ["cyberpunk"])
+
+    assert max_in_flight == 3
+    assert result.prompts == ["Optimized 0", "Optimized 1", "Base 2", "Base 3", "Optimized 4"]
+    assert result.input_tokens == 20
@@ -7,16 +7,20 @@ Handles parallel generation, retry logic, and cost tracking.
 import asyncio
 import time
 from decimal import Decimal
-from typing import Dict, Any, List, Literal, Tuple, Optional, Callable
+from typing import Dict, Any, List, Literal, Tuple, Optional, Callable, TYPE_CHECKING
 from uuid import UUID
 import httpx
 
-import replicate
 from shared.config import settings
-from shared.models.scene import ScenePlan, Scene, Character
+from shared.models.scene import ScenePlan, Scene, Character, Object
 from shared.errors import RetryableError, GenerationError, RateLimitError, ValidationError
 from shared.retry import retry_with_backoff
 from shared.logging import get_logger
+from shared.replicate_completion import create_replicate_client, webhook_kwargs, prediction_waiter
+from shared.replicate_governor import replicate_governor
+
+if TYPE_CHECKING:
+    from .prefetch import ReferencePrefetcher
 
 logger = get_logger("reference_generator.generator")
 
@@ -158,11 +162,58 @@ def get_model_version(image_type: Literal["scene", "character", "object"] = "sce
 
 # Initialize Replicate client
 try:
-    client = replicate.Client(api_token=settings.replicate_api_token)
+    client = create_replicate_client()
 except Exception as e:
     logger.error(f"Failed to initialize Replicate client: {str(e)}")
     raise
 
+# How long a single prediction_waiter.wait() call may block before waiting again
+PREDICTION_WAIT_TICK = 30.0
+
+
+def _cancel_prediction(prediction: Any) -> None:
+    """Cancel an abandoned prediction so it stops running (and billing); failures are only logged."""
+    try:
+        client.predictions.cancel(prediction.id)
+    except Exception as e:
+        logger.warning(f"Failed to cancel prediction {prediction.id}: {str(e)}")
+
+
+async def run_prediction(model_version: str, input_data: Dict[str, Any]) -> Any:
+    """
+    Create a Replicate prediction and wait for its output.
+    
+    Replaces client.run(), which ties up a thread polling Replicate until the
+    prediction finishes. Completion arrives via webhook (or the shared batched
+    poller); callers bound the total time with asyncio.wait_for. If the wait
+    is cancelled (timeout, discarded prefetch) the prediction is cancelled too.
+    
+    Args:
+        model_version: "owner/model" or "owner/model:version_hash"
+        input_data: Model input
+        
+    Returns:
+        Prediction output (URL string or list of URLs)
+        
+    Raises:
+        GenerationError: If the prediction failed or was canceled
+    """
+    model, _, version = model_version.partition(":")
+    target = {"version": version} if version else {"model": model}
+    prediction = await asyncio.to_thread(
+        client.predictions.create, input=input_data, **target, **webhook_kwargs()
+    )
+    try:
+        while not await prediction_waiter.wait(prediction, timeout=PREDICTION_WAIT_TICK):
+            pass
+    except asyncio.CancelledError:
+        # Not awaited: the cancel request must not delay (or be lost to) the cancellation
+        asyncio.get_running_loop().run_in_executor(None, _cancel_prediction, prediction)
+        raise
+    if prediction.status != "succeeded":
+        raise GenerationError(f"Prediction {prediction.id} {prediction.status}: {prediction.error}")
+    return prediction.output
+
 
 async def generate_image(
     prompt: str,
@@ -317,15 +368,13 @@ async def generate_image(
             extra={"job_id": str(job_id), "image_type": image_type, "image_id": image_id, "retry_count": retry_count}
         )
         
-        # Call Replicate API with timeout
-        output = await asyncio.wait_for(
-            asyncio.to_thread(
-                client.run,
-                model_version,
-                input=generation_settings
-            ),
-            timeout=120.0  # 120s timeout per image
-        )
+        # Call Replicate API with timeout, once account-wide capacity for this model is available
+        async with replicate_governor.slot(model_version, job_id=job_id) as governor_lease:
+            output = await asyncio.wait_for(
+                run_prediction(model_version, generation_settings),
+                timeout=120.0  # 120s timeout per image
+            )
+            governor_lease.succeeded()
         
         generation_time = time.time() - start_time
         
@@ -470,9 +519,10 @@ async def generate_all_references(
     plan: ScenePlan,
     scenes: List[Scene],
     characters: List[Character],
-    objects: List['Object'],
+    objects: List[Object],
     duration_seconds: Optional[float] = None,
-    events_callback: Optional[Callable[[Dict[str, Any]], None]] = None
+    events_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+    prefetcher: Optional["ReferencePrefetcher"] = None
 ) -> List[Dict[str, Any]]:
     """
     Generate all reference images in parallel with retry logic.
@@ -485,11 +535,13 @@ async def generate_all_references(
         characters: List of unique characters
         duration_seconds: Optional audio duration for budget checks
         events_callback: Optional callback to publish SSE events
+        prefetcher: Optional prefetcher holding images started while the plan streamed
+                    (reused when the prompt matches, otherwise generated here)
 
     Returns:
         List of result dictionaries with success/failure info
     """
-    from .prompts import synthesize_prompt
+    from .prompts import synthesize_reference_prompt
     from shared.errors import BudgetExceededError
     from shared.cost_tracking import cost_tracker
     from shared.config import settings
@@ -525,9 +577,6 @@ async def generate_all_references(
                 # Variation 0: use base_image_id (for backward compatibility)
                 image_id = base_image_id
 
-            # Get description - for characters, use description field or fallback to ID
-            description = getattr(scene_or_char, 'description', None) or base_image_id
-            
             # Check budget before generation (if duration provided)
             if duration_seconds:
                 duration_minutes = duration_seconds / 60.0
@@ -556,71 +605,60 @@ async def generate_all_references(
             
             try:
                 # Synthesize prompt with variation support
-                if img_type == "object":
-                    # Objects use specialized product photography prompts
-                    from .prompts import synthesize_object_prompt
-                    prompt = synthesize_object_prompt(
-                        obj=scene_or_char,
-                        style=plan.style,
-                        variation_index=variation_index
-                    )
-                else:
-                    # Scenes and characters use standard prompt synthesis
-                    # For character images, pass the Character object for enhanced prompts
-                    character_obj = scene_or_char if img_type == "character" else None
-                    prompt = synthesize_prompt(
-                        description,
-                        plan.style,
-                        img_type,
-                        variation_index,
-                        character=character_obj
-                    )
+                prompt = synthesize_reference_prompt(scene_or_char, plan.style, img_type, variation_index)
                 
-                # Generate image (first attempt)
+                # Reuse the image if it was started with the same prompt while the plan streamed
                 retry_count = 0
-                try:
-                    image_bytes, gen_time, cost, final_retry_count = await generate_image(
-                        prompt=prompt,
-                        image_type=img_type,
-                        image_id=image_id,
-                        job_id=job_id,
-                        retry_count=retry_count
-                    )
-                    retry_count = final_retry_count
-                except (RateLimitError, RetryableError) as e:
-                    # Retry once with adaptive backoff
-                    if isinstance(e, RateLimitError):
-                        rate_limit_count += 1
-                        retry_after = e.retry_after or (2 if retry_count == 0 else 5)
-                        logger.warning(
-                            f"Rate limit for {image_id}, waiting {retry_after}s before retry",
-                            extra={"job_id": str(job_id), "image_id": image_id, "retry_after": retry_after}
+                prefetched = (
+                    await prefetcher.take(img_type, base_image_id, variation_index, prompt)
+                    if prefetcher else None
+                )
+                if prefetched is not None:
+                    image_bytes, gen_time, cost, retry_count = prefetched
+                else:
+                    try:
+                        image_bytes, gen_time, cost, final_retry_count = await generate_image(
+                            prompt=prompt,
+                            image_type=img_type,
+                            image_id=image_id,
+                            job_id=job_id,
+                            retry_count=retry_count
                         )
-                        if events_callback:
-                            events_callback({
-                                "event_type": "reference_generation_retry",
-                                "data": {
-                                    "image_type": img_type,
-                                    "image_id": image_id,
-                                    "retry_count": 1,
-                                    "max_retries": 1,
-                                    "reason": "Rate limit exceeded"
-                                }
-                            })
-                        await asyncio.sleep(retry_after)
-                    else:
-                        # Other retryable errors: wait 2s
-                        await asyncio.sleep(2)
+                        retry_count = final_retry_count
+                    except (RateLimitError, RetryableError) as e:
+                        # Retry once with adaptive backoff
+                        if isinstance(e, RateLimitError):
+                            rate_limit_count += 1
+                            retry_after = e.retry_after or (2 if retry_count == 0 else 5)
+                            logger.warning(
+                                f"Rate limit for {image_id}, waiting {retry_after}s before retry",
+                                extra={"job_id": str(job_id), "image_id": image_id, "retry_after": retry_after}
+                            )
+                            if events_callback:
+                                events_callback({
+                                    "event_type": "reference_generation_retry",
+                                    "data": {
+                                        "image_type": img_type,
+                                        "image_id": image_id,
+                                        "retry_count": 1,
+                                        "max_retries": 1,
+                                        "reason": "Rate limit exceeded"
+                                    }
+                                })
+                            await asyncio.sleep(retry_after)
+                        else:
+                            # Other retryable errors: wait 2s
+                            await asyncio.sleep(2)
                     
-                    retry_count = 1
-                    image_bytes, gen_time, cost, final_retry_count = await generate_image(
-                        prompt=prompt,
-                        image_type=img_type,
-                        image_id=image_id,
-                        job_id=job_id,
-                        retry_count=retry_count
-                    )
-                    retry_count = final_retry_count
+                        retry_count = 1
+                        image_bytes, gen_time, cost, final_retry_count = await generate_image(
+                            prompt=prompt,
+                            image_type=img_type,
+                            image_id=image_id,
+                            job_id=job_id,
+                            retry_count=retry_count
+                        )
+                        retry_count = final_retry_count
                 
                 return {
                     "success": True,
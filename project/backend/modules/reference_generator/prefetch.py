@@ -0,0 +1,190 @@
+"""
+Reference image prefetching while the scene plan streams.
+
+The scene planner emits characters, scenes and style as soon as the LLM has
+written them, long before the clip scripts are done. ReferencePrefetcher
+starts the reference images for those entries right away, and
+generate_all_references later claims each finished image whose prompt still
+matches the final plan, so most of the image latency overlaps planning.
+
+Entries that change before the plan is final (e.g. after a retried LLM call
+or style refinement) produce a different prompt and are regenerated as usual;
+close() cancels whatever was not claimed (cancelling a generation cancels its
+Replicate prediction) and records the cost of images that finished unused.
+"""
+
+import asyncio
+import os
+from decimal import Decimal
+from typing import Any, Dict, List, Literal, Optional, Tuple
+from uuid import UUID
+
+from shared.config import settings
+from shared.cost_tracking import cost_tracker
+from shared.logging import get_logger
+from shared.models.scene import Style
+
+logger = get_logger("reference_generator.prefetch")
+
+ImageType = Literal["scene", "character", "object"]
+
+# (image_bytes, generation_time_seconds, cost, retry_count), as returned by generate_image
+GeneratedImage = Tuple[bytes, float, Decimal, int]
+
+
+class ReferencePrefetcher:
+    """Starts reference images for streamed plan entries before the plan is complete."""
+
+    def __init__(self, job_id: UUID, user_uploaded_images: Optional[List[Dict[str, Any]]] = None):
+        self.job_id = job_id
+        self.user_uploaded_images = user_uploaded_images
+        self._style: Optional[Style] = None
+        # Entries received before the style (prompts need it)
+        self._pending: List[Tuple[ImageType, Any]] = []
+        # (image type, entry ID, variation) -> (prompt, generation task)
+        self._tasks: Dict[Tuple[str, str, int], Tuple[str, asyncio.Task]] = {}
+        self._claimed = set()
+        self._unused_cost = Decimal("0")
+        self._semaphore = asyncio.Semaphore(int(os.getenv("REFERENCE_GEN_CONCURRENCY", "8")))
+
+    async def add(self, kind: str, entry: Any) -> None:
+        """
+        Receive a plan entry (scene planner on_entry callback).
+
+        Args:
+            kind: "character", "scene", "object" or "style"
+            entry: Character, Scene, Object or Style model
+        """
+        if kind == "style":
+            self._style = entry
+            pending, self._pending = self._pending, []
+            for image_type, pending_entry in pending:
+                self._start(image_type, pending_entry)
+        elif self._style is None:
+            self._pending.append((kind, entry))
+        else:
+            self._start(kind, entry)
+
+    def _variations(self, image_type: ImageType) -> int:
+        if image_type == "scene":
+            return settings.reference_variations_per_scene
+        if image_type == "character":
+            return settings.reference_variations_per_character
+        return settings.reference_variations_per_object
+
+    def _start(self, image_type: ImageType, entry: Any) -> None:
+        from .process import match_user_images_to_characters
+        from .prompts import synthesize_reference_prompt
+
+        # Characters matched to a user-uploaded image are not generated
+        if image_type == "character" and self.user_uploaded_images:
+            if match_user_images_to_characters(self.user_uploaded_images, [entry]):
+                return
+
+        for variation_index in range(self._variations(image_type)):
+            key = (image_type, entry.id, variation_index)
+            try:
+                prompt = synthesize_reference_prompt(entry, self._style, image_type, variation_index)
+            except Exception as e:
+                logger.warning(
+                    f"Skipping prefetch of {image_type} {entry.id}: {str(e)}",
+                    extra={"job_id": str(self.job_id), "image_type": image_type, "image_id": entry.id}
+                )
+                return
+
+            existing = self._tasks.get(key)
+            if existing is not None:
+                if existing[0] == prompt:
+                    continue
+                # The entry changed (retried LLM call); the old image can't be used
+                self._discard(existing[1])
+
+            image_id = entry.id if variation_index == 0 else f"{entry.id}_var{variation_index}"
+            task = asyncio.create_task(self._generate(prompt, image_type, image_id))
+            self._tasks[key] = (prompt, task)
+
+    async def _generate(self, prompt: str, image_type: ImageType, image_id: str) -> GeneratedImage:
+        from .generator import generate_image
+
+        async with self._semaphore:
+            return await generate_image(
+                prompt=prompt,
+                image_type=image_type,
+                image_id=image_id,
+                job_id=self.job_id
+            )
+
+    async def take(
+        self,
+        image_type: ImageType,
+        entry_id: str,
+        variation_index: int,
+        prompt: str
+    ) -> Optional[GeneratedImage]:
+        """
+        Claim a prefetched image.
+
+        Args:
+            image_type: "scene", "character", or "object"
+            entry_id: Scene, character, or object ID
+            variation_index: Variation index
+            prompt: Prompt the final plan produces for this image
+
+        Returns:
+            Result of generate_image, or None if nothing usable was prefetched
+            (not started, different prompt, or failed); generate it normally then
+        """
+        key = (image_type, entry_id, variation_index)
+        prefetched = self._tasks.get(key)
+        if prefetched is None or prefetched[0] != prompt:
+            return None
+
+        self._claimed.add(key)
+        try:
+            return await prefetched[1]
+        except Exception as e:
+            logger.warning(
+                f"Prefetched {image_type} image {entry_id} failed, generating again: {str(e)}",
+                extra={"job_id": str(self.job_id), "image_type": image_type, "image_id": entry_id}
+            )
+            return None
+
+    def _discard(self, task: asyncio.Task) -> None:
+        """
+        Drop an unclaimed generation, keeping the cost of one that already finished.
+
+        Cancelling an unfinished one cancels its Replicate prediction (run_prediction).
+        """
+        if not task.done():
+            task.cancel()
+        elif not task.cancelled() and task.exception() is None:
+            self._unused_cost += task.result()[2]
+
+    async def close(self) -> None:
+        """Cancel unclaimed generations and record the cost of images that finished unused."""
+        unused = [task for key, (_, task) in self._tasks.items() if key not in self._claimed]
+        for task in unused:
+            self._discard(task)
+        self._tasks.clear()
+        # Let the cancelled generations unwind (and request their predictions' cancellation)
+        await asyncio.gather(*unused, return_exceptions=True)
+
+        if unused:
+            logger.info(
+                f"Discarded {len(unused)} unused prefetched reference images",
+                extra={"job_id": str(self.job_id), "unused": len(unused), "cost": float(self._unused_cost)}
+            )
+        if self._unused_cost > 0:
+            try:
+                await cost_tracker.track_cost(
+                    job_id=self.job_id,
+                    stage_name="reference_generator",
+                    api_name="sdxl",
+                    cost=self._unused_cost
+                )
+                self._unused_cost = Decimal("0")
+            except Exception as e:
+                logger.warning(
+                    f"Failed to track cost of unused prefetched images: {str(e)}",
+                    extra={"job_id": str(self.job_id)}
+                )
@@ -7,7 +7,7 @@ Processes ScenePlan to generate reference images for scenes and characters.
 import time
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional, List, Dict, Any, Literal, Tuple
+from typing import Optional, List, Dict, Any, Literal, Tuple, TYPE_CHECKING
 from uuid import UUID
 
 from shared.models.scene import ScenePlan, ReferenceImages, ReferenceImage, Style
@@ -17,6 +17,9 @@ from shared.cost_tracking import cost_tracker
 from shared.storage import storage
 from shared.config import settings
 
+if TYPE_CHECKING:
+    from .prefetch import ReferencePrefetcher
+
 logger = get_logger("reference_generator")
 
 # Import will be done in functions to avoid circular imports
@@ -28,7 +31,8 @@ async def process(
     job_id: UUID,
     plan: ScenePlan,
     duration_seconds: Optional[float] = None,
-    user_uploaded_images: Optional[List[Dict[str, Any]]] = None
+    user_uploaded_images: Optional[List[Dict[str, Any]]] = None,
+    prefetcher: Optional["ReferencePrefetcher"] = None
 ) -> Tuple[Optional[ReferenceImages], List[Dict[str, Any]]]:
     """
     Generate reference images for scenes and characters.
@@ -38,6 +42,8 @@ async def process(
         plan: Scene plan from Scene Planner
         duration_seconds: Optional audio duration in seconds (for budget checks)
                          If None, budget checks may be skipped (orchestrator handles pre-flight)
+        user_uploaded_images: Optional user-uploaded images to use for matching characters
+        prefetcher: Optional prefetcher with images started while the scene plan streamed
         
     Returns:
         ReferenceImages object if successful (≥50% threshold AND minimum requirements met),
@@ -360,7 +366,8 @@ async def process(
             characters=characters_to_generate,  # Use filtered list (exclude matched characters)
             objects=unique_objects_list,
             duration_seconds=duration_seconds,
-            events_callback=publish_event_data
+            events_callback=publish_event_data,
+            prefetcher=prefetcher
         )
         elapsed_time = time.time() - start_time
         # Filter out skipped variations (they're not failures, just not generated)
@@ -5,7 +5,7 @@ Combines scene/character descriptions with style information to create SDXL prom
 Enhanced with detailed character features similar to video generator prompts.
 """
 
-from typing import Literal, Optional
+from typing import Any, Literal, Optional
 from shared.models.scene import Style, Character, CharacterFeatures, FaceFeatures
 from shared.errors import ValidationError
 from shared.logging import get_logger
@@ -517,3 +517,39 @@ def synthesize_object_prompt(
         raise
 
     return prompt
+
+
+def synthesize_reference_prompt(
+    entry: Any,
+    style: Style,
+    image_type: Literal["scene", "character", "object"],
+    variation_index: int = 0
+) -> str:
+    """
+    Synthesize the prompt for one reference image of a scene, character or object.
+
+    Args:
+        entry: Scene, Character or Object from the ScenePlan
+        style: Style object from ScenePlan
+        image_type: "scene", "character", or "object"
+        variation_index: Index of variation (0 = base, 1+ = variations)
+
+    Returns:
+        Synthesized prompt string
+
+    Raises:
+        ValidationError: If style is missing required fields or prompt is invalid
+    """
+    if image_type == "object":
+        # Objects use specialized product photography prompts
+        return synthesize_object_prompt(obj=entry, style=style, variation_index=variation_index)
+
+    # For character images, pass the Character object for enhanced prompts
+    description = getattr(entry, "description", None) or entry.id
+    return synthesize_prompt(
+        description,
+        style,
+        image_type,
+        variation_index,
+        character=entry if image_type == "character" else None
+    )
@@ -20,7 +20,7 @@ from shared.cost_tracking import cost_tracker
 @pytest.mark.asyncio
 async def test_rate_limiting_adaptive_backoff():
     """Test ES1: Rate limiting with adaptive backoff (2s → 5s → 10s)."""
-    with patch('modules.reference_generator.generator.client') as mock_client:
+    with patch('modules.reference_generator.generator.run_prediction', new_callable=AsyncMock) as mock_run_prediction:
         # Mock 429 response
         mock_response = Mock()
         mock_response.status_code = 429
@@ -40,11 +40,8 @@ async def test_rate_limiting_adaptive_backoff():
             mock_http_client.get = AsyncMock(side_effect=http_error)
             mock_httpx_class.return_value = mock_http_client
             
-            # Mock client.run to return a URL
-            async def mock_run(*args, **kwargs):
-                return "https://replicate.delivery/test.png"
-            
-            mock_client.run = mock_run
+            # Mock the Replicate prediction to return a URL
+            mock_run_prediction.return_value = "https://replicate.delivery/test.png"
             
             with pytest.raises(RateLimitError) as exc_info:
                 await generate_image(
@@ -60,7 +57,7 @@ async def test_rate_limiting_adaptive_backoff():
 @pytest.mark.asyncio
 async def test_rate_limiting_no_retry_after_header():
     """Test ES1: Rate limiting without Retry-After header uses adaptive backoff."""
-    with patch('modules.reference_generator.generator.client') as mock_client:
+    with patch('modules.reference_generator.generator.run_prediction', new_callable=AsyncMock) as mock_run_prediction:
         # Mock 429 response without Retry-After header
         mock_response = Mock()
         mock_response.status_code = 429
@@ -80,11 +77,8 @@ async def test_rate_limiting_no_retry_after_header():
             mock_http_client.get = AsyncMock(side_effect=http_error)
             mock_httpx_class.return_value = mock_http_client
             
-            # Mock client.run to return a URL
-            async def mock_run(*args, **kwargs):
-                return "https://replicate.delivery/test.png"
-            
-            mock_client.run = mock_run
+            # Mock the Replicate prediction to return a URL
+            mock_run_prediction.return_value = "https://replicate.delivery/test.png"
             
             with pytest.raises(RateLimitError) as exc_info:
                 await generate_image(
@@ -101,14 +95,13 @@ async def test_rate_limiting_no_retry_after_header():
 @pytest.mark.asyncio
 async def test_timeout_handling():
     """Test ES2: Timeout handling (120s limit)."""
-    with patch('modules.reference_generator.generator.client') as mock_client:
-        # Mock slow operation that times out
-        def slow_operation(*args, **kwargs):
-            import time
-            time.sleep(121)  # Exceeds 120s timeout (sync sleep for to_thread)
+    with patch('modules.reference_generator.generator.run_prediction', new_callable=AsyncMock) as mock_run_prediction:
+        # Mock slow prediction that times out
+        async def slow_operation(*args, **kwargs):
+            await asyncio.sleep(121)  # Exceeds 120s timeout
             return "http://example.com/image.png"
         
-        mock_client.run = slow_operation
+        mock_run_prediction.side_effect = slow_operation
         
         with pytest.raises(GenerationError) as exc_info:
             await generate_image(
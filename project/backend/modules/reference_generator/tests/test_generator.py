@@ -6,7 +6,7 @@ import pytest
 from unittest.mock import Mock, AsyncMock, patch
 from decimal import Decimal
 from uuid import UUID
-from modules.reference_generator.generator import generate_image, get_model_version
+from modules.reference_generator.generator import generate_image, get_model_version, run_prediction
 
 
 @pytest.mark.asyncio
@@ -18,13 +18,13 @@ async def test_get_model_version():
 
 
 @pytest.mark.asyncio
-@patch('modules.reference_generator.generator.client')
+@patch('modules.reference_generator.generator.run_prediction', new_callable=AsyncMock)
 @patch('httpx.AsyncClient')
-async def test_generate_image_success(mock_httpx, mock_client):
+async def test_generate_image_success(mock_httpx, mock_run_prediction):
     """Test successful image generation."""
     # Mock Replicate API response
     mock_output = "https://replicate.delivery/pbxt/test-image.png"
-    mock_client.run = Mock(return_value=mock_output)
+    mock_run_prediction.return_value = mock_output
     
     # Mock HTTP client for image download
     mock_response = Mock()
@@ -51,27 +51,13 @@ async def test_generate_image_success(mock_httpx, mock_client):
 
 
 @pytest.mark.asyncio
-@patch('modules.reference_generator.generator.replicate.run')
-async def test_generate_image_timeout(mock_replicate_run):
+@patch('modules.reference_generator.generator.run_prediction', new_callable=AsyncMock)
+async def test_generate_image_timeout(mock_run_prediction):
     """Test image generation timeout."""
     import asyncio
     
     # Mock timeout
-    async def slow_run(*args, **kwargs):
-        await asyncio.sleep(130)  # Longer than 120s timeout
-        return "https://test.com/image.png"
-    
-    # Wrap in asyncio.to_thread call
-    def sync_slow_run(*args, **kwargs):
-        import asyncio
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            return loop.run_until_complete(slow_run(*args, **kwargs))
-        finally:
-            loop.close()
-    
-    mock_replicate_run.side_effect = sync_slow_run
+    mock_run_prediction.side_effect = asyncio.TimeoutError()
     
     with pytest.raises(Exception):  # Should raise timeout error
         await generate_image(
@@ -83,13 +69,13 @@ async def test_generate_image_timeout(mock_replicate_run):
 
 
 @pytest.mark.asyncio
-@patch('modules.reference_generator.generator.replicate.run')
-async def test_generate_image_rate_limit(mock_replicate_run):
+@patch('modules.reference_generator.generator.run_prediction', new_callable=AsyncMock)
+async def test_generate_image_rate_limit(mock_run_prediction):
     """Test rate limit error handling."""
     import httpx
     
     # Mock rate limit error
-    mock_replicate_run.side_effect = httpx.HTTPStatusError(
+    mock_run_prediction.side_effect = httpx.HTTPStatusError(
         "Rate limit exceeded",
         request=Mock(),
         response=Mock(status_code=429, headers={"Retry-After": "5"})
@@ -103,3 +89,26 @@ async def test_generate_image_rate_limit(mock_replicate_run):
             job_id=UUID("550e8400-e29b-41d4-a716-446655440000")
         )
 
+
+@pytest.mark.asyncio
+@patch('modules.reference_generator.generator.prediction_waiter')
+@patch('modules.reference_generator.generator.client')
+async def test_run_prediction_cancelled_cancels_prediction(mock_client, mock_waiter):
+    """A prediction whose caller gave up is cancelled on Replicate."""
+    import asyncio
+    
+    mock_client.predictions.create.return_value = Mock(id="prediction_123")
+    
+    async def wait_forever(prediction, timeout):
+        await asyncio.sleep(60)
+    mock_waiter.wait = AsyncMock(side_effect=wait_forever)
+    
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(run_prediction("stability-ai/sdxl", {"prompt": "Test prompt"}), timeout=0.05)
+    
+    # The cancel request runs in a thread
+    for _ in range(50):
+        if mock_client.predictions.cancel.called:
+            break
+        await asyncio.sleep(0.01)
+    mock_client.predictions.cancel.assert_called_once_with("prediction_123")
@@ -0,0 +1,106 @@
+"""
+Unit tests for reference image prefetching.
+"""
+
+import asyncio
+import pytest
+from decimal import Decimal
+from unittest.mock import AsyncMock, patch
+from uuid import UUID
+
+from shared.config import settings
+from shared.models.scene import Character, Scene
+from modules.reference_generator.prefetch import ReferencePrefetcher
+from modules.reference_generator.prompts import synthesize_reference_prompt
+
+JOB_ID = UUID("550e8400-e29b-41d4-a716-446655440000")
+GENERATED = (b"image_bytes", 4.2, Decimal("0.005"), 0)
+
+
+@pytest.fixture(autouse=True)
+def one_variation():
+    """One variation per image keeps call counts readable."""
+    with patch.object(settings, "reference_variations_per_scene", 1), \
+         patch.object(settings, "reference_variations_per_character", 1):
+        yield
+
+
+@pytest.mark.asyncio
+async def test_prefetch_starts_after_style_and_is_claimed(sample_style):
+    """Entries wait for the style, then generate; a matching prompt claims the image."""
+    scene = Scene(id="city_street", description="Rain-slicked cyberpunk street", time_of_day="night")
+    prefetcher = ReferencePrefetcher(JOB_ID)
+
+    with patch("modules.reference_generator.generator.generate_image", new_callable=AsyncMock) as mock_generate:
+        mock_generate.return_value = GENERATED
+        await prefetcher.add("scene", scene)
+        await asyncio.sleep(0)
+        assert mock_generate.await_count == 0
+
+        await prefetcher.add("style", sample_style)
+        prompt = synthesize_reference_prompt(scene, sample_style, "scene", 0)
+        result = await prefetcher.take("scene", "city_street", 0, prompt)
+
+    assert result == GENERATED
+    assert mock_generate.await_args.kwargs["prompt"] == prompt
+
+
+@pytest.mark.asyncio
+async def test_changed_entry_is_not_claimed(sample_style):
+    """An image started for a different prompt is left for normal generation."""
+    character = Character(id="protagonist", description="Young woman in a red jacket", role="main character")
+    final = Character(id="protagonist", description="Young woman in a blue jacket", role="main character")
+    prefetcher = ReferencePrefetcher(JOB_ID)
+
+    with patch("modules.reference_generator.generator.generate_image", new_callable=AsyncMock) as mock_generate:
+        mock_generate.return_value = GENERATED
+        await prefetcher.add("style", sample_style)
+        await prefetcher.add("character", character)
+        prompt = synthesize_reference_prompt(final, sample_style, "character", 0)
+
+        assert await prefetcher.take("character", "protagonist", 0, prompt) is None
+        await prefetcher.close()
+
+
+@pytest.mark.asyncio
+async def test_close_tracks_cost_of_unused_images(sample_style):
+    """Images that finished but were never claimed are still billed to the job."""
+    scene = Scene(id="interior", description="Futuristic apartment", time_of_day="night")
+    prefetcher = ReferencePrefetcher(JOB_ID)
+
+    with patch("modules.reference_generator.generator.generate_image", new_callable=AsyncMock) as mock_generate, \
+         patch("modules.reference_generator.prefetch.cost_tracker.track_cost", new_callable=AsyncMock) as mock_track:
+        mock_generate.return_value = GENERATED
+        await prefetcher.add("style", sample_style)
+        await prefetcher.add("scene", scene)
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        await prefetcher.close()
+
+    mock_track.assert_awaited_once()
+    assert mock_track.await_args.kwargs["cost"] == Decimal("0.005")
+
+
+@pytest.mark.asyncio
+async def test_close_cancels_unfinished_generations(sample_style):
+    """Generations still running at close are cancelled before close returns, and cost nothing."""
+    scene = Scene(id="interior", description="Futuristic apartment", time_of_day="night")
+    prefetcher = ReferencePrefetcher(JOB_ID)
+    cancelled = asyncio.Event()
+
+    async def slow_generate(**kwargs):
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with patch("modules.reference_generator.generator.generate_image", side_effect=slow_generate), \
+         patch("modules.reference_generator.prefetch.cost_tracker.track_cost", new_callable=AsyncMock) as mock_track:
+        await prefetcher.add("style", sample_style)
+        await prefetcher.add("scene", scene)
+        await asyncio.sleep(0)
+        await prefetcher.close()
+
+    assert cancelled.is_set()
+    mock_track.assert_not_awaited()
@@ -0,0 +1,142 @@
+"""
+Incremental JSON parsing for streamed LLM responses.
+
+The scene plan is one large JSON object whose early keys (characters, scenes,
+objects, style) are complete long before the clip scripts finish streaming.
+JSONStreamParser reads the response as it arrives and returns each top-level
+value, and each element of a top-level array, as soon as it is complete, so
+callers can act on finished entries while the rest is still being generated.
+"""
+
+import json
+from typing import Any, List, Optional, Tuple
+
+from shared.logging import get_logger
+
+logger = get_logger("scene_planner")
+
+
+class JSONStreamParser:
+    """
+    Incremental parser for a streamed top-level JSON object.
+
+    Text before the opening brace (e.g. a markdown code fence) is ignored.
+    Entries that fail to parse are skipped; the complete response is still
+    parsed (and repaired) by the caller once streaming ends.
+    """
+
+    def __init__(self):
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._done = False
+        # Top-level key being read, and the key whose value follows
+        self._key_chars: Optional[List[str]] = None
+        self._key: Optional[str] = None
+        self._expect_value = False
+        # Whether the current top-level value is an array (emitted element by element)
+        self._in_array = False
+        # Characters of the value or array element being read
+        self._unit: Optional[List[str]] = None
+        self._unit_depth = 0
+        self._unit_is_scalar = False
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """
+        Consume the next piece of the response.
+
+        Args:
+            chunk: Response text (any size, split anywhere)
+
+        Returns:
+            (top-level key, value) for every value or array element completed by this chunk
+        """
+        entries: List[Tuple[str, Any]] = []
+        for char in chunk:
+            if self._done:
+                break
+            self._consume(char, entries)
+        return entries
+
+    def _at_value_start(self) -> bool:
+        if self._in_array:
+            return self._depth == 2
+        return self._depth == 1 and self._expect_value
+
+    def _start_unit(self, char: str, scalar: bool) -> None:
+        self._unit = [char]
+        self._unit_depth = self._depth
+        self._unit_is_scalar = scalar
+
+    def _emit(self, entries: List[Tuple[str, Any]]) -> None:
+        text = "".join(self._unit).strip()
+        self._unit = None
+        try:
+            entries.append((self._key, json.loads(text)))
+        except ValueError as e:
+            logger.debug(f"Skipping unparseable streamed entry for '{self._key}': {str(e)}")
+
+    def _consume(self, char: str, entries: List[Tuple[str, Any]]) -> None:
+        if self._unit is not None:
+            self._unit.append(char)
+
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+            elif char == "\\":
+                self._escape = True
+            elif char == '"':
+                self._in_string = False
+                if self._key_chars is not None:
+                    self._key = json.loads('"' + "".join(self._key_chars) + '"')
+                    self._key_chars = None
+                return
+            if self._key_chars is not None:
+                self._key_chars.append(char)
+            return
+
+        if self._depth == 0:
+            if char == "{":
+                self._depth = 1
+            return
+
+        if char.isspace():
+            return
+
+        if char == '"':
+            self._in_string = True
+            if self._depth == 1 and not self._expect_value:
+                self._key_chars = []
+            elif self._unit is None and self._at_value_start():
+                self._start_unit(char, scalar=True)
+        elif char in "{[":
+            if self._depth == 1 and self._expect_value and char == "[":
+                self._in_array = True
+            elif self._unit is None and self._at_value_start():
+                self._start_unit(char, scalar=False)
+            self._depth += 1
+        elif char in "}]":
+            self._depth -= 1
+            if self._unit is not None:
+                if self._unit_is_scalar and self._depth == self._unit_depth - 1:
+                    # A scalar ended by its container's closing bracket
+                    self._unit.pop()
+                    self._emit(entries)
+                elif not self._unit_is_scalar and self._depth == self._unit_depth:
+                    self._emit(entries)
+            if self._depth == 1 and self._in_array:
+                self._in_array = False
+            elif self._depth == 0:
+                self._done = True
+        elif char == ",":
+            if self._unit is not None and self._unit_is_scalar and self._depth == self._unit_depth:
+                self._unit.pop()
+                self._emit(entries)
+            if self._depth == 1:
+                self._expect_value = False
+        elif char == ":":
+            if self._depth == 1:
+                self._expect_value = True
+        elif self._unit is None and self._at_value_start():
+            # Numbers, true, false, null
+            self._start_unit(char, scalar=True)
@@ -8,7 +8,7 @@ cost tracking, and comprehensive prompt engineering.
 import json
 import re
 from decimal import Decimal
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Callable, Awaitable
 from uuid import UUID
 
 from openai import OpenAI, AsyncOpenAI
@@ -17,10 +17,13 @@ from openai import APIError, RateLimitError, APITimeoutError
 from shared.config import settings
 from shared.cost_tracking import cost_tracker
 from shared.errors import GenerationError, RetryableError
+from shared.llm_cache import LLMCompletion, llm_cache
 from shared.logging import get_logger
 from shared.retry import retry_with_backoff
 from shared.models.audio import AudioAnalysis
 
+from .json_stream import JSONStreamParser
+
 logger = get_logger("scene_planner")
 
 
@@ -742,7 +745,9 @@ async def generate_scene_plan(
     user_prompt: str,
     audio_data: AudioAnalysis,
     director_knowledge: str,
-    user_input_objects: Optional[List[Any]] = None
+    user_input_objects: Optional[List[Any]] = None,
+    on_entry: Optional[Callable[[str, Any], Awaitable[None]]] = None,
+    completions: Optional[List[LLMCompletion]] = None
 ) -> Dict[str, Any]:
     """
     Generate scene plan using LLM API.
@@ -760,6 +765,14 @@ async def generate_scene_plan(
         user_prompt: User's creative prompt (50-3000 characters)
         audio_data: AudioAnalysis with BPM, mood, structure, boundaries
         director_knowledge: Director knowledge base text
+        user_input_objects: Objects extracted from the user prompt (passed as hints)
+        on_entry: Optional async callback; when set, the response is streamed and
+                  each completed top-level value or array element (e.g. one
+                  character) is passed as (key, value) before the plan is complete.
+                  Entries may be repeated if the call is retried.
+        completions: Optional list the returned plan's completion is appended to,
+                     so the caller can llm_cache.discard() it if the plan turns
+                     out unusable
         
     Returns:
         Parsed JSON dict matching ScenePlan structure
@@ -788,7 +801,19 @@ async def generate_scene_plan(
         # Call OpenAI API
         client = get_openai_client()
         
-        response = await client.chat.completions.create(
+        # Stream the response so finished entries reach the caller while clip scripts are written
+        parser = JSONStreamParser()
+        
+        async def stream_entries(text: str) -> None:
+            for key, value in parser.feed(text):
+                await on_entry(key, value)
+        
+        completion = await llm_cache.complete(
+            client,
+            stage_name="scene_planning",
+            job_id=job_id,
+            cost_fn=_calculate_llm_cost,
+            on_delta=stream_entries if on_entry is not None else None,
             model=model,
             messages=[
                 {"role": "system", "content": system_prompt},
@@ -801,7 +826,7 @@ async def generate_scene_plan(
         )
         
         # Extract response
-        content = response.choices[0].message.content
+        content = completion.content
         if not content:
             raise GenerationError("Empty response from LLM", job_id=job_id)
         
@@ -857,22 +882,25 @@ async def generate_scene_plan(
                             "response_preview": content[:500]
                         }
                     )
+                # Don't serve the unparseable plan to the retry
+                await llm_cache.discard(completion)
                 raise RetryableError(f"Invalid JSON from LLM: {str(e)}", job_id=job_id) from e
         
         if scene_plan_dict is None:
             raise RetryableError(f"Invalid JSON from LLM: {str(parse_error)}", job_id=job_id) from parse_error
         
-        # Track cost
-        input_tokens = response.usage.prompt_tokens
-        output_tokens = response.usage.completion_tokens
+        # Track cost (a cached plan was free; the LLM cache records the saving)
+        input_tokens = completion.input_tokens
+        output_tokens = completion.output_tokens
         cost = _calculate_llm_cost(model, input_tokens, output_tokens)
         
-        await cost_tracker.track_cost(
-            job_id=job_id,
-            stage_name="scene_planning",
-            api_name=model,
-            cost=cost
-        )
+        if not completion.cached:
+            await cost_tracker.track_cost(
+                job_id=job_id,
+                stage_name="scene_planning",
+                api_name=model,
+                cost=cost
+            )
         
         logger.info(
             f"Scene plan generated successfully",
@@ -885,6 +913,8 @@ async def generate_scene_plan(
             }
         )
         
+        if completions is not None:
+            completions.append(completion)
         return scene_plan_dict
         
     except RateLimitError as e:
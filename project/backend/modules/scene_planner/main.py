@@ -4,6 +4,7 @@ FastAPI router integration and job processing entry point.
 Main entry point called by API Gateway orchestrator.
 """
 
+from typing import Optional
 from uuid import UUID
 from shared.models.audio import AudioAnalysis
 from shared.models.scene import ScenePlan
@@ -11,7 +12,7 @@ from shared.errors import ValidationError, GenerationError
 from shared.logging import get_logger, set_job_id
 from shared.validation import validate_prompt
 
-from .planner import plan_scenes
+from .planner import EntryCallback, plan_scenes
 
 logger = get_logger("scene_planner")
 
@@ -19,7 +20,8 @@ logger = get_logger("scene_planner")
 async def process_scene_planning(
     job_id: UUID,
     user_prompt: str,
-    audio_data: AudioAnalysis
+    audio_data: AudioAnalysis,
+    on_entry: Optional[EntryCallback] = None
 ) -> ScenePlan:
     """
     Main entry point for scene planning processing.
@@ -31,6 +33,8 @@ async def process_scene_planning(
         job_id: Job ID
         user_prompt: User's creative prompt (50-3000 characters)
         audio_data: AudioAnalysis from Module 3 (Audio Parser)
+        on_entry: Optional async callback receiving characters, scenes, style and
+                  user-requested objects as they stream in (see plan_scenes)
         
     Returns:
         ScenePlan Pydantic model
@@ -80,7 +84,8 @@ async def process_scene_planning(
         scene_plan = await plan_scenes(
             job_id=job_id,
             user_prompt=user_prompt,
-            audio_data=audio_data
+            audio_data=audio_data,
+            on_entry=on_entry
         )
         
         logger.info(
@@ -4,10 +4,12 @@ Core scene planning orchestration.
 Coordinates all planning steps and assembles final ScenePlan result.
 """
 
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional
 from uuid import UUID
 from shared.models.audio import AudioAnalysis
 from shared.models.scene import ScenePlan
 from shared.errors import GenerationError
+from shared.llm_cache import LLMCompletion, llm_cache
 from shared.logging import get_logger
 
 from .director_knowledge import get_director_knowledge
@@ -31,13 +33,23 @@ from .object_analyzer import (
     update_clip_scripts_with_objects as update_clips_with_object_ids
 )
 
+if TYPE_CHECKING:
+    from shared.models.scene import Character, Style
+
 logger = get_logger("scene_planner")
 
+# Receives ("character", Character), ("scene", Scene), ("object", Object) or ("style", Style)
+EntryCallback = Callable[[str, Any], Awaitable[None]]
+
+# Streamed LLM keys passed on early, by entry kind
+STREAMED_ENTRY_KINDS = {"characters": "character", "scenes": "scene", "style": "style"}
+
 
 async def plan_scenes(
     job_id: UUID,
     user_prompt: str,
-    audio_data: AudioAnalysis
+    audio_data: AudioAnalysis,
+    on_entry: Optional[EntryCallback] = None
 ) -> ScenePlan:
     """
     Coordinate all planning steps and assemble final ScenePlan.
@@ -55,6 +67,11 @@ async def plan_scenes(
         job_id: Job ID
         user_prompt: User's creative prompt (50-3000 characters)
         audio_data: AudioAnalysis with BPM, mood, structure, boundaries
+        on_entry: Optional async callback receiving characters, scenes, style and
+                  user-requested objects as the LLM streams them, before clip
+                  scripts are complete (e.g. to start reference images early).
+                  Entries may be repeated or differ from the final plan if the
+                  LLM call is retried; the returned plan is authoritative.
         
     Returns:
         Complete ScenePlan model
@@ -72,6 +89,9 @@ async def plan_scenes(
         }
     )
     
+    # LLM completion of the plan, discarded from the LLM cache if the plan can't be built
+    completions: List[LLMCompletion] = []
+    
     try:
         # Step 1: Load director knowledge
         director_knowledge = get_director_knowledge()
@@ -89,13 +109,26 @@ async def plan_scenes(
                 }
             )
         
+        # User-requested objects are always part of the plan, so they can go out first
+        if on_entry is not None:
+            for obj in user_input_objects:
+                try:
+                    await on_entry("object", obj)
+                except Exception as e:
+                    logger.warning(
+                        f"Failed to stream scene plan object: {str(e)}",
+                        extra={"job_id": str(job_id), "object_id": obj.id}
+                    )
+        
         # Step 2: Generate scene plan using LLM
         llm_output = await generate_scene_plan(
             job_id=job_id,
             user_prompt=user_prompt,
             audio_data=audio_data,
             director_knowledge=director_knowledge,
-            user_input_objects=user_input_objects  # Pass extracted objects as hints
+            user_input_objects=user_input_objects,  # Pass extracted objects as hints
+            on_entry=(lambda key, value: _stream_entry(on_entry, key, value, job_id)) if on_entry else None,
+            completions=completions
         )
         logger.debug("Generated scene plan from LLM")
         
@@ -125,71 +158,8 @@ async def plan_scenes(
         video_summary = ""
         
         if "characters" in llm_output:
-            from shared.models.scene import Character
             # Create characters and extract structured features
-            characters = []
-            for char_data in llm_output["characters"]:
-                # Extract character name from description if format is "Name - FIXED CHARACTER IDENTITY:"
-                # Otherwise use the character ID as fallback
-                description = char_data.get("description", "")
-                char_id = char_data.get("id", "unknown")
-                char_role = char_data.get("role", "character")
-
-                # Try to extract character name from description
-                character_name = char_id
-                if " - FIXED CHARACTER IDENTITY:" in description:
-                    character_name = description.split(" - FIXED CHARACTER IDENTITY:")[0].strip()
-                elif description:
-                    # Use first word of description as name fallback (but not feature keys)
-                    first_word = description.split()[0] if description.split() else char_id
-                    # Don't use feature keys like "Hair:", "Face:", etc. as names
-                    feature_keys = ["Hair:", "Face:", "Eyes:", "Clothing:", "Accessories:", "Build:", "Age:"]
-                    if (len(first_word) <= 20 and
-                        first_word[0].isupper() and
-                        first_word not in feature_keys and
-                        not first_word.startswith("-")):
-                        character_name = first_word
-
-                # EXTRACT structured features (does NOT format into text)
-                features, extracted_name = extract_character_features(
-                    character_id=char_id,
-                    character_name=character_name,
-                    description=description
-                )
-
-                # Use extracted name if available
-                if extracted_name:
-                    character_name = extracted_name
-
-                # Validate specificity if features were extracted
-                if features:
-                    # Build a temporary formatted description for specificity check
-                    # Format face_features into a string
-                    face_desc = f"{features.face_features.shape} face, {features.face_features.skin_tone} skin, {features.face_features.nose}, {features.face_features.mouth}, {features.face_features.cheeks}, {features.face_features.jawline}"
-                    if features.face_features.distinctive_marks != "none":
-                        face_desc += f", {features.face_features.distinctive_marks}"
-
-                    temp_description = f"{character_name} - Hair: {features.hair}, Face: {face_desc}, Eyes: {features.eyes}, Clothing: {features.clothing}, Accessories: {features.accessories}, Build: {features.build}, Age: {features.age}"
-                    specificity_check = validate_character_specificity(temp_description)
-                    if not specificity_check["is_specific"]:
-                        logger.warning(
-                            f"Character {char_id} description lacks specificity",
-                            extra={
-                                "character_id": char_id,
-                                "warnings": specificity_check["warnings"]
-                            }
-                        )
-
-                # Create character with structured features
-                # Keep description for backward compatibility (will be populated from features when needed)
-                character = Character(
-                    id=char_id,
-                    role=char_role,
-                    features=features,
-                    name=character_name,
-                    description=description  # Keep original for backward compatibility
-                )
-                characters.append(character)
+            characters = [_build_character(char_data) for char_data in llm_output["characters"]]
 
         # PHASE 2: Analyze clip scripts for implicit/background characters
         # Scan clip descriptions for mentions of characters not in the character list
@@ -391,12 +361,109 @@ async def plan_scenes(
             extra={"job_id": str(job_id)},
             exc_info=True
         )
+        # Don't serve a plan that failed construction or validation to the retry
+        for completion in completions:
+            await llm_cache.discard(completion)
         raise GenerationError(
             f"Failed to plan scenes: {str(e)}",
             job_id=job_id
         ) from e
 
 
+def _build_character(char_data: Dict[str, Any]) -> "Character":
+    """Create a Character with structured features from an LLM character entry."""
+    from shared.models.scene import Character
+    
+    # Extract character name from description if format is "Name - FIXED CHARACTER IDENTITY:"
+    # Otherwise use the character ID as fallback
+    description = char_data.get("description", "")
+    char_id = char_data.get("id", "unknown")
+    char_role = char_data.get("role", "character")
+
+    # Try to extract character name from description
+    character_name = char_id
+    if " - FIXED CHARACTER IDENTITY:" in description:
+        character_name = description.split(" - FIXED CHARACTER IDENTITY:")[0].strip()
+    elif description:
+        # Use first word of description as name fallback (but not feature keys)
+        first_word = description.split()[0] if description.split() else char_id
+        # Don't use feature keys like "Hair:", "Face:", etc. as names
+        feature_keys = ["Hair:", "Face:", "Eyes:", "Clothing:", "Accessories:", "Build:", "Age:"]
+        if (len(first_word) <= 20 and
+            first_word[0].isupper() and
+            first_word not in feature_keys and
+            not first_word.startswith("-")):
+            character_name = first_word
+
+    # EXTRACT structured features (does NOT format into text)
+    features, extracted_name = extract_character_features(
+        character_id=char_id,
+        character_name=character_name,
+        description=description
+    )
+
+    # Use extracted name if available
+    if extracted_name:
+        character_name = extracted_name
+
+    # Validate specificity if features were extracted
+    if features:
+        # Build a temporary formatted description for specificity check
+        # Format face_features into a string
+        face_desc = f"{features.face_features.shape} face, {features.face_features.skin_tone} skin, {features.face_features.nose}, {features.face_features.mouth}, {features.face_features.cheeks}, {features.face_features.jawline}"
+        if features.face_features.distinctive_marks != "none":
+            face_desc += f", {features.face_features.distinctive_marks}"
+
+        temp_description = f"{character_name} - Hair: {features.hair}, Face: {face_desc}, Eyes: {features.eyes}, Clothing: {features.clothing}, Accessories: {features.accessories}, Build: {features.build}, Age: {features.age}"
+        specificity_check = validate_character_specificity(temp_description)
+        if not specificity_check["is_specific"]:
+            logger.warning(
+                f"Character {char_id} description lacks specificity",
+                extra={
+                    "character_id": char_id,
+                    "warnings": specificity_check["warnings"]
+                }
+            )
+
+    # Create character with structured features
+    # Keep description for backward compatibility (will be populated from features when needed)
+    return Character(
+        id=char_id,
+        role=char_role,
+        features=features,
+        name=character_name,
+        description=description  # Keep original for backward compatibility
+    )
+
+
+async def _stream_entry(
+    on_entry: EntryCallback,
+    key: str,
+    value: Any,
+    job_id: UUID
+) -> None:
+    """Convert a streamed LLM entry to its model and pass it on (never raises)."""
+    from shared.models.scene import Scene, Style
+    
+    kind = STREAMED_ENTRY_KINDS.get(key)
+    if kind is None or not isinstance(value, dict):
+        return
+    try:
+        if kind == "character":
+            entry = _build_character(value)
+        elif kind == "scene":
+            entry = Scene(**value)
+        else:
+            entry = Style(**value)
+        await on_entry(kind, entry)
+    except Exception as e:
+        # Early entries are an optimization; the complete plan is still built below
+        logger.warning(
+            f"Failed to stream scene plan {kind}: {str(e)}",
+            extra={"job_id": str(job_id), "kind": kind}
+        )
+
+
 def _create_default_style(audio_data: AudioAnalysis) -> "Style":
     """Create default style if LLM didn't provide one."""
     from shared.models.scene import Style
@@ -0,0 +1,75 @@
+"""
+Unit tests for incremental JSON parsing of streamed scene plans.
+"""
+
+import json
+
+from modules.scene_planner.json_stream import JSONStreamParser
+
+
+SCENE_PLAN = {
+    "video_summary": "A \"neon\" night {chase} [remix]",
+    "characters": [
+        {"id": "protagonist", "description": "Hair: jet black, shoulder-length, wavy]"},
+        {"id": "rival", "description": "Build: lean, 5'10\""}
+    ],
+    "scenes": [{"id": "city_street", "description": "Rain-slicked street", "time_of_day": "night"}],
+    "objects": [],
+    "style": {"color_palette": ["#00FFFF", "#FF00FF"], "mood": "energetic"},
+    "clip_scripts": [{"clip_index": 0, "characters": ["protagonist"]}]
+}
+
+
+def _feed_in_chunks(text, size):
+    parser = JSONStreamParser()
+    entries = []
+    for start in range(0, len(text), size):
+        entries.extend(parser.feed(text[start:start + size]))
+    return entries
+
+
+def test_emits_array_elements_and_values_as_they_complete():
+    """Every array element and top-level value comes out once, whatever the chunking."""
+    text = json.dumps(SCENE_PLAN, indent=2)
+    expected = [
+        ("video_summary", SCENE_PLAN["video_summary"]),
+        ("characters", SCENE_PLAN["characters"][0]),
+        ("characters", SCENE_PLAN["characters"][1]),
+        ("scenes", SCENE_PLAN["scenes"][0]),
+        ("style", SCENE_PLAN["style"]),
+        ("clip_scripts", SCENE_PLAN["clip_scripts"][0])
+    ]
+
+    for size in (1, 3, 7, 64, len(text)):
+        assert _feed_in_chunks(text, size) == expected
+
+
+def test_characters_are_emitted_before_clip_scripts_arrive():
+    """A character is available as soon as its closing brace streams in."""
+    text = json.dumps(SCENE_PLAN)
+    cut = text.index('"rival"')
+
+    parser = JSONStreamParser()
+    entries = parser.feed(text[:cut])
+
+    assert entries == [
+        ("video_summary", SCENE_PLAN["video_summary"]),
+        ("characters", SCENE_PLAN["characters"][0])
+    ]
+
+
+def test_ignores_code_fence_and_trailing_text():
+    """Text around the JSON object is skipped."""
+    text = "```json\n" + json.dumps({"scenes": [{"id": "a"}], "count": 2}) + "\n```"
+
+    assert _feed_in_chunks(text, 5) == [("scenes", {"id": "a"}), ("count", 2)]
+
+
+def test_truncated_response_yields_completed_entries_only():
+    """Entries cut off by max_tokens are not emitted."""
+    text = json.dumps(SCENE_PLAN)
+    truncated = text[:text.index("Rain-slicked")]
+
+    entries = _feed_in_chunks(truncated, 10)
+
+    assert [key for key, _ in entries] == ["video_summary", "characters", "characters"]
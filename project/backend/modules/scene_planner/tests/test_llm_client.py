@@ -12,6 +12,8 @@ from decimal import Decimal
 from shared.models.audio import AudioAnalysis, Mood, SongStructure, Lyric, ClipBoundary
 from shared.errors import GenerationError, RetryableError
 
+from shared.config import settings
+
 from modules.scene_planner.llm_client import (
     generate_scene_plan,
     _calculate_llm_cost,
@@ -21,6 +23,13 @@ from modules.scene_planner.llm_client import (
 )
 
 
+@pytest.fixture(autouse=True)
+def no_shared_llm_state(monkeypatch):
+    """Keep the account-wide OpenAI limiter and the LLM cache (Redis) out of unit tests."""
+    monkeypatch.setattr(settings, "openai_rate_limiter_enabled", False)
+    monkeypatch.setattr(settings, "llm_cache_backend", "none")
+
+
 @pytest.fixture
 def sample_audio_analysis(job_id):
     """Create sample AudioAnalysis."""
@@ -149,6 +158,60 @@ class TestGenerateScenePlan:
             # Verify cost tracking was called
             mock_cost_tracker.track_cost.assert_called_once()
     
+    @pytest.mark.asyncio
+    @patch('modules.scene_planner.llm_client.get_openai_client')
+    @patch('modules.scene_planner.llm_client.cost_tracker')
+    async def test_generate_scene_plan_streams_entries(
+        self,
+        mock_cost_tracker,
+        mock_get_client,
+        job_id,
+        sample_audio_analysis
+    ):
+        """Characters and scenes reach on_entry before the clip scripts have streamed."""
+        content = '{"video_summary": "Test", "characters": [{"id": "protagonist", "role": "main"}], "scenes": [{"id": "street"}], "clip_scripts": [{"clip_index": 0}]}'
+        clip_scripts_at = content.index('"clip_scripts"')
+        parts = [content[:clip_scripts_at], content[clip_scripts_at:]]
+        chunks = [
+            MagicMock(choices=[MagicMock(delta=MagicMock(content=part), finish_reason=None)], usage=None)
+            for part in parts
+        ]
+        chunks[-1].choices[0].finish_reason = "stop"
+        chunks.append(MagicMock(choices=[], usage=MagicMock(prompt_tokens=1000, completion_tokens=500)))
+        
+        streamed = []
+        
+        async def stream():
+            for chunk in chunks:
+                streamed.append(chunk)
+                yield chunk
+        
+        mock_client = AsyncMock()
+        mock_client.chat.completions.create = AsyncMock(side_effect=lambda **kwargs: stream())
+        mock_get_client.return_value = mock_client
+        mock_cost_tracker.track_cost = AsyncMock()
+        
+        entries = []
+        
+        async def on_entry(key, value):
+            entries.append((key, value, len(streamed)))
+        
+        result = await generate_scene_plan(
+            job_id=job_id,
+            user_prompt="cyberpunk city at night",
+            audio_data=sample_audio_analysis,
+            director_knowledge="Test knowledge",
+            on_entry=on_entry
+        )
+        
+        assert entries[:3] == [
+            ("video_summary", "Test", 1),
+            ("characters", {"id": "protagonist", "role": "main"}, 1),
+            ("scenes", {"id": "street"}, 1)
+        ]
+        assert result["clip_scripts"] == [{"clip_index": 0}]
+        mock_cost_tracker.track_cost.assert_called_once()
+    
     @pytest.mark.asyncio
     @patch('modules.scene_planner.llm_client.get_openai_client')
     async def test_generate_scene_plan_rate_limit(
@@ -192,7 +192,34 @@ class TestPlanScenes:
                 user_prompt=sample_user_prompt,
                 audio_data=sample_audio_analysis
             )
-    
+
+    @pytest.mark.asyncio
+    async def test_plan_scenes_invalid_plan_discards_cached_completion(
+        self,
+        job_id,
+        sample_user_prompt,
+        sample_audio_analysis,
+        sample_scene_plan_dict
+    ):
+        """A plan that fails validation is dropped from the LLM cache so the retry calls the LLM."""
+        completion = MagicMock()
+
+        async def generate_scene_plan(**kwargs):
+            kwargs["completions"].append(completion)
+            return sample_scene_plan_dict
+
+        with patch.object(planner, 'generate_scene_plan', side_effect=generate_scene_plan), \
+             patch.object(planner, 'validate_scene_plan', side_effect=ValidationError("Clip count mismatch")), \
+             patch.object(planner.llm_cache, 'discard', new_callable=AsyncMock) as mock_discard:
+            with pytest.raises(GenerationError):
+                await plan_scenes(
+                    job_id=job_id,
+                    user_prompt=sample_user_prompt,
+                    audio_data=sample_audio_analysis
+                )
+
+        mock_discard.assert_awaited_once_with(completion)
+
     @pytest.mark.asyncio
     @patch('modules.scene_planner.director_knowledge.get_director_knowledge')
     @patch('modules.scene_planner.llm_client.cost_tracker.track_cost', new_callable=AsyncMock)
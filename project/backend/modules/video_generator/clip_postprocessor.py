@@ -0,0 +1,227 @@
+"""
+Single-pass post-processing for generated clips.
+
+One FFmpeg invocation reads the Replicate output straight from its URL and
+writes everything the pipeline needs from it: the video-only clip (stream
+copy, audio stripped), the thumbnail frame and, optionally, the composer's
+normalized segment. The input duration is parsed from the same run's log,
+so the clip never passes through memory and is never downloaded twice.
+"""
+import asyncio
+import re
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+import httpx
+
+from shared.errors import RetryableError
+from shared.logging import get_logger
+
+logger = get_logger("video_generator.clip_postprocessor")
+
+# Thumbnail size (16:9) and JPEG quality (2 = high, 31 = low)
+THUMBNAIL_SIZE = "320:180"
+THUMBNAIL_QUALITY = "2"
+
+POSTPROCESS_TIMEOUT_SECONDS = 180
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+_DURATION_PATTERN = re.compile(r"Duration:\s*(\d+):(\d+):(\d+(?:\.\d+)?)")
+
+
+@dataclass
+class ProcessedClip:
+    """Files produced from one generated clip."""
+    video_path: Path
+    duration: float
+    thumbnail_path: Optional[Path] = None
+    normalized_path: Optional[Path] = None
+
+
+def parse_ffmpeg_duration(ffmpeg_log: str) -> Optional[float]:
+    """
+    Parse the input duration FFmpeg logs when opening a file.
+
+    Args:
+        ffmpeg_log: FFmpeg stderr output
+
+    Returns:
+        Duration in seconds, or None if not present
+    """
+    match = _DURATION_PATTERN.search(ffmpeg_log)
+    if not match:
+        return None
+    hours, minutes, seconds = match.groups()
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+def build_postprocess_command(
+    source: str,
+    video_path: Path,
+    thumbnail_path: Path,
+    normalized_path: Optional[Path] = None,
+    normalize_size: Optional[Tuple[int, int]] = None
+) -> List[str]:
+    """
+    Build the FFmpeg command that writes all clip outputs in one pass.
+
+    Args:
+        source: Replicate output URL or local file path
+        video_path: Output for the video-only clip (stream copy)
+        thumbnail_path: Output for the first-frame JPEG thumbnail
+        normalized_path: Output for the composer's normalized segment (optional)
+        normalize_size: (width, height) of the normalized segment
+
+    Returns:
+        FFmpeg command as list of strings
+    """
+    cmd = ["ffmpeg", "-hide_banner", "-y"]
+    if source.startswith(("http://", "https://")):
+        # Survive dropped connections while reading from Replicate's CDN
+        cmd.extend(["-reconnect", "1", "-reconnect_streamed", "1", "-reconnect_delay_max", "5"])
+    cmd.extend(["-i", source])
+
+    # Video-only clip: copy the video stream, drop model-generated audio (we use the original track)
+    cmd.extend(["-map", "0:v:0", "-c:v", "copy", "-an", "-movflags", "+faststart", str(video_path)])
+
+    # Thumbnail: first frame, resized
+    cmd.extend([
+        "-map", "0:v:0",
+        "-vf", f"scale={THUMBNAIL_SIZE}",
+        "-frames:v", "1",
+        "-q:v", THUMBNAIL_QUALITY,
+        str(thumbnail_path)
+    ])
+
+    if normalized_path is not None and normalize_size is not None:
+        # Same scale/pad/fps and encode settings as the composer's normalize_clip
+        from modules.composer.config import OUTPUT_FPS
+        from modules.composer.encoder import video_encode_args
+        width, height = normalize_size
+        cmd.extend([
+            "-map", "0:v:0",
+            "-vf",
+            f"scale={width}:{height}:force_original_aspect_ratio=decrease:flags=lanczos,"
+            f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2:color=black,fps={OUTPUT_FPS}",
+        ])
+        cmd.extend(video_encode_args())
+        cmd.append(str(normalized_path))
+
+    return cmd
+
+
+async def _download_to_file(url: str, output_path: Path) -> None:
+    """Stream a URL to disk."""
+    async with httpx.AsyncClient(timeout=60.0) as client:
+        async with client.stream("GET", url) as response:
+            response.raise_for_status()
+            with open(output_path, "wb") as f:
+                async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+
+
+async def _raw_clip(source: str, work_dir: Path, clip_index: int) -> ProcessedClip:
+    """Fallback when FFmpeg can't run: keep the model output as-is."""
+    video_path = work_dir / f"clip_{clip_index}.mp4"
+    try:
+        if source.startswith(("http://", "https://")):
+            await _download_to_file(source, video_path)
+        else:
+            shutil.copyfile(source, video_path)
+    except Exception as e:
+        raise RetryableError(f"Video download failed: {str(e)}") from e
+
+    from modules.composer.utils import get_video_duration
+    duration = await get_video_duration(video_path)
+    return ProcessedClip(video_path=video_path, duration=duration)
+
+
+async def postprocess_clip(
+    source: str,
+    work_dir: Path,
+    clip_index: int,
+    job_id: Optional[UUID] = None,
+    normalize_size: Optional[Tuple[int, int]] = None
+) -> ProcessedClip:
+    """
+    Turn a Replicate output into upload-ready files with a single FFmpeg run.
+
+    Falls back to the unprocessed output (audio kept, no thumbnail) if FFmpeg
+    is unavailable or fails, rather than failing the clip.
+
+    Args:
+        source: Replicate output URL (or local file path)
+        work_dir: Directory for the outputs (caller removes it)
+        clip_index: Clip index for naming and logging
+        job_id: Job ID for logging
+        normalize_size: (width, height) to also write the composer's normalized segment
+
+    Returns:
+        ProcessedClip with local file paths and duration
+
+    Raises:
+        RetryableError: If the output can't be downloaded at all
+    """
+    log_extra = {"job_id": str(job_id) if job_id else None, "clip_index": clip_index}
+
+    if not shutil.which("ffmpeg"):
+        logger.warning(
+            "FFmpeg not available, cannot strip audio. Video may contain audio from model.",
+            extra=log_extra
+        )
+        return await _raw_clip(source, work_dir, clip_index)
+
+    video_path = work_dir / f"clip_{clip_index}.mp4"
+    thumbnail_path = work_dir / f"clip_{clip_index}_thumbnail.jpg"
+    normalized_path = work_dir / f"clip_{clip_index}_normalized.mp4" if normalize_size else None
+    cmd = build_postprocess_command(source, video_path, thumbnail_path, normalized_path, normalize_size)
+
+    logger.info(
+        "Post-processing clip (strip audio, thumbnail"
+        f"{', normalize ' + 'x'.join(map(str, normalize_size)) if normalize_size else ''})",
+        extra=log_extra
+    )
+
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        _, stderr = await asyncio.wait_for(process.communicate(), timeout=POSTPROCESS_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        logger.error(f"Clip post-processing timeout after {POSTPROCESS_TIMEOUT_SECONDS}s", extra=log_extra)
+        return await _raw_clip(source, work_dir, clip_index)
+
+    ffmpeg_log = stderr.decode(errors="replace") if stderr else ""
+    if process.returncode != 0 or not video_path.exists() or video_path.stat().st_size == 0:
+        logger.error(
+            f"Clip post-processing failed, using unprocessed output: {ffmpeg_log[-2000:]}",
+            extra={**log_extra, "error": ffmpeg_log[-2000:]}
+        )
+        return await _raw_clip(source, work_dir, clip_index)
+
+    duration = parse_ffmpeg_duration(ffmpeg_log)
+    if duration is None:
+        from modules.composer.utils import get_video_duration
+        duration = await get_video_duration(video_path)
+
+    has_thumbnail = thumbnail_path.exists() and thumbnail_path.stat().st_size > 0
+    has_normalized = normalized_path is not None and normalized_path.exists() and normalized_path.stat().st_size > 0
+
+    logger.info(
+        f"Post-processed clip {clip_index} ({duration:.2f}s, {video_path.stat().st_size} bytes)",
+        extra={**log_extra, "duration": duration, "thumbnail": has_thumbnail, "normalized": has_normalized}
+    )
+
+    return ProcessedClip(
+        video_path=video_path,
+        duration=duration,
+        thumbnail_path=thumbnail_path if has_thumbnail else None,
+        normalized_path=normalized_path if has_normalized else None
+    )
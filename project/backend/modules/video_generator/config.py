@@ -26,6 +26,17 @@ COGVIDEOX_MODEL_VERSION = os.getenv("COGVIDEOX_MODEL_VERSION", "latest")
 # Discrete models (Kling, etc.) use maximum buffer strategy instead
 VIDEO_GENERATOR_DURATION_BUFFER = float(os.getenv("VIDEO_GENERATOR_DURATION_BUFFER", "1.25"))
 
+# Clip post-processing
+# Also write the composer's normalized segment (job aspect-ratio resolution, 30 FPS) in the same
+# FFmpeg pass that strips audio and extracts the thumbnail, and store it in the composer's segment
+# cache. Moves the per-clip encode from composition into generation, where it overlaps other clips.
+VIDEO_PRENORMALIZE_FOR_COMPOSER = os.getenv("VIDEO_PRENORMALIZE_FOR_COMPOSER", "false").lower() == "true"
+
+# Reference images
+# Lifetime of the signed URLs handed to Replicate (cached URLs keep at least three quarters of it,
+# since predictions can wait for a governor slot before Replicate fetches the image)
+REFERENCE_URL_EXPIRES_IN = int(os.getenv("REFERENCE_URL_EXPIRES_IN", "3600"))
+
 KLING_MODEL = f"kwaivgi/kling-v2.1:{KLING_MODEL_VERSION}"
 SVD_MODEL = f"bytedance/seedance-1-pro-fast:{SVD_MODEL_VERSION}"
 COGVIDEOX_MODEL = f"THUDM/cogvideox:{COGVIDEOX_MODEL_VERSION}"
@@ -9,13 +9,14 @@ import time
 import subprocess
 import tempfile
 import os
+import shutil
+from pathlib import Path
 from typing import Optional, Callable, Dict, Any, List
 from uuid import UUID
 from decimal import Decimal
 from email.utils import parsedate_to_datetime
 from datetime import datetime
 
-import replicate
 import httpx
 
 from shared.models.video import Clip, ClipPrompt
@@ -23,21 +24,23 @@ from shared.storage import StorageClient
 from shared.cost_tracking import cost_tracker
 from shared.errors import RetryableError, GenerationError
 from shared.logging import get_logger
-from shared.config import settings
 from modules.video_generator.config import (
     SVD_MODEL, COGVIDEOX_MODEL, get_generation_settings,
     get_selected_model, get_model_config, get_model_replicate_string,
-    get_duration_buffer_multiplier
+    get_duration_buffer_multiplier, VIDEO_PRENORMALIZE_FOR_COMPOSER
 )
+from modules.video_generator.clip_postprocessor import postprocess_clip
 from modules.video_generator.model_validator import get_latest_version_hash, validate_model_config
 from modules.video_generator.cost_estimator import estimate_clip_cost
 from replicate.exceptions import ModelError
+from shared.replicate_completion import create_replicate_client, webhook_kwargs, prediction_waiter
+from shared.replicate_governor import replicate_governor
 
 logger = get_logger("video_generator.generator")
 
 # Initialize Replicate client
 try:
-    client = replicate.Client(api_token=settings.replicate_api_token)
+    client = create_replicate_client()
 except Exception as e:
     logger.error(f"Failed to initialize Replicate client: {str(e)}")
     raise
@@ -688,6 +691,8 @@ async def generate_video_clip(
             f"Please check VIDEO_MODEL configuration."
         )
     use_fallback = False
+    governor_lease = None
+    work_dir = None
     
     try:
         # Ensure no audio parameters are passed (we use original audio in composer)
@@ -765,6 +770,11 @@ async def generate_video_clip(
             }
         )
         
+        # Wait for account-wide capacity for this model family (shared with all workers and jobs)
+        governor_lease = await replicate_governor.acquire(
+            model_config.get("replicate_string", selected_model_key), job_id=job_id
+        )
+        
         # Create prediction - Replicate API
         # For models with "latest" version, dynamically retrieve latest hash or use model= parameter
         # For models with pinned version hashes, use version parameter
@@ -780,9 +790,11 @@ async def generate_video_clip(
                         f"Using dynamically retrieved latest version hash for {replicate_string}: {latest_hash}",
                         extra={"job_id": str(job_id), "model": selected_model_key, "version_hash": latest_hash}
                     )
-                    prediction = client.predictions.create(
+                    prediction = await asyncio.to_thread(
+                        client.predictions.create,
                         version=latest_hash,
-                        input=input_data
+                        input=input_data,
+                        **webhook_kwargs()
                     )
                 else:
                     # Fallback: Use model= parameter (Replicate will use latest)
@@ -790,9 +802,11 @@ async def generate_video_clip(
                         f"Could not retrieve latest version hash for {replicate_string}, using model= parameter",
                         extra={"job_id": str(job_id), "model": selected_model_key}
                     )
-                    prediction = client.predictions.create(
+                    prediction = await asyncio.to_thread(
+                        client.predictions.create,
                         model=replicate_string,
-                        input=input_data
+                        input=input_data,
+                        **webhook_kwargs()
                     )
             except Exception as e:
                 # Fallback to model= parameter if dynamic retrieval fails
@@ -800,9 +814,11 @@ async def generate_video_clip(
                     f"Error retrieving latest version hash for {replicate_string}, falling back to model=: {str(e)}",
                     extra={"job_id": str(job_id), "model": selected_model_key, "error": str(e)}
                 )
-                prediction = client.predictions.create(
+                prediction = await asyncio.to_thread(
+                    client.predictions.create,
                     model=replicate_string,
-                    input=input_data
+                    input=input_data,
+                    **webhook_kwargs()
                 )
         else:
             # For models with pinned version hashes, use version parameter
@@ -812,9 +828,11 @@ async def generate_video_clip(
                 extra={"job_id": str(job_id), "model": selected_model_key, "version_hash": model_version}
             )
             try:
-                prediction = client.predictions.create(
+                prediction = await asyncio.to_thread(
+                    client.predictions.create,
                     version=model_version,  # Version hash from config
-                    input=input_data
+                    input=input_data,
+                    **webhook_kwargs()
                 )
             except Exception as e:
                 error_str = str(e).lower()
@@ -841,7 +859,7 @@ async def generate_video_clip(
                     ) from e
                 raise
         
-        # Poll for completion with adaptive interval (faster when close to completion)
+        # Wait for completion, ticking with an adaptive interval for progress updates
         start_time = time.time()
         base_poll_interval = 3  # Base polling interval (3 seconds)
         fast_poll_interval = 1  # Fast polling when close to completion (1 second)
@@ -883,10 +901,9 @@ async def generate_video_clip(
             else:
                 poll_interval = base_poll_interval
             
-            await asyncio.sleep(poll_interval)
-            
-            # Reload to get latest status (check immediately after sleep for faster completion detection)
-            prediction.reload()
+            # Wait for the completion webhook (or the shared batched poller) instead of reloading here;
+            # returns as soon as the prediction finishes, or after poll_interval for progress updates
+            await prediction_waiter.wait(prediction, timeout=poll_interval)
             
             # Early exit: if status changed to success/failure, skip remaining loop
             if prediction.status in ["succeeded", "failed", "canceled"]:
@@ -960,6 +977,13 @@ async def generate_video_clip(
                     else:
                         progress_callback(progress_event)
         
+        # The prediction has finished on Replicate; free its capacity before downloading the output
+        if prediction.status == "succeeded":
+            governor_lease.succeeded()
+        elif "rate limit" in str(prediction.error).lower() or "429" in str(prediction.error):
+            governor_lease.throttled()
+        await replicate_governor.release(governor_lease)
+        
         # Handle result
         if prediction.status == "succeeded":
             # Get video output from Replicate
@@ -973,30 +997,25 @@ async def generate_video_clip(
             else:
                 video_output = output
             
-            # FileOutput objects have .read() method, URLs are strings
-            if hasattr(video_output, 'read'):
-                # FileOutput object - read bytes directly
-                logger.info(
-                    f"Reading video from Replicate FileOutput",
-                    extra={"job_id": str(job_id), "clip_index": clip_prompt.clip_index}
-                )
-                video_bytes = video_output.read()
+            # FileOutput objects expose the delivery URL; FFmpeg streams it directly
+            if hasattr(video_output, 'url'):
+                video_source = str(video_output.url)
             elif isinstance(video_output, str):
-                # URL string - download from URL
-                logger.info(
-                    f"Downloading video from Replicate URL",
-                    extra={"job_id": str(job_id), "clip_index": clip_prompt.clip_index, "url": video_output}
-                )
-                video_bytes = await download_video_from_url(video_output)
+                video_source = video_output
             else:
                 raise GenerationError(f"Unexpected output format: {type(video_output)}")
             
-            # IMPORTANT: Strip audio from video to ensure video-only clips
-            # Some models (like Veo 3.1) generate audio by default, but we use original audio in composer
-            video_bytes = await strip_audio_from_video_bytes(video_bytes, job_id=job_id)
-            
-            # Get actual duration
-            actual_duration = get_video_duration(video_bytes)
+            # One FFmpeg pass: strip audio (we use original audio in composer; Veo 3.1 generates audio
+            # by default), extract the thumbnail, read the duration and optionally pre-normalize
+            normalize_size = None
+            if VIDEO_PRENORMALIZE_FOR_COMPOSER:
+                from modules.composer.config import get_output_dimensions_from_aspect_ratio
+                normalize_size = get_output_dimensions_from_aspect_ratio(aspect_ratio)
+            work_dir = Path(tempfile.mkdtemp(prefix=f"clip_{clip_prompt.clip_index}_"))
+            processed = await postprocess_clip(
+                video_source, work_dir, clip_prompt.clip_index, job_id=job_id, normalize_size=normalize_size
+            )
+            actual_duration = processed.duration
             
             # Upload to Supabase Storage
             storage = StorageClient()
@@ -1110,20 +1129,27 @@ async def generate_video_clip(
             final_url = await storage.upload_file(
                 bucket="video-clips",
                 path=clip_path,
-                file_data=video_bytes,
+                file_data=processed.video_path,
                 content_type="video/mp4"
             )
             
-            # Fire-and-forget thumbnail generation (async, non-blocking)
+            # Fire-and-forget thumbnail upload (async, non-blocking). The frame was extracted in the
+            # post-processing pass; only fall back to re-downloading the clip if that produced none
             try:
-                from modules.video_generator.thumbnail_generator import generate_clip_thumbnail
-                asyncio.create_task(
-                    generate_clip_thumbnail(
+                from modules.video_generator.thumbnail_generator import generate_clip_thumbnail, store_clip_thumbnail
+                if processed.thumbnail_path is not None:
+                    thumbnail_task = store_clip_thumbnail(
+                        processed.thumbnail_path.read_bytes(),
+                        job_id=job_id,
+                        clip_index=clip_prompt.clip_index
+                    )
+                else:
+                    thumbnail_task = generate_clip_thumbnail(
                         clip_url=final_url,
                         job_id=job_id,
                         clip_index=clip_prompt.clip_index
                     )
-                )
+                asyncio.create_task(thumbnail_task)
                 logger.debug(
                     f"Started thumbnail generation task for clip {clip_prompt.clip_index}",
                     extra={"job_id": str(job_id), "clip_index": clip_prompt.clip_index}
@@ -1135,6 +1161,13 @@ async def generate_video_clip(
                     extra={"job_id": str(job_id), "clip_index": clip_prompt.clip_index}
                 )
             
+            # Hand the pre-normalized segment to the composer's segment cache (keyed by this clip version)
+            if processed.normalized_path is not None:
+                from modules.composer.segment_cache import store_segments
+                await store_segments(
+                    [(final_url, processed.normalized_path)], job_id, normalize_size[0], normalize_size[1]
+                )
+            
             # Get actual cost from Replicate prediction (if available)
             actual_cost = get_prediction_cost(prediction)
             if actual_cost is None:
@@ -1296,6 +1329,8 @@ async def generate_video_clip(
                 # If header parsing fails, continue without retry_after
                 pass
             
+            if governor_lease is not None:
+                governor_lease.throttled(retry_after)
             if retry_after:
                 logger.info(f"Rate limit hit, waiting {retry_after}s from Retry-After header")
                 raise RetryableError(f"Rate limit error (retry after {retry_after}s): {str(e)}") from e
@@ -1339,6 +1374,8 @@ async def generate_video_clip(
         # Classify other errors
         error_str = str(e).lower()
         if "rate limit" in error_str or "429" in error_str:
+            if governor_lease is not None:
+                governor_lease.throttled()
             raise RetryableError(f"Rate limit error: {str(e)}") from e
         elif "timeout" in error_str or "timed out" in error_str:
             raise RetryableError(f"Timeout error: {str(e)}") from e
@@ -1356,4 +1393,9 @@ async def generate_video_clip(
             ) from e
         else:
             raise GenerationError(f"Generation error: {str(e)}") from e
+    finally:
+        # No-op if already released after completion
+        await replicate_governor.release(governor_lease)
+        if work_dir is not None:
+            shutil.rmtree(work_dir, ignore_errors=True)
 
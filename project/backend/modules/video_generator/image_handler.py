@@ -1,11 +1,17 @@
 """
 Image handling for video generation.
 
-Downloads images from Supabase Storage and uploads to Replicate.
+Resolves Supabase Storage reference images to URLs Replicate can fetch.
+Signed URLs are minted without downloading the image and reused through the
+shared signed URL cache; the image is only downloaded and re-uploaded when
+signing fails.
 """
 from typing import Optional
 from uuid import UUID
 import re
+import uuid
+from modules.video_generator.config import REFERENCE_URL_EXPIRES_IN
+from shared.signed_urls import get_signed_url
 from shared.storage import StorageClient
 from shared.retry import retry_with_backoff
 from shared.errors import RetryableError
@@ -51,105 +57,109 @@ def parse_supabase_url(url: str) -> tuple[str, str]:
     return bucket, path
 
 
+async def _upload_temp_copy(
+    storage: StorageClient,
+    bucket: str,
+    path: str,
+    job_id: UUID
+) -> Optional[str]:
+    """
+    Fallback: copy the image to a temporary location and sign that instead.
+
+    Raises:
+        RetryableError: If the download fails (will retry)
+    """
+    logger.info(
+        f"Downloading image from Supabase: {bucket}/{path}",
+        extra={"job_id": str(job_id)}
+    )
+    image_bytes = await storage.download_file(bucket, path)
+
+    try:
+        temp_bucket = "reference-images"  # Use existing bucket
+        # Generate unique filename to avoid conflicts
+        unique_id = str(uuid.uuid4())[:8]
+        temp_path = f"temp/{job_id}/{unique_id}.jpg"
+
+        logger.info(
+            f"Uploading image to temporary Supabase location for Replicate",
+            extra={"job_id": str(job_id), "size": len(image_bytes), "temp_path": temp_path}
+        )
+
+        await storage.upload_file(
+            bucket=temp_bucket,
+            path=temp_path,
+            file_data=image_bytes,
+            content_type="image/jpeg"
+        )
+
+        signed_url = await storage.get_signed_url(temp_bucket, temp_path, expires_in=REFERENCE_URL_EXPIRES_IN)
+
+        logger.info(
+            f"Successfully uploaded image to temporary location and got signed URL",
+            extra={"job_id": str(job_id), "temp_path": temp_path}
+        )
+
+        return signed_url
+    except Exception as e:
+        logger.error(
+            f"Failed to upload image to temporary location: {e}",
+            extra={"job_id": str(job_id), "error": str(e)}
+        )
+        # Return None to proceed with text-only generation
+        return None
+
+
 @retry_with_backoff(max_attempts=3, base_delay=2)
 async def download_and_upload_image(
     image_url: str,
     job_id: UUID
 ) -> Optional[str]:
     """
-    Download image from Supabase and prepare for Replicate.
-    
+    Resolve a Supabase Storage image to a URL Replicate can fetch.
+
+    Uses the shared signed URL cache, so the image is never downloaded on the
+    normal path. It is only downloaded and re-uploaded to a temporary
+    location if signing fails.
+
     Args:
         image_url: Supabase Storage URL
         job_id: Job ID for logging
-        
+
     Returns:
         Signed URL string, or None if all attempts fail
-        
+
     Raises:
-        RetryableError: If download fails (will retry)
+        RetryableError: If the fallback download fails (will retry)
     """
-    storage = StorageClient()
-    
     try:
-        # Parse Supabase URL
         bucket, path = parse_supabase_url(image_url)
-        
-        # Download from Supabase
-        logger.info(
-            f"Downloading image from Supabase: {bucket}/{path}",
-            extra={"job_id": str(job_id)}
-        )
-        image_bytes = await storage.download_file(bucket, path)
-        
-        # Replicate requires URL strings, not BytesIO objects
-        # Strategy: Try Supabase signed URL first, fallback to uploading to temp location
-        
-        # Option 1: Try using Supabase signed URL directly (fastest approach)
-        # This avoids download/upload overhead
+
+        storage = StorageClient()
+
+        # Replicate requires URL strings; a signed URL of the original object needs no transfer
         try:
-            signed_url = await storage.get_signed_url(bucket, path, expires_in=3600)
-            logger.info(
-                f"Using Supabase signed URL for Replicate",
-                extra={"job_id": str(job_id)}
-            )
-            return signed_url
+            signed_url = await get_signed_url(bucket, path, expires_in=REFERENCE_URL_EXPIRES_IN, storage=storage)
         except Exception as e:
             logger.debug(
                 f"Signed URL approach failed, uploading to temporary location: {e}",
                 extra={"job_id": str(job_id)}
             )
-        
-        # Option 2: Upload to temporary Supabase location and get URL
-        # Replicate requires URLs, not BytesIO objects
-        # Upload to a temporary location in Supabase and return the signed URL
-        try:
-            import uuid
-            
-            # Upload to Supabase temporary location
-            temp_bucket = "reference-images"  # Use existing bucket
-            # Generate unique filename to avoid conflicts
-            unique_id = str(uuid.uuid4())[:8]
-            temp_path = f"temp/{job_id}/{unique_id}.jpg"
-            
-            logger.info(
-                f"Uploading image to temporary Supabase location for Replicate",
-                extra={"job_id": str(job_id), "size": len(image_bytes), "temp_path": temp_path}
-            )
-            
-            # Upload file to temporary location
-            await storage.upload_file(
-                bucket=temp_bucket,
-                path=temp_path,
-                file_data=image_bytes,
-                content_type="image/jpeg"
-            )
-            
-            # Get signed URL for Replicate
-            signed_url = await storage.get_signed_url(temp_bucket, temp_path, expires_in=3600)
-            
-            logger.info(
-                f"Successfully uploaded image to temporary location and got signed URL",
-                extra={"job_id": str(job_id), "temp_path": temp_path}
-            )
-            
-            return signed_url
-        except Exception as e:
-            logger.error(
-                f"Failed to upload image to temporary location: {e}",
-                extra={"job_id": str(job_id), "error": str(e)}
-            )
-            # Return None to proceed with text-only generation
-            return None
-        
+            return await _upload_temp_copy(storage, bucket, path, job_id)
+
+        logger.info(
+            f"Using Supabase signed URL for Replicate",
+            extra={"job_id": str(job_id)}
+        )
+        return signed_url
+
     except RetryableError:
         # Re-raise retryable errors (will be retried by decorator)
         raise
     except Exception as e:
         logger.error(
-            f"Failed to download/upload image: {e}",
+            f"Failed to resolve reference image URL: {e}",
             extra={"job_id": str(job_id), "error": str(e)}
         )
         # Return None to proceed with text-only
         return None
-
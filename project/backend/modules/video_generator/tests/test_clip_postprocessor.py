@@ -0,0 +1,82 @@
+"""
+Unit tests for single-pass clip post-processing.
+"""
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from modules.video_generator.clip_postprocessor import (
+    build_postprocess_command,
+    parse_ffmpeg_duration,
+    postprocess_clip,
+)
+
+
+class TestParseFfmpegDuration:
+    """Tests for parse_ffmpeg_duration."""
+
+    def test_parses_input_duration(self):
+        """The duration FFmpeg logs for the input is used as the clip duration."""
+        log = (
+            "Input #0, mov,mp4,m4a,3gp,3g2,mj2, from 'https://replicate.delivery/x/out.mp4':\n"
+            "  Duration: 00:00:05.04, start: 0.000000, bitrate: 4312 kb/s\n"
+        )
+        assert parse_ffmpeg_duration(log) == pytest.approx(5.04)
+
+    def test_missing_duration(self):
+        """Logs without a duration (e.g. N/A) return None."""
+        assert parse_ffmpeg_duration("  Duration: N/A, bitrate: N/A") is None
+
+
+class TestBuildPostprocessCommand:
+    """Tests for build_postprocess_command."""
+
+    def test_single_pass_outputs(self, tmp_path):
+        """One command streams the URL and writes the clip and the thumbnail."""
+        video_path = tmp_path / "clip_0.mp4"
+        thumbnail_path = tmp_path / "clip_0_thumbnail.jpg"
+
+        cmd = build_postprocess_command("https://replicate.delivery/x/out.mp4", video_path, thumbnail_path)
+
+        assert cmd.count("-i") == 1
+        assert "-reconnect" in cmd
+        copy_args = cmd[cmd.index("-c:v"):cmd.index(str(video_path))]
+        assert copy_args[:2] == ["-c:v", "copy"] and "-an" in copy_args
+        assert cmd[-1] == str(thumbnail_path)
+        assert "-frames:v" in cmd
+
+    def test_optional_normalized_output(self, tmp_path):
+        """The composer's normalized segment is a third output of the same pass."""
+        normalized_path = tmp_path / "clip_0_normalized.mp4"
+
+        cmd = build_postprocess_command(
+            str(tmp_path / "in.mp4"), tmp_path / "clip_0.mp4", tmp_path / "thumb.jpg",
+            normalized_path, (1920, 1080)
+        )
+
+        assert "-reconnect" not in cmd
+        assert cmd[-1] == str(normalized_path)
+        assert any(arg.startswith("scale=1920:1080") for arg in cmd)
+        assert cmd.count("-map") == 3
+
+
+class TestPostprocessClip:
+    """Tests for postprocess_clip."""
+
+    @pytest.mark.asyncio
+    @patch('modules.composer.utils.get_video_duration', new_callable=AsyncMock)
+    @patch('modules.video_generator.clip_postprocessor.shutil.which', return_value=None)
+    async def test_without_ffmpeg_keeps_raw_output(self, mock_which, mock_duration, tmp_path):
+        """Without FFmpeg the model output is uploaded as-is instead of failing the clip."""
+        source = tmp_path / "replicate_output.mp4"
+        source.write_bytes(b"video bytes")
+        work_dir = tmp_path / "work"
+        work_dir.mkdir()
+        mock_duration.return_value = 5.2
+
+        processed = await postprocess_clip(str(source), work_dir, 3)
+
+        assert processed.video_path == work_dir / "clip_3.mp4"
+        assert processed.video_path.read_bytes() == b"video bytes"
+        assert processed.duration == 5.2
+        assert processed.thumbnail_path is None
+        assert processed.normalized_path is None
@@ -10,6 +10,7 @@ from unittest.mock import Mock, AsyncMock, patch, MagicMock
 from decimal import Decimal
 from uuid import UUID, uuid4
 import time
+from pathlib import Path
 
 from shared.models.video import ClipPrompt, Clip
 from shared.errors import RetryableError, GenerationError
@@ -22,6 +23,7 @@ from modules.video_generator.generator import (
     parse_retry_after_header,
     get_prediction_cost
 )
+from modules.video_generator.clip_postprocessor import ProcessedClip
 
 
 # Test fixtures
@@ -252,7 +254,7 @@ class TestGenerateVideoClip:
     @patch('modules.video_generator.generator.cost_tracker')
     @patch('modules.video_generator.generator.get_video_duration')
     @patch('modules.video_generator.generator.download_video_from_url')
-    @patch('modules.video_generator.generator.replicate')
+    @patch('modules.video_generator.generator.create_replicate_client')
     async def test_generate_video_clip_success_with_url(
         self,
         mock_replicate,
@@ -273,7 +275,7 @@ class TestGenerateVideoClip:
         mock_prediction.metrics = {}
         
         # Mock Replicate API
-        mock_replicate.predictions.create.return_value = mock_prediction
+        mock_replicate.return_value.predictions.create.return_value = mock_prediction
         
         # Mock video download
         mock_download.return_value = b"video bytes"
@@ -314,7 +316,7 @@ class TestGenerateVideoClip:
     @patch('modules.video_generator.generator.StorageClient')
     @patch('modules.video_generator.generator.cost_tracker')
     @patch('modules.video_generator.generator.get_video_duration')
-    @patch('modules.video_generator.generator.replicate')
+    @patch('modules.video_generator.generator.create_replicate_client')
     async def test_generate_video_clip_success_with_fileoutput(
         self,
         mock_replicate,
@@ -338,7 +340,7 @@ class TestGenerateVideoClip:
         mock_prediction.metrics = {"cost": 0.20}
         
         # Mock Replicate API
-        mock_replicate.predictions.create.return_value = mock_prediction
+        mock_replicate.return_value.predictions.create.return_value = mock_prediction
         
         # Mock duration extraction
         mock_get_duration.return_value = 5.0
@@ -365,7 +367,7 @@ class TestGenerateVideoClip:
     
     @pytest.mark.asyncio
     @patch('modules.video_generator.generator.time')
-    @patch('modules.video_generator.generator.replicate')
+    @patch('modules.video_generator.generator.create_replicate_client')
     async def test_generate_video_clip_timeout(
         self,
         mock_replicate,
@@ -381,7 +383,7 @@ class TestGenerateVideoClip:
         mock_prediction.reload = Mock()
         
         # Mock Replicate API
-        mock_replicate.predictions.create.return_value = mock_prediction
+        mock_replicate.return_value.predictions.create.return_value = mock_prediction
         
         # Mock time to simulate timeout quickly
         start_time = 1000.0
@@ -397,7 +399,7 @@ class TestGenerateVideoClip:
             )
     
     @pytest.mark.asyncio
-    @patch('modules.video_generator.generator.replicate')
+    @patch('modules.video_generator.generator.create_replicate_client')
     async def test_generate_video_clip_rate_limit_error(
         self,
         mock_replicate,
@@ -415,7 +417,7 @@ class TestGenerateVideoClip:
         # Create ModelError with prediction object
         error = ModelError(mock_prediction)
         
-        mock_replicate.predictions.create.side_effect = error
+        mock_replicate.return_value.predictions.create.side_effect = error
         
         with pytest.raises(RetryableError, match="Rate limit"):
             await generate_video_clip(
@@ -427,7 +429,7 @@ class TestGenerateVideoClip:
             )
     
     @pytest.mark.asyncio
-    @patch('modules.video_generator.generator.replicate')
+    @patch('modules.video_generator.generator.create_replicate_client')
     async def test_generate_video_clip_model_unavailable(
         self,
         mock_replicate,
@@ -442,7 +444,7 @@ class TestGenerateVideoClip:
         mock_prediction.error = "Model unavailable"
         
         # Mock Replicate API
-        mock_replicate.predictions.create.return_value = mock_prediction
+        mock_replicate.return_value.predictions.create.return_value = mock_prediction
         
         with pytest.raises(RetryableError, match="Model unavailable"):
             await generate_video_clip(
@@ -454,7 +456,7 @@ class TestGenerateVideoClip:
             )
     
     @pytest.mark.asyncio
-    @patch('modules.video_generator.generator.replicate')
+    @patch('modules.video_generator.generator.create_replicate_client')
     async def test_generate_video_clip_invalid_input(
         self,
         mock_replicate,
@@ -468,7 +470,7 @@ class TestGenerateVideoClip:
         mock_prediction.error = "Invalid input parameters"
         error = ModelError(mock_prediction)
         
-        mock_replicate.predictions.create.side_effect = error
+        mock_replicate.return_value.predictions.create.side_effect = error
         
         with pytest.raises(GenerationError, match="Model error"):
             await generate_video_clip(
@@ -480,7 +482,7 @@ class TestGenerateVideoClip:
             )
     
     @pytest.mark.asyncio
-    @patch('modules.video_generator.generator.replicate')
+    @patch('modules.video_generator.generator.create_replicate_client')
     async def test_generate_video_clip_network_error(
         self,
         mock_replicate,
@@ -490,7 +492,7 @@ class TestGenerateVideoClip:
     ):
         """Test network error handling."""
         # Mock network error
-        mock_replicate.predictions.create.side_effect = Exception("Network connection error")
+        mock_replicate.return_value.predictions.create.side_effect = Exception("Network connection error")
         
         with pytest.raises(RetryableError, match="Network error"):
             await generate_video_clip(
@@ -506,7 +508,7 @@ class TestGenerateVideoClip:
     @patch('modules.video_generator.generator.cost_tracker')
     @patch('modules.video_generator.generator.get_video_duration')
     @patch('modules.video_generator.generator.download_video_from_url')
-    @patch('modules.video_generator.generator.replicate')
+    @patch('modules.video_generator.generator.create_replicate_client')
     async def test_generate_video_clip_with_actual_cost(
         self,
         mock_replicate,
@@ -527,7 +529,7 @@ class TestGenerateVideoClip:
         mock_prediction.metrics = {"cost": 0.25}
         
         # Mock Replicate API
-        mock_replicate.predictions.create.return_value = mock_prediction
+        mock_replicate.return_value.predictions.create.return_value = mock_prediction
         
         # Mock video download
         mock_download.return_value = b"video bytes"
@@ -559,7 +561,7 @@ class TestGenerateVideoClip:
     @patch('modules.video_generator.generator.cost_tracker')
     @patch('modules.video_generator.generator.get_video_duration')
     @patch('modules.video_generator.generator.download_video_from_url')
-    @patch('modules.video_generator.generator.replicate')
+    @patch('modules.video_generator.generator.create_replicate_client')
     async def test_generate_video_clip_list_output(
         self,
         mock_replicate,
@@ -580,7 +582,7 @@ class TestGenerateVideoClip:
         mock_prediction.metrics = {}
         
         # Mock Replicate API
-        mock_replicate.predictions.create.return_value = mock_prediction
+        mock_replicate.return_value.predictions.create.return_value = mock_prediction
         
         # Mock video download
         mock_download.return_value = b"video bytes"
@@ -611,7 +613,7 @@ class TestGenerateVideoClip:
         mock_download.assert_called_once_with("https://replicate.com/video1.mp4")
     
     @pytest.mark.asyncio
-    @patch('modules.video_generator.generator.replicate')
+    @patch('modules.video_generator.generator.create_replicate_client')
     async def test_generate_video_clip_unexpected_output_format(
         self,
         mock_replicate,
@@ -627,7 +629,7 @@ class TestGenerateVideoClip:
         mock_prediction.reload = Mock()
         
         # Mock Replicate API
-        mock_replicate.predictions.create.return_value = mock_prediction
+        mock_replicate.return_value.predictions.create.return_value = mock_prediction
         
         with pytest.raises(GenerationError, match="Unexpected output format"):
             await generate_video_clip(
@@ -646,16 +648,14 @@ class TestBufferCalculation:
     @pytest.mark.asyncio
     @patch('modules.video_generator.generator.get_latest_version_hash')
     @patch('modules.video_generator.generator.client')
-    @patch('modules.video_generator.generator.download_video_from_url')
+    @patch('modules.video_generator.generator.postprocess_clip')
     @patch('modules.video_generator.generator.StorageClient')
-    @patch('modules.video_generator.generator.get_video_duration')
     @patch('modules.video_generator.generator.get_duration_buffer_multiplier')
     async def test_buffer_calculation_kling_discrete_maximum(
         self,
         mock_buffer_multiplier,
-        mock_get_duration,
         mock_storage,
-        mock_download,
+        mock_postprocess,
         mock_client,
         mock_get_latest_hash,
         sample_job_id
@@ -686,8 +686,7 @@ class TestBufferCalculation:
         mock_client.predictions.create.return_value = mock_prediction
         
         # Mock other dependencies
-        mock_download.return_value = b"fake video"
-        mock_get_duration.return_value = 10.0
+        mock_postprocess.return_value = ProcessedClip(video_path=Path("/tmp/clip.mp4"), duration=10.0)
         mock_storage_instance = AsyncMock()
         mock_storage_instance.upload_file = AsyncMock(return_value="https://storage.com/video.mp4")
         mock_storage_instance.delete_file = AsyncMock()
@@ -716,16 +715,14 @@ class TestBufferCalculation:
     @pytest.mark.asyncio
     @patch('modules.video_generator.generator.get_latest_version_hash')
     @patch('modules.video_generator.generator.client')
-    @patch('modules.video_generator.generator.download_video_from_url')
+    @patch('modules.video_generator.generator.postprocess_clip')
     @patch('modules.video_generator.generator.StorageClient')
-    @patch('modules.video_generator.generator.get_video_duration')
     @patch('modules.video_generator.generator.get_duration_buffer_multiplier')
     async def test_buffer_calculation_kling_discrete_no_buffer(
         self,
         mock_buffer_multiplier,
-        mock_get_duration,
         mock_storage,
-        mock_download,
+        mock_postprocess,
         mock_client,
         mock_get_latest_hash,
         sample_job_id
@@ -755,8 +752,7 @@ class TestBufferCalculation:
         mock_client.predictions.create.return_value = mock_prediction
         
         # Mock other dependencies
-        mock_download.return_value = b"fake video"
-        mock_get_duration.return_value = 5.0
+        mock_postprocess.return_value = ProcessedClip(video_path=Path("/tmp/clip.mp4"), duration=5.0)
         mock_storage_instance = AsyncMock()
         mock_storage_instance.upload_file = AsyncMock(return_value="https://storage.com/video.mp4")
         mock_storage_instance.delete_file = AsyncMock()
@@ -785,16 +781,14 @@ class TestBufferCalculation:
     @pytest.mark.asyncio
     @patch('modules.video_generator.generator.get_latest_version_hash')
     @patch('modules.video_generator.generator.client')
-    @patch('modules.video_generator.generator.download_video_from_url')
+    @patch('modules.video_generator.generator.postprocess_clip')
     @patch('modules.video_generator.generator.StorageClient')
-    @patch('modules.video_generator.generator.get_video_duration')
     @patch('modules.video_generator.generator.get_duration_buffer_multiplier')
     async def test_buffer_calculation_veo_continuous_percentage(
         self,
         mock_buffer_multiplier,
-        mock_get_duration,
         mock_storage,
-        mock_download,
+        mock_postprocess,
         mock_client,
         mock_get_latest_hash,
         sample_job_id
@@ -825,8 +819,7 @@ class TestBufferCalculation:
         mock_client.predictions.create.return_value = mock_prediction
         
         # Mock other dependencies
-        mock_download.return_value = b"fake video"
-        mock_get_duration.return_value = 5.0
+        mock_postprocess.return_value = ProcessedClip(video_path=Path("/tmp/clip.mp4"), duration=5.0)
         mock_storage_instance = AsyncMock()
         mock_storage_instance.upload_file = AsyncMock(return_value="https://storage.com/video.mp4")
         mock_storage_instance.delete_file = AsyncMock()
@@ -855,16 +848,14 @@ class TestBufferCalculation:
     @pytest.mark.asyncio
     @patch('modules.video_generator.generator.get_latest_version_hash')
     @patch('modules.video_generator.generator.client')
-    @patch('modules.video_generator.generator.download_video_from_url')
+    @patch('modules.video_generator.generator.postprocess_clip')
     @patch('modules.video_generator.generator.StorageClient')
-    @patch('modules.video_generator.generator.get_video_duration')
     @patch('modules.video_generator.generator.get_duration_buffer_multiplier')
     async def test_buffer_calculation_veo_continuous_capped(
         self,
         mock_buffer_multiplier,
-        mock_get_duration,
         mock_storage,
-        mock_download,
+        mock_postprocess,
         mock_client,
         mock_get_latest_hash,
         sample_job_id
@@ -894,8 +885,7 @@ class TestBufferCalculation:
         mock_client.predictions.create.return_value = mock_prediction
         
         # Mock other dependencies
-        mock_download.return_value = b"fake video"
-        mock_get_duration.return_value = 10.0
+        mock_postprocess.return_value = ProcessedClip(video_path=Path("/tmp/clip.mp4"), duration=10.0)
         mock_storage_instance = AsyncMock()
         mock_storage_instance.upload_file = AsyncMock(return_value="https://storage.com/video.mp4")
         mock_storage_instance.delete_file = AsyncMock()
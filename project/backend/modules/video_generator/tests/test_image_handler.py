@@ -2,7 +2,6 @@
 Unit tests for video_generator.image_handler module.
 """
 import pytest
-import io
 from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import UUID
 from modules.video_generator.image_handler import (
@@ -12,6 +11,14 @@ from modules.video_generator.image_handler import (
 from shared.errors import RetryableError
 
 
+@pytest.fixture(autouse=True)
+def mock_signed_url():
+    """Signed URLs come from the shared signed URL service (tested in shared/tests)."""
+    with patch("modules.video_generator.image_handler.get_signed_url", new_callable=AsyncMock) as mock_get_signed_url:
+        mock_get_signed_url.return_value = "https://project.supabase.co/storage/v1/object/sign/bucket/image.jpg?token=signed"
+        yield mock_get_signed_url
+
+
 class TestParseSupabaseUrl:
     """Tests for parse_supabase_url() function."""
     
@@ -60,74 +67,72 @@ class TestDownloadAndUploadImage:
     """Tests for download_and_upload_image() function."""
     
     @pytest.mark.asyncio
-    async def test_successful_download_and_signed_url(self):
-        """Test successful download and signed URL generation."""
+    async def test_signed_url_without_download(self, mock_signed_url):
+        """Test the original object is signed through the shared cache without downloading it."""
         job_id = UUID("12345678-1234-1234-1234-123456789012")
         image_url = "https://project.supabase.co/storage/v1/object/public/bucket/image.jpg"
-        test_bytes = b"fake image data"
-        signed_url = "https://project.supabase.co/storage/v1/object/sign/bucket/image.jpg?token=signed"
         
         with patch("modules.video_generator.image_handler.StorageClient") as mock_storage_class:
             mock_storage = AsyncMock()
-            mock_storage.download_file = AsyncMock(return_value=test_bytes)
-            mock_storage.get_signed_url = AsyncMock(return_value=signed_url)
             mock_storage_class.return_value = mock_storage
             
             result = await download_and_upload_image(image_url, job_id)
             
-            assert result == signed_url
-            assert isinstance(result, str)
-            mock_storage.download_file.assert_called_once_with("bucket", "image.jpg")
-            mock_storage.get_signed_url.assert_called_once_with("bucket", "image.jpg", expires_in=3600)
+            assert result == mock_signed_url.return_value
+            mock_storage.download_file.assert_not_called()
+            mock_signed_url.assert_awaited_once_with("bucket", "image.jpg", expires_in=3600, storage=mock_storage)
     
     @pytest.mark.asyncio
-    async def test_signed_url_failure_fallback_to_file_object(self):
-        """Test fallback to file object when signed URL generation fails."""
+    async def test_signed_url_failure_falls_back_to_temp_upload(self, mock_signed_url):
+        """Test fallback downloads the image and signs a temporary copy."""
         job_id = UUID("12345678-1234-1234-1234-123456789012")
         image_url = "https://project.supabase.co/storage/v1/object/public/bucket/image.jpg"
         test_bytes = b"fake image data"
+        temp_signed_url = "https://project.supabase.co/storage/v1/object/sign/reference-images/temp/x.jpg?token=t"
         
         with patch("modules.video_generator.image_handler.StorageClient") as mock_storage_class:
             mock_storage = AsyncMock()
             mock_storage.download_file = AsyncMock(return_value=test_bytes)
-            mock_storage.get_signed_url = AsyncMock(side_effect=Exception("Signed URL failed"))
+            mock_storage.get_signed_url = AsyncMock(return_value=temp_signed_url)
+            mock_signed_url.side_effect = RetryableError("Signed URL failed")
             mock_storage_class.return_value = mock_storage
             
             result = await download_and_upload_image(image_url, job_id)
             
-            assert isinstance(result, io.BytesIO)
-            assert result.read() == test_bytes
-            assert result.name == "image.jpg"
-            mock_storage.download_file.assert_called_once()
-            mock_storage.get_signed_url.assert_called_once()
+            assert result == temp_signed_url
+            mock_storage.download_file.assert_called_once_with("bucket", "image.jpg")
+            upload_kwargs = mock_storage.upload_file.call_args.kwargs
+            assert upload_kwargs["bucket"] == "reference-images"
+            assert upload_kwargs["path"].startswith(f"temp/{job_id}/")
+            assert upload_kwargs["file_data"] == test_bytes
     
     @pytest.mark.asyncio
-    async def test_download_failure_returns_none(self):
-        """Test that download failure returns None after retries."""
+    async def test_fallback_download_retryable_error_is_re_raised(self, mock_signed_url):
+        """Test that RetryableError from the fallback download is re-raised for the decorator."""
         job_id = UUID("12345678-1234-1234-1234-123456789012")
         image_url = "https://project.supabase.co/storage/v1/object/public/bucket/image.jpg"
         
         with patch("modules.video_generator.image_handler.StorageClient") as mock_storage_class:
             mock_storage = AsyncMock()
-            # Simulate retryable error that eventually fails
-            mock_storage.download_file = AsyncMock(side_effect=RetryableError("Download failed"))
+            mock_signed_url.side_effect = Exception("Signed URL failed")
+            mock_storage.download_file = AsyncMock(side_effect=RetryableError("Network error"))
             mock_storage_class.return_value = mock_storage
             
             # The retry decorator will retry 3 times, then raise
-            # We need to catch the final exception
             with pytest.raises(RetryableError):
                 await download_and_upload_image(image_url, job_id)
     
     @pytest.mark.asyncio
-    async def test_non_retryable_error_returns_none(self):
-        """Test non-retryable error returns None."""
+    async def test_temp_upload_failure_returns_none(self, mock_signed_url):
+        """Test that a failed temporary upload returns None (text-only generation)."""
         job_id = UUID("12345678-1234-1234-1234-123456789012")
         image_url = "https://project.supabase.co/storage/v1/object/public/bucket/image.jpg"
         
         with patch("modules.video_generator.image_handler.StorageClient") as mock_storage_class:
             mock_storage = AsyncMock()
-            # Non-retryable error (not RetryableError)
-            mock_storage.download_file = AsyncMock(side_effect=ValueError("Invalid input"))
+            mock_signed_url.side_effect = Exception("Signed URL failed")
+            mock_storage.download_file = AsyncMock(return_value=b"fake image data")
+            mock_storage.upload_file = AsyncMock(side_effect=ValueError("Upload rejected"))
             mock_storage_class.return_value = mock_storage
             
             result = await download_and_upload_image(image_url, job_id)
@@ -135,59 +140,30 @@ class TestDownloadAndUploadImage:
             assert result is None
     
     @pytest.mark.asyncio
-    async def test_retryable_error_is_re_raised(self):
-        """Test that RetryableError is re-raised for decorator to handle."""
+    async def test_invalid_url_returns_none(self):
+        """Test non-Supabase URLs return None."""
         job_id = UUID("12345678-1234-1234-1234-123456789012")
-        image_url = "https://project.supabase.co/storage/v1/object/public/bucket/image.jpg"
         
         with patch("modules.video_generator.image_handler.StorageClient") as mock_storage_class:
-            mock_storage = AsyncMock()
-            mock_storage.download_file = AsyncMock(side_effect=RetryableError("Network error"))
-            mock_storage_class.return_value = mock_storage
+            result = await download_and_upload_image("https://invalid-url.com/file.jpg", job_id)
             
-            # RetryableError should be re-raised (decorator handles retry)
-            with pytest.raises(RetryableError):
-                await download_and_upload_image(image_url, job_id)
-    
-    @pytest.mark.asyncio
-    async def test_file_object_has_name_attribute(self):
-        """Test that returned file object has name attribute set."""
-        job_id = UUID("12345678-1234-1234-1234-123456789012")
-        image_url = "https://project.supabase.co/storage/v1/object/public/bucket/image.jpg"
-        test_bytes = b"fake image data"
-        
-        with patch("modules.video_generator.image_handler.StorageClient") as mock_storage_class:
-            mock_storage = AsyncMock()
-            mock_storage.download_file = AsyncMock(return_value=test_bytes)
-            mock_storage.get_signed_url = AsyncMock(side_effect=Exception("Failed"))
-            mock_storage_class.return_value = mock_storage
-            
-            result = await download_and_upload_image(image_url, job_id)
-            
-            assert isinstance(result, io.BytesIO)
-            assert hasattr(result, "name")
-            assert result.name == "image.jpg"
+            assert result is None
+            mock_storage_class.assert_not_called()
     
     @pytest.mark.asyncio
     async def test_logging_includes_job_id(self):
         """Test that logging includes job_id in extra context."""
         job_id = UUID("12345678-1234-1234-1234-123456789012")
         image_url = "https://project.supabase.co/storage/v1/object/public/bucket/image.jpg"
-        test_bytes = b"fake image data"
-        signed_url = "https://project.supabase.co/storage/v1/object/sign/bucket/image.jpg?token=signed"
         
         with patch("modules.video_generator.image_handler.StorageClient") as mock_storage_class, \
              patch("modules.video_generator.image_handler.logger") as mock_logger:
-            mock_storage = AsyncMock()
-            mock_storage.download_file = AsyncMock(return_value=test_bytes)
-            mock_storage.get_signed_url = AsyncMock(return_value=signed_url)
-            mock_storage_class.return_value = mock_storage
+            mock_storage_class.return_value = AsyncMock()
             
             await download_and_upload_image(image_url, job_id)
             
             # Verify logger was called with job_id in extra
             assert mock_logger.info.called
-            # Check that at least one call has job_id in extra
             calls_with_job_id = [
                 call for call in mock_logger.info.call_args_list
                 if call.kwargs.get("extra", {}).get("job_id") == str(job_id)
@@ -198,8 +174,6 @@ class TestDownloadAndUploadImage:
     async def test_various_supabase_url_formats(self):
         """Test function works with various Supabase URL formats."""
         job_id = UUID("12345678-1234-1234-1234-123456789012")
-        test_bytes = b"fake image data"
-        signed_url = "https://project.supabase.co/storage/v1/object/sign/bucket/image.jpg?token=signed"
         
         test_urls = [
             "https://project.supabase.co/storage/v1/object/public/bucket/image.jpg",
@@ -209,11 +183,7 @@ class TestDownloadAndUploadImage:
         
         for url in test_urls:
             with patch("modules.video_generator.image_handler.StorageClient") as mock_storage_class:
-                mock_storage = AsyncMock()
-                mock_storage.download_file = AsyncMock(return_value=test_bytes)
-                mock_storage.get_signed_url = AsyncMock(return_value=signed_url)
-                mock_storage_class.return_value = mock_storage
+                mock_storage_class.return_value = AsyncMock()
                 
                 result = await download_and_upload_image(url, job_id)
                 assert result is not None
-
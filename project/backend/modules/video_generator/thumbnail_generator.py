@@ -135,100 +135,120 @@ async def generate_clip_thumbnail(
                 )
                 return None
             
-            # Upload thumbnail to Supabase Storage
-            thumbnail_bytes = thumbnail_path.read_bytes()
-            thumbnail_path_storage = f"{job_id}/clip_{clip_index}_thumbnail.jpg"
+            return await store_clip_thumbnail(thumbnail_path.read_bytes(), job_id, clip_index)
             
+    except Exception as e:
+        logger.warning(
+            f"Thumbnail generation failed: {e}",
+            extra={"job_id": str(job_id), "clip_index": clip_index},
+            exc_info=True
+        )
+        return None  # Non-blocking failure
+
+
+async def store_clip_thumbnail(
+    thumbnail_bytes: bytes,
+    job_id: UUID,
+    clip_index: int
+) -> Optional[str]:
+    """
+    Upload a clip thumbnail and record it in clip_thumbnails.
+    
+    Used directly by the video generator, which extracts the thumbnail in the
+    same FFmpeg pass that post-processes the clip.
+    
+    Args:
+        thumbnail_bytes: JPEG thumbnail bytes
+        job_id: Job ID for logging and storage path
+        clip_index: Index of the clip (for storage path)
+        
+    Returns:
+        Thumbnail URL if successful, None if upload or database write fails
+    """
+    storage = StorageClient()
+    thumbnail_path_storage = f"{job_id}/clip_{clip_index}_thumbnail.jpg"
+
+    logger.debug(
+        f"Uploading thumbnail to storage",
+        extra={"job_id": str(job_id), "clip_index": clip_index, "size": len(thumbnail_bytes)}
+    )
+
+    try:
+        thumbnail_url = await storage.upload_file(
+            bucket="clip-thumbnails",
+            path=thumbnail_path_storage,
+            file_data=thumbnail_bytes,
+            content_type="image/jpeg",
+            overwrite=True  # Allow overwriting existing thumbnails
+        )
+    except Exception as e:
+        # Check if it's a 409 duplicate error - if so, try to get the existing file URL
+        error_str = str(e).lower()
+        if "409" in error_str or "duplicate" in error_str or "already exists" in error_str:
             logger.debug(
-                f"Uploading thumbnail to storage",
-                extra={"job_id": str(job_id), "clip_index": clip_index, "size": len(thumbnail_bytes)}
+                f"Thumbnail already exists, getting existing URL",
+                extra={"job_id": str(job_id), "clip_index": clip_index}
             )
-            
             try:
-                thumbnail_url = await storage.upload_file(
+                # Try to get the signed URL for the existing file
+                thumbnail_url = await storage.get_signed_url(
                     bucket="clip-thumbnails",
                     path=thumbnail_path_storage,
-                    file_data=thumbnail_bytes,
-                    content_type="image/jpeg",
-                    overwrite=True  # Allow overwriting existing thumbnails
+                    expires_in=31536000  # 1 year
                 )
-            except Exception as e:
-                # Check if it's a 409 duplicate error - if so, try to get the existing file URL
-                error_str = str(e).lower()
-                if "409" in error_str or "duplicate" in error_str or "already exists" in error_str:
-                    logger.debug(
-                        f"Thumbnail already exists, getting existing URL",
-                        extra={"job_id": str(job_id), "clip_index": clip_index}
-                    )
-                    try:
-                        # Try to get the signed URL for the existing file
-                        thumbnail_url = await storage.get_signed_url(
-                            bucket="clip-thumbnails",
-                            path=thumbnail_path_storage,
-                            expires_in=31536000  # 1 year
-                        )
-                        if thumbnail_url:
-                            return thumbnail_url
-                    except Exception as url_error:
-                        logger.warning(
-                            f"Failed to get existing thumbnail URL: {url_error}",
-                            extra={"job_id": str(job_id), "clip_index": clip_index}
-                        )
-                
+                if thumbnail_url:
+                    return thumbnail_url
+            except Exception as url_error:
                 logger.warning(
-                    f"Failed to upload thumbnail: {e}",
+                    f"Failed to get existing thumbnail URL: {url_error}",
                     extra={"job_id": str(job_id), "clip_index": clip_index}
                 )
-                return None
-            
-            # Store in database (handle duplicate key errors with UPSERT)
-            db = DatabaseClient()
+
+        logger.warning(
+            f"Failed to upload thumbnail: {e}",
+            extra={"job_id": str(job_id), "clip_index": clip_index}
+        )
+        return None
+
+    # Store in database (handle duplicate key errors with UPSERT)
+    db = DatabaseClient()
+    try:
+        # Try INSERT first
+        await db.table("clip_thumbnails").insert({
+            "job_id": str(job_id),
+            "clip_index": clip_index,
+            "thumbnail_url": thumbnail_url
+        }).execute()
+
+        logger.info(
+            f"Thumbnail generated and stored successfully",
+            extra={"job_id": str(job_id), "clip_index": clip_index, "thumbnail_url": thumbnail_url}
+        )
+
+    except Exception as e:
+        # Handle duplicate key (UPDATE instead)
+        error_str = str(e).lower()
+        if "duplicate" in error_str or "unique" in error_str or "violates unique constraint" in error_str:
             try:
-                # Try INSERT first
-                await db.table("clip_thumbnails").insert({
-                    "job_id": str(job_id),
-                    "clip_index": clip_index,
+                await db.table("clip_thumbnails").update({
                     "thumbnail_url": thumbnail_url
-                }).execute()
-                
+                }).eq("job_id", str(job_id)).eq("clip_index", clip_index).execute()
+
                 logger.info(
-                    f"Thumbnail generated and stored successfully",
+                    f"Thumbnail updated in database",
                     extra={"job_id": str(job_id), "clip_index": clip_index, "thumbnail_url": thumbnail_url}
                 )
-                
-            except Exception as e:
-                # Handle duplicate key (UPDATE instead)
-                error_str = str(e).lower()
-                if "duplicate" in error_str or "unique" in error_str or "violates unique constraint" in error_str:
-                    try:
-                        await db.table("clip_thumbnails").update({
-                            "thumbnail_url": thumbnail_url
-                        }).eq("job_id", str(job_id)).eq("clip_index", clip_index).execute()
-                        
-                        logger.info(
-                            f"Thumbnail updated in database",
-                            extra={"job_id": str(job_id), "clip_index": clip_index, "thumbnail_url": thumbnail_url}
-                        )
-                    except Exception as update_error:
-                        logger.warning(
-                            f"Failed to update thumbnail in database: {update_error}",
-                            extra={"job_id": str(job_id), "clip_index": clip_index}
-                        )
-                        return None
-                else:
-                    logger.warning(
-                        f"Failed to store thumbnail in database: {e}",
-                        extra={"job_id": str(job_id), "clip_index": clip_index}
-                    )
-                    return None
-            
-            return thumbnail_url
-            
-    except Exception as e:
-        logger.warning(
-            f"Thumbnail generation failed: {e}",
-            extra={"job_id": str(job_id), "clip_index": clip_index},
-            exc_info=True
-        )
-        return None  # Non-blocking failure
+            except Exception as update_error:
+                logger.warning(
+                    f"Failed to update thumbnail in database: {update_error}",
+                    extra={"job_id": str(job_id), "clip_index": clip_index}
+                )
+                return None
+        else:
+            logger.warning(
+                f"Failed to store thumbnail in database: {e}",
+                extra={"job_id": str(job_id), "clip_index": clip_index}
+            )
+            return None
 
+    return thumbnail_url
@@ -3,7 +3,8 @@
 Monitor job queue and worker status.
 
 Shows:
-- Queue size (jobs waiting)
+- Queue size (jobs waiting, per lane)
+- Delayed retries
 - Active jobs (currently processing)
 - Recent job activity
 """
@@ -17,45 +18,52 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from shared.redis_client import RedisClient
 from shared.database import DatabaseClient
 from shared.logging import get_logger
+from api_gateway.services.queue_service import get_queue_contents
 
 logger = get_logger(__name__)
-redis_client = RedisClient()
 db_client = DatabaseClient()
 
-QUEUE_NAME = "video_generation"
+
+def _job_id(payload: bytes) -> str:
+    """Get the job ID from a raw queue payload."""
+    try:
+        return json.loads(payload).get("job_id", "unknown")
+    except ValueError:
+        return "invalid payload"
 
 
 async def get_queue_status():
     """Get current queue status."""
-    queue_key = f"{QUEUE_NAME}:queue"
-    processing_key = f"{QUEUE_NAME}:processing"
-    
     try:
-        queue_size = await redis_client.client.llen(queue_key)
-        processing_jobs = await redis_client.client.smembers(processing_key)
-        processing_count = len(processing_jobs) if processing_jobs else 0
-        
-        # Get job IDs from processing set
-        processing_job_ids = []
-        if processing_jobs:
-            for job_id_bytes in processing_jobs:
-                if isinstance(job_id_bytes, bytes):
-                    processing_job_ids.append(job_id_bytes.decode('utf-8'))
-                else:
-                    processing_job_ids.append(str(job_id_bytes))
+        contents = await get_queue_contents()
+        lane_sizes = {
+            priority_class: sum(len(jobs) for jobs in users.values())
+            for priority_class, users in contents["lanes"].items()
+        }
+        processing_job_ids = [
+            _job_id(payload)
+            for payloads in contents["processing"].values()
+            for payload in payloads
+        ]
         
         return {
-            "queue_size": queue_size,
-            "processing_count": processing_count,
+            "queue_size": len(contents["recovery"]) + sum(lane_sizes.values()),
+            "recovery_size": len(contents["recovery"]),
+            "legacy_size": len(contents["legacy"]),
+            "lane_sizes": lane_sizes,
+            "delayed_count": len(contents["delayed"]),
+            "processing_count": len(processing_job_ids),
             "processing_jobs": processing_job_ids
         }
     except Exception as e:
         logger.error("Failed to get queue status", exc_info=e)
         return {
             "queue_size": 0,
+            "recovery_size": 0,
+            "lane_sizes": {},
+            "delayed_count": 0,
             "processing_count": 0,
             "processing_jobs": []
         }
@@ -82,6 +90,10 @@ async def main():
     queue_status = await get_queue_status()
     print(f"📊 Queue Status:")
     print(f"   Queue Size (waiting): {queue_status['queue_size']}")
+    print(f"     Recovery lane: {queue_status['recovery_size']}")
+    for priority_class, size in queue_status['lane_sizes'].items():
+        print(f"     {priority_class}: {size}")
+    print(f"   Delayed retries: {queue_status['delayed_count']}")
     print(f"   Processing: {queue_status['processing_count']}")
     
     if queue_status['processing_jobs']:
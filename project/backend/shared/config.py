@@ -5,7 +5,7 @@ Centralized environment variable management and validation.
 """
 
 import os
-from typing import Literal, Optional
+from typing import Dict, Literal, Optional
 from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from shared.errors import ConfigError
@@ -26,6 +26,13 @@ class Settings(BaseSettings):
     supabase_service_key: str
     supabase_anon_key: str
     
+    # Shared Supabase HTTP pool (one per process, used by Storage and PostgREST calls)
+    # SUPABASE_MAX_CONNECTIONS also sizes the dedicated executor for blocking Supabase calls
+    supabase_max_connections: int = 32
+    supabase_max_keepalive_connections: int = 16
+    supabase_keepalive_expiry: float = 30.0  # Seconds an idle connection stays open
+    supabase_http_timeout: float = 120.0  # Per-operation read/write timeout in seconds
+    
     # Redis configuration
     redis_url: str
     
@@ -59,12 +66,35 @@ class Settings(BaseSettings):
     prompt_generator_use_llm: bool = True
     prompt_generator_llm_model: Literal["gpt-4o", "claude-3-5-sonnet"] = "gpt-4o"
     prompt_generator_batch_size: int = 15  # Number of clips per LLM batch
+    # PROMPT_GENERATOR_MAX_CONCURRENT_BATCHES: LLM batches in flight at once per job
+    # (all OpenAI calls also share the account-wide rate limiter below)
+    prompt_generator_max_concurrent_batches: int = 4
+    
+    # OpenAI rate limiter (shared by all workers through Redis)
+    # OPENAI_RATE_LIMITER_ENABLED: Gate OpenAI calls on the account's per-model limits
+    openai_rate_limiter_enabled: bool = True
+    # OPENAI_REQUESTS_PER_MINUTE / OPENAI_TOKENS_PER_MINUTE: Per-model limits of the OpenAI account tier
+    openai_requests_per_minute: int = 500
+    openai_tokens_per_minute: int = 300000
+    
+    # LLM response cache (shared.llm_cache)
+    # LLM_CACHE_BACKEND: "redis" (shared by all workers), "disk" (LLM_CACHE_DIR, per machine) or "none"
+    llm_cache_backend: Literal["redis", "disk", "none"] = "redis"
+    llm_cache_dir: str = "/tmp/videogen-llm-cache"
+    # LLM_CACHE_TTL_SECONDS: Default entry lifetime (call sites may set their own)
+    llm_cache_ttl_seconds: int = 604800  # 7 days
+    # LLM_CACHE_DETERMINISTIC: Send temperature 0 and a request-derived seed so repeated runs match
+    llm_cache_deterministic: bool = False
 
     # Reference Generator configuration
     # USE_REFERENCE_IMAGES: Enable/disable reference images (default: true for backward compatibility)
     # Set to false to use text-only mode for video generation
     use_reference_images: bool = True
 
+    # REFERENCE_PREFETCH_ENABLED: Start reference images for characters and scenes while the
+    # scene plan is still streaming (images whose final prompt differs are regenerated)
+    reference_prefetch_enabled: bool = True
+
     # REFERENCE_VARIATIONS_PER_SCENE: Number of reference image variations to generate per scene
     # Default: 2 (wide shot + medium shot from different angle)
     # Variations provide different camera angles/perspectives of the same scene
@@ -89,6 +119,35 @@ class Settings(BaseSettings):
     # Options: "kling_v21" (default), "kling_v25_turbo", "hailuo_23", "wan_25_i2v", "veo_31"
     video_model: str = "kling_v21"
     
+    # Replicate completion configuration
+    # REPLICATE_WEBHOOK_URL: Public URL of POST /api/v1/webhooks/replicate. When set together with
+    # REPLICATE_WEBHOOK_SECRET, predictions report completion via webhook and polling only runs as a
+    # slow fallback
+    replicate_webhook_url: Optional[str] = None
+    # REPLICATE_WEBHOOK_SECRET: Signing secret ("whsec_...") used to verify webhook callbacks (required for webhooks)
+    replicate_webhook_secret: Optional[str] = None
+    # REPLICATE_BASE_URL: Override the Replicate API base URL (e.g. a local stub server in tests)
+    replicate_base_url: Optional[str] = None
+    # Batched fallback polling interval in seconds, without / with webhooks configured
+    replicate_poll_interval: float = 3.0
+    replicate_webhook_fallback_poll_interval: float = 20.0
+    
+    # Replicate concurrency governor (shared by all workers through Redis)
+    # REPLICATE_GOVERNOR_ENABLED: Gate prediction creation on account-wide capacity
+    replicate_governor_enabled: bool = True
+    # REPLICATE_PREDICTIONS_PER_MINUTE: Token bucket rate for creating predictions (account-wide)
+    replicate_predictions_per_minute: int = 600
+    # REPLICATE_MODEL_CONCURRENCY: Maximum in-flight predictions per model family (JSON object).
+    # Limits adapt below these values after 429 responses and recover as predictions succeed
+    replicate_model_concurrency: Dict[str, int] = {
+        "kling": 6,
+        "veo": 3,
+        "flux": 8,
+        "sdxl": 8,
+        "pixverse": 4,
+        "default": 4,
+    }
+    
     # Server timeout configuration
     # SERVER_TIMEOUT: Request timeout in seconds for long-running endpoints (default: 300s = 5 minutes)
     # Increase this for jobs with many clips (e.g., 46 clips may need 300s+)
@@ -102,6 +102,10 @@ class CostTracker:
                         "total_cost": float(new_total)
                     }).eq("id", str(job_id)).execute()
                     
+                    # Keep the materialized job status document current (lazy import, as below)
+                    from api_gateway.services.job_status_store import patch_job_status
+                    await patch_job_status(str(job_id), {"total_cost": float(new_total)})
+                    
                     # Publish cost_update SSE event immediately for live cost updates
                     # Use lazy import to avoid circular dependency (api_gateway imports shared)
                     try:
@@ -149,6 +153,80 @@ class CostTracker:
                 )
                 raise RetryableError(f"Failed to track cost: {str(e)}") from e
     
+    async def track_cost_saved(
+        self,
+        job_id: UUID,
+        stage_name: str,
+        api_name: str,
+        cost_saved: Decimal
+    ) -> None:
+        """
+        Record an API call that was answered from a cache instead.
+        
+        Inserts a zero-cost job_costs row ("<api_name>:cached") carrying the
+        cost the call would have had, so spend and savings can be reported per
+        job. Never raises: losing the record must not fail the cached call.
+        
+        Args:
+            job_id: Job ID
+            stage_name: Pipeline stage name
+            api_name: API name of the avoided call (e.g., "gpt-4o")
+            cost_saved: Cost of the avoided call in USD
+        """
+        cost_record = {
+            "job_id": str(job_id),
+            "stage_name": stage_name,
+            "api_name": f"{api_name}:cached"[:50],
+            "cost": 0.0,
+            "cost_saved": float(cost_saved),
+            "timestamp": "now()"
+        }
+        try:
+            await db.table("job_costs").insert(cost_record).execute()
+        except Exception as e:
+            logger.warning(
+                f"Failed to record cost saved for job {job_id}: {str(e)}",
+                extra={"job_id": str(job_id), "stage_name": stage_name, "api_name": api_name}
+            )
+            return
+        
+        logger.info(
+            f"Tracked cost saved for job {job_id}",
+            extra={
+                "job_id": str(job_id),
+                "stage_name": stage_name,
+                "api_name": api_name,
+                "cost_saved": float(cost_saved)
+            }
+        )
+    
+    async def get_total_cost_saved(self, job_id: UUID) -> Decimal:
+        """
+        Get total cost saved by cached API calls for a job.
+        
+        Args:
+            job_id: Job ID
+            
+        Returns:
+            Total cost saved in USD
+            
+        Raises:
+            RetryableError: If database operation fails
+        """
+        try:
+            result = await db.table("job_costs").select("cost_saved").eq("job_id", str(job_id)).execute()
+            return sum(
+                (Decimal(str(row.get("cost_saved") or 0)) for row in (result.data or [])),
+                Decimal("0.00")
+            )
+            
+        except Exception as e:
+            logger.error(
+                f"Failed to get total cost saved for job {job_id}: {str(e)}",
+                extra={"job_id": str(job_id), "error": str(e)}
+            )
+            raise RetryableError(f"Failed to get total cost saved: {str(e)}") from e
+    
     async def get_total_cost(self, job_id: UUID) -> Decimal:
         """
         Get total cost for a job.
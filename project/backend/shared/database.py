@@ -6,9 +6,9 @@ Supabase PostgreSQL client with connection pooling and query utilities.
 
 import asyncio
 from typing import Optional, Any, Callable
-from supabase import create_client, Client
-from shared.config import settings
+from supabase import Client
 from shared.errors import RetryableError, ConfigError
+from shared.supabase_pool import get_supabase_client, run_in_pool
 
 
 class DatabaseClient:
@@ -17,10 +17,8 @@ class DatabaseClient:
     def __init__(self):
         """Initialize database client."""
         try:
-            self.client: Client = create_client(
-                settings.supabase_url,
-                settings.supabase_service_key
-            )
+            # Process-wide client: constructing DatabaseClient is cheap and shares pooled connections
+            self.client: Client = get_supabase_client()
         except Exception as e:
             raise ConfigError(f"Failed to initialize database client: {str(e)}") from e
     
@@ -41,8 +39,7 @@ class DatabaseClient:
         last_error = None
         for attempt in range(max_attempts):
             try:
-                loop = asyncio.get_event_loop()
-                return await loop.run_in_executor(None, func)
+                return await run_in_pool(func)
             except Exception as e:
                 last_error = e
                 if attempt < max_attempts - 1:
@@ -124,8 +121,7 @@ class DatabaseClient:
         return _transaction()
     
     async def close(self):
-        """Close database connections (no-op for Supabase client)."""
-        # Supabase client doesn't require explicit cleanup
+        """Close database connections (no-op: the shared client lives for the whole process)."""
         pass
 
 
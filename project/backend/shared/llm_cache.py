@@ -0,0 +1,351 @@
+"""
+LLM response cache.
+
+Content-addressed cache for OpenAI chat completions. Identical requests (same
+model, messages, temperature, response format and max_tokens) are answered
+from the cache instead of the API, so retries, test jobs re-run with
+stop_at_stage, and resubmissions of the same song and prompt skip the call's
+latency and cost. Entries live in Redis (shared by all workers) or in a local
+directory (LLM_CACHE_BACKEND), with a TTL per call site.
+
+Only complete responses (finish_reason "stop") are stored, and callers discard
+responses they couldn't use, so a retry after a bad response calls the API
+again. With LLM_CACHE_DETERMINISTIC, requests are sent with temperature 0 and
+a seed derived from the request, so a miss reproduces the same answer as far
+as OpenAI allows (test runs, regression comparisons).
+
+Callers can stream a miss (on_delta receives content as it is generated); a
+hit replays the whole cached content through the same callback. Misses go
+through the shared OpenAI rate limiter. Cache failures never fail the call.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from uuid import UUID
+
+from shared.config import settings
+from shared.cost_tracking import cost_tracker
+from shared.llm_rate_limiter import estimate_tokens, llm_rate_limiter
+from shared.logging import get_logger
+from shared.redis_client import redis_client
+
+logger = get_logger("llm_cache")
+
+KEY_PREFIX = "videogen:llm_cache:"
+
+# Part of every key; bump to orphan all entries when the stored format changes
+CACHE_VERSION = 1
+
+# Request fields that determine the response
+KEY_FIELDS = ("model", "messages", "temperature", "response_format", "max_tokens", "seed")
+
+# Pricing function: (model, input_tokens, output_tokens) -> cost in USD
+CostFunction = Callable[[str, int, int], Decimal]
+
+# Receives response content as it streams in
+DeltaCallback = Callable[[str], Awaitable[None]]
+
+
+@dataclass
+class LLMCompletion:
+    """A chat completion's text and billed usage, from the API or the cache."""
+    content: Optional[str]
+    finish_reason: Optional[str]
+    model: str
+    input_tokens: int  # 0 when served from the cache
+    output_tokens: int  # 0 when served from the cache
+    cached: bool = False
+    key: Optional[str] = None
+
+
+def request_key(request: Dict[str, Any]) -> str:
+    """
+    Cache key of a chat.completions.create request.
+
+    Args:
+        request: Request arguments (only KEY_FIELDS are hashed)
+
+    Returns:
+        SHA-256 hex digest
+    """
+    fields = {name: request.get(name) for name in KEY_FIELDS}
+    payload = json.dumps({"version": CACHE_VERSION, **fields}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class RedisCacheBackend:
+    """Entries as JSON strings in Redis (shared by all workers)."""
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        value = await redis_client.client.get(f"{KEY_PREFIX}{key}")
+        return json.loads(value) if value else None
+
+    async def set(self, key: str, entry: Dict[str, Any], ttl: int) -> None:
+        await redis_client.client.set(f"{KEY_PREFIX}{key}", json.dumps(entry).encode("utf-8"), ex=ttl)
+
+    async def delete(self, key: str) -> None:
+        await redis_client.client.delete(f"{KEY_PREFIX}{key}")
+
+
+class DiskCacheBackend:
+    """Entries as JSON files under a local directory (one machine, survives restarts)."""
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def _read(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        try:
+            record = json.loads(path.read_text())
+        except FileNotFoundError:
+            return None
+        if record.get("expires_at", 0) < time.time():
+            path.unlink(missing_ok=True)
+            return None
+        return record.get("entry")
+
+    def _write(self, key: str, entry: Dict[str, Any], ttl: int) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename, so concurrent readers never see a partial file
+        temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        temp_path.write_text(json.dumps({"expires_at": time.time() + ttl, "entry": entry}))
+        os.replace(temp_path, path)
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self._read, key)
+
+    async def set(self, key: str, entry: Dict[str, Any], ttl: int) -> None:
+        await asyncio.to_thread(self._write, key, entry, ttl)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self._path(key).unlink, missing_ok=True)
+
+
+class LLMCache:
+    """Cache-aside wrapper around chat.completions.create with hit/miss and savings accounting."""
+
+    def __init__(self, backend: Optional[Any] = None):
+        self._backend = backend
+        self._stats: Dict[str, Any] = {
+            "hits": 0, "misses": 0, "stores": 0, "discards": 0, "errors": 0, "cost_saved": Decimal("0")
+        }
+        self._stage_stats: Dict[str, Dict[str, int]] = {}
+
+    @property
+    def backend(self) -> Optional[Any]:
+        """Injected backend, else the one LLM_CACHE_BACKEND selects (None for "none")."""
+        if self._backend is not None:
+            return self._backend
+        if settings.llm_cache_backend == "redis":
+            return RedisCacheBackend()
+        if settings.llm_cache_backend == "disk":
+            return DiskCacheBackend(settings.llm_cache_dir)
+        return None
+
+    def _count(self, stage_name: str, outcome: str) -> None:
+        self._stats[outcome] += 1
+        stage = self._stage_stats.setdefault(stage_name, {"hits": 0, "misses": 0})
+        if outcome in stage:
+            stage[outcome] += 1
+
+    async def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        if self.backend is None:
+            return None
+        try:
+            return await self.backend.get(key)
+        except Exception as e:
+            self._stats["errors"] += 1
+            logger.warning(f"Failed to read LLM cache: {str(e)}")
+            # Cache failures should not fail the request
+            return None
+
+    async def _set(self, key: str, entry: Dict[str, Any], ttl: int) -> None:
+        if self.backend is None:
+            return
+        try:
+            await self.backend.set(key, entry, ttl)
+            self._stats["stores"] += 1
+        except Exception as e:
+            self._stats["errors"] += 1
+            logger.warning(f"Failed to write LLM cache: {str(e)}")
+            # Cache failures should not fail the request
+
+    async def _stream(
+        self,
+        client: Any,
+        request: Dict[str, Any],
+        on_delta: DeltaCallback
+    ) -> Tuple[Optional[str], Optional[str], Any]:
+        """Stream a completion into on_delta; returns (content, finish_reason, usage)."""
+        stream = await client.chat.completions.create(
+            **request, stream=True, stream_options={"include_usage": True}
+        )
+        parts = []
+        finish_reason = None
+        usage = None
+        async for chunk in stream:
+            # The final chunk carries usage and no choices
+            if getattr(chunk, "usage", None) is not None:
+                usage = chunk.usage
+            if not chunk.choices:
+                continue
+            choice = chunk.choices[0]
+            if choice.delta.content:
+                parts.append(choice.delta.content)
+                await on_delta(choice.delta.content)
+            if choice.finish_reason:
+                finish_reason = choice.finish_reason
+        return "".join(parts) or None, finish_reason, usage
+
+    async def complete(
+        self,
+        client: Any,
+        *,
+        stage_name: str,
+        job_id: Optional[UUID] = None,
+        cost_fn: Optional[CostFunction] = None,
+        ttl: Optional[int] = None,
+        on_delta: Optional[DeltaCallback] = None,
+        **request: Any
+    ) -> LLMCompletion:
+        """
+        Create a chat completion, answering identical requests from the cache.
+
+        Args:
+            client: AsyncOpenAI client (called on cache misses)
+            stage_name: Pipeline stage, for hit/miss and savings accounting
+            job_id: Job credited with the saved cost on a hit (optional)
+            cost_fn: Pricing function used to value a hit (savings are 0 without one)
+            ttl: Entry lifetime in seconds (default: LLM_CACHE_TTL_SECONDS)
+            on_delta: Stream the response into this callback (a hit is replayed in one piece)
+            **request: chat.completions.create arguments
+
+        Returns:
+            LLMCompletion (cached, with zero billed tokens, on a hit)
+
+        Raises:
+            Whatever chat.completions.create raises on a miss
+            RetryableError: If no OpenAI capacity became available in time
+        """
+        if settings.llm_cache_deterministic:
+            request["temperature"] = 0
+            request["seed"] = int(request_key(request)[:8], 16)
+        key = request_key(request)
+        model = request.get("model", "")
+
+        entry = await self._get(key)
+        if entry is not None:
+            cost_saved = (
+                cost_fn(entry["model"], entry["input_tokens"], entry["output_tokens"]) if cost_fn else Decimal("0")
+            )
+            self._count(stage_name, "hits")
+            self._stats["cost_saved"] += cost_saved
+            logger.info(
+                f"LLM cache hit for {stage_name}",
+                extra={
+                    "job_id": str(job_id) if job_id else None,
+                    "stage": stage_name,
+                    "model": model,
+                    "cost_saved": float(cost_saved)
+                }
+            )
+            if job_id:
+                await cost_tracker.track_cost_saved(job_id, stage_name, model, cost_saved)
+            if on_delta is not None and entry["content"]:
+                await on_delta(entry["content"])
+            return LLMCompletion(
+                content=entry["content"],
+                finish_reason=entry["finish_reason"],
+                model=entry["model"],
+                input_tokens=0,
+                output_tokens=0,
+                cached=True,
+                key=key
+            )
+
+        self._count(stage_name, "misses")
+        reserved_tokens = estimate_tokens(
+            *(str(message.get("content", "")) for message in request.get("messages", []))
+        ) + int(request.get("max_tokens") or 0)
+        async with llm_rate_limiter.slot(model, reserved_tokens, job_id=job_id) as lease:
+            if on_delta is not None:
+                content, finish_reason, usage = await self._stream(client, request, on_delta)
+            else:
+                response = await client.chat.completions.create(**request)
+                choice = response.choices[0]
+                content = choice.message.content
+                finish_reason = getattr(choice, "finish_reason", None)
+                usage = getattr(response, "usage", None)
+            input_tokens = getattr(usage, "prompt_tokens", 0) or 0
+            output_tokens = getattr(usage, "completion_tokens", 0) or 0
+            if usage is not None:
+                lease.record_usage(input_tokens + output_tokens)
+
+        completion = LLMCompletion(
+            content=content,
+            finish_reason=finish_reason,
+            model=model,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            key=key
+        )
+
+        # Truncated or empty responses are never reused
+        if completion.content and completion.finish_reason == "stop":
+            await self._set(key, {
+                "content": completion.content,
+                "finish_reason": completion.finish_reason,
+                "model": model,
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "created_at": time.time()
+            }, ttl or settings.llm_cache_ttl_seconds)
+        return completion
+
+    async def discard(self, completion: LLMCompletion) -> None:
+        """
+        Drop a completion the caller couldn't use, so a retry calls the API again.
+
+        Args:
+            completion: Completion returned by complete()
+        """
+        if completion.key is None or self.backend is None:
+            return
+        self._stats["discards"] += 1
+        try:
+            await self.backend.delete(completion.key)
+        except Exception as e:
+            self._stats["errors"] += 1
+            logger.warning(f"Failed to discard LLM cache entry: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Snapshot of the cache for health checks.
+
+        Returns:
+            Backend, hit/miss/store/discard/error counts, hit rate, cost saved
+            in USD, and hits/misses per stage (this process since start)
+        """
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "backend": settings.llm_cache_backend,
+            "hit_rate": round(self._stats["hits"] / lookups, 3) if lookups else 0.0,
+            "cost_saved": float(self._stats["cost_saved"]),
+            "stages": {stage: dict(counts) for stage, counts in self._stage_stats.items()}
+        }
+
+
+# Singleton instance
+llm_cache = LLMCache()
@@ -0,0 +1,189 @@
+"""
+OpenAI rate limiter.
+
+OpenAI enforces requests-per-minute and tokens-per-minute limits per model
+across the whole account, so concurrent LLM calls from every worker and job
+share one pair of token buckets in Redis (OPENAI_REQUESTS_PER_MINUTE,
+OPENAI_TOKENS_PER_MINUTE). A call reserves one request and its estimated
+tokens (prompt plus max_tokens, as OpenAI counts them) before it is sent,
+and unused tokens are returned once the response reports actual usage.
+
+If Redis is unavailable the limiter fails open and calls run unlimited.
+"""
+
+import asyncio
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+from uuid import UUID
+
+from shared.config import settings
+from shared.errors import RetryableError
+from shared.logging import get_logger
+from shared.redis_client import redis_client
+
+logger = get_logger("llm_rate_limiter")
+
+KEY_PREFIX = "videogen:openai:limiter:"
+
+# Rough prompt size estimate for reservations (reconciled with actual usage afterwards)
+CHARS_PER_TOKEN = 4
+# Upper bound on a single sleep while waiting for capacity (refunds can free it sooner)
+MAX_WAIT_STEP_SECONDS = 2.0
+# Give up waiting for capacity after this long (surfaced as retryable)
+ACQUIRE_TIMEOUT_SECONDS = 300.0
+# Limiter keys expire when no worker has touched them for a day
+STATE_TTL_SECONDS = 86400
+
+# KEYS: model bucket hash
+# ARGV: now, requests_per_minute, tokens_per_minute, reserved tokens, state_ttl
+# Returns {1, "0"} when granted, otherwise {0, "<seconds to wait>"}
+ACQUIRE_SCRIPT = """
+local now = tonumber(ARGV[1])
+local rpm = tonumber(ARGV[2])
+local tpm = tonumber(ARGV[3])
+local cost = math.min(tonumber(ARGV[4]), tpm)
+
+local requests = tonumber(redis.call('HGET', KEYS[1], 'requests') or ARGV[2])
+local tokens = tonumber(redis.call('HGET', KEYS[1], 'tokens') or ARGV[3])
+local refilled_at = tonumber(redis.call('HGET', KEYS[1], 'refilled_at') or ARGV[1])
+local elapsed = math.max(0, now - refilled_at)
+requests = math.min(rpm, requests + elapsed * rpm / 60)
+tokens = math.min(tpm, tokens + elapsed * tpm / 60)
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[5]))
+
+if requests < 1 or tokens < cost then
+    redis.call('HSET', KEYS[1], 'requests', tostring(requests), 'tokens', tostring(tokens), 'refilled_at', tostring(now))
+    return {0, tostring(math.max((1 - requests) * 60 / rpm, (cost - tokens) * 60 / tpm))}
+end
+
+redis.call('HSET', KEYS[1], 'requests', tostring(requests - 1), 'tokens', tostring(tokens - cost), 'refilled_at', tostring(now))
+return {1, '0'}
+"""
+
+# KEYS: model bucket hash
+# ARGV: tokens_per_minute, tokens to return
+REFUND_SCRIPT = """
+local tokens = tonumber(redis.call('HGET', KEYS[1], 'tokens') or ARGV[1])
+redis.call('HSET', KEYS[1], 'tokens', tostring(math.min(tonumber(ARGV[1]), tokens + tonumber(ARGV[2]))))
+return 1
+"""
+
+
+def estimate_tokens(*texts: str) -> int:
+    """Rough token count of prompt text (about four characters per token)."""
+    return sum(len(text or "") for text in texts) // CHARS_PER_TOKEN + 1
+
+
+class LLMLease:
+    """One call's reservation; report actual usage before release to return unused tokens."""
+
+    def __init__(self, model: str, reserved_tokens: int, granted: bool):
+        self.model = model
+        self.reserved_tokens = reserved_tokens
+        self.granted = granted  # False when the limiter is disabled or failed open
+        self.used_tokens: Optional[int] = None
+        self.released = False
+
+    def record_usage(self, total_tokens: int) -> None:
+        """Tokens the call actually consumed (prompt plus completion)."""
+        self.used_tokens = total_tokens
+
+
+class LLMRateLimiter:
+    """Redis-backed request and token budget for OpenAI calls across all workers."""
+
+    async def acquire(self, model: str, tokens: int, job_id: Optional[UUID] = None) -> LLMLease:
+        """
+        Wait until the model's request and token buckets can cover the call.
+
+        Args:
+            model: OpenAI model name
+            tokens: Tokens to reserve (estimated prompt tokens plus max_tokens)
+            job_id: Job ID for logging
+
+        Returns:
+            Lease to pass to release()
+
+        Raises:
+            RetryableError: If no capacity became available within ACQUIRE_TIMEOUT_SECONDS
+        """
+        if not settings.openai_rate_limiter_enabled:
+            return LLMLease(model, tokens, False)
+
+        rpm = max(1, settings.openai_requests_per_minute)
+        tpm = max(1, settings.openai_tokens_per_minute)
+        tokens = min(tokens, tpm)
+        started = time.monotonic()
+        logged_wait = False
+
+        while True:
+            try:
+                granted, wait = await redis_client.client.eval(
+                    ACQUIRE_SCRIPT, 1, f"{KEY_PREFIX}{model}",
+                    time.time(), rpm, tpm, tokens, STATE_TTL_SECONDS
+                )
+            except Exception as e:
+                logger.warning(
+                    f"OpenAI rate limiter unavailable, running {model} call unlimited: {e}",
+                    extra={"job_id": str(job_id) if job_id else None, "model": model}
+                )
+                return LLMLease(model, tokens, False)
+
+            if int(granted) == 1:
+                return LLMLease(model, tokens, True)
+
+            waited = time.monotonic() - started
+            if waited > ACQUIRE_TIMEOUT_SECONDS:
+                raise RetryableError(f"Timed out after {waited:.0f}s waiting for OpenAI capacity ({model})")
+            if not logged_wait:
+                logged_wait = True
+                logger.info(
+                    f"Waiting for OpenAI capacity for {model}",
+                    extra={"job_id": str(job_id) if job_id else None, "model": model, "tokens": tokens}
+                )
+            wait_seconds = float(wait.decode("utf-8") if isinstance(wait, bytes) else wait)
+            # Jitter spreads out callers waiting on the same refill
+            await asyncio.sleep(min(MAX_WAIT_STEP_SECONDS, wait_seconds) + random.uniform(0, 0.25))
+
+    async def release(self, lease: Optional[LLMLease]) -> None:
+        """
+        Return the tokens a call reserved but did not use.
+
+        Calls without recorded usage keep their whole reservation. Safe to call
+        more than once; only the first call has an effect.
+        """
+        if lease is None or lease.released:
+            return
+        lease.released = True
+        if not lease.granted or lease.used_tokens is None:
+            return
+        unused = lease.reserved_tokens - lease.used_tokens
+        if unused <= 0:
+            return
+        try:
+            await redis_client.client.eval(
+                REFUND_SCRIPT, 1, f"{KEY_PREFIX}{lease.model}",
+                max(1, settings.openai_tokens_per_minute), unused
+            )
+        except Exception as e:
+            # The bucket refills on its own
+            logger.warning(f"Failed to return unused OpenAI tokens for {lease.model}: {e}")
+
+    @asynccontextmanager
+    async def slot(self, model: str, tokens: int, job_id: Optional[UUID] = None) -> AsyncIterator[LLMLease]:
+        """
+        Hold a request and token reservation for the duration of a call.
+
+        Call lease.record_usage() with the response's total tokens to return the rest.
+        """
+        lease = await self.acquire(model, tokens, job_id=job_id)
+        try:
+            yield lease
+        finally:
+            await self.release(lease)
+
+
+# Singleton instance
+llm_rate_limiter = LLMRateLimiter()
@@ -0,0 +1,294 @@
+"""
+Replicate prediction completion.
+
+Replicate calls POST /api/v1/webhooks/replicate when a prediction finishes.
+The route stores the result in Redis and publishes it; one listener per
+process wakes whichever coroutine is waiting on that prediction, in any
+worker. Predictions whose webhook never arrives (webhooks not configured,
+local development, lost callbacks) are reloaded by a single batched poller
+off the event loop, so generators no longer run their own reload loops.
+"""
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Mapping, Optional
+
+import replicate
+
+from shared.config import settings
+from shared.logging import get_logger
+from shared.redis_client import redis_client
+
+logger = get_logger("replicate_completion")
+
+TERMINAL_STATUSES = ("succeeded", "failed", "canceled")
+
+RESULT_KEY_PREFIX = "videogen:replicate:prediction:"
+CHANNEL_PREFIX = "replicate_predictions:"
+RESULT_TTL_SECONDS = 3600
+
+# Fallback polling: at most this many reloads in flight at once
+POLL_CONCURRENCY = 8
+# Forget predictions nobody has waited on for this long (caller gave up or timed out)
+STALE_WAITER_SECONDS = 120
+# Maximum age of a webhook timestamp before the callback is rejected (replay protection)
+WEBHOOK_TOLERANCE_SECONDS = 300
+
+# Prediction fields carried by webhook payloads and copied onto waiting Prediction objects
+PREDICTION_FIELDS = ("status", "output", "error", "logs", "metrics", "completed_at")
+
+
+def create_replicate_client() -> replicate.Client:
+    """
+    Create a Replicate client, honouring REPLICATE_BASE_URL (e.g. a local stub server).
+
+    Returns:
+        Configured replicate.Client
+    """
+    if settings.replicate_base_url:
+        return replicate.Client(api_token=settings.replicate_api_token, base_url=settings.replicate_base_url)
+    return replicate.Client(api_token=settings.replicate_api_token)
+
+
+def webhooks_enabled() -> bool:
+    """
+    Whether predictions should report completion via webhook.
+
+    Both the URL and the signing secret are required: the route rejects every
+    callback it cannot verify, so without a secret predictions rely on polling.
+    """
+    return bool(settings.replicate_webhook_url and settings.replicate_webhook_secret)
+
+
+def webhook_kwargs() -> Dict[str, Any]:
+    """
+    Extra predictions.create() arguments that ask Replicate to call our webhook.
+
+    Returns:
+        {"webhook": ..., "webhook_events_filter": ["completed"]}, or {} when webhooks are not configured
+    """
+    if not webhooks_enabled():
+        return {}
+    return {"webhook": settings.replicate_webhook_url, "webhook_events_filter": ["completed"]}
+
+
+def prediction_payload(prediction: Any) -> Dict[str, Any]:
+    """Serialize the completion-relevant fields of a Prediction."""
+    payload = {"id": prediction.id}
+    for name in PREDICTION_FIELDS:
+        payload[name] = getattr(prediction, name, None)
+    return payload
+
+
+def verify_webhook_signature(headers: Mapping[str, str], body: bytes, secret: str) -> bool:
+    """
+    Verify a Replicate webhook signature.
+
+    Replicate signs "{webhook-id}.{webhook-timestamp}.{body}" with HMAC-SHA256
+    using the base64 key after the "whsec_" prefix of the signing secret.
+
+    Args:
+        headers: Request headers (webhook-id, webhook-timestamp, webhook-signature)
+        body: Raw request body
+        secret: Webhook signing secret
+
+    Returns:
+        True if one of the v1 signatures matches and the timestamp is recent
+    """
+    webhook_id = headers.get("webhook-id")
+    timestamp = headers.get("webhook-timestamp")
+    signatures = headers.get("webhook-signature")
+    if not webhook_id or not timestamp or not signatures:
+        return False
+    try:
+        if abs(time.time() - int(timestamp)) > WEBHOOK_TOLERANCE_SECONDS:
+            return False
+        key = base64.b64decode(secret.split("_", 1)[1] if secret.startswith("whsec_") else secret)
+    except (ValueError, TypeError):
+        return False
+    signed_content = f"{webhook_id}.{timestamp}.".encode("utf-8") + body
+    expected = base64.b64encode(hmac.new(key, signed_content, hashlib.sha256).digest()).decode("utf-8")
+    for signature in signatures.split():
+        version, _, value = signature.partition(",")
+        if version == "v1" and hmac.compare_digest(value, expected):
+            return True
+    return False
+
+
+async def publish_prediction_result(payload: Dict[str, Any]) -> None:
+    """
+    Store a finished prediction in Redis and notify waiting processes.
+
+    The result key covers waiters that register after the webhook arrived.
+
+    Args:
+        payload: Replicate prediction JSON (must contain id and status)
+    """
+    prediction_id = payload["id"]
+    message = json.dumps(payload, default=str)
+    await redis_client.client.set(f"{RESULT_KEY_PREFIX}{prediction_id}", message, ex=RESULT_TTL_SECONDS)
+    await redis_client.client.publish(f"{CHANNEL_PREFIX}{prediction_id}", message)
+
+
+async def get_stored_result(prediction_id: str) -> Optional[Dict[str, Any]]:
+    """Get a prediction result previously published by the webhook route."""
+    raw = await redis_client.client.get(f"{RESULT_KEY_PREFIX}{prediction_id}")
+    if raw is None:
+        return None
+    return json.loads(raw.decode("utf-8") if isinstance(raw, bytes) else raw)
+
+
+@dataclass
+class _PendingPrediction:
+    prediction: Any
+    future: asyncio.Future
+    last_wait: float = field(default_factory=time.monotonic)
+
+
+class PredictionWaiter:
+    """
+    Waits for Replicate predictions via webhook notifications with a batched polling fallback.
+
+    One Redis pattern subscription and one poller task serve every prediction
+    in the process. Both stop when nothing is pending and restart on demand.
+    """
+
+    def __init__(self):
+        self._pending: Dict[str, _PendingPrediction] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._listener_task: Optional[asyncio.Task] = None
+        self._poller_task: Optional[asyncio.Task] = None
+
+    async def wait(self, prediction: Any, timeout: float) -> bool:
+        """
+        Wait up to timeout seconds for a prediction to finish.
+
+        On completion the prediction object is updated in place (status,
+        output, error, ...), exactly as prediction.reload() would.
+
+        Args:
+            prediction: Prediction returned by client.predictions.create()
+            timeout: Maximum seconds to wait in this call
+
+        Returns:
+            True if the prediction reached a terminal status
+        """
+        if prediction.status in TERMINAL_STATUSES:
+            return True
+
+        self._bind_loop()
+        entry = self._pending.get(prediction.id)
+        if entry is None:
+            entry = _PendingPrediction(prediction, self._loop.create_future())
+            self._pending[prediction.id] = entry
+            await self._check_stored_result(prediction.id)
+        entry.last_wait = time.monotonic()
+        self._ensure_tasks()
+
+        try:
+            await asyncio.wait_for(asyncio.shield(entry.future), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return prediction.status in TERMINAL_STATUSES
+
+    def _bind_loop(self) -> None:
+        """Reset state if called from a different event loop (e.g. a new worker loop)."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._pending.clear()
+            self._listener_task = None
+            self._poller_task = None
+
+    def _ensure_tasks(self) -> None:
+        if self._listener_task is None or self._listener_task.done():
+            self._listener_task = asyncio.create_task(self._listen())
+        if self._poller_task is None or self._poller_task.done():
+            self._poller_task = asyncio.create_task(self._poll())
+
+    def _resolve(self, prediction_id: str, payload: Dict[str, Any]) -> None:
+        """Copy a terminal payload onto the waiting prediction and wake its waiter."""
+        if payload.get("status") not in TERMINAL_STATUSES:
+            return
+        entry = self._pending.pop(prediction_id, None)
+        if entry is None:
+            return
+        for name in PREDICTION_FIELDS:
+            if name in payload:
+                setattr(entry.prediction, name, payload[name])
+        if not entry.future.done():
+            entry.future.set_result(payload)
+
+    async def _check_stored_result(self, prediction_id: str) -> None:
+        try:
+            payload = await get_stored_result(prediction_id)
+        except Exception as e:
+            logger.debug(f"Could not read stored result for prediction {prediction_id}: {e}")
+            return
+        if payload is not None:
+            self._resolve(prediction_id, payload)
+
+    async def _listen(self) -> None:
+        """Receive webhook results published by any API gateway instance."""
+        pubsub = None
+        try:
+            pubsub = redis_client.client.pubsub()
+            await pubsub.psubscribe(f"{CHANNEL_PREFIX}*")
+            # Results published before the subscription was active are only in the result keys
+            for prediction_id in list(self._pending):
+                await self._check_stored_result(prediction_id)
+            while self._pending:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if not message or message.get("type") != "pmessage":
+                    continue
+                data = message.get("data")
+                payload = json.loads(data.decode("utf-8") if isinstance(data, bytes) else data)
+                self._resolve(payload.get("id"), payload)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Polling keeps working; the listener restarts on the next wait()
+            logger.warning(f"Replicate webhook listener stopped: {e}")
+        finally:
+            if pubsub is not None:
+                try:
+                    await pubsub.punsubscribe()
+                    await pubsub.close()
+                except Exception:
+                    pass
+
+    async def _poll(self) -> None:
+        """Reload all pending predictions together, off the event loop."""
+        interval = (
+            settings.replicate_webhook_fallback_poll_interval
+            if webhooks_enabled()
+            else settings.replicate_poll_interval
+        )
+        semaphore = asyncio.Semaphore(POLL_CONCURRENCY)
+
+        async def reload(prediction_id: str, entry: _PendingPrediction) -> None:
+            async with semaphore:
+                try:
+                    await asyncio.to_thread(entry.prediction.reload)
+                except Exception as e:
+                    logger.warning(f"Failed to reload prediction {prediction_id}: {e}")
+                    return
+            self._resolve(prediction_id, prediction_payload(entry.prediction))
+
+        while self._pending:
+            await asyncio.sleep(interval)
+            now = time.monotonic()
+            for prediction_id, entry in list(self._pending.items()):
+                if now - entry.last_wait > STALE_WAITER_SECONDS:
+                    self._pending.pop(prediction_id, None)
+            if self._pending:
+                await asyncio.gather(*(reload(pid, entry) for pid, entry in list(self._pending.items())))
+
+
+# Singleton instance
+prediction_waiter = PredictionWaiter()
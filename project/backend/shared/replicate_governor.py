@@ -0,0 +1,293 @@
+"""
+Replicate concurrency governor.
+
+Per-job semaphores bound how many predictions one job runs, but every worker
+and every job shares the same Replicate account. The governor keeps the
+account-wide state in Redis so all workers and all Replicate callers (video
+generator, lipsync processor, reference generator) draw from it:
+
+- a token bucket for prediction creation (REPLICATE_PREDICTIONS_PER_MINUTE)
+- an in-flight limit per model family (Kling, Veo, Flux, ...), adapted with
+  AIMD: +1/limit per successful prediction, halved on a 429, with new
+  predictions for that family paused for the Retry-After period
+
+Leases expire on their own, so a crashed worker cannot leak capacity.
+If Redis is unavailable the governor fails open and predictions run ungoverned.
+"""
+
+import asyncio
+import random
+import time
+import uuid
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+from uuid import UUID
+
+from shared.config import settings
+from shared.errors import RetryableError
+from shared.logging import get_logger
+from shared.redis_client import redis_client
+
+logger = get_logger("replicate_governor")
+
+KEY_PREFIX = "videogen:replicate:governor:"
+
+# Model families with their own in-flight limit, matched as substrings of the model reference
+MODEL_FAMILIES = ("kling", "veo", "flux", "sdxl", "pixverse", "hailuo", "wan")
+DEFAULT_FAMILY = "default"
+
+# Leases of crashed workers are reclaimed after this long
+LEASE_TTL_SECONDS = 900
+# Pause applied to a family on a 429 without a Retry-After header
+DEFAULT_BACKOFF_SECONDS = 10.0
+# Upper bound on a single sleep while waiting for capacity (state changes as leases are released)
+MAX_WAIT_STEP_SECONDS = 2.0
+# Give up waiting for capacity after this long (surfaced as retryable)
+ACQUIRE_TIMEOUT_SECONDS = 900.0
+# Governor keys expire when no worker has touched them for a day
+STATE_TTL_SECONDS = 86400
+
+# KEYS: family state hash, family lease zset, global bucket hash
+# ARGV: now, lease_id, lease_ttl, max_limit, rate_per_second, burst, state_ttl
+# Returns {1, "0"} when granted, otherwise {0, "<seconds to wait>"}
+ACQUIRE_SCRIPT = """
+local now = tonumber(ARGV[1])
+local max_limit = tonumber(ARGV[4])
+local rate = tonumber(ARGV[5])
+local burst = tonumber(ARGV[6])
+local state_ttl = tonumber(ARGV[7])
+
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', now)
+
+local blocked_until = tonumber(redis.call('HGET', KEYS[1], 'blocked_until') or '0')
+if now < blocked_until then
+    return {0, tostring(blocked_until - now)}
+end
+
+local limit = tonumber(redis.call('HGET', KEYS[1], 'limit') or ARGV[4])
+if limit > max_limit then
+    limit = max_limit
+end
+if redis.call('ZCARD', KEYS[2]) >= math.max(1, math.floor(limit)) then
+    return {0, '0.5'}
+end
+
+local tokens = tonumber(redis.call('HGET', KEYS[3], 'tokens') or ARGV[6])
+local refilled_at = tonumber(redis.call('HGET', KEYS[3], 'refilled_at') or ARGV[1])
+tokens = math.min(burst, tokens + math.max(0, now - refilled_at) * rate)
+if tokens < 1 then
+    redis.call('HSET', KEYS[3], 'tokens', tostring(tokens), 'refilled_at', tostring(now))
+    return {0, tostring((1 - tokens) / rate)}
+end
+
+redis.call('HSET', KEYS[3], 'tokens', tostring(tokens - 1), 'refilled_at', tostring(now))
+redis.call('ZADD', KEYS[2], now + tonumber(ARGV[3]), ARGV[2])
+redis.call('HSET', KEYS[1], 'limit', tostring(limit))
+redis.call('EXPIRE', KEYS[1], state_ttl)
+redis.call('EXPIRE', KEYS[2], state_ttl)
+redis.call('EXPIRE', KEYS[3], state_ttl)
+return {1, '0'}
+"""
+
+# KEYS: family state hash, family lease zset
+# ARGV: now, lease_id, outcome ("succeeded" | "throttled" | "released"), retry_after, max_limit, min_limit
+# Returns the family's new in-flight limit
+RELEASE_SCRIPT = """
+local now = tonumber(ARGV[1])
+local max_limit = tonumber(ARGV[5])
+local min_limit = tonumber(ARGV[6])
+
+redis.call('ZREM', KEYS[2], ARGV[2])
+
+local limit = tonumber(redis.call('HGET', KEYS[1], 'limit') or ARGV[5])
+if ARGV[3] == 'succeeded' then
+    limit = math.min(max_limit, limit + 1 / limit)
+elseif ARGV[3] == 'throttled' then
+    -- Halve once per backoff window, not once per prediction caught in the same burst of 429s
+    local blocked_until = tonumber(redis.call('HGET', KEYS[1], 'blocked_until') or '0')
+    if now >= blocked_until then
+        limit = math.max(min_limit, limit / 2)
+    end
+    redis.call('HSET', KEYS[1], 'blocked_until', tostring(math.max(blocked_until, now + tonumber(ARGV[4]))))
+end
+redis.call('HSET', KEYS[1], 'limit', tostring(limit))
+return tostring(limit)
+"""
+
+
+def model_family(model_ref: str) -> str:
+    """
+    Map a model reference (config key or Replicate "owner/model[:version]") to its family.
+
+    Args:
+        model_ref: e.g. "kling_v21", "kwaivgi/kling-v2.1", "google/veo-3.1"
+
+    Returns:
+        Family name from MODEL_FAMILIES, or "default"
+    """
+    ref = (model_ref or "").lower()
+    for family in MODEL_FAMILIES:
+        if family in ref:
+            return family
+    return DEFAULT_FAMILY
+
+
+def family_limit(family: str) -> int:
+    """Configured maximum in-flight predictions for a model family."""
+    limits = settings.replicate_model_concurrency
+    return max(1, int(limits.get(family, limits.get(DEFAULT_FAMILY, 4))))
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """True if an exception from the Replicate client looks like a 429."""
+    status_code = getattr(error, "status", None)
+    response = getattr(error, "response", None)
+    if status_code is None and response is not None:
+        status_code = getattr(response, "status_code", None)
+    if status_code == 429:
+        return True
+    error_str = str(error).lower()
+    return "rate limit" in error_str or "429" in error_str
+
+
+def retry_after_from_error(error: BaseException) -> Optional[float]:
+    """Retry-After seconds carried by a rate-limit exception, if any."""
+    retry_after = getattr(error, "retry_after", None)
+    if retry_after:
+        return float(retry_after)
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    try:
+        return float(headers.get("Retry-After")) if headers and headers.get("Retry-After") else None
+    except (TypeError, ValueError):
+        return None
+
+
+class ReplicateLease:
+    """One prediction's claim on governor capacity; record its outcome before release."""
+
+    def __init__(self, family: str, lease_id: Optional[str]):
+        self.family = family
+        self.lease_id = lease_id  # None when the governor is disabled or failed open
+        self.outcome = "released"
+        self.retry_after: Optional[float] = None
+        self.released = False
+
+    def succeeded(self) -> None:
+        """The prediction completed; lets the family's limit grow."""
+        if self.outcome != "throttled":
+            self.outcome = "succeeded"
+
+    def throttled(self, retry_after: Optional[float] = None) -> None:
+        """Replicate answered 429; halves the family's limit and pauses it for retry_after."""
+        self.outcome = "throttled"
+        self.retry_after = retry_after if retry_after and retry_after > 0 else DEFAULT_BACKOFF_SECONDS
+
+
+class ReplicateGovernor:
+    """Redis-backed admission control for Replicate predictions across all workers."""
+
+    async def acquire(self, model_ref: str, job_id: Optional[UUID] = None) -> ReplicateLease:
+        """
+        Wait until the model's family has capacity and a creation token is available.
+
+        Args:
+            model_ref: Model config key or Replicate model string
+            job_id: Job ID for logging
+
+        Returns:
+            Lease to pass to release()
+
+        Raises:
+            RetryableError: If no capacity became available within ACQUIRE_TIMEOUT_SECONDS
+        """
+        family = model_family(model_ref)
+        if not settings.replicate_governor_enabled:
+            return ReplicateLease(family, None)
+
+        lease_id = uuid.uuid4().hex
+        rate = settings.replicate_predictions_per_minute / 60.0
+        burst = max(1, settings.replicate_predictions_per_minute // 6)
+        started = time.monotonic()
+        logged_wait = False
+
+        while True:
+            try:
+                granted, wait = await redis_client.client.eval(
+                    ACQUIRE_SCRIPT, 3,
+                    f"{KEY_PREFIX}{family}", f"{KEY_PREFIX}{family}:leases", f"{KEY_PREFIX}bucket",
+                    time.time(), lease_id, LEASE_TTL_SECONDS, family_limit(family), rate, burst, STATE_TTL_SECONDS
+                )
+            except Exception as e:
+                logger.warning(
+                    f"Replicate governor unavailable, running {family} prediction ungoverned: {e}",
+                    extra={"job_id": str(job_id) if job_id else None, "family": family}
+                )
+                return ReplicateLease(family, None)
+
+            if int(granted) == 1:
+                return ReplicateLease(family, lease_id)
+
+            waited = time.monotonic() - started
+            if waited > ACQUIRE_TIMEOUT_SECONDS:
+                raise RetryableError(f"Timed out after {waited:.0f}s waiting for Replicate capacity ({family})")
+            if not logged_wait:
+                logged_wait = True
+                logger.info(
+                    f"Waiting for Replicate capacity for {family} model",
+                    extra={"job_id": str(job_id) if job_id else None, "family": family}
+                )
+            wait_seconds = float(wait.decode("utf-8") if isinstance(wait, bytes) else wait)
+            # Jitter spreads out workers woken by the same release
+            await asyncio.sleep(min(MAX_WAIT_STEP_SECONDS, wait_seconds) + random.uniform(0, 0.25))
+
+    async def release(self, lease: Optional[ReplicateLease]) -> None:
+        """
+        Return a lease's capacity and apply its outcome to the family's limit.
+
+        Safe to call more than once; only the first call has an effect.
+        """
+        if lease is None or lease.released:
+            return
+        lease.released = True
+        if lease.lease_id is None:
+            return
+        try:
+            limit = await redis_client.client.eval(
+                RELEASE_SCRIPT, 2,
+                f"{KEY_PREFIX}{lease.family}", f"{KEY_PREFIX}{lease.family}:leases",
+                time.time(), lease.lease_id, lease.outcome, lease.retry_after or 0,
+                family_limit(lease.family), 1
+            )
+        except Exception as e:
+            # The lease expires on its own
+            logger.warning(f"Failed to release Replicate governor lease for {lease.family}: {e}")
+            return
+        if lease.outcome == "throttled":
+            logger.warning(
+                f"Replicate rate limit for {lease.family}: limit reduced to "
+                f"{float(limit.decode('utf-8') if isinstance(limit, bytes) else limit):.2f}, "
+                f"pausing new predictions for {lease.retry_after:.0f}s",
+                extra={"family": lease.family, "retry_after": lease.retry_after}
+            )
+
+    @asynccontextmanager
+    async def slot(self, model_ref: str, job_id: Optional[UUID] = None) -> AsyncIterator[ReplicateLease]:
+        """
+        Hold governor capacity for the duration of a prediction.
+
+        Rate-limit exceptions raised inside the block mark the lease throttled;
+        call lease.succeeded() once the prediction has completed.
+        """
+        lease = await self.acquire(model_ref, job_id=job_id)
+        try:
+            yield lease
+        except BaseException as e:
+            if isinstance(e, Exception) and is_rate_limit_error(e):
+                lease.throttled(retry_after_from_error(e))
+            raise
+        finally:
+            await self.release(lease)
+
+
+# Singleton instance
+replicate_governor = ReplicateGovernor()
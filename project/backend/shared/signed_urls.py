@@ -0,0 +1,130 @@
+"""
+Signed URL service.
+
+Mints signed URLs for private storage objects in bulk (one create_signed_urls
+request per bucket, not one request per file) and caches them in Redis, so
+listing a job's clips or reference images costs at most one Supabase round
+trip and repeat reads cost none.
+
+Cached URLs are keyed by bucket, path, lifetime and expiry bucket: time is
+split into windows of a quarter of the requested lifetime, and a URL minted
+in a window is reused until that window ends. Every URL handed out therefore
+has at least three quarters of its requested lifetime left.
+"""
+
+import math
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+from shared.errors import RetryableError
+from shared.logging import get_logger
+from shared.redis_client import redis_client
+from shared.storage import StorageClient, storage as shared_storage
+
+logger = get_logger("signed_urls")
+
+KEY_PREFIX = "videogen:signed_url:"
+
+# Windows per URL lifetime (a cached URL keeps at least 1 - 1/N of its lifetime)
+EXPIRY_BUCKETS_PER_LIFETIME = 4
+
+
+def _expiry_bucket(expires_in: int, now: float) -> Tuple[int, int]:
+    """Current expiry bucket index and the seconds left in it."""
+    window = max(1, expires_in // EXPIRY_BUCKETS_PER_LIFETIME)
+    index = int(now // window)
+    return index, max(1, math.ceil((index + 1) * window - now))
+
+
+def _cache_key(bucket: str, path: str, expires_in: int, index: int) -> str:
+    return f"{KEY_PREFIX}{bucket}:{expires_in}:{index}:{path}"
+
+
+async def _read_cached(keys: List[str]) -> List[Optional[str]]:
+    try:
+        values = await redis_client.client.mget(keys)
+    except Exception as e:
+        logger.warning(f"Failed to read cached signed URLs: {str(e)}")
+        # Cache failures should not fail the request
+        return [None] * len(keys)
+    return [value.decode("utf-8") if isinstance(value, bytes) else value for value in values]
+
+
+async def _store_cached(entries: Dict[str, str], ttl: int) -> None:
+    try:
+        pipe = redis_client.client.pipeline(transaction=False)
+        for key, url in entries.items():
+            pipe.set(key, url.encode("utf-8"), ex=ttl)
+        await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Failed to cache signed URLs: {str(e)}")
+        # Cache failures should not fail the request
+
+
+async def get_signed_urls(
+    bucket: str,
+    paths: Iterable[str],
+    expires_in: int = 3600,
+    storage: Optional[StorageClient] = None
+) -> Dict[str, str]:
+    """
+    Get signed URLs for many files in one bucket.
+
+    Args:
+        bucket: Storage bucket name
+        paths: File paths in bucket
+        expires_in: Requested URL lifetime in seconds (default: 3600)
+        storage: Storage client to mint with (shared client if omitted)
+
+    Returns:
+        Dict of path to signed URL (paths that could not be signed are omitted)
+
+    Raises:
+        RetryableError: If minting the uncached URLs fails
+    """
+    paths = list(dict.fromkeys(paths))
+    if not paths:
+        return {}
+
+    index, ttl = _expiry_bucket(expires_in, time.time())
+    keys = {path: _cache_key(bucket, path, expires_in, index) for path in paths}
+    cached = await _read_cached(list(keys.values()))
+
+    signed_urls = {path: url for path, url in zip(paths, cached) if url}
+    missing = [path for path in paths if path not in signed_urls]
+    if missing:
+        minted = await (storage or shared_storage).get_signed_urls(bucket, missing, expires_in=expires_in)
+        await _store_cached({keys[path]: url for path, url in minted.items() if path in keys}, ttl)
+        signed_urls.update(minted)
+
+    logger.debug(
+        f"Resolved {len(signed_urls)} signed URLs for {bucket} ({len(paths) - len(missing)} cached)",
+        extra={"bucket": bucket, "count": len(paths), "minted": len(missing)}
+    )
+    return signed_urls
+
+
+async def get_signed_url(
+    bucket: str,
+    path: str,
+    expires_in: int = 3600,
+    storage: Optional[StorageClient] = None
+) -> str:
+    """
+    Get a signed URL for one file (cached; see get_signed_urls).
+
+    Args:
+        bucket: Storage bucket name
+        path: File path in bucket
+        expires_in: Requested URL lifetime in seconds (default: 3600)
+        storage: Storage client to mint with (shared client if omitted)
+
+    Returns:
+        Signed URL
+
+    Raises:
+        RetryableError: If the URL could not be generated
+    """
+    signed_urls = await get_signed_urls(bucket, [path], expires_in=expires_in, storage=storage)
+    if not signed_urls.get(path):
+        raise RetryableError(f"Empty signed URL for {bucket}/{path}")
+    return signed_urls[path]
@@ -6,12 +6,12 @@ Supabase Storage operations for file upload/download.
 
 import asyncio
 import mimetypes
-from typing import Optional, Dict, Any, Callable
-from supabase import create_client
-from shared.config import settings
+from pathlib import Path
+from typing import Optional, Dict, Any, Callable, List, Union
 from shared.errors import RetryableError, ConfigError
 from shared.retry import retry_with_backoff
 from shared.logging import get_logger
+from shared.supabase_pool import get_supabase_client, run_in_pool
 
 logger = get_logger("storage")
 
@@ -35,10 +35,8 @@ class StorageClient:
             bucket_limits: Optional dict of bucket name to max file size in bytes
         """
         try:
-            self.client = create_client(
-                settings.supabase_url,
-                settings.supabase_service_key
-            )
+            # Process-wide client: constructing StorageClient is cheap and shares pooled connections
+            self.client = get_supabase_client()
             self.storage = self.client.storage
             self.bucket_limits = bucket_limits or DEFAULT_BUCKET_LIMITS.copy()
         except Exception as e:
@@ -48,6 +46,8 @@ class StorageClient:
         """
         Execute a synchronous Supabase storage operation in an async context with timeout.
         
+        Runs on the shared Supabase executor (not the default thread pool).
+        
         Args:
             func: Synchronous function to execute
             timeout: Maximum time to wait in seconds (default: 60s)
@@ -58,11 +58,7 @@ class StorageClient:
         Raises:
             asyncio.TimeoutError: If operation exceeds timeout
         """
-        loop = asyncio.get_event_loop()
-        return await asyncio.wait_for(
-            loop.run_in_executor(None, func),
-            timeout=timeout
-        )
+        return await asyncio.wait_for(run_in_pool(func), timeout=timeout)
     
     def _detect_content_type(self, path: str, default: Optional[str] = None) -> str:
         """
@@ -85,7 +81,7 @@ class StorageClient:
         self,
         bucket: str,
         path: str,
-        file_data: bytes,
+        file_data: Union[bytes, Path],
         content_type: Optional[str] = None,
         max_size: Optional[int] = None,
         overwrite: bool = False,
@@ -97,7 +93,7 @@ class StorageClient:
         Args:
             bucket: Storage bucket name
             path: File path in bucket
-            file_data: File data as bytes
+            file_data: File data as bytes, or a local file path (streamed from disk)
             content_type: Content type (auto-detected if not provided)
             max_size: Maximum file size in bytes (uses bucket default if not provided)
             overwrite: If True, delete existing file before uploading (default: False)
@@ -118,10 +114,11 @@ class StorageClient:
                 content_type = self._detect_content_type(path)
             
             # Validate file size
+            file_size = file_data.stat().st_size if isinstance(file_data, Path) else len(file_data)
             max_size = max_size or self.bucket_limits.get(bucket, 10 * 1024 * 1024)
-            if len(file_data) > max_size:
+            if file_size > max_size:
                 max_size_mb = max_size / (1024 * 1024)
-                file_size_mb = len(file_data) / (1024 * 1024)
+                file_size_mb = file_size / (1024 * 1024)
                 raise ValidationError(
                     f"File size ({file_size_mb:.2f} MB) exceeds maximum of {max_size_mb:.2f} MB for bucket {bucket}"
                 )
@@ -206,7 +203,7 @@ class StorageClient:
             
             logger.info(
                 f"Uploaded file to {bucket}/{path}",
-                extra={"bucket": bucket, "path": path, "size": len(file_data), "overwrite": overwrite}
+                extra={"bucket": bucket, "path": path, "size": file_size, "overwrite": overwrite}
             )
             
             return file_url
@@ -385,6 +382,91 @@ class StorageClient:
             )
             raise RetryableError(f"Failed to generate signed URL: {str(e)}") from e
     
+    async def get_signed_urls(
+        self,
+        bucket: str,
+        paths: List[str],
+        expires_in: int = 3600
+    ) -> Dict[str, str]:
+        """
+        Generate signed URLs for many files in one request.
+        
+        Args:
+            bucket: Storage bucket name
+            paths: File paths in bucket
+            expires_in: Expiration time in seconds (default: 3600)
+            
+        Returns:
+            Dict of path to signed URL (paths Supabase could not sign are omitted)
+            
+        Raises:
+            RetryableError: If the request fails
+        """
+        if not paths:
+            return {}
+        try:
+            def _create_signed_urls():
+                return self.storage.from_(bucket).create_signed_urls(
+                    paths=list(paths),
+                    expires_in=expires_in
+                )
+            
+            response = await self._execute_sync(_create_signed_urls)
+            
+            signed_urls = {}
+            for item in response or []:
+                url = item.get("signedURL") or item.get("signedUrl")
+                if item.get("error") or not url:
+                    logger.warning(
+                        f"Failed to sign {bucket}/{item.get('path')}: {item.get('error')}",
+                        extra={"bucket": bucket, "path": item.get("path")}
+                    )
+                    continue
+                signed_urls[item.get("path")] = url
+            
+            logger.info(
+                f"Generated {len(signed_urls)} signed URLs for {bucket}",
+                extra={"bucket": bucket, "count": len(paths), "expires_in": expires_in}
+            )
+            
+            return signed_urls
+            
+        except Exception as e:
+            logger.error(
+                f"Failed to generate signed URLs for {bucket}: {str(e)}",
+                extra={"bucket": bucket, "count": len(paths), "error": str(e)}
+            )
+            raise RetryableError(f"Failed to generate signed URLs: {str(e)}") from e
+    
+    async def list_files(self, bucket: str, folder: str, limit: int = 1000) -> List[Dict[str, Any]]:
+        """
+        List the objects directly inside a folder.
+
+        Args:
+            bucket: Storage bucket name
+            folder: Folder path in bucket
+            limit: Maximum number of entries to return
+
+        Returns:
+            Entries with name, updated_at and metadata (eTag, size, ...);
+            subfolders are included with metadata set to None
+
+        Raises:
+            RetryableError: If listing fails
+        """
+        try:
+            def _list():
+                return self.storage.from_(bucket).list(folder, {"limit": limit})
+
+            return await self._execute_sync(_list) or []
+
+        except Exception as e:
+            logger.error(
+                f"Failed to list files in {bucket}/{folder}: {str(e)}",
+                extra={"bucket": bucket, "folder": folder, "error": str(e)}
+            )
+            raise RetryableError(f"Failed to list files: {str(e)}") from e
+
     @retry_with_backoff(max_attempts=3, base_delay=2)
     async def delete_file(self, bucket: str, path: str) -> bool:
         """
@@ -0,0 +1,138 @@
+"""
+Shared Supabase client.
+
+One lazily created Supabase client per process, used by every StorageClient
+and DatabaseClient. Storage and PostgREST requests share one pooled HTTP
+client (keep-alive, bounded connections to the Supabase host), and the
+blocking client calls run on a dedicated executor sized to that pool instead
+of the default thread pool, so small requests reuse warm connections and
+never queue behind unrelated blocking work.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+import httpx
+from supabase import Client, ClientOptions, create_client
+
+from shared.config import settings
+from shared.logging import get_logger
+
+logger = get_logger("supabase_pool")
+
+_lock = threading.Lock()
+_client: Optional[Client] = None
+_http_client: Optional[httpx.Client] = None
+_executor: Optional[ThreadPoolExecutor] = None
+
+# Pool counters (updated from the event loop and executor threads)
+_stats = {"calls": 0, "in_flight": 0, "requests": 0}
+_stats_lock = threading.Lock()
+
+
+def _count_request(request: httpx.Request) -> None:
+    with _stats_lock:
+        _stats["requests"] += 1
+
+
+def _create_http_client() -> httpx.Client:
+    """Pooled HTTP client shared by Storage and PostgREST requests."""
+    return httpx.Client(
+        limits=httpx.Limits(
+            max_connections=settings.supabase_max_connections,
+            max_keepalive_connections=settings.supabase_max_keepalive_connections,
+            keepalive_expiry=settings.supabase_keepalive_expiry
+        ),
+        timeout=httpx.Timeout(settings.supabase_http_timeout, connect=10.0),
+        follow_redirects=True,
+        http2=True,
+        event_hooks={"request": [_count_request]}
+    )
+
+
+def get_supabase_client() -> Client:
+    """
+    Get the process-wide Supabase client, creating it on first use.
+
+    Returns:
+        Supabase client whose Storage and PostgREST calls use the shared HTTP pool
+    """
+    global _client, _http_client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                http_client = _create_http_client()
+                _client = create_client(
+                    settings.supabase_url,
+                    settings.supabase_service_key,
+                    options=ClientOptions(httpx_client=http_client)
+                )
+                _http_client = http_client
+                logger.info(
+                    "Created shared Supabase client",
+                    extra={"max_connections": settings.supabase_max_connections}
+                )
+    return _client
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Dedicated executor for blocking Supabase calls (one thread per pooled connection)."""
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.supabase_max_connections,
+                    thread_name_prefix="supabase"
+                )
+    return _executor
+
+
+async def run_in_pool(func: Callable[[], Any]) -> Any:
+    """
+    Run a blocking Supabase call on the dedicated executor.
+
+    Args:
+        func: Synchronous function to execute
+
+    Returns:
+        Function result
+    """
+    def _tracked():
+        with _stats_lock:
+            _stats["in_flight"] += 1
+        try:
+            return func()
+        finally:
+            with _stats_lock:
+                _stats["in_flight"] -= 1
+
+    with _stats_lock:
+        _stats["calls"] += 1
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(get_executor(), _tracked)
+
+
+def pool_stats() -> Dict[str, Any]:
+    """
+    Snapshot of the Supabase pool for health checks and debugging.
+
+    Returns:
+        Executor size, running and queued calls, total calls and HTTP requests,
+        and open / idle pooled connections
+    """
+    with _stats_lock:
+        stats: Dict[str, Any] = dict(_stats)
+    stats["max_workers"] = settings.supabase_max_connections
+    stats["queued"] = _executor._work_queue.qsize() if _executor is not None else 0
+
+    connections = []
+    if _http_client is not None:
+        pool = getattr(_http_client._transport, "_pool", None)
+        connections = list(getattr(pool, "connections", []) or [])
+    stats["connections"] = len(connections)
+    stats["idle_connections"] = sum(1 for connection in connections if connection.is_idle())
+    return stats
+
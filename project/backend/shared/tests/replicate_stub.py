@@ -0,0 +1,179 @@
+"""
+Local stand-in for the Replicate predictions API.
+
+Serves the endpoints the Replicate client uses to create and reload
+predictions, and builds (optionally delivers) signed completion webhooks.
+Point a client at it with REPLICATE_BASE_URL or replicate.Client(base_url=...).
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import re
+import threading
+import time
+import urllib.request
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+
+TERMINAL_STATUSES = ("succeeded", "failed", "canceled")
+
+STUB_WEBHOOK_SECRET = "whsec_" + base64.b64encode(b"replicate-stub-signing-key").decode("utf-8")
+
+
+class ReplicateStub:
+    """
+    Minimal Replicate predictions API running on a local port.
+
+    Predictions start as "starting" and succeed after polls_to_complete
+    reloads, or immediately when complete() is called (as a webhook would report).
+    """
+
+    def __init__(
+        self,
+        polls_to_complete: Optional[int] = 1,
+        output: Any = "https://replicate.delivery/stub/output.mp4",
+        webhook_secret: str = STUB_WEBHOOK_SECRET,
+        deliver_webhooks: bool = False
+    ):
+        self.polls_to_complete = polls_to_complete
+        self.output = output
+        self.webhook_secret = webhook_secret
+        self.deliver_webhooks = deliver_webhooks
+        self.predictions: Dict[str, Dict[str, Any]] = {}
+        self.poll_counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def start(self) -> "ReplicateStub":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "ReplicateStub":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+    def create(self, body: Dict[str, Any], model: Optional[str] = None) -> Dict[str, Any]:
+        prediction_id = uuid.uuid4().hex
+        prediction = {
+            "id": prediction_id,
+            "model": model or "stub/model",
+            "version": body.get("version", "stub-version"),
+            "status": "starting",
+            "input": body.get("input", {}),
+            "output": None,
+            "logs": "",
+            "error": None,
+            "metrics": {},
+            "webhook": body.get("webhook"),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "urls": {
+                "get": f"{self.base_url}/v1/predictions/{prediction_id}",
+                "cancel": f"{self.base_url}/v1/predictions/{prediction_id}/cancel",
+            },
+        }
+        with self._lock:
+            self.predictions[prediction_id] = prediction
+            self.poll_counts[prediction_id] = 0
+        return prediction
+
+    def get(self, prediction_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            prediction = self.predictions.get(prediction_id)
+            if prediction is None:
+                return None
+            self.poll_counts[prediction_id] += 1
+            finish = (
+                self.polls_to_complete is not None
+                and prediction["status"] not in TERMINAL_STATUSES
+                and self.poll_counts[prediction_id] >= self.polls_to_complete
+            )
+        if finish:
+            return self.complete(prediction_id)
+        return dict(prediction)
+
+    def complete(self, prediction_id: str, status: str = "succeeded", error: Optional[str] = None) -> Dict[str, Any]:
+        """Finish a prediction and deliver its webhook if enabled."""
+        with self._lock:
+            prediction = self.predictions[prediction_id]
+            prediction.update({
+                "status": status,
+                "output": self.output if status == "succeeded" else None,
+                "error": error,
+                "completed_at": datetime.now(timezone.utc).isoformat(),
+            })
+            snapshot = dict(prediction)
+        if self.deliver_webhooks and snapshot.get("webhook"):
+            body, headers = self.signed_webhook(prediction_id)
+            request = urllib.request.Request(snapshot["webhook"], data=body, headers=headers, method="POST")
+            urllib.request.urlopen(request, timeout=5).close()
+        return snapshot
+
+    def signed_webhook(self, prediction_id: str) -> Tuple[bytes, Dict[str, str]]:
+        """Build the body and signed headers Replicate would POST to the webhook."""
+        with self._lock:
+            body = json.dumps(self.predictions[prediction_id]).encode("utf-8")
+        webhook_id = f"msg_{uuid.uuid4().hex}"
+        timestamp = str(int(time.time()))
+        key = base64.b64decode(self.webhook_secret.split("_", 1)[1])
+        signature = base64.b64encode(
+            hmac.new(key, f"{webhook_id}.{timestamp}.".encode("utf-8") + body, hashlib.sha256).digest()
+        ).decode("utf-8")
+        headers = {
+            "Content-Type": "application/json",
+            "webhook-id": webhook_id,
+            "webhook-timestamp": timestamp,
+            "webhook-signature": f"v1,{signature}",
+        }
+        return body, headers
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status: int, payload: Dict[str, Any]) -> None:
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                model_match = re.fullmatch(r"/v1/models/([^/]+/[^/]+)/predictions", self.path)
+                if self.path == "/v1/predictions":
+                    self._send(201, stub.create(body))
+                elif model_match:
+                    self._send(201, stub.create(body, model=model_match.group(1)))
+                else:
+                    self._send(404, {"detail": "Not found"})
+
+            def do_GET(self):
+                match = re.fullmatch(r"/v1/predictions/([^/]+)", self.path)
+                prediction = stub.get(match.group(1)) if match else None
+                if prediction is None:
+                    self._send(404, {"detail": "Not found"})
+                else:
+                    self._send(200, prediction)
+
+        return Handler
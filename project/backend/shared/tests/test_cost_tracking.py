@@ -298,3 +298,34 @@ async def test_get_total_cost_raises_retryable_error(cost_tracker):
     with pytest.raises(RetryableError, match="Failed to get total cost"):
         await tracker.get_total_cost(job_id)
 
+
+
+@pytest.mark.asyncio
+async def test_track_cost_saved(mock_db):
+    """Cache hits are recorded as zero-cost rows carrying the cost they saved."""
+    mock_insert = Mock()
+    mock_insert.execute = AsyncMock()
+    mock_table = Mock()
+    mock_table.insert = Mock(return_value=mock_insert)
+    mock_db.table = Mock(return_value=mock_table)
+    
+    with patch("shared.cost_tracking.db", mock_db):
+        await CostTracker().track_cost_saved(uuid4(), "scene_planning", "gpt-4o", Decimal("0.12"))
+    
+    record = mock_table.insert.call_args.args[0]
+    assert record["api_name"] == "gpt-4o:cached"
+    assert record["cost"] == 0.0
+    assert record["cost_saved"] == 0.12
+
+
+@pytest.mark.asyncio
+async def test_track_cost_saved_never_raises(mock_db):
+    """Losing the savings record does not fail the cached call."""
+    mock_insert = Mock()
+    mock_insert.execute = AsyncMock(side_effect=Exception("column cost_saved does not exist"))
+    mock_table = Mock()
+    mock_table.insert = Mock(return_value=mock_insert)
+    mock_db.table = Mock(return_value=mock_table)
+    
+    with patch("shared.cost_tracking.db", mock_db):
+        await CostTracker().track_cost_saved(uuid4(), "scene_planning", "gpt-4o", Decimal("0.12"))
@@ -30,41 +30,30 @@ def mock_supabase_client():
 @pytest.fixture
 def db_client(mock_supabase_client):
     """Create a database client with mocked Supabase."""
-    with patch("shared.database.create_client", return_value=mock_supabase_client):
-        with patch("shared.database.settings") as mock_settings:
-            mock_settings.supabase_url = "https://test.supabase.co"
-            mock_settings.supabase_service_key = "test_key"
-            client = DatabaseClient()
-            client.client = mock_supabase_client
-            return client
+    with patch("shared.database.get_supabase_client", return_value=mock_supabase_client):
+        client = DatabaseClient()
+        client.client = mock_supabase_client
+        return client
 
 
 @pytest.mark.asyncio
 async def test_database_client_initialization():
     """Test that database client initializes correctly."""
-    with patch("shared.database.create_client") as mock_create:
+    with patch("shared.database.get_supabase_client") as mock_create:
         mock_client = Mock()
         mock_create.return_value = mock_client
         
-        with patch("shared.database.settings") as mock_settings:
-            mock_settings.supabase_url = "https://test.supabase.co"
-            mock_settings.supabase_service_key = "test_key"
-            
-            client = DatabaseClient()
-            assert client.client == mock_client
-            mock_create.assert_called_once()
+        client = DatabaseClient()
+        assert client.client == mock_client
+        mock_create.assert_called_once()
 
 
 @pytest.mark.asyncio
 async def test_database_client_initialization_failure():
     """Test that ConfigError is raised on initialization failure."""
-    with patch("shared.database.create_client", side_effect=Exception("Connection failed")):
-        with patch("shared.database.settings") as mock_settings:
-            mock_settings.supabase_url = "https://test.supabase.co"
-            mock_settings.supabase_service_key = "test_key"
-            
-            with pytest.raises(ConfigError, match="Failed to initialize database client"):
-                DatabaseClient()
+    with patch("shared.database.get_supabase_client", side_effect=Exception("Connection failed")):
+        with pytest.raises(ConfigError, match="Failed to initialize database client"):
+            DatabaseClient()
 
 
 @pytest.mark.asyncio
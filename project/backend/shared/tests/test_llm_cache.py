@@ -0,0 +1,185 @@
+"""
+Tests for the LLM response cache.
+"""
+
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+
+from shared.config import settings
+from shared.llm_cache import DiskCacheBackend, LLMCache, request_key
+
+
+class MemoryBackend:
+    """In-memory cache backend."""
+
+    def __init__(self):
+        self.entries = {}
+
+    async def get(self, key):
+        return self.entries.get(key)
+
+    async def set(self, key, entry, ttl):
+        self.entries[key] = entry
+
+    async def delete(self, key):
+        self.entries.pop(key, None)
+
+
+def _client(content="{}", finish_reason="stop"):
+    response = SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content), finish_reason=finish_reason)],
+        usage=SimpleNamespace(prompt_tokens=1000, completion_tokens=500),
+    )
+    create = AsyncMock(return_value=response)
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+
+def _request(**overrides):
+    request = {
+        "model": "gpt-4o",
+        "messages": [{"role": "user", "content": "plan a video"}],
+        "temperature": 0.7,
+        "max_tokens": 400,
+    }
+    request.update(overrides)
+    return request
+
+
+def _cost(model, input_tokens, output_tokens):
+    return Decimal(input_tokens) / 1000 * Decimal("0.005") + Decimal(output_tokens) / 1000 * Decimal("0.015")
+
+
+@pytest.fixture(autouse=True)
+def no_rate_limiter():
+    """Keep the OpenAI limiter (Redis) out of cache tests."""
+    with patch.object(settings, "openai_rate_limiter_enabled", False), \
+         patch.object(settings, "llm_cache_deterministic", False):
+        yield
+
+
+def test_request_key_covers_response_inputs():
+    """Keys change with anything that changes the response, and ignore the rest."""
+    assert request_key(_request()) == request_key(_request(timeout=30.0))
+    assert request_key(_request()) != request_key(_request(temperature=0.3))
+    assert request_key(_request()) != request_key(_request(max_tokens=16000))
+    assert request_key(_request()) != request_key(_request(response_format={"type": "json_object"}))
+
+
+@pytest.mark.asyncio
+async def test_identical_request_is_served_from_cache():
+    """The second identical call skips the API, bills nothing and credits the saving."""
+    cache = LLMCache(backend=MemoryBackend())
+    client = _client(content='{"ok": true}')
+    job_id = uuid4()
+
+    with patch("shared.llm_cache.cost_tracker.track_cost_saved", new_callable=AsyncMock) as mock_saved:
+        first = await cache.complete(client, stage_name="scene_planning", job_id=job_id, cost_fn=_cost, **_request())
+        second = await cache.complete(client, stage_name="scene_planning", job_id=job_id, cost_fn=_cost, **_request())
+
+    assert client.chat.completions.create.await_count == 1
+    assert not first.cached and first.input_tokens == 1000
+    assert second.cached and second.content == '{"ok": true}'
+    assert second.input_tokens == 0 and second.output_tokens == 0
+    mock_saved.assert_awaited_once_with(job_id, "scene_planning", "gpt-4o", Decimal("0.0125"))
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+    assert stats["cost_saved"] == 0.0125
+    assert stats["stages"]["scene_planning"] == {"hits": 1, "misses": 1}
+
+
+@pytest.mark.asyncio
+async def test_truncated_and_discarded_responses_are_not_reused():
+    """Truncated responses are never stored, and discarded ones are dropped."""
+    cache = LLMCache(backend=MemoryBackend())
+
+    truncated = _client(finish_reason="length")
+    await cache.complete(truncated, stage_name="prompt_generator", **_request())
+    await cache.complete(truncated, stage_name="prompt_generator", **_request())
+    assert truncated.chat.completions.create.await_count == 2
+
+    client = _client(content="not json")
+    completion = await cache.complete(client, stage_name="prompt_generator", **_request())
+    await cache.discard(completion)
+    await cache.complete(client, stage_name="prompt_generator", **_request())
+    assert client.chat.completions.create.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_deterministic_mode_pins_temperature_and_seed():
+    """Deterministic mode sends temperature 0 with a request-derived seed."""
+    cache = LLMCache(backend=MemoryBackend())
+    client = _client()
+
+    with patch.object(settings, "llm_cache_deterministic", True):
+        await cache.complete(client, stage_name="scene_planning", **_request())
+
+    sent = client.chat.completions.create.await_args.kwargs
+    assert sent["temperature"] == 0
+    assert isinstance(sent["seed"], int)
+
+
+@pytest.mark.asyncio
+async def test_backend_failures_fail_open():
+    """A broken backend means a miss, never a failed call."""
+    backend = MemoryBackend()
+    backend.get = AsyncMock(side_effect=ConnectionError("Redis down"))
+    backend.set = AsyncMock(side_effect=ConnectionError("Redis down"))
+    cache = LLMCache(backend=backend)
+
+    completion = await cache.complete(_client(), stage_name="scene_planning", **_request())
+
+    assert not completion.cached
+    assert cache.stats()["errors"] == 2
+
+
+@pytest.mark.asyncio
+async def test_disk_backend_round_trip_and_expiry(tmp_path):
+    """Disk entries are read back until their TTL passes."""
+    backend = DiskCacheBackend(str(tmp_path))
+
+    await backend.set("ab12", {"content": "x"}, ttl=60)
+    assert await backend.get("ab12") == {"content": "x"}
+
+    await backend.set("cd34", {"content": "y"}, ttl=-1)
+    assert await backend.get("cd34") is None
+
+
+def _streaming_client(parts, finish_reason="stop"):
+    chunks = [
+        SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=part), finish_reason=None)], usage=None)
+        for part in parts
+    ]
+    chunks.append(SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=None), finish_reason=finish_reason)], usage=None))
+    chunks.append(SimpleNamespace(choices=[], usage=SimpleNamespace(prompt_tokens=1000, completion_tokens=500)))
+
+    async def stream():
+        for chunk in chunks:
+            yield chunk
+
+    create = AsyncMock(side_effect=lambda **kwargs: stream())
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+
+@pytest.mark.asyncio
+async def test_streamed_miss_is_cached_and_replayed_on_hit():
+    """A streamed miss feeds on_delta piece by piece; a hit replays the whole content."""
+    cache = LLMCache(backend=MemoryBackend())
+    client = _streaming_client(['{"characters": ', '[{"id": "a"}]', '}'])
+    received = []
+
+    async def on_delta(text):
+        received.append(text)
+
+    first = await cache.complete(client, stage_name="scene_planning", on_delta=on_delta, **_request())
+    second = await cache.complete(client, stage_name="scene_planning", on_delta=on_delta, **_request())
+
+    assert client.chat.completions.create.await_args.kwargs["stream"] is True
+    assert client.chat.completions.create.await_count == 1
+    assert first.content == '{"characters": [{"id": "a"}]}'
+    assert first.finish_reason == "stop" and first.output_tokens == 500
+    assert second.cached
+    assert received == ['{"characters": ', '[{"id": "a"}]', '}', '{"characters": [{"id": "a"}]}']
@@ -0,0 +1,65 @@
+"""
+Tests for the OpenAI rate limiter.
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from shared.config import settings
+from shared.llm_rate_limiter import LLMRateLimiter, estimate_tokens
+
+
+@pytest.fixture
+def fake_redis():
+    """Redis whose EVAL results are scripted per test."""
+    fake = MagicMock()
+    fake.client.eval = AsyncMock()
+    with patch("shared.llm_rate_limiter.redis_client", fake):
+        yield fake
+
+
+def test_estimate_tokens():
+    """Prompt text is estimated at about four characters per token."""
+    assert estimate_tokens("a" * 400) == 101
+    assert estimate_tokens("a" * 200, "b" * 200) == 101
+    assert estimate_tokens("") == 1
+
+
+@pytest.mark.asyncio
+async def test_acquire_waits_until_granted(fake_redis):
+    """Denied acquisitions sleep for the hinted time and try again."""
+    fake_redis.client.eval.side_effect = [[0, b"0.01"], [1, b"0"]]
+
+    with patch.object(settings, "openai_rate_limiter_enabled", True):
+        lease = await LLMRateLimiter().acquire("gpt-4o", 5000)
+
+    assert lease.granted
+    assert lease.reserved_tokens == 5000
+    assert fake_redis.client.eval.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_acquire_fails_open(fake_redis):
+    """Calls still run when Redis is unavailable."""
+    fake_redis.client.eval.side_effect = ConnectionError("Redis down")
+
+    with patch.object(settings, "openai_rate_limiter_enabled", True):
+        lease = await LLMRateLimiter().acquire("gpt-4o", 5000)
+
+    assert not lease.granted
+
+
+@pytest.mark.asyncio
+async def test_slot_returns_unused_tokens_once(fake_redis):
+    """Tokens reserved beyond actual usage go back to the bucket, once."""
+    fake_redis.client.eval.side_effect = [[1, b"0"], 1]
+    limiter = LLMRateLimiter()
+
+    with patch.object(settings, "openai_rate_limiter_enabled", True):
+        async with limiter.slot("gpt-4o", 12000) as lease:
+            lease.record_usage(4500)
+        await limiter.release(lease)
+
+    assert fake_redis.client.eval.await_count == 2
+    assert fake_redis.client.eval.await_args_list[1].args[-1] == 7500
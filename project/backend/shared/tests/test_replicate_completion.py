@@ -0,0 +1,174 @@
+"""
+Tests for Replicate completion (webhooks + batched polling fallback).
+"""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+import pytest
+import replicate
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from shared.config import settings
+from shared.replicate_completion import PredictionWaiter, verify_webhook_signature, webhook_kwargs
+from shared.tests.replicate_stub import ReplicateStub, STUB_WEBHOOK_SECRET
+
+
+class FakePubSub:
+    """Pattern subscription fed from an asyncio.Queue."""
+
+    def __init__(self):
+        self.queue: asyncio.Queue = asyncio.Queue()
+
+    async def psubscribe(self, pattern):
+        pass
+
+    async def get_message(self, ignore_subscribe_messages=True, timeout=1.0):
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def punsubscribe(self):
+        pass
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture
+def replicate_stub():
+    """Local Replicate API that finishes predictions on the second reload."""
+    with ReplicateStub(polls_to_complete=2) as stub:
+        yield stub
+
+
+@pytest.fixture
+def fake_redis():
+    """Redis with no stored results and an in-memory pub/sub."""
+    pubsub = FakePubSub()
+    fake = MagicMock()
+    fake.client.get = AsyncMock(return_value=None)
+    fake.client.pubsub = Mock(return_value=pubsub)
+    with patch("shared.replicate_completion.redis_client", fake):
+        yield fake, pubsub
+
+
+async def create_prediction(stub: ReplicateStub):
+    client = replicate.Client(api_token="r8_test123456789012345678901234567890", base_url=stub.base_url)
+    return await asyncio.to_thread(client.predictions.create, version="stub-version", input={"prompt": "test"})
+
+
+@pytest.mark.asyncio
+async def test_polling_fallback_completes_prediction(replicate_stub, fake_redis):
+    """Without a webhook, the shared poller reloads the prediction until it finishes."""
+    waiter = PredictionWaiter()
+    prediction = await create_prediction(replicate_stub)
+
+    with patch.object(settings, "replicate_webhook_url", None), \
+         patch.object(settings, "replicate_poll_interval", 0.05):
+        assert await waiter.wait(prediction, timeout=0.01) is False
+        assert await waiter.wait(prediction, timeout=5) is True
+
+    assert prediction.status == "succeeded"
+    assert prediction.output == replicate_stub.output
+    assert replicate_stub.poll_counts[prediction.id] == 2
+
+
+@pytest.mark.asyncio
+async def test_webhook_result_wakes_waiter(replicate_stub, fake_redis):
+    """A published webhook result completes the prediction without polling."""
+    _, pubsub = fake_redis
+    replicate_stub.polls_to_complete = None  # Only complete() finishes predictions
+    waiter = PredictionWaiter()
+    prediction = await create_prediction(replicate_stub)
+    payload = replicate_stub.complete(prediction.id)
+
+    with patch.object(settings, "replicate_webhook_url", "https://api.test/api/v1/webhooks/replicate"), \
+         patch.object(settings, "replicate_webhook_secret", STUB_WEBHOOK_SECRET), \
+         patch.object(settings, "replicate_webhook_fallback_poll_interval", 60):
+        wait_task = asyncio.create_task(waiter.wait(prediction, timeout=5))
+        await pubsub.queue.put({"type": "pmessage", "data": json.dumps(payload).encode("utf-8")})
+        assert await wait_task is True
+
+    assert prediction.status == "succeeded"
+    assert replicate_stub.poll_counts[prediction.id] == 0
+
+
+@pytest.mark.asyncio
+async def test_stored_result_completes_late_waiter(replicate_stub, fake_redis):
+    """Waiters registering after the webhook arrived read the stored result."""
+    redis, _ = fake_redis
+    replicate_stub.polls_to_complete = None
+    waiter = PredictionWaiter()
+    prediction = await create_prediction(replicate_stub)
+    payload = replicate_stub.complete(prediction.id, status="failed", error="NSFW content detected")
+    redis.client.get = AsyncMock(return_value=json.dumps(payload).encode("utf-8"))
+
+    assert await waiter.wait(prediction, timeout=5) is True
+    assert prediction.status == "failed"
+    assert prediction.error == "NSFW content detected"
+
+
+def test_verify_webhook_signature(replicate_stub):
+    """Signatures must match the secret and the exact body."""
+    replicate_stub.predictions["abc"] = {"id": "abc", "status": "succeeded"}
+    body, headers = replicate_stub.signed_webhook("abc")
+
+    assert verify_webhook_signature(headers, body, STUB_WEBHOOK_SECRET)
+    assert not verify_webhook_signature(headers, body + b" ", STUB_WEBHOOK_SECRET)
+    assert not verify_webhook_signature({**headers, "webhook-timestamp": "1"}, body, STUB_WEBHOOK_SECRET)
+    assert not verify_webhook_signature({}, body, STUB_WEBHOOK_SECRET)
+
+
+def test_webhook_route_publishes_terminal_results(replicate_stub):
+    """The gateway route verifies the signature and publishes finished predictions."""
+    from api_gateway.routes import webhooks
+
+    app = FastAPI()
+    app.include_router(webhooks.router, prefix="/api/v1")
+    client = TestClient(app)
+    prediction = replicate_stub.create({"version": "stub-version", "input": {}})
+    replicate_stub.complete(prediction["id"])
+    body, headers = replicate_stub.signed_webhook(prediction["id"])
+
+    with patch.object(settings, "replicate_webhook_secret", STUB_WEBHOOK_SECRET), \
+         patch("api_gateway.routes.webhooks.publish_prediction_result", new_callable=AsyncMock) as mock_publish:
+        response = client.post("/api/v1/webhooks/replicate", content=body, headers=headers)
+        assert response.status_code == 200
+        assert mock_publish.await_args[0][0]["id"] == prediction["id"]
+
+        forged = client.post("/api/v1/webhooks/replicate", content=body, headers={**headers, "webhook-signature": "v1,forged"})
+        assert forged.status_code == 401
+        assert mock_publish.await_count == 1
+
+
+def test_webhook_route_rejects_callbacks_without_secret(replicate_stub):
+    """Without a signing secret every callback is rejected, signed or not."""
+    from api_gateway.routes import webhooks
+
+    app = FastAPI()
+    app.include_router(webhooks.router, prefix="/api/v1")
+    client = TestClient(app)
+    prediction = replicate_stub.create({"version": "stub-version", "input": {}})
+    replicate_stub.complete(prediction["id"])
+    body, headers = replicate_stub.signed_webhook(prediction["id"])
+
+    with patch.object(settings, "replicate_webhook_secret", None), \
+         patch("api_gateway.routes.webhooks.publish_prediction_result", new_callable=AsyncMock) as mock_publish:
+        assert client.post("/api/v1/webhooks/replicate", content=body, headers=headers).status_code == 401
+        assert client.post("/api/v1/webhooks/replicate", content=body).status_code == 401
+        assert not mock_publish.called
+
+
+def test_webhooks_registered_only_with_secret():
+    """Predictions only ask for webhooks when callbacks can be verified."""
+    url = "https://api.test/api/v1/webhooks/replicate"
+    with patch.object(settings, "replicate_webhook_url", url), \
+         patch.object(settings, "replicate_webhook_secret", None):
+        assert webhook_kwargs() == {}
+    with patch.object(settings, "replicate_webhook_url", url), \
+         patch.object(settings, "replicate_webhook_secret", STUB_WEBHOOK_SECRET):
+        assert webhook_kwargs()["webhook"] == url
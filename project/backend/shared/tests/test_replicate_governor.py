@@ -0,0 +1,86 @@
+"""
+Tests for the Replicate concurrency governor.
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from shared.config import settings
+from shared.errors import RateLimitError
+from shared.replicate_governor import ReplicateGovernor, model_family
+
+
+@pytest.fixture
+def fake_redis():
+    """Redis whose EVAL results are scripted per test."""
+    fake = MagicMock()
+    fake.client.eval = AsyncMock()
+    with patch("shared.replicate_governor.redis_client", fake):
+        yield fake
+
+
+def test_model_family():
+    """Config keys and Replicate model strings map to the same family."""
+    assert model_family("kling_v21") == "kling"
+    assert model_family("kwaivgi/kling-v2.1") == "kling"
+    assert model_family("google/veo-3.1") == "veo"
+    assert model_family("black-forest-labs/flux-1.1-pro-ultra") == "flux"
+    assert model_family("pixverse/lipsync") == "pixverse"
+    assert model_family("someone/unknown-model:abc123") == "default"
+
+
+@pytest.mark.asyncio
+async def test_acquire_waits_until_granted(fake_redis):
+    """Denied acquisitions sleep for the hinted time and try again."""
+    fake_redis.client.eval.side_effect = [[0, b"0.01"], [1, b"0"]]
+
+    with patch.object(settings, "replicate_governor_enabled", True):
+        lease = await ReplicateGovernor().acquire("kwaivgi/kling-v2.1")
+
+    assert lease.family == "kling"
+    assert lease.lease_id is not None
+    assert fake_redis.client.eval.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_acquire_fails_open(fake_redis):
+    """Predictions still run when Redis is unavailable."""
+    fake_redis.client.eval.side_effect = ConnectionError("Redis down")
+
+    with patch.object(settings, "replicate_governor_enabled", True):
+        lease = await ReplicateGovernor().acquire("google/veo-3.1")
+
+    assert lease.lease_id is None
+
+
+@pytest.mark.asyncio
+async def test_slot_reports_throttling_with_retry_after(fake_redis):
+    """A 429 inside the slot releases the lease as throttled with its Retry-After."""
+    fake_redis.client.eval.side_effect = [[1, b"0"], b"3.0"]
+    governor = ReplicateGovernor()
+
+    with patch.object(settings, "replicate_governor_enabled", True):
+        with pytest.raises(RateLimitError):
+            async with governor.slot("black-forest-labs/flux-1.1-pro-ultra") as lease:
+                raise RateLimitError("Rate limit exceeded", retry_after=30)
+
+    release_args = fake_redis.client.eval.await_args_list[1].args
+    assert lease.released
+    assert release_args[5:8] == (lease.lease_id, "throttled", 30.0)
+
+
+@pytest.mark.asyncio
+async def test_release_is_idempotent(fake_redis):
+    """Releasing after completion and again in cleanup returns capacity once."""
+    fake_redis.client.eval.side_effect = [[1, b"0"], b"6.0"]
+    governor = ReplicateGovernor()
+
+    with patch.object(settings, "replicate_governor_enabled", True):
+        lease = await governor.acquire("pixverse/lipsync")
+        lease.succeeded()
+        await governor.release(lease)
+        await governor.release(lease)
+
+    assert fake_redis.client.eval.await_count == 2
+    assert fake_redis.client.eval.await_args_list[1].args[6] == "succeeded"
@@ -0,0 +1,106 @@
+"""
+Tests for the signed URL service.
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from shared import signed_urls
+from shared.errors import RetryableError
+
+
+@pytest.fixture
+def mock_redis():
+    """In-memory stand-in for the Redis calls the cache makes."""
+    store = {}
+    with patch("shared.signed_urls.redis_client") as mock_redis_client:
+        mock_redis_client.client.mget = AsyncMock(side_effect=lambda keys: [store.get(key) for key in keys])
+
+        def pipeline(transaction=True):
+            pipe = MagicMock()
+            pipe.set = MagicMock(side_effect=lambda key, value, ex=None: store.__setitem__(key, value))
+            pipe.execute = AsyncMock(return_value=[])
+            return pipe
+
+        mock_redis_client.client.pipeline = MagicMock(side_effect=pipeline)
+        mock_redis_client.store = store
+        yield mock_redis_client
+
+
+@pytest.fixture
+def mock_storage():
+    """Storage client that signs every requested path."""
+    storage = MagicMock()
+    storage.get_signed_urls = AsyncMock(
+        side_effect=lambda bucket, paths, expires_in=3600: {path: f"https://signed/{bucket}/{path}" for path in paths}
+    )
+    return storage
+
+
+@pytest.mark.asyncio
+async def test_misses_are_minted_in_one_request(mock_redis, mock_storage):
+    """All uncached paths are signed with one bulk request."""
+    paths = [f"job/clip_{i}.mp4" for i in range(30)]
+
+    result = await signed_urls.get_signed_urls("video-clips", paths, storage=mock_storage)
+
+    assert result == {path: f"https://signed/video-clips/{path}" for path in paths}
+    mock_storage.get_signed_urls.assert_awaited_once_with("video-clips", paths, expires_in=3600)
+    assert len(mock_redis.store) == 30
+
+
+@pytest.mark.asyncio
+async def test_cached_urls_skip_supabase(mock_redis, mock_storage):
+    """Only paths missing from the cache are minted."""
+    await signed_urls.get_signed_urls("video-clips", ["job/clip_0.mp4"], storage=mock_storage)
+    mock_storage.get_signed_urls.reset_mock()
+
+    result = await signed_urls.get_signed_urls(
+        "video-clips", ["job/clip_0.mp4", "job/clip_1.mp4"], storage=mock_storage
+    )
+
+    assert set(result) == {"job/clip_0.mp4", "job/clip_1.mp4"}
+    mock_storage.get_signed_urls.assert_awaited_once_with("video-clips", ["job/clip_1.mp4"], expires_in=3600)
+
+
+@pytest.mark.asyncio
+async def test_expiry_bucket_rollover_mints_again(mock_redis, mock_storage):
+    """A URL is reused within its expiry bucket, then replaced by a fresh one."""
+    with patch("shared.signed_urls.time.time", return_value=1000.0):
+        await signed_urls.get_signed_url("video-outputs", "job/video.mp4", storage=mock_storage)
+    with patch("shared.signed_urls.time.time", return_value=1000.0 + 900):
+        await signed_urls.get_signed_url("video-outputs", "job/video.mp4", storage=mock_storage)
+
+    assert mock_storage.get_signed_urls.await_count == 2
+
+
+def test_expiry_bucket_leaves_most_of_the_lifetime():
+    """Cached URLs expire with the bucket, at most a quarter into their lifetime."""
+    index, ttl = signed_urls._expiry_bucket(3600, 1000.0)
+
+    assert index == 1
+    assert ttl == 800
+
+
+@pytest.mark.asyncio
+async def test_redis_failure_falls_back_to_minting(mock_redis, mock_storage):
+    """Cache errors never fail the request."""
+    mock_redis.client.mget.side_effect = ConnectionError("Redis down")
+    mock_redis.client.pipeline.side_effect = ConnectionError("Redis down")
+
+    result = await signed_urls.get_signed_url("video-outputs", "job/video.mp4", storage=mock_storage)
+
+    assert result == "https://signed/video-outputs/job/video.mp4"
+
+
+@pytest.mark.asyncio
+async def test_unsigned_path_raises(mock_redis, mock_storage):
+    """A path Supabase could not sign raises a retryable error."""
+    mock_storage.get_signed_urls.side_effect = None
+    mock_storage.get_signed_urls.return_value = {}
+
+    with pytest.raises(RetryableError):
+        await signed_urls.get_signed_url("video-outputs", "job/missing.mp4", storage=mock_storage)
+
+    assert mock_redis.store == {}
@@ -28,17 +28,13 @@ def storage_client(mock_supabase_storage):
     """Create a storage client with mocked Supabase."""
     storage, bucket = mock_supabase_storage
     
-    with patch("shared.storage.create_client") as mock_create:
+    with patch("shared.storage.get_supabase_client") as mock_create:
         mock_client = Mock()
         mock_client.storage = storage
         mock_create.return_value = mock_client
         
-        with patch("shared.storage.settings") as mock_settings:
-            mock_settings.supabase_url = "https://test.supabase.co"
-            mock_settings.supabase_service_key = "test_key"
-            
-            client = StorageClient()
-            return client, bucket
+        client = StorageClient()
+        return client, bucket
 
 
 @pytest.mark.asyncio
@@ -48,26 +44,18 @@ async def test_storage_client_initialization():
     mock_storage = Mock()
     mock_client.storage = mock_storage
     
-    with patch("shared.storage.create_client", return_value=mock_client):
-        with patch("shared.storage.settings") as mock_settings:
-            mock_settings.supabase_url = "https://test.supabase.co"
-            mock_settings.supabase_service_key = "test_key"
-            
-            client = StorageClient()
-            assert client.storage == mock_storage
-            assert client.bucket_limits == DEFAULT_BUCKET_LIMITS
+    with patch("shared.storage.get_supabase_client", return_value=mock_client):
+        client = StorageClient()
+        assert client.storage == mock_storage
+        assert client.bucket_limits == DEFAULT_BUCKET_LIMITS
 
 
 @pytest.mark.asyncio
 async def test_storage_client_initialization_failure():
     """Test that ConfigError is raised on initialization failure."""
-    with patch("shared.storage.create_client", side_effect=Exception("Connection failed")):
-        with patch("shared.storage.settings") as mock_settings:
-            mock_settings.supabase_url = "https://test.supabase.co"
-            mock_settings.supabase_service_key = "test_key"
-            
-            with pytest.raises(ConfigError, match="Failed to initialize storage client"):
-                StorageClient()
+    with patch("shared.storage.get_supabase_client", side_effect=Exception("Connection failed")):
+        with pytest.raises(ConfigError, match="Failed to initialize storage client"):
+            StorageClient()
 
 
 @pytest.mark.asyncio
@@ -180,6 +168,27 @@ async def test_storage_get_signed_url(storage_client):
         assert result == signed_url
 
 
+@pytest.mark.asyncio
+async def test_storage_get_signed_urls(storage_client):
+    """Test generating signed URLs in one bulk request."""
+    client, bucket = storage_client
+    
+    response = [
+        {"path": "job/clip_0.mp4", "signedURL": "https://storage.supabase.co/clip_0?token=a", "error": None},
+        {"path": "job/clip_1.mp4", "signedURL": None, "error": "Either the object does not exist or you do not have access to it"},
+    ]
+    bucket.create_signed_urls = Mock(return_value=response)
+    
+    with patch("shared.storage.run_in_pool", new=AsyncMock(side_effect=lambda func: func())):
+        result = await client.get_signed_urls(
+            bucket="video-clips",
+            paths=["job/clip_0.mp4", "job/clip_1.mp4"]
+        )
+    
+    assert result == {"job/clip_0.mp4": "https://storage.supabase.co/clip_0?token=a"}
+    bucket.create_signed_urls.assert_called_once_with(paths=["job/clip_0.mp4", "job/clip_1.mp4"], expires_in=3600)
+
+
 @pytest.mark.asyncio
 async def test_storage_get_signed_url_alternative_key(storage_client):
     """Test that signed URL handles alternative key names."""
@@ -267,15 +276,11 @@ async def test_storage_custom_bucket_limits():
     """Test that custom bucket limits can be provided."""
     custom_limits = {"audio-uploads": 20 * 1024 * 1024}
     
-    with patch("shared.storage.create_client") as mock_create:
+    with patch("shared.storage.get_supabase_client") as mock_create:
         mock_client = Mock()
         mock_client.storage = Mock()
         mock_create.return_value = mock_client
         
-        with patch("shared.storage.settings") as mock_settings:
-            mock_settings.supabase_url = "https://test.supabase.co"
-            mock_settings.supabase_service_key = "test_key"
-            
-            client = StorageClient(bucket_limits=custom_limits)
-            assert client.bucket_limits["audio-uploads"] == 20 * 1024 * 1024
+        client = StorageClient(bucket_limits=custom_limits)
+        assert client.bucket_limits["audio-uploads"] == 20 * 1024 * 1024
 
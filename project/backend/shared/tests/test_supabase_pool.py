@@ -0,0 +1,46 @@
+"""
+Tests for the shared Supabase client and executor.
+"""
+
+import threading
+from unittest.mock import Mock, patch
+
+import httpx
+import pytest
+
+from shared import supabase_pool
+
+
+@pytest.fixture
+def fresh_pool():
+    """Start each test without a shared client or executor."""
+    with patch.object(supabase_pool, "_client", None), \
+         patch.object(supabase_pool, "_http_client", None), \
+         patch.object(supabase_pool, "_executor", None):
+        yield
+
+
+def test_client_is_created_once(fresh_pool):
+    """All callers share one client built on the pooled HTTP client."""
+    with patch("shared.supabase_pool.create_client", return_value=Mock()) as mock_create, \
+         patch("shared.supabase_pool.ClientOptions") as mock_options:
+        first = supabase_pool.get_supabase_client()
+        second = supabase_pool.get_supabase_client()
+
+    assert first is second
+    mock_create.assert_called_once()
+    assert isinstance(mock_options.call_args.kwargs["httpx_client"], httpx.Client)
+
+
+@pytest.mark.asyncio
+async def test_run_in_pool_uses_dedicated_executor(fresh_pool):
+    """Blocking calls run on the Supabase executor, not the default thread pool."""
+    calls_before = supabase_pool.pool_stats()["calls"]
+
+    thread_name = await supabase_pool.run_in_pool(lambda: threading.current_thread().name)
+
+    assert thread_name.startswith("supabase")
+    stats = supabase_pool.pool_stats()
+    assert stats["calls"] == calls_before + 1
+    assert stats["in_flight"] == 0
+    assert stats["connections"] == 0
@@ -22,6 +22,8 @@ export function useSSE(
   const reconnectAttemptsRef = useRef(0)
   const reconnectTimeoutRef = useRef<NodeJS.Timeout | null>(null)
   const lastErrorTimeRef = useRef<number | null>(null) // Track when errors occur to detect 503-like issues
+  // Last event log ID received, sent on reconnect so the server replays missed events
+  const lastEventIdRef = useRef<string | null>(null)
   // Store handlers in ref to prevent re-connections when handlers change
   const handlersRef = useRef<SSEHandlers>(handlers)
   
@@ -66,10 +68,20 @@ export function useSSE(
       return // Don't connect without token
     }
     
-    const url = `${API_BASE_URL}/api/v1/jobs/${jobId}/stream?token=${encodeURIComponent(token)}`
+    let url = `${API_BASE_URL}/api/v1/jobs/${jobId}/stream?token=${encodeURIComponent(token)}`
+    // We reconnect manually with a new EventSource, so pass the resume point ourselves
+    if (lastEventIdRef.current) {
+      url += `&last_event_id=${encodeURIComponent(lastEventIdRef.current)}`
+    }
     
     const eventSource = new EventSource(url, { withCredentials: true })
 
+    const trackEventId = (e: MessageEvent) => {
+      if (e.lastEventId) {
+        lastEventIdRef.current = e.lastEventId
+      }
+    }
+
     eventSource.onopen = () => {
       setIsConnected(true)
       setError(null)
@@ -111,6 +123,7 @@ export function useSSE(
 
     // Register event listeners - use handlersRef to get latest handlers without re-creating connection
     eventSource.addEventListener("stage_update", (e: MessageEvent) => {
+      trackEventId(e)
       try {
         const data = JSON.parse(e.data)
         handlersRef.current.onStageUpdate?.(data)
@@ -120,6 +133,7 @@ export function useSSE(
     })
 
     eventSource.addEventListener("progress", (e: MessageEvent) => {
+      trackEventId(e)
       try {
         const data = JSON.parse(e.data)
         handlersRef.current.onProgress?.(data)
@@ -129,6 +143,7 @@ export function useSSE(
     })
 
     eventSource.addEventListener("message", (e: MessageEvent) => {
+      trackEventId(e)
       try {
         const data = JSON.parse(e.data)
         handlersRef.current.onMessage?.(data)
@@ -138,6 +153,7 @@ export function useSSE(
     })
 
     eventSource.addEventListener("cost_update", (e: MessageEvent) => {
+      trackEventId(e)
       try {
         const data = JSON.parse(e.data)
         handlersRef.current.onCostUpdate?.(data)
@@ -147,6 +163,7 @@ export function useSSE(
     })
 
     eventSource.addEventListener("completed", (e: MessageEvent) => {
+      trackEventId(e)
       try {
         const data = JSON.parse(e.data)
         handlersRef.current.onCompleted?.(data)
@@ -158,6 +175,7 @@ export function useSSE(
     })
 
     eventSource.addEventListener("error", (e: MessageEvent) => {
+      trackEventId(e)
       try {
         // Only parse if data exists and is not empty
         if (e.data && typeof e.data === 'string' && e.data.trim() !== '') {
@@ -175,6 +193,7 @@ export function useSSE(
     })
 
     eventSource.addEventListener("audio_parser_results", (e: MessageEvent) => {
+      trackEventId(e)
       try {
         const data = JSON.parse(e.data)
         handlersRef.current.onAudioParserResults?.(data)
@@ -184,6 +203,7 @@ export function useSSE(
     })
 
     eventSource.addEventListener("scene_planner_results", (e: MessageEvent) => {
+      trackEventId(e)
       try {
         const data = JSON.parse(e.data)
         handlersRef.current.onScenePlannerResults?.(data)
@@ -193,6 +213,7 @@ export function useSSE(
     })
 
     eventSource.addEventListener("prompt_generator_results", (e: MessageEvent) => {
+      trackEventId(e)
       try {
         const data = JSON.parse(e.data)
         handlersRef.current.onPromptGeneratorResults?.(data)
@@ -201,6 +222,7 @@ export function useSSE(
       }
     })
     eventSource.addEventListener("video_generation_start", (e: MessageEvent) => {
+      trackEventId(e)
       try {
         const data = JSON.parse(e.data)
         handlersRef.current.onVideoGenerationStart?.(data)
@@ -209,6 +231,7 @@ export function useSSE(
       }
     })
     eventSource.addEventListener("video_generation_complete", (e: MessageEvent) => {
+      trackEventId(e)
       try {
         const data = JSON.parse(e.data)
         handlersRef.current.onVideoGenerationComplete?.(data)
@@ -217,6 +240,7 @@ export function useSSE(
       }
     })
     eventSource.addEventListener("video_generation_failed", (e: MessageEvent) => {
+      trackEventId(e)
       try {
         const data = JSON.parse(e.data)
         handlersRef.current.onVideoGenerationFailed?.(data)
@@ -225,6 +249,7 @@ export function useSSE(
       }
     })
     eventSource.addEventListener("video_generation_retry", (e: MessageEvent) => {
+      trackEventId(e)
       try {
         const data = JSON.parse(e.data)
         handlersRef.current.onVideoGenerationRetry?.(data)
@@ -234,6 +259,7 @@ export function useSSE(
     })
 
     eventSource.addEventListener("reference_generation_start", (e: MessageEvent) => {
+      trackEventId(e)
       try {
         const data = JSON.parse(e.data)
         handlersRef.current.onReferenceGenerationStart?.(data)
@@ -243,6 +269,7 @@ export function useSSE(
     })
 
     eventSource.addEventListener("reference_generation_complete", (e: MessageEvent) => {
+      trackEventId(e)
       try {
         const data = JSON.parse(e.data)
         handlersRef.current.onReferenceGenerationComplete?.(data)
@@ -252,6 +279,7 @@ export function useSSE(
     })
 
     eventSource.addEventListener("reference_generation_failed", (e: MessageEvent) => {
+      trackEventId(e)
       try {
         const data = JSON.parse(e.data)
         handlersRef.current.onReferenceGenerationFailed?.(data)
@@ -261,6 +289,7 @@ export function useSSE(
     })
 
     eventSource.addEventListener("reference_generation_retry", (e: MessageEvent) => {
+      trackEventId(e)
       try {
         const data = JSON.parse(e.data)
         handlersRef.current.onReferenceGenerationRetry?.(data)
@@ -270,6 +299,7 @@ export function useSSE(
     })
 
     eventSource.addEventListener("regeneration_started", (e: MessageEvent) => {
+      trackEventId(e)
       try {
         const data = JSON.parse(e.data)
         handlersRef.current.onRegenerationStarted?.(data)
@@ -279,6 +309,7 @@ export function useSSE(
     })
 
     eventSource.addEventListener("template_matched", (e: MessageEvent) => {
+      trackEventId(e)
       try {
         const data = JSON.parse(e.data)
         handlersRef.current.onTemplateMatched?.(data)
@@ -288,6 +319,7 @@ export function useSSE(
     })
 
     eventSource.addEventListener("prompt_modified", (e: MessageEvent) => {
+      trackEventId(e)
       try {
         const data = JSON.parse(e.data)
         handlersRef.current.onPromptModified?.(data)
@@ -297,6 +329,7 @@ export function useSSE(
     })
 
     eventSource.addEventListener("video_generating", (e: MessageEvent) => {
+      trackEventId(e)
       try {
         const data = JSON.parse(e.data)
         handlersRef.current.onVideoGenerating?.(data)
@@ -306,6 +339,7 @@ export function useSSE(
     })
 
     eventSource.addEventListener("regeneration_complete", (e: MessageEvent) => {
+      trackEventId(e)
       try {
         const data = JSON.parse(e.data)
         handlersRef.current.onRegenerationComplete?.(data)
@@ -315,6 +349,7 @@ export function useSSE(
     })
 
     eventSource.addEventListener("regeneration_failed", (e: MessageEvent) => {
+      trackEventId(e)
       try {
         const data = JSON.parse(e.data)
         handlersRef.current.onRegenerationFailed?.(data)
@@ -324,6 +359,7 @@ export function useSSE(
     })
 
     eventSource.addEventListener("recomposition_started", (e: MessageEvent) => {
+      trackEventId(e)
       try {
         const data = JSON.parse(e.data)
         handlersRef.current.onRecompositionStarted?.(data)
@@ -333,6 +369,7 @@ export function useSSE(
     })
 
     eventSource.addEventListener("recomposition_complete", (e: MessageEvent) => {
+      trackEventId(e)
       try {
         const data = JSON.parse(e.data)
         handlersRef.current.onRecompositionComplete?.(data)
@@ -342,6 +379,7 @@ export function useSSE(
     })
 
     eventSource.addEventListener("recomposition_failed", (e: MessageEvent) => {
+      trackEventId(e)
       try {
         const data = JSON.parse(e.data)
         handlersRef.current.onRecompositionFailed?.(data)
@@ -354,6 +392,8 @@ export function useSSE(
   }, [jobId, close])
 
   useEffect(() => {
+    // Resume points belong to one job's event log
+    lastEventIdRef.current = null
     if (jobId && !eventSourceRef.current) {
       connect()
     }
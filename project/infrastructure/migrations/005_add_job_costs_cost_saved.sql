@@ -0,0 +1,8 @@
+-- Migration: Add cost_saved column to job_costs table
+-- Calls answered from the LLM response cache are recorded as zero-cost rows
+-- (api_name "<model>:cached") carrying the cost the avoided API call would have had
+
+ALTER TABLE job_costs
+ADD COLUMN IF NOT EXISTS cost_saved DECIMAL(10,4) NOT NULL DEFAULT 0 CHECK (cost_saved >= 0);
+
+COMMENT ON COLUMN job_costs.cost_saved IS 'Cost of an API call avoided by a cache hit (cost is 0 on these rows)';